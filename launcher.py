@@ -20,7 +20,6 @@ Configuration:
 from __future__ import annotations
 
 import argparse
-import asyncio
 import contextlib
 import io
 import os
@@ -30,7 +29,6 @@ import subprocess
 import sys
 import threading
 import time
-import webbrowser
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -51,6 +49,9 @@ REPO_ROOT = Path(__file__).resolve().parent
 DEFAULT_STREAMLIT_APP = REPO_ROOT / "streamlit_app.py"
 
 # Architecture v4 - Chemins DuckDB (centralisés dans src/utils/paths)
+# src.utils n'importe ses sous-modules qu'à la demande : coût négligeable avant
+# le parsing des arguments. asyncio / webbrowser sont importés par les
+# commandes qui s'en servent (sync / run).
 from src.utils.paths import (
     METADATA_DB_FILENAME,
     PLAYER_DB_FILENAME,
@@ -412,11 +413,17 @@ def _sync_player_duckdb(
     Returns:
         Tuple (matchs_avant, matchs_après)
     """
+    import asyncio
+
     return asyncio.run(_sync_player_duckdb_async(gamertag, delta=delta, max_matches=max_matches))
 
 
-def _fetch_profile_assets(gamertag: str) -> None:
-    """Récupère les assets profil du joueur."""
+def _fetch_profile_assets(gamertag: str) -> list[tuple[str, str]]:
+    """Récupère l'apparence du joueur et retourne ses images à télécharger.
+
+    Returns:
+        Liste de (url, prefix) pour `download_images_to_cache`.
+    """
     try:
         from src.ui.profile_api import (
             fetch_appearance_via_spnkr,
@@ -425,7 +432,7 @@ def _fetch_profile_assets(gamertag: str) -> None:
             save_cached_xuid,
         )
     except ImportError:
-        return
+        return []
 
     print("  → Fetch assets profil...")
 
@@ -443,8 +450,9 @@ def _fetch_profile_assets(gamertag: str) -> None:
             pass
 
     if not xuid:
-        return
+        return []
 
+    appearance = None
     try:
         appearance = fetch_appearance_via_spnkr(xuid=xuid)
         if appearance:
@@ -452,6 +460,41 @@ def _fetch_profile_assets(gamertag: str) -> None:
     except Exception:
         pass
 
+    if not appearance:
+        return []
+    return [
+        (str(url), prefix)
+        for prefix, url in (
+            ("emblem", getattr(appearance, "emblem_image_url", None)),
+            ("backdrop", getattr(appearance, "backdrop_image_url", None)),
+            ("nameplate", getattr(appearance, "nameplate_image_url", None)),
+            ("adornment", getattr(appearance, "adornment_image_url", None)),
+        )
+        if url
+    ]
+
+
+def _download_profile_images(image_requests: list[tuple[str, str]]) -> None:
+    """Télécharge en un lot (session partagée) les images profil absentes du cache."""
+    if not image_requests:
+        return
+    try:
+        from src.ui.player_assets import download_images_to_cache
+    except ImportError:
+        return
+
+    print("\n🖼  Téléchargement des images profil...")
+    try:
+        results = download_images_to_cache(image_requests)
+    except Exception as e:
+        print(f"   ⚠ Images profil: {e}")
+        return
+    failed = sum(1 for ok, _msg, _path in results.values() if not ok)
+    print(
+        f"   ✓ {len(results) - failed} image(s) en cache"
+        + (f", {failed} échec(s)" if failed else "")
+    )
+
 
 # =============================================================================
 # Commandes principales
@@ -488,6 +531,9 @@ def _launch_streamlit(
         str(chosen_port),
         "--server.headless",
         "true",
+        # Atlas d'icônes servis depuis static/ (src/ui/sprite_atlas.py)
+        "--server.enableStaticServing",
+        "true",
     ]
 
     # Délai avant ouverture du navigateur pour laisser Streamlit démarrer
@@ -510,6 +556,8 @@ def _launch_streamlit(
 
     if not no_browser:
         time.sleep(STREAMLIT_STARTUP_DELAY_SECONDS)
+        import webbrowser
+
         with contextlib.suppress(Exception):
             webbrowser.open(url)
 
@@ -575,6 +623,7 @@ def _cmd_sync(args: argparse.Namespace) -> int:
 
     total_new = 0
     failures = 0
+    image_requests: list[tuple[str, str]] = []
 
     for player in players:
         if _check_shutdown():
@@ -598,8 +647,8 @@ def _cmd_sync(args: argparse.Namespace) -> int:
             else:
                 print(f"  ✓ À jour ({after} matchs)")
 
-            # Fetch assets profil
-            _fetch_profile_assets(player.gamertag)
+            # Fetch assets profil (images téléchargées en un lot après la boucle)
+            image_requests.extend(_fetch_profile_assets(player.gamertag))
 
         except Exception as e:
             print(f"  ⚠ Erreur: {e}")
@@ -608,6 +657,8 @@ def _cmd_sync(args: argparse.Namespace) -> int:
     if _check_shutdown():
         return 0
 
+    _download_profile_images(image_requests)
+
     print("\n" + "=" * 60)
     print("✅ SYNCHRONISATION TERMINÉE")
     print("=" * 60)
@@ -23,7 +23,6 @@ Structure de sortie:
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import sys
 from datetime import datetime, timedelta
@@ -34,6 +33,8 @@ from typing import Any
 REPO_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(REPO_ROOT))
 
+from src.data.infrastructure.parquet.archive_catalog import ArchiveCatalog  # noqa: E402
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -120,24 +121,28 @@ def get_archive_index(archive_dir: Path) -> dict[str, Any]:
     """Charge l'index des archives existantes.
 
     Returns:
-        Dict avec les métadonnées des archives.
+        Dict avec les métadonnées des archives (statistiques de footer incluses).
     """
-    index_file = archive_dir / "archive_index.json"
-
-    if not index_file.exists():
-        return {"version": 1, "archives": [], "last_updated": None}
+    return ArchiveCatalog.load(archive_dir).to_dict()
 
-    with open(index_file, encoding="utf-8") as f:
-        return json.load(f)
 
+def update_archive_catalog(
+    archive_dir: Path,
+    files_created: list[str],
+    cutoff_date: datetime,
+) -> ArchiveCatalog:
+    """Enregistre les archives créées dans le catalogue et le publie.
 
-def save_archive_index(archive_dir: Path, index: dict[str, Any]) -> None:
-    """Sauvegarde l'index des archives."""
-    index_file = archive_dir / "archive_index.json"
-    index["last_updated"] = datetime.now().isoformat()
-
-    with open(index_file, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2, ensure_ascii=False, default=str)
+    Chaque entrée reçoit son nombre de lignes et sa plage min/max de
+    ``start_time`` (footer Parquet), utilisés par le repository pour
+    n'ouvrir que les archives pertinentes.
+    """
+    catalog = ArchiveCatalog.load(archive_dir)
+    now = datetime.now().isoformat()
+    for file_name in files_created:
+        catalog.register(file_name, created_at=now, cutoff_date=cutoff_date.isoformat())
+    catalog.save()
+    return catalog
 
 
 def archive_matches(
@@ -263,18 +268,8 @@ def archive_matches(
                 if single_stats.get("file_path"):
                     stats["files_created"].append(single_stats["file_path"])
 
-        # Mettre à jour l'index des archives
-        index = get_archive_index(archive_dir)
-        for file_path in stats["files_created"]:
-            if file_path not in [a["file"] for a in index["archives"]]:
-                index["archives"].append(
-                    {
-                        "file": file_path,
-                        "created_at": datetime.now().isoformat(),
-                        "cutoff_date": cutoff_date.isoformat(),
-                    }
-                )
-        save_archive_index(archive_dir, index)
+        # Mettre à jour le catalogue des archives (statistiques de footer)
+        update_archive_catalog(archive_dir, stats["files_created"], cutoff_date)
 
         # Résumé
         total_mb = stats["bytes_written"] / (1024 * 1024)
@@ -389,22 +384,25 @@ def list_archives(gamertag: str) -> None:
     if archive_dir.exists():
         logger.info(f"\nArchives ({archive_dir}):")
 
-        index = get_archive_index(archive_dir)
+        catalog = ArchiveCatalog.load(archive_dir)
 
-        parquet_files = list(archive_dir.glob("*.parquet"))
-        if parquet_files:
-            total_size = sum(f.stat().st_size for f in parquet_files)
-            logger.info(f"  Fichiers: {len(parquet_files)}")
+        if catalog.entries:
+            total_size = sum(e.size_bytes or 0 for e in catalog.entries)
+            logger.info(f"  Fichiers: {len(catalog.entries)}")
+            logger.info(f"  Matchs archivés: {catalog.total_rows}")
             logger.info(f"  Taille totale: {total_size / (1024*1024):.2f} MB")
 
-            for pf in sorted(parquet_files):
-                size_mb = pf.stat().st_size / (1024 * 1024)
-                logger.info(f"    - {pf.name} ({size_mb:.2f} MB)")
+            for entry in catalog.entries:
+                size_mb = (entry.size_bytes or 0) / (1024 * 1024)
+                span = f"{entry.min_start_time or '?'} → {entry.max_start_time or '?'}"
+                logger.info(
+                    f"    - {entry.file} ({size_mb:.2f} MB, {entry.row_count} matchs, {span})"
+                )
         else:
             logger.info("  Aucune archive")
 
-        if index.get("last_updated"):
-            logger.info(f"\n  Dernière mise à jour: {index['last_updated']}")
+        if catalog.last_updated:
+            logger.info(f"\n  Dernière mise à jour: {catalog.last_updated}")
     else:
         logger.info("\nArchives: Aucune (dossier inexistant)")
 
@@ -4,6 +4,7 @@ Structure :
 - core.py         : Fonctions d'insertion de base (medals, events, skill, etc.)
 - detection.py    : Détection des matchs avec données manquantes (AND/OR configurable)
 - strategies.py   : Stratégies de backfill spécifiques (killer/victim, end_time, perf_score)
+- bulk_updates.py : UPDATE groupés par lot de matchs (participants, accuracy/shots, enemy_mmr)
 - orchestrator.py : Orchestration du backfill pour un ou plusieurs joueurs
 - cli.py          : Parsing des arguments CLI
 """
@@ -0,0 +1,333 @@
+"""Mises à jour groupées du backfill (UPDATE … FROM un lot Arrow).
+
+Les backfills participants (scores, kda, shots, damage, avg_life), accuracy /
+shots de match_stats et enemy_mmr mettaient à jour ligne par ligne
+(``UPDATE … WHERE match_id = ? AND xuid = ?``), chaque requête étant sa
+propre transaction : des centaines de milliers de commits sur un backfill
+complet du shared.
+
+HOW IT WORKS:
+1. L'orchestrateur empile les lignes extraites de chaque match dans un
+   ``BulkUpdateBatch`` (aucune écriture pendant le traitement du match)
+2. Tous les ``chunk_size`` matchs (et en fin de boucle), ``flush`` construit
+   une table Arrow par cible, l'enregistre (``register``) et applique une
+   seule requête ``UPDATE … FROM`` par cible, suivie du bitmask
+   ``backfill_completed`` des matchs du lot (même ordre qu'avant : données
+   puis bitmask, un lot interrompu est simplement retraité)
+3. ``BulkUpdateReport`` cumule lots, lignes et durées pour le rapport de
+   progression et de débit
+
+Aucun commit : le commit est géré par l'orchestrateur.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from scripts.backfill.core import insert_skill_row
+from src.data.sync import tracing
+from src.data.sync.batch_insert import CAST_PLAN, coerce_row_types
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_MATCHES = 200
+
+# Groupe de backfill → colonnes de match_participants
+PARTICIPANT_DETAIL_COLUMNS: dict[str, tuple[str, ...]] = {
+    "scores": ("rank", "score"),
+    "kda": ("kills", "deaths", "assists"),
+    "shots": ("shots_fired", "shots_hit"),
+    "damage": ("damage_dealt", "damage_taken"),
+    "avg_life": ("avg_life_seconds",),
+}
+
+# Groupes mis à jour seulement si l'API a renvoyé une valeur (comme le chemin ligne à ligne)
+_GUARDED_GROUPS = ("shots", "damage", "avg_life")
+
+_ARROW_TYPES = {
+    "VARCHAR": "string",
+    "TINYINT": "int8",
+    "SMALLINT": "int16",
+    "INTEGER": "int32",
+    "BIGINT": "int64",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+    "BOOLEAN": "bool_",
+}
+
+
+def _arrow_table(rows: list[dict[str, Any]], table_name: str, columns: list[str]) -> Any:
+    """Table Arrow typée selon le CAST_PLAN de `table_name` (colonnes BOOLEAN hors plan)."""
+    import pyarrow as pa
+
+    plan = CAST_PLAN.get(table_name, {})
+    schema = pa.schema(
+        [(col, getattr(pa, _ARROW_TYPES[plan.get(col, "BOOLEAN")])()) for col in columns]
+    )
+    return pa.Table.from_pydict({col: [row.get(col) for row in rows] for col in columns}, schema)
+
+
+def _apply(conn: Any, name: str, table: Any, sql: str) -> int:
+    """Exécute `sql` avec `table` enregistrée sous `name` ; retourne le nombre de lignes modifiées."""
+    conn.register(name, table)
+    try:
+        row = conn.execute(sql).fetchone()
+    finally:
+        conn.unregister(name)
+    return int(row[0]) if row else 0
+
+
+@dataclass
+class BulkUpdateReport:
+    """Cumul des lots appliqués (progression et débit du backfill)."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    chunks: int = 0
+    matches: int = 0
+    rows_updated: int = 0
+    flush_seconds: float = 0.0
+
+    def record(self, matches: int, rows: int, seconds: float) -> None:
+        self.chunks += 1
+        self.matches += matches
+        self.rows_updated += rows
+        self.flush_seconds += seconds
+
+    def summary(self) -> str:
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        flush = max(self.flush_seconds, 1e-9)
+        return (
+            f"{self.matches} matchs en {self.chunks} lot(s), {elapsed:.1f} s "
+            f"({self.matches / elapsed:.1f} matchs/s) | {self.rows_updated} lignes mises à "
+            f"jour en {self.flush_seconds * 1000:.0f} ms d'écriture "
+            f"({self.rows_updated / flush:.0f} lignes/s)"
+        )
+
+
+@dataclass
+class BulkUpdateBatch:
+    """Mises à jour différées d'un lot de matchs.
+
+    Args:
+        participant_groups: Groupes de PARTICIPANT_DETAIL_COLUMNS à mettre à jour.
+        force_accuracy: Écrase accuracy même si déjà renseignée.
+        force_shots: Écrase shots_fired/shots_hit même si déjà renseignés.
+        force_enemy_mmr: Réécrit la ligne player_match_stats complète.
+        chunk_size: Nombre de matchs par lot.
+    """
+
+    participant_groups: tuple[str, ...] = ()
+    force_accuracy: bool = False
+    force_shots: bool = False
+    force_enemy_mmr: bool = False
+    chunk_size: int = DEFAULT_CHUNK_MATCHES
+    report: BulkUpdateReport = field(default_factory=BulkUpdateReport)
+    _participants: dict[tuple[str, str], dict[str, Any]] = field(default_factory=dict)
+    _match_stats: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _skill_rows: dict[tuple[str, str], tuple[Any, str]] = field(default_factory=dict)
+    _completed: dict[int, list[str]] = field(default_factory=dict)
+    _matches: set[str] = field(default_factory=set)
+
+    @property
+    def pending_matches(self) -> int:
+        return len(self._matches)
+
+    @property
+    def full(self) -> bool:
+        return len(self._matches) >= self.chunk_size
+
+    # ── Empilement ──
+
+    def add_participants(self, participant_rows: list) -> tuple[int, int, int, int, int]:
+        """Empile les détails des participants d'un match.
+
+        Returns:
+            Tuple (scores, kda, shots, damage, avg_life), comptés comme le
+            chemin ligne à ligne (``_update_participants_details``).
+        """
+        counts = dict.fromkeys(PARTICIPANT_DETAIL_COLUMNS, 0)
+        for row in participant_rows:
+            entry: dict[str, Any] = {"match_id": row.match_id, "xuid": row.xuid}
+            for group in self.participant_groups:
+                columns = PARTICIPANT_DETAIL_COLUMNS[group]
+                values = {col: getattr(row, col, None) for col in columns}
+                has_value = any(v is not None for v in values.values())
+                if group in _GUARDED_GROUPS:
+                    entry[f"has_{group}"] = has_value
+                    if not has_value:
+                        continue
+                entry.update(values)
+                counts[group] += 1
+            self._participants[(row.match_id, row.xuid)] = entry
+            self._matches.add(row.match_id)
+        return tuple(counts.values())
+
+    def add_match_stats(
+        self, match_row: Any, match_id: str, *, accuracy: bool, shots: bool
+    ) -> None:
+        """Empile accuracy et/ou shots du joueur pour un match (match_stats)."""
+        self._match_stats[match_id] = {
+            "match_id": match_id,
+            "accuracy": match_row.accuracy if accuracy else None,
+            "shots_fired": match_row.shots_fired if shots else None,
+            "shots_hit": match_row.shots_hit if shots else None,
+        }
+        self._matches.add(match_id)
+
+    def add_enemy_mmr(self, skill_row: Any, xuid: str) -> None:
+        """Empile enemy_mmr du joueur pour un match (player_match_stats)."""
+        if skill_row is None or skill_row.enemy_mmr is None:
+            return
+        self._skill_rows[(skill_row.match_id, xuid)] = (skill_row, xuid)
+        self._matches.add(skill_row.match_id)
+
+    def mark_completed(self, match_id: str, mask: int) -> None:
+        """Bitmask backfill_completed à poser au flush (après les données)."""
+        self._matches.add(match_id)
+        if mask > 0:
+            self._completed.setdefault(mask, []).append(match_id)
+
+    # ── Application ──
+
+    def flush(
+        self,
+        conn: Any,
+        *,
+        participants_conn: Any | None = None,
+        completed_table: str = "match_stats",
+        completed_conn: Any | None = None,
+    ) -> dict[str, int]:
+        """Applique le lot puis le vide.
+
+        Args:
+            conn: Connexion joueur (match_stats, player_match_stats).
+            participants_conn: Connexion portant match_participants (shared en
+                v5, défaut : `conn`).
+            completed_table: Table du bitmask (``match_registry`` si participants seuls).
+            completed_conn: Connexion de `completed_table` (défaut : `conn`).
+
+        Returns:
+            Compteurs {"participants", "accuracy", "shots", "enemy_mmr", "completed"}.
+        """
+        result = {"participants": 0, "accuracy": 0, "shots": 0, "enemy_mmr": 0, "completed": 0}
+        if not self._matches:
+            return result
+        t0 = time.perf_counter()
+        matches = len(self._matches)
+        try:
+            with tracing.span("write.bulk"):
+                if self._participants:
+                    result["participants"] = self._flush_participants(participants_conn or conn)
+                if self._match_stats:
+                    result["accuracy"], result["shots"] = self._flush_match_stats(conn)
+                if self._skill_rows:
+                    result["enemy_mmr"] = self._flush_enemy_mmr(conn)
+                target = completed_conn or conn
+                for mask, match_ids in self._completed.items():
+                    row = target.execute(
+                        f"UPDATE {completed_table} "
+                        f"SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
+                        f"WHERE match_id IN ?",
+                        [mask, match_ids],
+                    ).fetchone()
+                    result["completed"] += int(row[0]) if row else 0
+        finally:
+            # Lot en échec : ses matchs restent sans bitmask et seront retraités
+            self._participants.clear()
+            self._match_stats.clear()
+            self._skill_rows.clear()
+            self._completed.clear()
+            self._matches.clear()
+        seconds = time.perf_counter() - t0
+        rows = result["participants"] + result["accuracy"] + result["shots"] + result["enemy_mmr"]
+        self.report.record(matches, rows, seconds)
+        logger.debug(f"Lot de {matches} matchs appliqué en {seconds * 1000:.1f} ms")
+        return result
+
+    def _flush_participants(self, conn: Any) -> int:
+        assignments = []
+        columns = ["match_id", "xuid"]
+        for group in self.participant_groups:
+            group_columns = PARTICIPANT_DETAIL_COLUMNS[group]
+            columns.extend(group_columns)
+            if group in _GUARDED_GROUPS:
+                columns.append(f"has_{group}")
+                assignments += [
+                    f"{col} = CASE WHEN b.has_{group} THEN b.{col} ELSE mp.{col} END"
+                    for col in group_columns
+                ]
+            else:
+                assignments += [f"{col} = b.{col}" for col in group_columns]
+        if not assignments:
+            return 0
+        rows = [
+            coerce_row_types(entry, "match_participants") for entry in self._participants.values()
+        ]
+        return _apply(
+            conn,
+            "_bf_participants",
+            _arrow_table(rows, "match_participants", columns),
+            f"UPDATE match_participants AS mp SET {', '.join(assignments)} "
+            f"FROM _bf_participants b WHERE mp.match_id = b.match_id AND mp.xuid = b.xuid",
+        )
+
+    def _flush_match_stats(self, conn: Any) -> tuple[int, int]:
+        rows = [coerce_row_types(entry, "match_stats") for entry in self._match_stats.values()]
+        table = _arrow_table(
+            rows, "match_stats", ["match_id", "accuracy", "shots_fired", "shots_hit"]
+        )
+        accuracy_filter = "" if self.force_accuracy else " AND ms.accuracy IS NULL"
+        shots_filter = (
+            "" if self.force_shots else " AND (ms.shots_fired IS NULL OR ms.shots_hit IS NULL)"
+        )
+        accuracy = _apply(
+            conn,
+            "_bf_match_stats",
+            table,
+            f"UPDATE match_stats AS ms SET accuracy = b.accuracy FROM _bf_match_stats b "
+            f"WHERE ms.match_id = b.match_id AND b.accuracy IS NOT NULL{accuracy_filter}",
+        )
+        shots = _apply(
+            conn,
+            "_bf_match_stats",
+            table,
+            f"UPDATE match_stats AS ms SET shots_fired = b.shots_fired, shots_hit = b.shots_hit "
+            f"FROM _bf_match_stats b WHERE ms.match_id = b.match_id "
+            f"AND (b.shots_fired IS NOT NULL OR b.shots_hit IS NOT NULL){shots_filter}",
+        )
+        return accuracy, shots
+
+    def _flush_enemy_mmr(self, conn: Any) -> int:
+        if self.force_enemy_mmr:
+            return sum(insert_skill_row(conn, row, xuid) for row, xuid in self._skill_rows.values())
+        rows = [
+            coerce_row_types(
+                {"match_id": row.match_id, "xuid": xuid, "enemy_mmr": row.enemy_mmr},
+                "player_match_stats",
+            )
+            for row, xuid in self._skill_rows.values()
+        ]
+        table = _arrow_table(rows, "player_match_stats", ["match_id", "xuid", "enemy_mmr"])
+        updated = _apply(
+            conn,
+            "_bf_enemy_mmr",
+            table,
+            "UPDATE player_match_stats AS p SET enemy_mmr = b.enemy_mmr FROM _bf_enemy_mmr b "
+            "WHERE p.match_id = b.match_id AND p.xuid = b.xuid AND p.enemy_mmr IS NULL",
+        )
+        # Matchs sans ligne player_match_stats : insertion de la ligne skill complète
+        conn.register("_bf_enemy_mmr", table)
+        try:
+            missing = conn.execute(
+                "SELECT b.match_id, b.xuid FROM _bf_enemy_mmr b "
+                "ANTI JOIN player_match_stats p ON p.match_id = b.match_id AND p.xuid = b.xuid"
+            ).fetchall()
+        finally:
+            conn.unregister("_bf_enemy_mmr")
+        for key in missing:
+            row, xuid = self._skill_rows[key]
+            updated += insert_skill_row(conn, row, xuid)
+        return updated
@@ -198,7 +198,9 @@ def insert_participant_rows(conn: Any, rows: list) -> int:
     """Insère les participants dans match_participants en batch (Sprint 15).
 
     Crée la table si elle n'existe pas et s'assure que les colonnes
-    sont à jour via migrations.
+    sont à jour via migrations. Si la base porte l'index des coéquipiers
+    (shared), il est mis à jour pour ces matchs dans la même transaction :
+    les lecteurs font confiance à l'index dès qu'il existe.
 
     Args:
         conn: Connexion DuckDB.
@@ -210,6 +212,11 @@ def insert_participant_rows(conn: Any, rows: list) -> int:
     if not rows:
         return 0
 
+    from src.data.infrastructure.database.teammate_index import (
+        ensure_teammate_index_columns,
+        teammate_index_exists,
+        update_teammate_index,
+    )
     from src.data.sync.migrations import ensure_match_participants_columns
 
     conn.execute("""
@@ -235,4 +242,16 @@ def insert_participant_rows(conn: Any, rows: list) -> int:
             "CREATE INDEX IF NOT EXISTS idx_participants_team ON match_participants(match_id, team_id)"
         )
 
-    return batch_upsert_rows(conn, "match_participants", rows, PARTICIPANT_COLUMNS)
+    if not teammate_index_exists(conn):
+        return batch_upsert_rows(conn, "match_participants", rows, PARTICIPANT_COLUMNS)
+
+    ensure_teammate_index_columns(conn)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        n = batch_upsert_rows(conn, "match_participants", rows, PARTICIPANT_COLUMNS)
+        update_teammate_index(conn, {row.match_id for row in rows})
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return n
@@ -12,6 +12,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from scripts.backfill.bulk_updates import BulkUpdateBatch
 from scripts.backfill.core import (
     insert_alias_rows,
     insert_event_rows,
@@ -26,11 +27,14 @@ from scripts.backfill.strategies import (
     backfill_killer_victim_pairs,
     compute_performance_score_for_match,
 )
+from src.data.infrastructure.database.snapshots import publish_written
+from src.data.sync import tracing
 
 logger = logging.getLogger(__name__)
 
 # Répertoire racine du projet
 _PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_SHARED_DB_PATH = _PROJECT_ROOT / "data" / "warehouse" / "shared_matches.duckdb"
 
 
 def _get_shared_connection(db_path: Path) -> Any | None:
@@ -41,7 +45,7 @@ def _get_shared_connection(db_path: Path) -> Any | None:
     """
     import duckdb
 
-    shared_path = _PROJECT_ROOT / "data" / "warehouse" / "shared_matches.duckdb"
+    shared_path = _SHARED_DB_PATH
     if not shared_path.exists():
         logger.warning(f"shared_matches.duckdb introuvable: {shared_path}")
         return None
@@ -229,6 +233,7 @@ async def backfill_player_data(
 
     conn = duckdb.connect(str(db_path), read_only=False)
     shared_conn_for_detection = None
+    trace_token = tracing.start_trace("backfill", gamertag=gamertag)
 
     try:
         # Déterminer si des données locales (match_stats) sont demandées
@@ -453,12 +458,16 @@ async def backfill_player_data(
         )
 
     finally:
+        tracing.finish_trace(trace_token)
         with contextlib.suppress(Exception):
             conn.commit()
         conn.close()
         if shared_conn_for_detection is not None:
             with contextlib.suppress(Exception):
                 shared_conn_for_detection.close()
+        # Nouvelle génération lisible par l'UI (OPENSPARTAN_DB_SNAPSHOTS)
+        if not dry_run:
+            publish_written(db_path, _SHARED_DB_PATH)
 
 
 async def backfill_all_players(
@@ -893,211 +902,224 @@ async def _backfill_with_api(
     totals["matches_checked"] = len(match_ids)
     totals["matches_missing_data"] = len(match_ids)
 
+    # UPDATE participants / accuracy / shots / enemy_mmr groupés par lot de matchs
+    participant_groups = tuple(
+        group
+        for group, enabled in (
+            ("scores", participants_scores),
+            ("kda", participants_kda),
+            ("shots", participants_shots),
+            ("damage", participants_damage),
+            ("avg_life", participants_avg_life),
+        )
+        if enabled
+    )
+    updates = BulkUpdateBatch(
+        participant_groups=participant_groups,
+        force_accuracy=force_accuracy,
+        force_shots=force_shots,
+        force_enemy_mmr=force_enemy_mmr,
+    )
+    # Utiliser shared_conn si disponible (v5), sinon conn local
+    mp_conn = shared_conn if shared_conn is not None else conn
+    if participant_groups:
+        ensure_match_participants_columns(mp_conn)
+    # v5 participants-only → bitmask dans match_registry, sinon match_stats (local)
+    completed_in_registry = shared_conn is not None and participants_only
+
+    def _flush_updates(position: int) -> None:
+        if not updates.pending_matches:
+            return
+        try:
+            applied = updates.flush(
+                conn,
+                participants_conn=mp_conn,
+                completed_table="match_registry" if completed_in_registry else "match_stats",
+                completed_conn=shared_conn if completed_in_registry else conn,
+            )
+        except Exception as e:
+            logger.error(f"Erreur application du lot (matchs retraités au prochain backfill): {e}")
+            return
+        totals["accuracy_updated"] += applied["accuracy"]
+        totals["shots_updated"] += applied["shots"]
+        with tracing.span("write.commit"):
+            conn.commit()
+            if shared_conn is not None:
+                shared_conn.commit()
+        logger.info(f"[{position}/{len(match_ids)}] Lot appliqué — {updates.report.summary()}")
+
     async with SPNKrAPIClient(
         tokens=tokens,
         requests_per_second=requests_per_second,
     ) as client:
         for i, match_id in enumerate(match_ids, 1):
-            try:
-                logger.info(f"[{i}/{len(match_ids)}] Traitement {match_id}...")
+            with tracing.match_scope(match_id):
+                try:
+                    logger.info(f"[{i}/{len(match_ids)}] Traitement {match_id}...")
 
-                stats_json = await client.get_match_stats(match_id)
-                if not stats_json:
-                    logger.warning(f"Impossible de récupérer {match_id}")
-                    continue
+                    stats_json = await client.get_match_stats(match_id)
+                    if not stats_json:
+                        logger.warning(f"Impossible de récupérer {match_id}")
+                        continue
 
-                inserted = {}
-
-                # ── Participants scores/kda/shots/damage/avg_life (UPDATE) ──
-                if (
-                    participants_scores
-                    or participants_kda
-                    or participants_shots
-                    or participants_damage
-                    or participants_avg_life
-                ):
-                    # Utiliser shared_conn si disponible (v5), sinon conn local
-                    mp_conn = shared_conn if shared_conn is not None else conn
-                    ensure_match_participants_columns(mp_conn)
-                    ps, pk, psh, pd, pal = _update_participants_details(
-                        mp_conn,
-                        stats_json,
-                        participants_scores=participants_scores,
-                        participants_kda=participants_kda,
-                        participants_shots=participants_shots,
-                        participants_damage=participants_damage,
-                        participants_avg_life=participants_avg_life,
-                    )
-                    inserted["participants_scores"] = ps
-                    inserted["participants_kda"] = pk
-                    inserted["participants_shots"] = psh
-                    inserted["participants_damage"] = pd
-                    inserted["participants_avg_life"] = pal
-                    totals["participants_scores_updated"] += ps
-                    totals["participants_kda_updated"] += pk
-                    totals["participants_shots_updated"] += psh
-                    totals["participants_damage_updated"] += pd
-                    totals["participants_avg_life_updated"] += pal
-
-                # ── Assets ──
-                if assets:
-                    await _backfill_assets(client, conn, stats_json, xuid, match_id)
-                    totals["assets_updated"] += 1
-
-                xuids = extract_xuids_from_match(stats_json)
-
-                skill_json = None
-                highlight_events: list = []
-
-                if (skill or enemy_mmr) and xuids:
-                    skill_json = await client.get_skill_stats(match_id, xuids)
-                if events:
-                    highlight_events = await client.get_highlight_events(match_id)
-
-                # ── Accuracy / Shots ──
-                if accuracy or shots:
-                    match_row = transform_match_stats(stats_json, xuid)
-                    if match_row:
-                        a, s = _update_accuracy_shots(
-                            conn,
-                            match_row,
-                            match_id,
-                            accuracy=accuracy,
-                            shots=shots,
-                            force_accuracy=force_accuracy,
-                            force_shots=force_shots,
+                    inserted = {}
+
+                    # ── Participants scores/kda/shots/damage/avg_life (UPDATE groupé) ──
+                    if participant_groups:
+                        ps, pk, psh, pd, pal = updates.add_participants(
+                            extract_participants(stats_json)
                         )
-                        totals["accuracy_updated"] += a
-                        totals["shots_updated"] += s
-
-                # ── Médailles ──
-                if medals:
-                    medal_rows = extract_medals(stats_json, xuid)
-                    if medal_rows:
-                        n = insert_medal_rows(conn, medal_rows)
-                        totals["medals_inserted"] += n
-
-                # ── Events ──
-                if events and highlight_events:
-                    event_rows = transform_highlight_events(highlight_events, match_id)
-                    if event_rows:
-                        n = insert_event_rows(conn, event_rows)
-                        totals["events_inserted"] += n
-
-                # ── Skill ──
-                if skill and skill_json:
-                    skill_row = transform_skill_stats(skill_json, match_id, xuid)
-                    if skill_row:
-                        n = insert_skill_row(conn, skill_row, xuid)
-                        totals["skill_inserted"] += n
-
-                # ── Enemy MMR ──
-                if enemy_mmr and skill_json:
-                    _update_enemy_mmr(conn, skill_json, match_id, xuid, force_enemy_mmr)
-                    totals["enemy_mmr_updated"] += 1
-
-                # ── Personal scores ──
-                if personal_scores:
-                    ps_data = extract_personal_score_awards(stats_json, xuid)
-                    if ps_data:
-                        ps_rows = transform_personal_score_awards(match_id, xuid, ps_data)
-                        if ps_rows:
-                            n = insert_personal_score_rows(conn, ps_rows)
-                            totals["personal_scores_inserted"] += n
-
-                # ── Aliases ──
-                if aliases:
-                    alias_rows = extract_aliases(stats_json)
-                    if alias_rows:
-                        n = insert_alias_rows(conn, alias_rows)
-                        totals["aliases_inserted"] += n
-
-                # ── Participants (full insert) ──
-                if participants:
-                    participant_rows = extract_participants(stats_json)
-                    if participant_rows:
-                        n = insert_participant_rows(conn, participant_rows)
-                        totals["participants_inserted"] += n
-
-                # ── Performance scores ──
-                if performance_scores and compute_performance_score_for_match(conn, match_id):
-                    totals["performance_scores_inserted"] += 1
-
-                # Marquer le bitmask backfill_completed pour tous les types demandés
-                requested_types: list[str] = []
-                if medals:
-                    requested_types.append("medals")
-                if events:
-                    requested_types.append("events")
-                if skill:
-                    requested_types.append("skill")
-                if personal_scores:
-                    requested_types.append("personal_scores")
-                if performance_scores:
-                    requested_types.append("performance_scores")
-                if aliases:
-                    requested_types.append("aliases")
-                if accuracy:
-                    requested_types.append("accuracy")
-                if shots:
-                    requested_types.append("shots")
-                if enemy_mmr:
-                    requested_types.append("enemy_mmr")
-                if assets:
-                    requested_types.append("assets")
-                if participants:
-                    requested_types.append("participants")
-                if participants_scores:
-                    requested_types.append("participants_scores")
-                if participants_kda:
-                    requested_types.append("participants_kda")
-                if participants_shots:
-                    requested_types.append("participants_shots")
-                if participants_damage:
-                    requested_types.append("participants_damage")
-                if participants_avg_life:
-                    requested_types.append("participants_avg_life")
-
-                # Marquer backfill_completed
-                # v5: Utiliser shared_conn si participants-only, sinon conn local
-                mask = compute_backfill_mask(*requested_types)
-                if shared_conn is not None and participants_only:
-                    # Pour v5 participants-only → UPDATE match_registry
-                    if mask > 0:
-                        try:
-                            shared_conn.execute(
-                                "UPDATE match_registry "
-                                "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
-                                "WHERE match_id = ?",
-                                [mask, match_id],
-                            )
-                        except Exception as e:
-                            logger.debug(
-                                f"Impossible de marquer backfill_completed dans match_registry: {e}"
+                        inserted["participants_scores"] = ps
+                        inserted["participants_kda"] = pk
+                        inserted["participants_shots"] = psh
+                        inserted["participants_damage"] = pd
+                        inserted["participants_avg_life"] = pal
+                        totals["participants_scores_updated"] += ps
+                        totals["participants_kda_updated"] += pk
+                        totals["participants_shots_updated"] += psh
+                        totals["participants_damage_updated"] += pd
+                        totals["participants_avg_life_updated"] += pal
+
+                    # ── Assets ──
+                    if assets:
+                        await _backfill_assets(client, conn, stats_json, xuid, match_id)
+                        totals["assets_updated"] += 1
+
+                    xuids = extract_xuids_from_match(stats_json)
+
+                    skill_json = None
+                    highlight_events: list = []
+
+                    if (skill or enemy_mmr) and xuids:
+                        skill_json = await client.get_skill_stats(match_id, xuids)
+                    if events:
+                        highlight_events = await client.get_highlight_events(match_id)
+
+                    # ── Accuracy / Shots ──
+                    with tracing.span("write.player"):
+                        if accuracy or shots:
+                            match_row = transform_match_stats(stats_json, xuid)
+                            if match_row:
+                                updates.add_match_stats(
+                                    match_row, match_id, accuracy=accuracy, shots=shots
+                                )
+
+                        # ── Médailles ──
+                        if medals:
+                            medal_rows = extract_medals(stats_json, xuid)
+                            if medal_rows:
+                                n = insert_medal_rows(conn, medal_rows)
+                                totals["medals_inserted"] += n
+
+                        # ── Events ──
+                        if events and highlight_events:
+                            event_rows = transform_highlight_events(highlight_events, match_id)
+                            if event_rows:
+                                n = insert_event_rows(conn, event_rows)
+                                totals["events_inserted"] += n
+
+                        # ── Skill ──
+                        if skill and skill_json:
+                            skill_row = transform_skill_stats(skill_json, match_id, xuid)
+                            if skill_row:
+                                n = insert_skill_row(conn, skill_row, xuid)
+                                totals["skill_inserted"] += n
+
+                        # ── Enemy MMR ──
+                        if enemy_mmr and skill_json:
+                            updates.add_enemy_mmr(
+                                transform_skill_stats(skill_json, match_id, xuid), xuid
                             )
-                else:
-                    # v4 ou mixte → UPDATE match_stats (local DB)
-                    _mark_backfill_completed(conn, match_id, mask=mask)
-
-                # Commit après chaque match
-                conn.commit()
-                if shared_conn is not None:
-                    shared_conn.commit()
-
-                logger.info(f"  ✅ Match {match_id[:20]}... traité")
-
-            except Exception as e:
-                logger.error(f"Erreur traitement {match_id}: {e}")
-                import traceback
+                            totals["enemy_mmr_updated"] += 1
+
+                        # ── Personal scores ──
+                        if personal_scores:
+                            ps_data = extract_personal_score_awards(stats_json, xuid)
+                            if ps_data:
+                                ps_rows = transform_personal_score_awards(match_id, xuid, ps_data)
+                                if ps_rows:
+                                    n = insert_personal_score_rows(conn, ps_rows)
+                                    totals["personal_scores_inserted"] += n
+
+                        # ── Aliases ──
+                        if aliases:
+                            alias_rows = extract_aliases(stats_json)
+                            if alias_rows:
+                                n = insert_alias_rows(conn, alias_rows)
+                                totals["aliases_inserted"] += n
+
+                        # ── Participants (full insert) ──
+                        if participants:
+                            participant_rows = extract_participants(stats_json)
+                            if participant_rows:
+                                n = insert_participant_rows(conn, participant_rows)
+                                totals["participants_inserted"] += n
+
+                        # ── Performance scores ──
+                        if performance_scores and compute_performance_score_for_match(
+                            conn, match_id
+                        ):
+                            totals["performance_scores_inserted"] += 1
+
+                    # Marquer le bitmask backfill_completed pour tous les types demandés
+                    requested_types: list[str] = []
+                    if medals:
+                        requested_types.append("medals")
+                    if events:
+                        requested_types.append("events")
+                    if skill:
+                        requested_types.append("skill")
+                    if personal_scores:
+                        requested_types.append("personal_scores")
+                    if performance_scores:
+                        requested_types.append("performance_scores")
+                    if aliases:
+                        requested_types.append("aliases")
+                    if accuracy:
+                        requested_types.append("accuracy")
+                    if shots:
+                        requested_types.append("shots")
+                    if enemy_mmr:
+                        requested_types.append("enemy_mmr")
+                    if assets:
+                        requested_types.append("assets")
+                    if participants:
+                        requested_types.append("participants")
+                    if participants_scores:
+                        requested_types.append("participants_scores")
+                    if participants_kda:
+                        requested_types.append("participants_kda")
+                    if participants_shots:
+                        requested_types.append("participants_shots")
+                    if participants_damage:
+                        requested_types.append("participants_damage")
+                    if participants_avg_life:
+                        requested_types.append("participants_avg_life")
+
+                    # Marquer backfill_completed au flush du lot, après ses UPDATE
+                    updates.mark_completed(match_id, compute_backfill_mask(*requested_types))
+                    if updates.full:
+                        _flush_updates(i)
+
+                    logger.info(f"  ✅ Match {match_id[:20]}... traité")
+
+                except Exception as e:
+                    logger.error(f"Erreur traitement {match_id}: {e}")
+                    import traceback
+
+                    traceback.print_exc()
+                    continue
 
-                traceback.print_exc()
-                continue
+        _flush_updates(len(match_ids))
+    if updates.report.chunks:
+        logger.info(f"UPDATE groupés : {updates.report.summary()}")
 
     # ── Backfill local post-API ──
     if killer_victim:
         logger.info("Backfill des paires killer/victim depuis highlight_events...")
         kv_shared = shared_conn or _get_shared_connection(db_path)
-        n = backfill_killer_victim_pairs(conn, xuid, shared_conn=kv_shared)
+        with tracing.span("killer_victim"):
+            n = backfill_killer_victim_pairs(conn, xuid, shared_conn=kv_shared)
         if kv_shared is not shared_conn and kv_shared is not None:
             kv_shared.close()
         totals["killer_victim_pairs_inserted"] = n
@@ -1106,20 +1128,23 @@ async def _backfill_with_api(
 
     if end_time:
         logger.info("Backfill de l'heure de fin des matchs (end_time)...")
-        n = backfill_end_time(conn, force=force_end_time)
+        with tracing.span("end_time"):
+            n = backfill_end_time(conn, force=force_end_time)
         totals["end_time_updated"] = n
         if n > 0:
             logger.info(f"✅ {n} match(s) avec end_time mis à jour")
 
     if sessions:
-        n = _backfill_sessions(conn, db_path, xuid, force=force_sessions, dry_run=dry_run)
+        with tracing.span("sessions"):
+            n = _backfill_sessions(conn, db_path, xuid, force=force_sessions, dry_run=dry_run)
         totals["sessions_updated"] = n
 
     if citations:
         from scripts.backfill.strategies import backfill_citations
 
         logger.info("Backfill des citations...")
-        n = backfill_citations(conn, db_path, xuid, force=force_citations)
+        with tracing.span("citations"):
+            n = backfill_citations(conn, db_path, xuid, force=force_citations)
         totals["citations_computed"] = n
 
     # Fermer la connexion shared uniquement si on l'a ouverte nous-même
@@ -1151,6 +1176,9 @@ def _update_participants_details(
 ) -> tuple[int, int, int, int, int]:
     """Met à jour les détails des participants (scores, kda, shots, damage, avg_life).
 
+    Chemin ligne à ligne : le backfill passe par ``BulkUpdateBatch``
+    (voir bulk_updates.py), cette fonction sert de référence au benchmark.
+
     Returns:
         Tuple (scores, kda, shots, damage, avg_life) nombre de mises à jour.
     """
@@ -1222,7 +1250,7 @@ def _update_accuracy_shots(
     force_accuracy: bool,
     force_shots: bool,
 ) -> tuple[int, int]:
-    """Met à jour accuracy et/ou shots pour un match.
+    """Met à jour accuracy et/ou shots pour un match (chemin ligne à ligne).
 
     Returns:
         Tuple (accuracy_updated, shots_updated).
@@ -1316,7 +1344,7 @@ def _update_enemy_mmr(
     xuid: str,
     force: bool,
 ) -> None:
-    """Met à jour enemy_mmr pour un match."""
+    """Met à jour enemy_mmr pour un match (chemin ligne à ligne)."""
     from src.data.sync.transformers import transform_skill_stats
 
     skill_row = transform_skill_stats(skill_json, match_id, xuid)
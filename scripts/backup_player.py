@@ -4,10 +4,15 @@
 Exporte les données DuckDB d'un joueur vers des fichiers Parquet
 avec compression Zstd optimale pour archivage et partage.
 
+Les backups sont incrémentaux : seules les tables (et, pour les tables à
+clé, les matchs) modifiés depuis le backup précédent sont exportés, chaînés
+par ``backup_manifest.json``. ``--full`` force une nouvelle base.
+
 Usage:
     python scripts/backup_player.py --gamertag Chocoboflor
     python scripts/backup_player.py --gamertag Chocoboflor --output ./backups
     python scripts/backup_player.py --all --compression-level 9
+    python scripts/backup_player.py --gamertag Chocoboflor --full
 """
 
 from __future__ import annotations
@@ -16,7 +21,6 @@ import argparse
 import json
 import logging
 import sys
-from datetime import datetime
 from pathlib import Path
 
 # Ajouter le répertoire parent au path pour les imports
@@ -57,80 +61,68 @@ def backup_player(
     *,
     compression_level: int = 9,
     include_metadata: bool = True,
+    full: bool = False,
+    max_workers: int = 4,
 ) -> tuple[bool, str, dict]:
-    """Sauvegarde les données d'un joueur vers Parquet compressé.
+    """Sauvegarde incrémentale des données d'un joueur vers Parquet compressé.
+
+    Seules les tables modifiées depuis le backup précédent sont exportées
+    (delta par clé, ou export complet), voir
+    ``src.data.infrastructure.database.backup``.
 
     Args:
         gamertag: Gamertag du joueur.
         output_dir: Répertoire de sortie.
         compression_level: Niveau de compression Zstd (1-22, 9 recommandé).
         include_metadata: Inclure un fichier de métadonnées JSON.
+        full: Forcer un backup complet (nouvelle base pour toutes les tables).
+        max_workers: Nombre de tables exportées en parallèle.
 
     Returns:
         Tuple (success, message, stats).
     """
-    import duckdb
+    from src.data.infrastructure.database.backup import backup_database
 
     db_path = get_player_db_path(gamertag)
     if not db_path:
         return False, f"DB non trouvée pour {gamertag}", {}
 
-    # Créer le répertoire de sortie
     backup_dir = output_dir / gamertag
-    backup_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     stats = {"tables": {}, "total_bytes": 0, "compression_level": compression_level}
 
     try:
-        conn = duckdb.connect(str(db_path), read_only=True)
-
-        # Lister les tables à exporter
-        tables_result = conn.execute(
-            "SELECT table_name FROM information_schema.tables "
-            "WHERE table_schema = 'main' AND table_type = 'BASE TABLE'"
-        ).fetchall()
-        tables = [t[0] for t in tables_result]
-
-        logger.info(f"Backup de {gamertag}: {len(tables)} tables trouvées")
-
-        for table_name in tables:
-            # Compter les lignes
-            row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-
-            if row_count == 0:
-                logger.info(f"  {table_name}: vide, skip")
-                continue
-
-            # Exporter vers Parquet avec compression Zstd
-            output_file = backup_dir / f"{table_name}_{timestamp}.parquet"
-            conn.execute(
-                f"""
-                COPY {table_name} TO '{output_file}'
-                (FORMAT PARQUET, COMPRESSION 'zstd', COMPRESSION_LEVEL {compression_level})
-                """
-            )
+        logger.info(f"Backup de {gamertag}{' (complet)' if full else ''}")
+        entry = backup_database(
+            db_path,
+            backup_dir,
+            compression_level=compression_level,
+            full=full,
+            max_workers=max_workers,
+        )
 
-            # Stats
-            file_size = output_file.stat().st_size
+        for table_name, state in entry.tables.items():
+            file_size = sum(
+                (backup_dir / f).stat().st_size
+                for f in (state.file, state.touched_file)
+                if f and state.mode != "unchanged"
+            )
             stats["tables"][table_name] = {
-                "rows": row_count,
+                "mode": state.mode,
+                "rows": state.rows,
+                "total_rows": state.total_rows,
                 "file_size_bytes": file_size,
-                "file": str(output_file.name),
+                "file": state.file if state.mode != "unchanged" else None,
             }
             stats["total_bytes"] += file_size
 
-            size_mb = file_size / (1024 * 1024)
-            logger.info(f"  {table_name}: {row_count} lignes, {size_mb:.2f} MB")
-
-        conn.close()
-
         # Métadonnées JSON
         if include_metadata:
             metadata = {
                 "gamertag": gamertag,
-                "backup_timestamp": timestamp,
-                "backup_datetime": datetime.now().isoformat(),
+                "backup_timestamp": entry.id,
+                "backup_datetime": entry.created_at,
+                "backup_kind": entry.kind,
+                "parent": entry.parent,
                 "source_db": str(db_path),
                 "compression": "zstd",
                 "compression_level": compression_level,
@@ -139,14 +131,18 @@ def backup_player(
                 "total_size_mb": round(stats["total_bytes"] / (1024 * 1024), 2),
             }
 
-            metadata_file = backup_dir / f"backup_metadata_{timestamp}.json"
+            metadata_file = backup_dir / f"backup_metadata_{entry.id}.json"
             with open(metadata_file, "w", encoding="utf-8") as f:
                 json.dump(metadata, f, indent=2, ensure_ascii=False)
 
             logger.info(f"  Métadonnées: {metadata_file.name}")
 
+        changed = sum(1 for t in stats["tables"].values() if t["mode"] != "unchanged")
         total_mb = stats["total_bytes"] / (1024 * 1024)
-        msg = f"Backup {gamertag}: {len(stats['tables'])} tables, {total_mb:.2f} MB total"
+        msg = (
+            f"Backup {gamertag} ({entry.kind}): {changed}/{len(stats['tables'])} tables "
+            f"écrites, {total_mb:.2f} MB"
+        )
         logger.info(msg)
 
         return True, msg, stats
@@ -168,6 +164,7 @@ Exemples:
   python scripts/backup_player.py --gamertag JGtm --output ./backups
   python scripts/backup_player.py --all
   python scripts/backup_player.py --all --compression-level 15
+  python scripts/backup_player.py --gamertag JGtm --full
 
 Niveaux de compression Zstd:
   1-3   : Rapide, compression faible
@@ -208,6 +205,18 @@ Niveaux de compression Zstd:
         action="store_true",
         help="Ne pas inclure le fichier de métadonnées JSON",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Forcer un backup complet (ignorer le backup précédent)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=4,
+        help="Nombre de tables exportées en parallèle (défaut: 4)",
+    )
     parser.add_argument(
         "--list",
         "-l",
@@ -262,6 +271,8 @@ Niveaux de compression Zstd:
             output_dir,
             compression_level=compression_level,
             include_metadata=not args.no_metadata,
+            full=args.full,
+            max_workers=args.workers,
         )
         if ok:
             success_count += 1
@@ -0,0 +1,7 @@
+"""Package benchmark — Suite de benchmarks sur données synthétiques.
+
+Structure :
+- synthetic.py : Générateur de DBs shared + joueurs réalistes à échelle configurable
+- harness.py   : Benchmarks (loaders, sessions, scores, citations, antagonistes, MV),
+                 rapport JSON et détection des régressions contre un baseline
+"""
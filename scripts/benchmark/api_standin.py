@@ -0,0 +1,747 @@
+"""Serveur local imitant les services Halo Infinite utilisés par la sync (SPNKr).
+
+Rejoue des payloads générés (ou enregistrés) pour mesurer la sync et les
+backfills hors ligne : ``SPNKR_API_BASE_URL=<url>`` redirige
+``SPNKrAPIClient`` (et ``refetch_film_roster.py``) vers ce serveur.
+
+Routes (préfixe = premier label de l'hôte halowaypoint.com redirigé) :
+
+    /halostats/hi/players/{player}/matches             historique (Start/Count)
+    /halostats/hi/players/{player}/matches/count       compteurs
+    /halostats/hi/matches/{match_id}/stats             MatchStats
+    /skill/hi/matches/{match_id}/skill                 skill (MMR, CSR)
+    /discovery-infiniteugc/hi/films/matches/{id}/spectate   manifeste film
+    /discovery-infiniteugc/hi/{type}/{id}/versions/{v}      assets UGC
+    /blobs-infiniteugc/ugcstorage/film/{id}/{chunk}          chunks film (zlib)
+    /_standin/stats                                          compteurs serveur
+
+HOW IT WORKS:
+1. ``SyntheticPayloads`` dérive chaque match de son index (graine + index →
+   même match sur toutes les machines) : roster, kills/deaths cohérents entre
+   MatchStats, skill et chunk highlight events (format lu par spnkr.film),
+   chunk d'en-tête avec le roster (format lu par refetch_film_roster.py)
+2. ``RecordedPayloads`` rejoue des JSON MatchStats/skill enregistrés dans un
+   dossier et complète le reste (film, assets) par la génération
+3. ``FaultProfile`` applique à chaque requête une latence log-normale, des
+   429 (avec Retry-After) / 5xx aléatoires et un débit sortant plafonné
+   partagé entre toutes les connexions
+4. ``StandinServer`` démarre l'application sur 127.0.0.1 (port libre par
+   défaut) dans la boucle courante, pour les tests et benchmarks in-process
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+from scripts.benchmark.synthetic import MAPS, MEDAL_IDS, PLAYLISTS, POOL_XUID_BASE, tracked_xuid
+
+logger = logging.getLogger(__name__)
+
+FILM_MAJOR_VERSION = 42
+BLOBS_HOST = "https://blobs-infiniteugc.svc.halowaypoint.com"
+# Valeurs 1 octet des médailles du chunk highlight events (spnkr.film.medals)
+FILM_MEDAL_VALUES = [0, 1, 9, 11]
+# (AssetKind spnkr, type d'asset Discovery)
+_ASSET_KINDS = {"map": 2, "playlist": 3, "variant": 6, "pair": 7}
+# Segment d'URL Discovery (spnkr.services.discovery_ugc) → type d'asset
+_DISCOVERY_TYPES = {
+    "maps": "map",
+    "playlists": "playlist",
+    "ugcgamevariants": "variant",
+    "mapmodepairs": "pair",
+}
+_UUID_NS = uuid.UUID("5f1d3c2a-7b4e-4c1a-9e2d-0b8a6f4e3d21")
+_VARIANTS = [("variant-slayer", "Slayer", 6), ("variant-ctf", "CTF", 15)]
+_EVENT_END = b"\x00\x00\x2e\xe0"
+_ROSTER_MARKER = b"\x2d\xc0"
+COUNTERS_KEY = web.AppKey("counters", Counter)
+
+
+def _asset_uuid(key: str) -> str:
+    return str(uuid.uuid5(_UUID_NS, key))
+
+
+def _duration(seconds: int) -> str:
+    return f"PT{seconds // 60}M{seconds % 60}S"
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Latence, erreurs injectées et débit du serveur.
+
+    Attributes:
+        latency_ms: Latence médiane par requête.
+        latency_sigma: Dispersion log-normale (0 = latence constante).
+        rate_429: Probabilité d'une réponse 429 (avec Retry-After).
+        rate_5xx: Probabilité d'une réponse 500/502/503.
+        retry_after_s: Valeur de l'en-tête Retry-After des 429.
+        bandwidth_bytes_per_s: Débit sortant total (None = illimité).
+        seed: Graine du tirage des latences / erreurs.
+    """
+
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after_s: float = 1.0
+    bandwidth_bytes_per_s: float | None = None
+    seed: int = 0
+
+
+@dataclass
+class _Match:
+    """Match généré (source commune de stats, skill et film)."""
+
+    match_id: str
+    start_time: datetime
+    duration_s: int
+    playlist: tuple[str, str, str, bool]
+    map: tuple[str, str]
+    variant: tuple[str, str, int]
+    players: list[tuple[int, str, int]]  # (xuid, gamertag, team_id)
+    # (time_ms, killer_xuid, victim_xuid) triés par temps
+    kills: list[tuple[int, int, int]]
+    medals: list[tuple[int, int, int]]  # (time_ms, xuid, valeur film)
+    stats: dict[int, dict[str, int]] = field(default_factory=dict)
+
+
+class SyntheticPayloads:
+    """Payloads API dérivés d'une graine (historique de ``matches`` matchs)."""
+
+    def __init__(
+        self,
+        *,
+        matches: int = 1000,
+        gamertag: str = "SynPlayer0",
+        xuid: str | None = None,
+        participants: int = 8,
+        kills_per_match: int = 12,
+        seed: int = 42,
+    ) -> None:
+        self.matches = matches
+        self.gamertag = gamertag
+        self.xuid = int(xuid or tracked_xuid(0))
+        self.participants = participants
+        self.kills_per_match = kills_per_match
+        self.seed = seed
+        self._epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self._assets = self._build_assets()
+        self._build_match = lru_cache(maxsize=512)(self._generate)
+
+    # --- Identifiants --------------------------------------------------------
+    def match_id(self, index: int) -> str:
+        """ID du match `index` (0 = plus récent)."""
+        return str(uuid.UUID(int=(self.seed << 64) | index))
+
+    def match_index(self, match_id: str) -> int | None:
+        try:
+            value = uuid.UUID(match_id).int
+        except ValueError:
+            return None
+        index = value & ((1 << 64) - 1)
+        if value >> 64 != self.seed or index >= self.matches:
+            return None
+        return index
+
+    def is_player(self, player: str) -> bool:
+        return player.lower() in (self.gamertag.lower(), f"xuid({self.xuid})", str(self.xuid))
+
+    def _build_assets(self) -> dict[str, dict[str, Any]]:
+        assets = {}
+        for pid, name, _cat, _ranked in PLAYLISTS:
+            assets[_asset_uuid(pid)] = {"kind": "playlist", "name": name}
+        for mid, name in MAPS:
+            assets[_asset_uuid(mid)] = {"kind": "map", "name": name}
+        for vid, name, _cat in _VARIANTS:
+            assets[_asset_uuid(vid)] = {"kind": "variant", "name": name}
+            for mid, map_name in MAPS:
+                assets[_asset_uuid(f"{mid}/{vid}")] = {
+                    "kind": "pair",
+                    "name": f"{name} - {map_name}",
+                }
+        return assets
+
+    # --- Génération d'un match -----------------------------------------------
+    def _generate(self, index: int) -> _Match:
+        rng = random.Random(self.seed * 1_000_003 + index)
+        # Sessions de ~6 matchs, du plus récent (index 0) au plus ancien
+        start = self._epoch - timedelta(
+            hours=6 * (index // 6), minutes=15 * (index % 6), seconds=rng.randrange(120)
+        )
+        half = self.participants // 2
+        pool = rng.sample(range(self.matches * 4 + self.participants), self.participants - 1)
+        players = [(self.xuid, self.gamertag, 0)] + [
+            (POOL_XUID_BASE + n, f"Spartan{n}", 0 if slot < half - 1 else 1)
+            for slot, n in enumerate(pool)
+        ]
+        duration = 480 + rng.randrange(420)
+
+        kills = []
+        times = sorted(rng.sample(range(5_000, duration * 1000, 7), self.kills_per_match))
+        for t in times:
+            killer = rng.choice(players)
+            victim = rng.choice([p for p in players if p[2] != killer[2]])
+            kills.append((t, killer[0], victim[0]))
+        medals = [
+            (t + 3, killer, rng.choice(FILM_MEDAL_VALUES))
+            for t, killer, _ in kills
+            if rng.random() < 0.3
+        ]
+
+        match = _Match(
+            match_id=self.match_id(index),
+            start_time=start,
+            duration_s=duration,
+            playlist=rng.choice(PLAYLISTS),
+            map=rng.choice(MAPS),
+            variant=rng.choice(_VARIANTS),
+            players=players,
+            kills=kills,
+            medals=medals,
+        )
+        for xuid, _gt, _team in players:
+            k = sum(1 for _, killer, _v in kills if killer == xuid)
+            d = sum(1 for _, _k, victim in kills if victim == xuid)
+            a = rng.randrange(0, 4)
+            shots = 80 + rng.randrange(200)
+            match.stats[xuid] = {
+                "kills": k,
+                "deaths": d,
+                "assists": a,
+                "shots_fired": shots,
+                "shots_hit": shots * (30 + rng.randrange(30)) // 100,
+                "damage_dealt": 300 * k + rng.randrange(800),
+                "damage_taken": 300 * d + rng.randrange(800),
+                "medals": sum(1 for _, x, _m in medals if x == xuid),
+            }
+        return match
+
+    def _match(self, match_id: str) -> _Match | None:
+        index = self.match_index(match_id)
+        return None if index is None else self._build_match(index)
+
+    def _asset_ref(self, kind: str, key: str) -> dict[str, Any]:
+        asset_id = _asset_uuid(key)
+        return {
+            "AssetKind": _ASSET_KINDS[kind],
+            "AssetId": asset_id,
+            "VersionId": _asset_uuid(f"{key}@1"),
+        }
+
+    def _match_info(self, m: _Match) -> dict[str, Any]:
+        pl_id, _pl_name, _cat, ranked = m.playlist
+        map_id, _map_name = m.map
+        variant_id, _variant_name, category = m.variant
+        return {
+            "StartTime": _iso(m.start_time),
+            "EndTime": _iso(m.start_time + timedelta(seconds=m.duration_s)),
+            "Duration": _duration(m.duration_s),
+            "LifecycleMode": 3,
+            "GameVariantCategory": category,
+            "LevelId": _asset_uuid(f"level/{map_id}"),
+            "MapVariant": self._asset_ref("map", map_id),
+            "UgcGameVariant": self._asset_ref("variant", variant_id),
+            "ClearanceId": _asset_uuid("clearance"),
+            "Playlist": self._asset_ref("playlist", pl_id),
+            "PlaylistExperience": 2,
+            "PlaylistMapModePair": self._asset_ref("pair", f"{map_id}/{variant_id}"),
+            "SeasonId": "Seasons/Season9.json",
+            "PlayableDuration": _duration(m.duration_s),
+            "TeamsEnabled": True,
+            "TeamScoringEnabled": True,
+            "GameplayInteraction": 1,
+            "IsRanked": ranked,
+        }
+
+    def _outcome(self, m: _Match, team_id: int) -> int:
+        scores = self._team_scores(m)
+        if scores[0] == scores[1]:
+            return 1
+        return 2 if scores[team_id] > scores[1 - team_id] else 3
+
+    def _team_scores(self, m: _Match) -> dict[int, int]:
+        scores = {0: 0, 1: 0}
+        for xuid, _gt, team in m.players:
+            scores[team] += m.stats[xuid]["kills"]
+        return scores
+
+    # --- Payloads ------------------------------------------------------------
+    def history(self, player: str, start: int, count: int) -> dict[str, Any] | None:
+        if not self.is_player(player):
+            return None
+        indexes = range(start, min(start + max(0, count), self.matches))
+        results = []
+        for i in indexes:
+            m = self._build_match(i)
+            results.append(
+                {
+                    "MatchId": m.match_id,
+                    "MatchInfo": self._match_info(m),
+                    "LastTeamId": 0,
+                    "Outcome": self._outcome(m, 0),
+                    "Rank": 1,
+                    "PresentAtEndOfMatch": True,
+                }
+            )
+        return {"Start": start, "Count": count, "ResultCount": len(results), "Results": results}
+
+    def match_count(self, player: str) -> dict[str, Any] | None:
+        if not self.is_player(player):
+            return None
+        return {
+            "CustomMatchesPlayedCount": 0,
+            "MatchesPlayedCount": self.matches,
+            "MatchmadeMatchesPlayedCount": self.matches,
+            "LocalMatchesPlayedCount": 0,
+        }
+
+    def match_stats(self, match_id: str) -> dict[str, Any] | None:
+        m = self._match(match_id)
+        if m is None:
+            return None
+        scores = self._team_scores(m)
+        ranked = sorted(m.players, key=lambda p: -m.stats[p[0]]["kills"])
+        rank_of = {p[0]: r for r, p in enumerate(ranked, 1)}
+        players = []
+        for xuid, gamertag, team in m.players:
+            s = m.stats[xuid]
+            medal_counts = Counter(mv for _, x, mv in m.medals if x == xuid)
+            core = {
+                "Score": 100 * s["kills"] + 50 * s["assists"],
+                "PersonalScore": 100 * s["kills"] + 50 * s["assists"],
+                "RoundsWon": 0,
+                "RoundsLost": 0,
+                "RoundsTied": 0,
+                "Kills": s["kills"],
+                "Deaths": s["deaths"],
+                "Assists": s["assists"],
+                "KDA": s["kills"] + s["assists"] / 3 - s["deaths"],
+                "Suicides": 0,
+                "Betrayals": 0,
+                "AverageLifeDuration": _duration(m.duration_s // max(1, s["deaths"] + 1)),
+                "GrenadeKills": 0,
+                "HeadshotKills": s["kills"] // 2,
+                "MeleeKills": s["kills"] // 5,
+                "PowerWeaponKills": s["kills"] // 6,
+                "ShotsFired": s["shots_fired"],
+                "ShotsHit": s["shots_hit"],
+                "Accuracy": round(100 * s["shots_hit"] / s["shots_fired"], 2),
+                "DamageDealt": s["damage_dealt"],
+                "DamageTaken": s["damage_taken"],
+                "CalloutAssists": 0,
+                "VehicleDestroys": 0,
+                "DriverAssists": 0,
+                "Hijacks": 0,
+                "EmpAssists": 0,
+                "MaxKillingSpree": min(s["kills"], 5),
+                "Medals": [
+                    {
+                        "NameId": MEDAL_IDS[mv % len(MEDAL_IDS)],
+                        "Count": c,
+                        "TotalPersonalScoreAwarded": 0,
+                    }
+                    for mv, c in sorted(medal_counts.items())
+                ],
+                "PersonalScores": [
+                    {
+                        "NameId": 1024030246,
+                        "Count": s["kills"],
+                        "TotalPersonalScoreAwarded": 100 * s["kills"],
+                    },
+                    {
+                        "NameId": 638246808,
+                        "Count": s["assists"],
+                        "TotalPersonalScoreAwarded": 50 * s["assists"],
+                    },
+                ],
+            }
+            players.append(
+                {
+                    "PlayerId": f"xuid({xuid})",
+                    "PlayerGamertag": gamertag,
+                    "PlayerType": 1,
+                    "LastTeamId": team,
+                    "Outcome": self._outcome(m, team),
+                    "Rank": rank_of[xuid],
+                    "ParticipationInfo": {
+                        "FirstJoinedTime": _iso(m.start_time),
+                        "JoinedInProgress": False,
+                        "PresentAtBeginning": True,
+                        "LeftInProgress": False,
+                        "PresentAtCompletion": True,
+                        "TimePlayed": _duration(m.duration_s),
+                    },
+                    "PlayerTeamStats": [{"TeamId": team, "Stats": {"CoreStats": core}}],
+                }
+            )
+        return {
+            "MatchId": m.match_id,
+            "MatchInfo": self._match_info(m),
+            "Teams": [
+                {
+                    "TeamId": t,
+                    "Outcome": self._outcome(m, t),
+                    "Rank": 1 if self._outcome(m, t) == 2 else 2,
+                    "TotalPoints": scores[t],
+                    "Stats": {"CoreStats": {"Score": scores[t]}},
+                }
+                for t in (0, 1)
+            ],
+            "Players": players,
+        }
+
+    def skill(self, match_id: str, xuids: list[int]) -> dict[str, Any] | None:
+        m = self._match(match_id)
+        if m is None:
+            return None
+        rng = random.Random(f"{self.seed}/{match_id}/skill")
+        team_mmrs = {"0": 1200 + rng.randrange(300), "1": 1200 + rng.randrange(300)}
+        value = []
+        for xuid, _gt, team in m.players:
+            if xuid not in xuids:
+                continue
+            s = m.stats[xuid]
+            value.append(
+                {
+                    "Id": f"xuid({xuid})",
+                    "ResultCode": 0,
+                    "Result": {
+                        "TeamId": team,
+                        "TeamMmr": team_mmrs[str(team)],
+                        "TeamMmrs": team_mmrs,
+                        "StatPerformances": {
+                            "Kills": {"Count": s["kills"], "Expected": 10.5, "StdDev": 3.2},
+                            "Deaths": {"Count": s["deaths"], "Expected": 10.1, "StdDev": 3.0},
+                        },
+                    },
+                }
+            )
+        return {"Value": value}
+
+    def film_manifest(self, match_id: str) -> dict[str, Any] | None:
+        m = self._match(match_id)
+        if m is None:
+            return None
+        asset_id = _asset_uuid(f"film/{match_id}")
+        chunks = [(1, "filmChunk0"), (2, "filmChunk1"), (3, "filmChunk2")]
+        return {
+            "AssetId": asset_id,
+            "FilmStatusBond": 1,
+            "BlobStoragePathPrefix": f"{BLOBS_HOST}/ugcstorage/film/{match_id}/",
+            "CustomData": {
+                "FilmLength": m.duration_s * 1000,
+                "Chunks": [
+                    {
+                        "Index": i,
+                        "ChunkStartTimeOffsetMilliseconds": 0,
+                        "DurationMilliseconds": m.duration_s * 1000 if ctype == 2 else 0,
+                        "ChunkSize": len(self.film_chunk(match_id, name) or b""),
+                        "FileRelativePath": f"/{name}",
+                        "ChunkType": ctype,
+                    }
+                    for i, (ctype, name) in enumerate(chunks)
+                ],
+                "HasGameEnded": True,
+                "ManifestRefreshSeconds": 0,
+                "MatchId": match_id,
+                "FilmMajorVersion": FILM_MAJOR_VERSION,
+            },
+        }
+
+    def film_chunk(self, match_id: str, name: str) -> bytes | None:
+        m = self._match(match_id)
+        if m is None:
+            return None
+        if name == "filmChunk0":
+            return zlib.compress(self._roster_chunk(m))
+        if name == "filmChunk1":
+            return zlib.compress(bytes(512))
+        if name == "filmChunk2":
+            return zlib.compress(self._highlight_chunk(m))
+        return None
+
+    @staticmethod
+    def _roster_chunk(m: _Match) -> bytes:
+        """Roster : gamertag UTF-16BE, XUID little-endian puis marqueur 2D C0."""
+        out = bytearray(b"\xff" * 16)
+        for xuid, gamertag, _team in m.players:
+            out += b"\xff\xff" + gamertag.encode("utf-16-be") + xuid.to_bytes(8, "little")
+            out += _ROSTER_MARKER + b"\xff" * 6
+        return bytes(out)
+
+    @staticmethod
+    def _highlight_chunk(m: _Match) -> bytes:
+        """Highlight events au format lu par ``spnkr.film.highlight_events``."""
+        gamertags = {xuid: gt for xuid, gt, _team in m.players}
+        events = []
+        for t, killer, victim in m.kills:
+            events.append((t, killer, 50, 0, 0))
+            events.append((t, victim, 20, 0, 0))
+        events.extend((t, xuid, 100, 1, value) for t, xuid, value in m.medals)
+        out = bytearray(bytes(8))
+        for t, xuid, hint, is_medal, medal in sorted(events):
+            out += xuid.to_bytes(8, "little") + b"\x2d\xc0"
+            out += gamertags[xuid].encode("utf-16-le")[:32].ljust(32, b"\x00")
+            out += bytes(15) + bytes([hint]) + t.to_bytes(4, "big")
+            out += bytes(3) + bytes([is_medal]) + bytes(3) + bytes([medal])
+            out += _EVENT_END + bytes(8)
+        return bytes(out)
+
+    def asset(self, asset_type: str, asset_id: str, version_id: str) -> dict[str, Any] | None:
+        info = self._assets.get(asset_id)
+        if info is None or _DISCOVERY_TYPES.get(asset_type.lower()) != info["kind"]:
+            return None
+        return {
+            "AssetId": asset_id,
+            "VersionId": version_id,
+            "PublicName": info["name"],
+            "Description": f"{info['name']} (stand-in)",
+            "AssetKind": _ASSET_KINDS[info["kind"]],
+            "Tags": [],
+        }
+
+
+class RecordedPayloads(SyntheticPayloads):
+    """MatchStats / skill enregistrés (``<dir>/<match_id>.json`` et ``.skill.json``).
+
+    L'historique suit l'ordre des StartTime enregistrés (plus récent d'abord) ;
+    film et assets restent générés.
+    """
+
+    def __init__(self, directory: Path | str, *, gamertag: str, xuid: str, seed: int = 42):
+        self.directory = Path(directory)
+        self._recorded: dict[str, dict[str, Any]] = {}
+        for path in sorted(self.directory.glob("*.json")):
+            if path.name.endswith(".skill.json"):
+                continue
+            data = json.loads(path.read_text(encoding="utf-8"))
+            match_id = str(data.get("MatchId") or path.stem)
+            self._recorded[match_id] = data
+        self._order = sorted(
+            self._recorded,
+            key=lambda mid: str((self._recorded[mid].get("MatchInfo") or {}).get("StartTime")),
+            reverse=True,
+        )
+        super().__init__(matches=len(self._order), gamertag=gamertag, xuid=xuid, seed=seed)
+
+    def match_index(self, match_id: str) -> int | None:
+        try:
+            return self._order.index(match_id)
+        except ValueError:
+            return None
+
+    def history(self, player: str, start: int, count: int) -> dict[str, Any] | None:
+        if not self.is_player(player):
+            return None
+        results = []
+        for match_id in self._order[start : start + max(0, count)]:
+            data = self._recorded[match_id]
+            me = next(
+                (
+                    p
+                    for p in data.get("Players") or []
+                    if str(self.xuid) in str(p.get("PlayerId", ""))
+                ),
+                {},
+            )
+            results.append(
+                {
+                    "MatchId": match_id,
+                    "MatchInfo": data.get("MatchInfo"),
+                    "LastTeamId": me.get("LastTeamId", 0),
+                    "Outcome": me.get("Outcome", 0),
+                    "Rank": me.get("Rank", 1),
+                    "PresentAtEndOfMatch": True,
+                }
+            )
+        return {"Start": start, "Count": count, "ResultCount": len(results), "Results": results}
+
+    def match_stats(self, match_id: str) -> dict[str, Any] | None:
+        return self._recorded.get(match_id)
+
+    def skill(self, match_id: str, xuids: list[int]) -> dict[str, Any] | None:
+        path = self.directory / f"{match_id}.skill.json"
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        wanted = {f"xuid({x})" for x in xuids}
+        return {**data, "Value": [v for v in data.get("Value") or [] if v.get("Id") in wanted]}
+
+
+class _Bandwidth:
+    """Débit sortant partagé : chaque réponse réserve sa fenêtre d'émission."""
+
+    def __init__(self, bytes_per_s: float) -> None:
+        self._rate = bytes_per_s
+        self._next_free = 0.0
+
+    async def wait(self, size: int) -> None:
+        now = time.monotonic()
+        start = max(now, self._next_free)
+        self._next_free = start + size / self._rate
+        await asyncio.sleep(self._next_free - now)
+
+
+def create_app(payloads: SyntheticPayloads, faults: FaultProfile | None = None) -> web.Application:
+    """Application aiohttp servant `payloads` avec le profil `faults`."""
+    faults = faults or FaultProfile()
+    rng = random.Random(faults.seed)
+    bandwidth = _Bandwidth(faults.bandwidth_bytes_per_s) if faults.bandwidth_bytes_per_s else None
+    counters: Counter[str] = Counter()
+
+    def _json(data: Any) -> web.Response:
+        if data is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.Response(body=json.dumps(data).encode(), content_type="application/json")
+
+    @web.middleware
+    async def faults_middleware(request: web.Request, handler):
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else "unknown"
+        counters["requests"] += 1
+        counters[f"route:{name}"] += 1
+        if name == "/_standin/stats":
+            return await handler(request)
+
+        if faults.latency_ms > 0:
+            delay = faults.latency_ms * math.exp(faults.latency_sigma * rng.gauss(0.0, 1.0))
+            await asyncio.sleep(delay / 1000)
+        draw = rng.random()
+        if draw < faults.rate_429:
+            counters["status:429"] += 1
+            return web.json_response(
+                {"error": "too many requests"},
+                status=429,
+                headers={"Retry-After": str(faults.retry_after_s)},
+            )
+        if draw < faults.rate_429 + faults.rate_5xx:
+            status = rng.choice((500, 502, 503))
+            counters[f"status:{status}"] += 1
+            return web.json_response({"error": "injected"}, status=status)
+
+        response = await handler(request)
+        size = len(response.body or b"") if isinstance(response, web.Response) else 0
+        counters[f"status:{response.status}"] += 1
+        counters["bytes"] += size
+        if bandwidth is not None and size:
+            await bandwidth.wait(size)
+        return response
+
+    async def history(request: web.Request) -> web.Response:
+        q = request.query
+        return _json(
+            payloads.history(
+                request.match_info["player"], int(q.get("start", 0)), int(q.get("count", 25))
+            )
+        )
+
+    async def match_count(request: web.Request) -> web.Response:
+        return _json(payloads.match_count(request.match_info["player"]))
+
+    async def match_stats(request: web.Request) -> web.Response:
+        return _json(payloads.match_stats(request.match_info["match_id"]))
+
+    async def skill(request: web.Request) -> web.Response:
+        xuids = [
+            int("".join(c for c in p if c.isdigit())) for p in request.query.getall("players", [])
+        ]
+        return _json(payloads.skill(request.match_info["match_id"], xuids))
+
+    async def film_manifest(request: web.Request) -> web.Response:
+        return _json(payloads.film_manifest(request.match_info["match_id"]))
+
+    async def film_chunk(request: web.Request) -> web.Response:
+        data = payloads.film_chunk(request.match_info["match_id"], request.match_info["chunk"])
+        if data is None:
+            return web.Response(status=404)
+        return web.Response(body=data, content_type="application/octet-stream")
+
+    async def ugc_asset(request: web.Request) -> web.Response:
+        info = request.match_info
+        return _json(payloads.asset(info["asset_type"], info["asset_id"], info["version_id"]))
+
+    async def stats(_request: web.Request) -> web.Response:
+        return web.json_response(dict(counters))
+
+    app = web.Application(middlewares=[faults_middleware])
+    app[COUNTERS_KEY] = counters
+    app.router.add_get("/halostats/hi/players/{player}/matches", history)
+    app.router.add_get("/halostats/hi/players/{player}/matches/count", match_count)
+    app.router.add_get("/halostats/hi/matches/{match_id}/stats", match_stats)
+    app.router.add_get("/skill/hi/matches/{match_id}/skill", skill)
+    app.router.add_get("/discovery-infiniteugc/hi/films/matches/{match_id}/spectate", film_manifest)
+    app.router.add_get(
+        "/discovery-infiniteugc/hi/{asset_type}/{asset_id}/versions/{version_id}", ugc_asset
+    )
+    app.router.add_get("/blobs-infiniteugc/ugcstorage/film/{match_id}/{chunk}", film_chunk)
+    app.router.add_get("/_standin/stats", stats)
+    return app
+
+
+class StandinServer:
+    """Serveur stand-in démarré dans la boucle courante.
+
+    Usage:
+        async with StandinServer(SyntheticPayloads(matches=10_000)) as server:
+            os.environ["SPNKR_API_BASE_URL"] = server.base_url
+    """
+
+    def __init__(
+        self,
+        payloads: SyntheticPayloads,
+        faults: FaultProfile | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.app = create_app(payloads, faults)
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def counters(self) -> Counter[str]:
+        return self.app[COUNTERS_KEY]
+
+    async def start(self) -> StandinServer:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> StandinServer:
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
@@ -0,0 +1,448 @@
+"""Benchmarks sur dataset synthétique, rapport JSON et détection des régressions.
+
+HOW IT WORKS:
+1. Chaque benchmark mesure ``runs`` exécutions d'un chemin applicatif réel
+   sur le joueur suivi principal du dataset (``setup`` hors chronomètre :
+   vidage des caches, remise à NULL des colonnes recalculées…)
+2. Les lectures (loaders du repository, ``load_df_optimized``, antagonistes)
+   passent avant les écritures (sessions, scores, citations, MV) ; chaque
+   benchmark ouvre et ferme ses propres connexions
+3. Le rapport JSON contient la spécification du dataset, la machine et, par
+   benchmark, les temps bruts, p50, moyenne et écart-type
+4. ``find_regressions`` compare le p50 de chaque benchmark à un baseline de
+   même spécification : régression si le p50 dépasse le baseline de plus de
+   ``threshold`` (relatif) ET de ``min_delta_ms`` (bruit de mesure)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from scripts.benchmark.synthetic import SyntheticDataset, SyntheticPlayer
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MIN_DELTA_MS = 5.0
+# Matchs traités par le benchmark citations (calcul par match, coûteux à 100k)
+CITATION_SAMPLE = 200
+BUNDLE_SAMPLE = 20
+
+
+@dataclass
+class BenchResult:
+    """Résultat d'un benchmark."""
+
+    name: str
+    times_ms: list[float] = field(default_factory=list)
+    rows_returned: int = 0
+    success: bool = True
+    error: str | None = None
+
+    @property
+    def p50_ms(self) -> float:
+        return statistics.median(self.times_ms) if self.times_ms else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.mean(self.times_ms) if self.times_ms else 0.0
+
+    @property
+    def std_ms(self) -> float:
+        return statistics.stdev(self.times_ms) if len(self.times_ms) > 1 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "times_ms": [round(t, 3) for t in self.times_ms],
+            "p50_ms": round(self.p50_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "std_ms": round(self.std_ms, 3),
+            "rows_returned": self.rows_returned,
+            "success": self.success,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BenchContext:
+    """Dataset et joueur mesurés."""
+
+    dataset: SyntheticDataset
+    player: SyntheticPlayer
+
+    @property
+    def db_path(self) -> str:
+        return str(self.player.db_path)
+
+    def repository(self, *, read_only: bool = True):
+        from src.data.repositories.duckdb_repo import DuckDBRepository
+
+        return DuckDBRepository(
+            self.player.db_path,
+            self.player.xuid,
+            gamertag=self.player.gamertag,
+            read_only=read_only,
+        )
+
+
+def _count(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, dict):
+        return sum(_count(v) for v in value.values())
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
+def _measure(
+    name: str,
+    runs: int,
+    fn: Callable[[], Any],
+    *,
+    setup: Callable[[], None] | None = None,
+) -> BenchResult:
+    """Chronomètre `fn` `runs` fois (`setup` exécuté hors chronomètre)."""
+    result = BenchResult(name=name)
+    try:
+        for _ in range(runs):
+            if setup is not None:
+                setup()
+            t0 = time.perf_counter()
+            value = fn()
+            result.times_ms.append((time.perf_counter() - t0) * 1000)
+            result.rows_returned = _count(value)
+    except Exception as e:
+        result.success = False
+        result.error = str(e)
+    return result
+
+
+def _execute(db_path: str, sql: str) -> None:
+    conn = duckdb.connect(db_path)
+    try:
+        conn.execute(sql)
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Lectures
+# ---------------------------------------------------------------------------
+def bench_repo_load_cold(ctx: BenchContext, runs: int) -> BenchResult:
+    """load_matches_as_polars avec ouverture du repository (ATTACH shared compris)."""
+
+    def run():
+        repo = ctx.repository()
+        try:
+            return repo.load_matches_as_polars(include_firefight=True)
+        finally:
+            repo.close()
+
+    return _measure("repo_load_matches_cold", runs, run)
+
+
+def bench_repo_load_warm(ctx: BenchContext, runs: int) -> BenchResult:
+    """load_matches_as_polars sur une connexion réutilisée."""
+    repo = ctx.repository()
+    try:
+        return _measure(
+            "repo_load_matches_warm",
+            runs,
+            lambda: repo.load_matches_as_polars(include_firefight=True),
+        )
+    finally:
+        repo.close()
+
+
+def bench_repo_teammates(ctx: BenchContext, runs: int) -> BenchResult:
+    """Top coéquipiers (shared.match_participants)."""
+    repo = ctx.repository()
+    try:
+        return _measure("repo_top_teammates", runs, lambda: repo.list_top_teammates(limit=20))
+    finally:
+        repo.close()
+
+
+def bench_repo_medals(ctx: BenchContext, runs: int) -> BenchResult:
+    """Top médailles sur tous les matchs du joueur."""
+    repo = ctx.repository()
+    try:
+        match_ids = repo.load_matches_as_polars(columns=["match_id"])["match_id"].to_list()
+        return _measure("repo_top_medals", runs, lambda: repo.load_top_medals(match_ids, top_n=25))
+    finally:
+        repo.close()
+
+
+def bench_repo_bundles(ctx: BenchContext, runs: int) -> BenchResult:
+    """Bundles de la vue Match pour les matchs les plus récents."""
+    repo = ctx.repository()
+    try:
+        df = repo.load_matches_as_polars(columns=["match_id", "start_time"])
+        match_ids = df.sort("start_time", descending=True)["match_id"].head(BUNDLE_SAMPLE)
+        return _measure(
+            "repo_match_bundles", runs, lambda: len(repo.load_match_bundles(match_ids.to_list()))
+        )
+    finally:
+        repo.close()
+
+
+def bench_load_df_optimized(ctx: BenchContext, runs: int) -> BenchResult:
+    """Chargement + enrichissement du DataFrame principal (cache Streamlit vidé)."""
+    from src.ui.cache_loaders import load_df_optimized
+
+    return _measure(
+        "load_df_optimized",
+        runs,
+        lambda: load_df_optimized(ctx.db_path, ctx.player.xuid),
+        setup=load_df_optimized.clear,
+    )
+
+
+def bench_antagonists(ctx: BenchContext, runs: int) -> BenchResult:
+    """Résumé némésis / victimes depuis shared.killer_victim_pairs."""
+
+    def run():
+        repo = ctx.repository()
+        try:
+            return repo.get_antagonists_summary_polars(top_n=20)
+        finally:
+            repo.close()
+
+    return _measure("antagonists_summary", runs, run)
+
+
+# ---------------------------------------------------------------------------
+# Écritures
+# ---------------------------------------------------------------------------
+def bench_sessions(ctx: BenchContext, runs: int) -> BenchResult:
+    """Recalcul complet des sessions (backfill --sessions --force)."""
+    from src.data.sessions_backfill import backfill_sessions_for_player
+
+    return _measure(
+        "sessions_backfill",
+        runs,
+        lambda: backfill_sessions_for_player(ctx.db_path, ctx.player.xuid, force=True)["updated"],
+    )
+
+
+def bench_performance_scores(ctx: BenchContext, runs: int) -> BenchResult:
+    """Calcul vectorisé des performance_score de tous les matchs."""
+    from src.data.sync.engine import DuckDBSyncEngine
+
+    def run():
+        engine = DuckDBSyncEngine(
+            ctx.player.db_path,
+            xuid=ctx.player.xuid,
+            gamertag=ctx.player.gamertag,
+            shared_db_path=ctx.dataset.shared_db_path,
+        )
+        try:
+            return engine.batch_compute_performance_scores()
+        finally:
+            engine.close()
+
+    return _measure(
+        "performance_scores",
+        runs,
+        run,
+        setup=lambda: _execute(ctx.db_path, "UPDATE match_stats SET performance_score = NULL"),
+    )
+
+
+def bench_citations(ctx: BenchContext, runs: int) -> BenchResult:
+    """Citations des CITATION_SAMPLE matchs les plus récents."""
+    from src.analysis.citations.engine import CitationEngine
+
+    def run():
+        conn = duckdb.connect(ctx.db_path)
+        try:
+            conn.execute(f"ATTACH '{ctx.dataset.shared_db_path}' AS shared (READ_ONLY)")
+            engine = CitationEngine(
+                ctx.db_path,
+                ctx.player.xuid,
+                metadata_db_path=ctx.dataset.metadata_db_path,
+                shared_db_path=ctx.dataset.shared_db_path,
+                conn=conn,
+            )
+            match_ids = [
+                r[0]
+                for r in conn.execute(
+                    "SELECT match_id FROM match_stats ORDER BY start_time DESC LIMIT ?",
+                    [CITATION_SAMPLE],
+                ).fetchall()
+            ]
+            return sum(engine.compute_and_store_for_match(mid, conn=conn) for mid in match_ids)
+        finally:
+            conn.close()
+
+    return _measure(
+        "citations",
+        runs,
+        run,
+        setup=lambda: _execute(ctx.db_path, "DELETE FROM match_citations"),
+    )
+
+
+def bench_mv_refresh(ctx: BenchContext, runs: int) -> BenchResult:
+    """Rafraîchissement des vues matérialisées (mv_*) après sync."""
+
+    def run():
+        repo = ctx.repository(read_only=False)
+        try:
+            return repo.refresh_materialized_views()
+        finally:
+            repo.close()
+
+    return _measure("mv_refresh", runs, run)
+
+
+BENCHMARKS: list[tuple[str, Callable[[BenchContext, int], BenchResult]]] = [
+    ("repo_load_matches_cold", bench_repo_load_cold),
+    ("repo_load_matches_warm", bench_repo_load_warm),
+    ("repo_top_teammates", bench_repo_teammates),
+    ("repo_top_medals", bench_repo_medals),
+    ("repo_match_bundles", bench_repo_bundles),
+    ("load_df_optimized", bench_load_df_optimized),
+    ("antagonists_summary", bench_antagonists),
+    ("sessions_backfill", bench_sessions),
+    ("performance_scores", bench_performance_scores),
+    ("citations", bench_citations),
+    ("mv_refresh", bench_mv_refresh),
+]
+
+
+# ---------------------------------------------------------------------------
+# Rapport et régressions
+# ---------------------------------------------------------------------------
+def _git_hash() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=str(_PROJECT_ROOT),
+            timeout=5,
+        )
+        return result.stdout.strip() if result.returncode == 0 else "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(
+    dataset: SyntheticDataset,
+    *,
+    runs: int = 5,
+    only: list[str] | None = None,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> dict[str, Any]:
+    """Exécute les benchmarks sur le joueur suivi principal du dataset.
+
+    Args:
+        dataset: Dataset synthétique généré.
+        runs: Exécutions chronométrées par benchmark.
+        only: Noms des benchmarks à exécuter (défaut : tous).
+        progress: Callback appelé après chaque benchmark.
+
+    Returns:
+        Rapport JSON-sérialisable.
+    """
+    player = max(dataset.players, key=lambda p: p.matches)
+    ctx = BenchContext(dataset=dataset, player=player)
+    results = []
+    for name, func in BENCHMARKS:
+        if only and name not in only:
+            continue
+        result = func(ctx, runs)
+        if progress is not None:
+            progress(result)
+        results.append(result.to_dict())
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_hash": _git_hash(),
+        "spec": asdict(dataset.spec),
+        "player": {"gamertag": player.gamertag, "matches": player.matches},
+        "runs": runs,
+        "machine": {
+            "python": sys.version.split()[0],
+            "duckdb": duckdb.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "benchmarks": results,
+    }
+
+
+def find_regressions(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[dict[str, Any]]:
+    """Benchmarks dont le p50 a régressé par rapport au baseline.
+
+    Args:
+        baseline: Rapport de référence (même spécification de dataset).
+        current: Rapport courant.
+        threshold: Hausse relative tolérée du p50 (0.20 = +20 %).
+        min_delta_ms: Hausse absolue en dessous de laquelle on ignore (bruit).
+
+    Returns:
+        Liste de {name, baseline_ms, current_ms, delta_pct, reason}.
+
+    Raises:
+        ValueError: Si les deux rapports ne portent pas sur le même dataset.
+    """
+    if baseline.get("spec") != current.get("spec"):
+        raise ValueError(
+            f"Spécifications de dataset différentes : {baseline.get('spec')} "
+            f"vs {current.get('spec')}"
+        )
+    base_by_name = {b["name"]: b for b in baseline.get("benchmarks", [])}
+    regressions = []
+    for cur in current.get("benchmarks", []):
+        base = base_by_name.get(cur["name"])
+        if base is None or not base.get("success"):
+            continue
+        if not cur.get("success"):
+            regressions.append(
+                {
+                    "name": cur["name"],
+                    "baseline_ms": base["p50_ms"],
+                    "current_ms": None,
+                    "delta_pct": None,
+                    "reason": f"échec : {cur.get('error')}",
+                }
+            )
+            continue
+        delta = cur["p50_ms"] - base["p50_ms"]
+        if delta > min_delta_ms and cur["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append(
+                {
+                    "name": cur["name"],
+                    "baseline_ms": base["p50_ms"],
+                    "current_ms": cur["p50_ms"],
+                    "delta_pct": round(100 * delta / base["p50_ms"], 1) if base["p50_ms"] else None,
+                    "reason": "p50 au-dessus du seuil",
+                }
+            )
+    return regressions
@@ -0,0 +1,109 @@
+"""Test de charge de la sync contre le serveur stand-in (api_standin.py).
+
+HOW IT WORKS:
+1. Crée sous ``root`` une shared v5 vide et la DB du joueur servi
+   (``<root>/players/<gamertag>/stats.duckdb``, schéma du moteur de sync)
+2. Démarre ``StandinServer`` dans la boucle courante et pointe
+   ``SPNKR_API_BASE_URL`` dessus le temps de la sync
+3. Lance ``DuckDBSyncEngine.sync_full`` (tous les matchs servis) et retourne
+   débit, compteurs du serveur (requêtes, 429/5xx, octets) et SyncResult
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from scripts.benchmark.api_standin import FaultProfile, StandinServer, SyntheticPayloads
+from scripts.benchmark.synthetic import create_shared_schema
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_data_dir(root: Path, payloads: SyntheticPayloads) -> tuple[Path, Path]:
+    """Crée la shared vide et retourne (player_db_path, shared_db_path)."""
+    shared_path = root / "warehouse" / "shared_matches.duckdb"
+    shared_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(shared_path))
+    try:
+        create_shared_schema(conn)
+    finally:
+        conn.close()
+    player_path = root / "players" / payloads.gamertag / "stats.duckdb"
+    player_path.parent.mkdir(parents=True, exist_ok=True)
+    return player_path, shared_path
+
+
+async def run_sync_load(
+    root: Path,
+    payloads: SyntheticPayloads,
+    faults: FaultProfile | None = None,
+    *,
+    parallel_matches: int = 5,
+    requests_per_second: int = 10,
+    trace_dir: str | None = None,
+) -> dict[str, Any]:
+    """Synchronise tous les matchs servis par `payloads` dans `root` (vide).
+
+    Args:
+        root: Dossier de données (doit être vide ou absent).
+        payloads: Source des réponses API.
+        faults: Latence / erreurs / débit du serveur.
+        parallel_matches: SyncOptions.parallel_matches.
+        requests_per_second: Rate limiting SPNKr par service.
+        trace_dir: Dossier des traces par étape (tracing.py).
+
+    Returns:
+        Rapport JSON-sérialisable (débit, compteurs serveur, SyncResult).
+    """
+    from src.data.sync.api_client import API_BASE_URL_ENV
+    from src.data.sync.engine import DuckDBSyncEngine
+    from src.data.sync.models import SyncOptions
+
+    player_path, shared_path = prepare_data_dir(root, payloads)
+    options = SyncOptions(
+        max_matches=payloads.matches,
+        parallel_matches=parallel_matches,
+        requests_per_second=requests_per_second,
+        trace_dir=trace_dir,
+    )
+
+    previous = os.environ.get(API_BASE_URL_ENV)
+    async with StandinServer(payloads, faults) as server:
+        os.environ[API_BASE_URL_ENV] = server.base_url
+        engine = DuckDBSyncEngine(
+            player_path,
+            xuid=str(payloads.xuid),
+            gamertag=payloads.gamertag,
+            shared_db_path=shared_path,
+        )
+        t0 = time.perf_counter()
+        try:
+            result = await engine.sync_full(options)
+        finally:
+            elapsed = time.perf_counter() - t0
+            engine.close()
+            if previous is None:
+                os.environ.pop(API_BASE_URL_ENV, None)
+            else:
+                os.environ[API_BASE_URL_ENV] = previous
+        counters = dict(server.counters)
+
+    return {
+        "matches_served": payloads.matches,
+        "elapsed_seconds": round(elapsed, 3),
+        "matches_per_second": round(result.matches_inserted / elapsed, 2) if elapsed else 0.0,
+        "faults": asdict(faults or FaultProfile()),
+        "options": {
+            "parallel_matches": parallel_matches,
+            "requests_per_second": requests_per_second,
+        },
+        "server": counters,
+        "result": result.to_dict(),
+    }
@@ -0,0 +1,560 @@
+"""Générateur de DBs synthétiques réalistes (shared + joueurs) pour les benchmarks.
+
+Produit l'arborescence standard :
+
+    <root>/warehouse/shared_matches.duckdb   (schéma v5 : schema_v5.sql + migrations)
+    <root>/warehouse/metadata.duckdb         (citation_mappings)
+    <root>/players/<gamertag>/stats.duckdb   (schéma du moteur de sync)
+
+HOW IT WORKS:
+1. Tout est généré en SQL dans DuckDB (``INSERT ... SELECT FROM range()``) :
+   100k matchs restent l'affaire de quelques secondes
+2. Le hasard est un hachage arithmétique de (clé, sel, graine) : mêmes
+   paramètres → mêmes DBs sur toutes les machines et versions
+3. Chaque match a ``participants`` joueurs sur 2 équipes : un joueur suivi,
+   parfois un second joueur suivi (``overlap``, matchs partagés entre DBs
+   joueurs), des amis récurrents et des adversaires tirés d'un pool
+4. Les DBs joueurs reçoivent match_stats, personal_score_awards, sync_meta
+   et match_citations (vide) pour leurs matchs ; la shared reçoit registry,
+   participants, médailles, highlight events, paires killer/victim, aliases
+5. ``generate_dataset`` réutilise un dossier déjà généré avec la même
+   spécification (manifeste ``synthetic.json``)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_SQL_PATH = _PROJECT_ROOT / "scripts" / "migration" / "schema_v5.sql"
+MANIFEST_NAME = "synthetic.json"
+
+TRACKED_XUID_BASE = 2533274900000000
+FRIEND_XUID_BASE = 2533274850000000
+POOL_XUID_BASE = 2533274800000000
+
+# (id, nom, catégorie de mode, classé)
+PLAYLISTS = [
+    ("pl-ranked-arena", "Ranked Arena", "Ranked", True),
+    ("pl-quick-play", "Quick Play", "Assassin", False),
+    ("pl-btb", "Big Team Battle", "BTB", False),
+    ("pl-fiesta", "Fiesta", "Fiesta", False),
+]
+MAPS = [
+    ("map-aquarius", "Aquarius"),
+    ("map-recharge", "Recharge"),
+    ("map-streets", "Streets"),
+    ("map-live-fire", "Live Fire"),
+    ("map-bazaar", "Bazaar"),
+    ("map-behemoth", "Behemoth"),
+]
+MEDAL_IDS = [
+    622331684,
+    1169390319,
+    1512363953,
+    2063152177,
+    2780740615,
+    3169118333,
+    221693153,
+    2758320809,
+    3655682764,
+    4229934157,
+]
+# (nom affiché, catégorie, colonne de participants pour award_count, points par unité)
+PERSONAL_SCORE_AWARDS = [
+    ("Joueur tué", "kill", "kills", 100),
+    ("Assistance kill", "assist", "assists", 50),
+    ("Drapeau ramené", "objective", "objectives", 75),
+]
+CITATION_MAPPINGS = [
+    ("pilote", "Pilote", "medal", 3169118333, None, None),
+    ("ecrasement", "Écrasement", "medal", 221693153, None, None),
+    ("assistant", "Assistant", "stat", None, "assists", None),
+    ("defenseur du drapeau", "Défenseur du drapeau", "award", None, None, "Drapeau ramené"),
+]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Paramètres de génération (identiques → DBs identiques)."""
+
+    matches: int = 1000
+    players: int = 3
+    # Part des matchs où un second joueur suivi est présent (matchs partagés)
+    overlap: float = 0.3
+    participants: int = 8
+    events_per_match: int = 24
+    seed: int = 42
+
+
+@dataclass
+class SyntheticPlayer:
+    """Joueur suivi généré."""
+
+    gamertag: str
+    xuid: str
+    db_path: Path
+    matches: int = 0
+
+
+@dataclass
+class SyntheticDataset:
+    """DBs générées et leur spécification."""
+
+    root: Path
+    spec: SyntheticSpec
+    shared_db_path: Path
+    metadata_db_path: Path
+    players: list[SyntheticPlayer] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "spec": asdict(self.spec),
+            "players": [
+                {"gamertag": p.gamertag, "xuid": p.xuid, "matches": p.matches} for p in self.players
+            ],
+        }
+
+
+def tracked_xuid(index: int) -> str:
+    """XUID du joueur suivi `index`."""
+    return str(TRACKED_XUID_BASE + index)
+
+
+def _values_sql(rows: list[tuple]) -> str:
+    """Littéral VALUES DuckDB pour une petite table de référence."""
+
+    def literal(v: Any) -> str:
+        if isinstance(v, bool):
+            return "TRUE" if v else "FALSE"
+        if isinstance(v, int | float):
+            return str(v)
+        return "'" + str(v).replace("'", "''") + "'"
+
+    return ", ".join("(" + ", ".join(literal(v) for v in row) + ")" for row in rows)
+
+
+def _schema_statements() -> list[str]:
+    """Instructions de schema_v5.sql (même parsing que create_shared_matches_db)."""
+    lines = []
+    for line in SCHEMA_SQL_PATH.read_text(encoding="utf-8").splitlines():
+        pos = line.find("--")
+        lines.append(line[:pos] if pos >= 0 else line)
+    return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+
+def _create_macros(conn: duckdb.DuckDBPyConnection, seed: int) -> None:
+    # Hachage multiplicatif : entier dans [0, 1000003), reproductible partout
+    conn.execute(
+        f"CREATE OR REPLACE TEMP MACRO rnd(k, salt) AS "
+        f"((k * 2654435761 + salt * 40503 + {int(seed)} * 7919) % 1000003)"
+    )
+
+
+def create_shared_schema(conn: duckdb.DuckDBPyConnection) -> None:
+    """Crée le schéma v5 (vide) dans une DB shared."""
+    from src.data.sync.migrations import ensure_match_participants_columns
+
+    for stmt in _schema_statements():
+        conn.execute(stmt)
+    ensure_match_participants_columns(conn)
+
+
+def _build_shared(conn: duckdb.DuckDBPyConnection, spec: SyntheticSpec) -> None:
+    """Remplit la DB shared (tables temporaires syn_* réutilisées pour les joueurs)."""
+    create_shared_schema(conn)
+
+    p = spec.participants
+    half = p // 2
+    n = spec.players
+    pool = max(4 * p, 500 + spec.matches // 20)
+    stride = pool // p
+    overlap = int(round(spec.overlap * 1000))
+
+    conn.execute(
+        "CREATE TEMP TABLE syn_playlists AS SELECT * FROM (VALUES "
+        f"{_values_sql([(i, *row) for i, row in enumerate(PLAYLISTS)])}"
+        ") t(idx, id, name, mode_category, is_ranked)"
+    )
+    conn.execute(
+        "CREATE TEMP TABLE syn_maps AS SELECT * FROM (VALUES "
+        f"{_values_sql([(i, *row) for i, row in enumerate(MAPS)])}"
+        ") t(idx, id, name)"
+    )
+
+    # Sessions de 6 matchs espacées de 6 h
+    conn.execute(f"""
+        CREATE TEMP TABLE syn_matches AS
+        SELECT
+            i,
+            printf('syn%05d-%04d-4000-8000-%012d', {spec.seed} % 100000, i % 10000, i) AS match_id,
+            TIMESTAMP '2022-01-03 18:00:00'
+                + to_minutes(CAST((i // 6) * 360 + (i % 6) * 14 + rnd(i, 1) % 4 AS BIGINT))
+                AS start_time,
+            CAST(480 + rnd(i, 2) % 420 AS INTEGER) AS duration_seconds,
+            CAST(rnd(i, 3) % {len(PLAYLISTS)} AS INTEGER) AS playlist_idx,
+            CAST(rnd(i, 4) % {len(MAPS)} AS INTEGER) AS map_idx,
+            CAST(i % {n} AS INTEGER) AS owner,
+            rnd(i, 5) % 100 < 52 AS team0_wins
+        FROM range({spec.matches}) t(i)
+    """)
+
+    # Slot 0 : joueur suivi ; slot 1 : second joueur suivi (overlap) ;
+    # slot 2 : ami récurrent (40 %) ; autres : pool d'adversaires/coéquipiers
+    second_tracked = (
+        f"WHEN s = 1 AND rnd(i, 6) % 1000 < {overlap} "
+        f"THEN {TRACKED_XUID_BASE} + (owner + 1 + rnd(i, 7) % {n - 1}) % {n}"
+        if n > 1
+        else ""
+    )
+    conn.execute(f"""
+        CREATE TEMP TABLE syn_participants AS
+        WITH slots AS (
+            SELECT m.*, s, i * {p} + s AS k,
+                CASE
+                    WHEN s = 0 THEN {TRACKED_XUID_BASE} + owner
+                    {second_tracked}
+                    WHEN s = 2 AND rnd(i, 8) % 100 < 40
+                        THEN {FRIEND_XUID_BASE} + owner * 10 + rnd(i, 9) % 5
+                    ELSE {POOL_XUID_BASE} + (rnd(i, 10) + s * {stride}) % {pool}
+                END AS xuid_num
+            FROM syn_matches m CROSS JOIN range({p}) r(s)
+        ),
+        stats AS (
+            SELECT *,
+                CAST(CASE WHEN s < {half} THEN 0 ELSE 1 END AS INTEGER) AS team_id,
+                CAST(4 + rnd(k, 11) % 22 AS INTEGER) AS kills,
+                CAST(4 + rnd(k, 12) % 18 AS INTEGER) AS deaths,
+                CAST(1 + rnd(k, 13) % 12 AS INTEGER) AS assists,
+                CAST(CASE WHEN playlist_idx = 2 THEN rnd(k, 14) % 4 ELSE 0 END AS INTEGER)
+                    AS objectives,
+                CAST(150 + rnd(k, 15) % 250 AS INTEGER) AS shots_fired,
+                CAST(35 + rnd(k, 16) % 25 AS INTEGER) AS hit_pct
+            FROM slots
+        )
+        SELECT *,
+            CASE WHEN (team_id = 0) = team0_wins THEN 2 ELSE 3 END AS outcome,
+            shots_fired * hit_pct // 100 AS shots_hit,
+            CAST(kills * 110 + rnd(k, 17) % 900 AS FLOAT) AS damage_dealt,
+            CAST(deaths * 105 + rnd(k, 18) % 900 AS FLOAT) AS damage_taken,
+            kills * 100 + assists * 50 + objectives * 75 + CAST(rnd(k, 19) % 300 AS INTEGER)
+                AS score,
+            CAST(duration_seconds / (deaths + 1.0) AS FLOAT) AS avg_life_seconds,
+            CASE
+                WHEN xuid_num >= {TRACKED_XUID_BASE}
+                    THEN 'SynPlayer' || CAST(xuid_num - {TRACKED_XUID_BASE} AS VARCHAR)
+                WHEN xuid_num >= {FRIEND_XUID_BASE}
+                    THEN 'SynFriend' || CAST(xuid_num - {FRIEND_XUID_BASE} AS VARCHAR)
+                ELSE 'SynRival' || CAST(xuid_num - {POOL_XUID_BASE} AS VARCHAR)
+            END AS gamertag,
+            CAST(xuid_num AS VARCHAR) AS xuid
+        FROM stats
+    """)
+    conn.execute("""
+        INSERT INTO match_participants (
+            match_id, xuid, gamertag, team_id, outcome, rank, score,
+            kills, deaths, assists, shots_fired, shots_hit,
+            damage_dealt, damage_taken, avg_life_seconds
+        )
+        SELECT match_id, xuid, gamertag, team_id, outcome,
+            CAST(row_number() OVER (PARTITION BY match_id ORDER BY score DESC, s) AS SMALLINT),
+            score, kills, deaths, assists, shots_fired, shots_hit,
+            damage_dealt, damage_taken, avg_life_seconds
+        FROM syn_participants
+    """)
+
+    conn.execute("""
+        INSERT INTO match_registry (
+            match_id, start_time, end_time, playlist_id, playlist_name, map_id, map_name,
+            pair_id, pair_name, game_variant_id, game_variant_name, mode_category,
+            is_ranked, is_firefight, duration_seconds, team_0_score, team_1_score,
+            participants_loaded, events_loaded, medals_loaded,
+            first_sync_by, first_sync_at, last_updated_at, player_count
+        )
+        SELECT
+            m.match_id, m.start_time, m.start_time + to_seconds(m.duration_seconds),
+            pl.id, pl.name, mp.id, mp.name,
+            pl.id || ':' || mp.id, pl.mode_category || ' on ' || mp.name,
+            'gv-' || lower(pl.mode_category), pl.mode_category, pl.mode_category,
+            pl.is_ranked, FALSE, m.duration_seconds,
+            CAST(sc.team0 AS SMALLINT), CAST(sc.team1 AS SMALLINT),
+            TRUE, TRUE, TRUE,
+            'SynPlayer' || CAST(m.owner AS VARCHAR), m.start_time, m.start_time,
+            CAST(sc.tracked AS SMALLINT)
+        FROM syn_matches m
+        JOIN syn_playlists pl ON pl.idx = m.playlist_idx
+        JOIN syn_maps mp ON mp.idx = m.map_idx
+        JOIN (
+            SELECT i,
+                SUM(kills) FILTER (WHERE team_id = 0) AS team0,
+                SUM(kills) FILTER (WHERE team_id = 1) AS team1,
+                COUNT(*) FILTER (WHERE gamertag LIKE 'SynPlayer%') AS tracked
+            FROM syn_participants GROUP BY i
+        ) sc ON sc.i = m.i
+    """)
+
+    medal_list = "[" + ", ".join(str(m) for m in MEDAL_IDS) + "]"
+    conn.execute(f"""
+        INSERT INTO medals_earned (match_id, xuid, medal_name_id, count)
+        SELECT match_id, xuid,
+            {medal_list}[1 + CAST((rnd(k, 20) + j) % {len(MEDAL_IDS)} AS INTEGER)],
+            CAST(1 + rnd(k * 4 + j, 21) % 3 AS SMALLINT)
+        FROM syn_participants CROSS JOIN range(4) r(j)
+        WHERE j < 1 + rnd(k, 22) % 4
+    """)
+
+    e = spec.events_per_match
+    conn.execute(f"""
+        INSERT INTO highlight_events (
+            match_id, event_type, time_ms, killer_xuid, killer_gamertag,
+            victim_xuid, victim_gamertag, type_hint
+        )
+        SELECT ev.match_id, 'kill', ev.time_ms, killer.xuid, killer.gamertag,
+            victim.xuid, victim.gamertag, 50
+        FROM (
+            SELECT m.i, m.match_id,
+                CAST(j * m.duration_seconds * 1000 // {e} + rnd(m.i * {e} + j, 23) % 1000
+                    AS INTEGER) AS time_ms,
+                rnd(m.i * {e} + j, 24) % {p} AS killer_slot,
+                rnd(m.i * {e} + j, 25) % {half} AS victim_offset
+            FROM syn_matches m CROSS JOIN range({e}) r(j)
+        ) ev
+        JOIN syn_participants killer ON killer.i = ev.i AND killer.s = ev.killer_slot
+        JOIN syn_participants victim ON victim.i = ev.i
+            AND victim.s = CASE WHEN ev.killer_slot < {half} THEN {half} ELSE 0 END
+                + ev.victim_offset
+        ORDER BY ev.i, ev.time_ms
+    """)
+    conn.execute("""
+        INSERT INTO killer_victim_pairs (
+            match_id, killer_xuid, killer_gamertag, victim_xuid, victim_gamertag,
+            kill_count, time_ms, is_validated
+        )
+        SELECT match_id, killer_xuid, killer_gamertag, victim_xuid, victim_gamertag,
+            1, time_ms, TRUE
+        FROM highlight_events
+    """)
+    conn.execute("""
+        INSERT INTO xuid_aliases (xuid, gamertag, last_seen, source)
+        SELECT xuid, any_value(gamertag), MAX(start_time), 'synthetic'
+        FROM syn_participants GROUP BY xuid
+    """)
+
+
+def _create_player_db(db_path: Path, xuid: str, gamertag: str, shared_db_path: Path) -> None:
+    """Crée une DB joueur vide avec le schéma du moteur de sync."""
+    from src.data.sync.engine import DuckDBSyncEngine
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    engine = DuckDBSyncEngine(db_path, xuid=xuid, gamertag=gamertag, shared_db_path=shared_db_path)
+    try:
+        engine._get_connection()
+    finally:
+        engine.close()
+
+
+def _fill_player_db(
+    conn: duckdb.DuckDBPyConnection,
+    player: SyntheticPlayer,
+) -> None:
+    """Remplit la DB joueur attachée comme ``player`` depuis les tables syn_*."""
+    from scripts.create_match_citations_table import create_match_citations_table
+
+    conn.execute(f"""
+        INSERT INTO player.match_stats (
+            match_id, start_time, end_time, playlist_id, playlist_name, map_id, map_name,
+            pair_id, pair_name, game_variant_id, game_variant_name,
+            outcome, team_id, rank, kills, deaths, assists, kda, accuracy,
+            headshot_kills, max_killing_spree, time_played_seconds, avg_life_seconds,
+            my_team_score, enemy_team_score, team_mmr, enemy_mmr,
+            damage_dealt, damage_taken, shots_fired, shots_hit,
+            grenade_kills, melee_kills, power_weapon_kills, score, personal_score,
+            mode_category, is_ranked, is_firefight, left_early, created_at, updated_at
+        )
+        SELECT
+            r.match_id, r.start_time, r.end_time, r.playlist_id, r.playlist_name,
+            r.map_id, r.map_name, r.pair_id, r.pair_name,
+            r.game_variant_id, r.game_variant_name,
+            p.outcome, p.team_id, mp.rank, p.kills, p.deaths, p.assists,
+            (p.kills + p.assists / 3.0) / greatest(p.deaths, 1),
+            p.shots_hit * 100.0 / p.shots_fired,
+            p.kills * (20 + rnd(p.k, 30) % 40) // 100,
+            1 + rnd(p.k, 31) % greatest(p.kills // 2, 1),
+            r.duration_seconds, p.avg_life_seconds,
+            CASE WHEN p.team_id = 0 THEN r.team_0_score ELSE r.team_1_score END,
+            CASE WHEN p.team_id = 0 THEN r.team_1_score ELSE r.team_0_score END,
+            1350 + rnd(p.i, 32) % 300, 1350 + rnd(p.i, 33) % 300,
+            p.damage_dealt, p.damage_taken, p.shots_fired, p.shots_hit,
+            rnd(p.k, 34) % 3, rnd(p.k, 35) % 3, rnd(p.k, 36) % 4, p.score, p.score,
+            r.mode_category, r.is_ranked, r.is_firefight, FALSE,
+            r.start_time, r.start_time
+        FROM syn_participants p
+        JOIN match_registry r ON r.match_id = p.match_id
+        JOIN match_participants mp ON mp.match_id = p.match_id AND mp.xuid = p.xuid
+        WHERE p.xuid = '{player.xuid}'
+    """)
+    for name, category, column, points in PERSONAL_SCORE_AWARDS:
+        conn.execute(
+            f"""
+            INSERT INTO player.personal_score_awards (
+                match_id, xuid, award_name, award_category, award_count, award_score,
+                created_at
+            )
+            SELECT match_id, xuid, ?, ?, {column}, {column} * {points}, start_time
+            FROM syn_participants
+            WHERE xuid = ? AND {column} > 0
+            """,
+            [name, category, player.xuid],
+        )
+    conn.execute(
+        "INSERT OR REPLACE INTO player.sync_meta (key, value) VALUES ('xuid', ?), ('gamertag', ?)",
+        [player.xuid, player.gamertag],
+    )
+    current = conn.execute("SELECT current_database()").fetchone()[0]
+    conn.execute("USE player")
+    try:
+        create_match_citations_table(conn)
+    finally:
+        conn.execute(f"USE {current}")
+    player.matches = conn.execute("SELECT COUNT(*) FROM player.match_stats").fetchone()[0]
+
+
+def _create_metadata_db(path: Path) -> None:
+    conn = duckdb.connect(str(path))
+    try:
+        conn.execute("""
+            CREATE TABLE citation_mappings (
+                citation_name_norm TEXT PRIMARY KEY,
+                citation_name_display TEXT NOT NULL,
+                mapping_type TEXT NOT NULL,
+                medal_id BIGINT,
+                medal_ids TEXT,
+                stat_name TEXT,
+                award_name TEXT,
+                award_category TEXT,
+                custom_function TEXT,
+                confidence TEXT,
+                notes TEXT,
+                enabled BOOLEAN DEFAULT TRUE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO citation_mappings (citation_name_norm, citation_name_display, "
+            "mapping_type, medal_id, stat_name, award_name, confidence, notes) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'high', 'synthetic')",
+            CITATION_MAPPINGS,
+        )
+    finally:
+        conn.close()
+
+
+def load_dataset(root: Path) -> SyntheticDataset | None:
+    """Relit un dataset généré (None si absent ou incomplet)."""
+    manifest = root / MANIFEST_NAME
+    if not manifest.exists():
+        return None
+    try:
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+        spec = SyntheticSpec(**data["spec"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    dataset = SyntheticDataset(
+        root=root,
+        spec=spec,
+        shared_db_path=root / "warehouse" / "shared_matches.duckdb",
+        metadata_db_path=root / "warehouse" / "metadata.duckdb",
+        players=[
+            SyntheticPlayer(
+                gamertag=p["gamertag"],
+                xuid=p["xuid"],
+                db_path=root / "players" / p["gamertag"] / "stats.duckdb",
+                matches=p.get("matches", 0),
+            )
+            for p in data.get("players", [])
+        ],
+    )
+    paths = [dataset.shared_db_path, dataset.metadata_db_path]
+    paths.extend(p.db_path for p in dataset.players)
+    return dataset if all(p.exists() for p in paths) else None
+
+
+def generate_dataset(
+    root: str | Path,
+    spec: SyntheticSpec | None = None,
+    *,
+    force: bool = False,
+) -> SyntheticDataset:
+    """Génère (ou réutilise) les DBs synthétiques sous `root`.
+
+    Args:
+        root: Dossier de sortie (équivalent de ``data/``).
+        spec: Paramètres de génération (défaut : 1000 matchs, 3 joueurs).
+        force: Régénère même si un dataset de même spécification existe.
+
+    Returns:
+        Le dataset (chemins des DBs et joueurs suivis).
+    """
+    root = Path(root)
+    spec = spec or SyntheticSpec()
+    if spec.players < 1 or spec.participants < 2 or spec.participants % 2:
+        raise ValueError("players >= 1 et participants pair >= 2 requis")
+
+    existing = None if force else load_dataset(root)
+    if existing is not None and existing.spec == spec:
+        logger.info(f"Dataset synthétique réutilisé: {root}")
+        return existing
+
+    for sub in ("warehouse", "players"):
+        shutil.rmtree(root / sub, ignore_errors=True)
+    (root / MANIFEST_NAME).unlink(missing_ok=True)
+    (root / "warehouse").mkdir(parents=True, exist_ok=True)
+
+    dataset = SyntheticDataset(
+        root=root,
+        spec=spec,
+        shared_db_path=root / "warehouse" / "shared_matches.duckdb",
+        metadata_db_path=root / "warehouse" / "metadata.duckdb",
+    )
+    _create_metadata_db(dataset.metadata_db_path)
+
+    from src.data.infrastructure.database.teammate_index import rebuild_teammate_index
+
+    conn = duckdb.connect(str(dataset.shared_db_path))
+    try:
+        _create_macros(conn, spec.seed)
+        _build_shared(conn, spec)
+        rebuild_teammate_index(conn)
+        conn.execute("CHECKPOINT")
+        for index in range(spec.players):
+            gamertag = f"SynPlayer{index}"
+            player = SyntheticPlayer(
+                gamertag=gamertag,
+                xuid=tracked_xuid(index),
+                db_path=root / "players" / gamertag / "stats.duckdb",
+            )
+            _create_player_db(player.db_path, player.xuid, gamertag, dataset.shared_db_path)
+            conn.execute(f"ATTACH '{player.db_path}' AS player")
+            try:
+                _fill_player_db(conn, player)
+            finally:
+                conn.execute("DETACH player")
+            dataset.players.append(player)
+    finally:
+        conn.close()
+
+    (root / MANIFEST_NAME).write_text(json.dumps(dataset.to_dict(), indent=2), encoding="utf-8")
+    logger.info(
+        f"Dataset synthétique généré: {spec.matches} matchs, {spec.players} joueurs ({root})"
+    )
+    return dataset
@@ -0,0 +1,157 @@
+"""Benchmark des UPDATE du backfill participants : ligne à ligne vs lot Arrow.
+
+Crée un shared_matches.duckdb temporaire de N matchs (participants sans
+détails), puis applique ``--participants-scores/kda/shots/damage/avg-life``
+avec ``_update_participants_details`` (une requête par participant et par
+groupe) et avec ``BulkUpdateBatch`` (un ``UPDATE … FROM`` par lot). Vérifie
+que les deux chemins produisent la même table.
+
+Usage:
+    python scripts/benchmark_backfill_updates.py
+    python scripts/benchmark_backfill_updates.py --matches 2000 --chunk 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.backfill.bulk_updates import (  # noqa: E402
+    DEFAULT_CHUNK_MATCHES,
+    PARTICIPANT_DETAIL_COLUMNS,
+    BulkUpdateBatch,
+)
+from scripts.backfill.orchestrator import _update_participants_details  # noqa: E402
+from scripts.benchmark.synthetic import create_shared_schema  # noqa: E402
+from scripts.benchmark_match_decoder import synthetic_match  # noqa: E402
+from src.data.sync.batch_insert import PARTICIPANT_COLUMNS, batch_insert_rows  # noqa: E402
+from src.data.sync.transformers import extract_participants  # noqa: E402
+
+_DETAIL_COLUMNS = [c for cols in PARTICIPANT_DETAIL_COLUMNS.values() for c in cols]
+
+
+def synthetic_matches(n: int, players: int) -> list[dict[str, Any]]:
+    """N JSON MatchStats (identifiants et joueurs distincts par match)."""
+    matches = []
+    for i in range(n):
+        match = synthetic_match(players, seed_xuid=2535400000000000 + (i % 50) * players)
+        match["MatchId"] = f"bench-match-{i:06d}"
+        matches.append(match)
+    return matches
+
+
+def create_shared_db(path: Path, matches: list[dict[str, Any]]) -> None:
+    """shared_matches.duckdb avec les participants des matchs, détails à NULL."""
+    conn = duckdb.connect(str(path))
+    try:
+        create_shared_schema(conn)
+        rows = [row for match in matches for row in extract_participants(match)]
+        batch_insert_rows(conn, "match_participants", rows, PARTICIPANT_COLUMNS)
+        conn.execute(
+            f"UPDATE match_participants SET {', '.join(f'{c} = NULL' for c in _DETAIL_COLUMNS)}"
+        )
+        conn.execute("CHECKPOINT")
+    finally:
+        conn.close()
+
+
+def run_row_wise(path: Path, matches: list[dict[str, Any]]) -> float:
+    conn = duckdb.connect(str(path))
+    try:
+        t0 = time.perf_counter()
+        for match in matches:
+            _update_participants_details(
+                conn,
+                match,
+                participants_scores=True,
+                participants_kda=True,
+                participants_shots=True,
+                participants_damage=True,
+                participants_avg_life=True,
+            )
+            conn.commit()
+        return time.perf_counter() - t0
+    finally:
+        conn.close()
+
+
+def run_bulk(path: Path, matches: list[dict[str, Any]], chunk: int) -> float:
+    conn = duckdb.connect(str(path))
+    try:
+        batch = BulkUpdateBatch(
+            participant_groups=tuple(PARTICIPANT_DETAIL_COLUMNS), chunk_size=chunk
+        )
+        t0 = time.perf_counter()
+        for match in matches:
+            batch.add_participants(extract_participants(match))
+            if batch.full:
+                batch.flush(conn)
+                conn.commit()
+        batch.flush(conn)
+        conn.commit()
+        return time.perf_counter() - t0
+    finally:
+        conn.close()
+
+
+def _snapshot(path: Path) -> list[tuple]:
+    conn = duckdb.connect(str(path), read_only=True)
+    try:
+        return conn.execute(
+            f"SELECT match_id, xuid, {', '.join(_DETAIL_COLUMNS)} FROM match_participants "
+            "ORDER BY match_id, xuid"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def main() -> int:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark des UPDATE du backfill participants")
+    parser.add_argument("--matches", type=int, default=500, help="Matchs à mettre à jour")
+    parser.add_argument("--players", type=int, default=8, help="Joueurs par match")
+    parser.add_argument(
+        "--chunk",
+        type=int,
+        default=DEFAULT_CHUNK_MATCHES,
+        help=f"Matchs par lot Arrow (défaut: {DEFAULT_CHUNK_MATCHES})",
+    )
+    args = parser.parse_args()
+
+    matches = synthetic_matches(args.matches, args.players)
+    n_rows = args.matches * args.players
+
+    print("=" * 70)
+    print(f"  BENCHMARK backfill participants — {args.matches} matchs, {n_rows} participants")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        row_path = Path(tmp) / "row_wise.duckdb"
+        bulk_path = Path(tmp) / "bulk.duckdb"
+        create_shared_db(row_path, matches)
+        create_shared_db(bulk_path, matches)
+
+        row_s = run_row_wise(row_path, matches)
+        bulk_s = run_bulk(bulk_path, matches, args.chunk)
+        same = _snapshot(row_path) == _snapshot(bulk_path)
+
+    for label, seconds in (("ligne à ligne", row_s), (f"lots de {args.chunk} matchs", bulk_s)):
+        print(
+            f"  {label:<22}: {seconds:8.2f} s  {args.matches / seconds:9.1f} matchs/s  "
+            f"{n_rows / seconds:10.0f} participants/s  x{row_s / seconds:6.1f}"
+        )
+    print(f"  Tables identiques : {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
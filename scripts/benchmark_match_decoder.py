@@ -0,0 +1,229 @@
+"""Benchmark du décodage MatchStats : extracteurs séparés vs décodeur en une passe.
+
+Mesure le temps (µs/match) et les allocations (tracemalloc) pour produire
+toutes les lignes d'un match, avec les extracteurs de transformers.py appelés
+un par un (comportement historique) puis avec ``decode_match``. Mesure aussi
+le parsing JSON depuis les bytes (json vs orjson si installé).
+
+Usage:
+    python scripts/benchmark_match_decoder.py
+    python scripts/benchmark_match_decoder.py --players 24 --iterations 2000
+    python scripts/benchmark_match_decoder.py --fixtures "data/debug/matches/*.json"
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.sync.match_decoder import decode_match  # noqa: E402
+from src.data.sync.transformers import (  # noqa: E402
+    extract_aliases,
+    extract_all_medals,
+    extract_match_registry_data,
+    extract_medals,
+    extract_participants,
+    extract_personal_score_awards,
+    extract_xuids_from_match,
+    transform_match_stats,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def synthetic_match(players: int = 8, seed_xuid: int = 2535400000000000) -> dict[str, Any]:
+    """JSON MatchStats synthétique (structure SPNKr, `players` joueurs sur 2 équipes)."""
+    roster = []
+    for i in range(players):
+        roster.append(
+            {
+                "PlayerId": f"xuid({seed_xuid + i})",
+                "PlayerGamertag": f"Player{i}",
+                "Outcome": 2 if i % 2 == 0 else 3,
+                "LastTeamId": i % 2,
+                "Rank": i + 1,
+                "PlayerTeamStats": [
+                    {
+                        "Stats": {
+                            "CoreStats": {
+                                "Kills": 10 + i,
+                                "Deaths": 8 + i % 5,
+                                "Assists": 3 + i % 4,
+                                "KDA": 1.5,
+                                "Accuracy": 0.45,
+                                "HeadshotKills": 4,
+                                "MaxKillingSpree": 5,
+                                "AverageLifeSeconds": 40.0,
+                                "DamageDealt": 3000.0,
+                                "DamageTaken": 2800.0,
+                                "ShotsFired": 220,
+                                "ShotsHit": 100,
+                                "PersonalScore": 1500 + 10 * i,
+                                "Score": 1500 + 10 * i,
+                                "Medals": [
+                                    {"NameId": 1001 + m, "Count": 1 + m % 3} for m in range(6)
+                                ],
+                                "PersonalScores": [
+                                    {
+                                        "NameId": 2001 + s,
+                                        "Count": 2,
+                                        "TotalPersonalScoreAwarded": 100,
+                                    }
+                                    for s in range(5)
+                                ],
+                            }
+                        }
+                    }
+                ],
+            }
+        )
+    return {
+        "MatchId": "bench-match-0001",
+        "MatchInfo": {
+            "StartTime": "2024-06-15T18:30:00Z",
+            "Duration": "PT12M30S",
+            "Playlist": {"AssetId": "playlist-ranked-arena", "PublicName": "Ranked Arena"},
+            "MapVariant": {"AssetId": "map-recharge", "PublicName": "Recharge"},
+            "PlaylistMapModePair": {"AssetId": "pair-recharge-slayer", "PublicName": "Slayer"},
+            "UgcGameVariant": {"AssetId": "variant-slayer", "PublicName": "Slayer"},
+        },
+        "Teams": [{"TeamId": 0, "TotalPoints": 50}, {"TeamId": 1, "TotalPoints": 47}],
+        "Players": roster,
+    }
+
+
+def load_fixtures(pattern: str) -> list[dict[str, Any]]:
+    """Charge des JSON MatchStats enregistrés (glob)."""
+    matches = []
+    for path in sorted(glob.glob(pattern)):
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get("Players"), list):
+            matches.append(data)
+    return matches
+
+
+def _first_xuid(match: dict[str, Any]) -> str:
+    xuids = extract_xuids_from_match(match)
+    return str(xuids[0]) if xuids else "0"
+
+
+def separate_extractors(match: dict[str, Any], xuid: str) -> None:
+    """Toutes les lignes d'un match, un extracteur après l'autre (sans scan)."""
+    extract_xuids_from_match(match)
+    transform_match_stats(match, xuid)
+    extract_match_registry_data(match)
+    extract_participants(match)
+    extract_all_medals(match)
+    extract_medals(match, xuid)
+    extract_aliases(match)
+    extract_personal_score_awards(match, xuid)
+
+
+def single_pass(match: dict[str, Any], xuid: str) -> None:
+    """Toutes les lignes d'un match via decode_match."""
+    decode_match(match, xuid)
+
+
+def measure(
+    fn: Callable[[dict[str, Any], str], None],
+    matches: list[dict[str, Any]],
+    iterations: int,
+) -> tuple[float, float, int]:
+    """Retourne (µs/match, KiB alloués/match, pic KiB) pour `fn`."""
+    xuids = [_first_xuid(m) for m in matches]
+    total = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for match, xuid in zip(matches, xuids, strict=True):
+            fn(match, xuid)
+            total += 1
+    elapsed_us = (time.perf_counter() - start) * 1e6 / max(1, total)
+
+    # Allocations mesurées à part (tracemalloc ralentit fortement l'exécution)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for match, xuid in zip(matches, xuids, strict=True):
+        fn(match, xuid)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0
+    )
+    return elapsed_us, allocated / 1024 / max(1, len(matches)), peak // 1024
+
+
+def measure_parse(payloads: list[bytes], iterations: int) -> dict[str, float]:
+    """µs/match pour le parsing JSON depuis les bytes."""
+    parsers: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    if orjson is not None:
+        parsers["orjson"] = orjson.loads
+    results = {}
+    for name, loads in parsers.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for payload in payloads:
+                loads(payload)
+        results[name] = (time.perf_counter() - start) * 1e6 / max(1, iterations * len(payloads))
+    return results
+
+
+def main() -> int:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark du décodage MatchStats")
+    parser.add_argument("--fixtures", help="Glob de JSON MatchStats enregistrés")
+    parser.add_argument("--players", type=int, default=8, help="Joueurs du match synthétique")
+    parser.add_argument("--iterations", type=int, default=500, help="Répétitions par match")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        matches = load_fixtures(args.fixtures)
+        if not matches:
+            print(f"Aucun JSON MatchStats trouvé pour {args.fixtures}")
+            return 1
+        source = f"{len(matches)} fixture(s)"
+    else:
+        matches = [synthetic_match(args.players)]
+        source = f"match synthétique ({args.players} joueurs)"
+
+    print("=" * 70)
+    print(f"  BENCHMARK décodage MatchStats — {source}")
+    print("=" * 70)
+
+    payloads = [json.dumps(m).encode("utf-8") for m in matches]
+    for name, us in measure_parse(payloads, args.iterations).items():
+        print(f"  parse {name:<24}: {us:8.1f} µs/match")
+
+    rows = [
+        ("extracteurs séparés", separate_extractors),
+        ("decode_match (une passe)", single_pass),
+    ]
+    baseline = None
+    for label, fn in rows:
+        us, kib, peak = measure(fn, matches, args.iterations)
+        baseline = baseline or us
+        print(
+            f"  {label:<30}: {us:8.1f} µs/match  x{baseline / us:4.2f}  "
+            f"{kib:7.1f} KiB alloués/match  (pic {peak} KiB)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
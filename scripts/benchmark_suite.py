@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Suite de benchmarks sur données synthétiques, avec gating des régressions.
+
+Génère (ou réutilise) des DBs shared + joueurs réalistes à l'échelle voulue,
+mesure les loaders du repository, load_df_optimized, les sessions, les
+performance scores, les citations, les antagonistes et le refresh des MV,
+écrit le rapport JSON et échoue (code 1) si un benchmark régresse par
+rapport au baseline.
+
+Usage:
+    python scripts/benchmark_suite.py --scale 10k --output .ai/reports/bench_10k.json
+    python scripts/benchmark_suite.py --scale 10k --baseline .ai/reports/bench_10k.json
+    python scripts/benchmark_suite.py --matches 2500 --players 5 --overlap 0.5 --runs 3
+    python scripts/benchmark_suite.py --scale 100k --only repo_load_matches_cold,mv_refresh
+
+Architecture :
+    scripts/benchmark/
+    ├── __init__.py
+    ├── synthetic.py — Générateur de DBs synthétiques (schéma v5 + DBs joueurs)
+    └── harness.py   — Benchmarks, rapport JSON, détection des régressions
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.benchmark.harness import (  # noqa: E402
+    BENCHMARKS,
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    BenchResult,
+    find_regressions,
+    run_benchmarks,
+)
+from scripts.benchmark.synthetic import SyntheticSpec, generate_dataset  # noqa: E402
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+
+def _print_result(res: BenchResult) -> None:
+    status = "✅" if res.success else f"❌ {res.error}"
+    print(
+        f"  {res.name:<28} p50 {res.p50_ms:>9.1f}ms  (±{res.std_ms:.1f}ms) "
+        f"[{res.rows_returned} rows] {status}"
+    )
+
+
+def main() -> int:
+    """Point d'entrée de la suite."""
+    parser = argparse.ArgumentParser(description="Benchmarks LevelUp sur données synthétiques")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k", help="Taille du dataset")
+    parser.add_argument("--matches", type=int, help="Nombre de matchs (remplace --scale)")
+    parser.add_argument("--players", type=int, default=3, help="Joueurs suivis")
+    parser.add_argument(
+        "--overlap", type=float, default=0.3, help="Part des matchs partagés entre joueurs suivis"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    parser.add_argument("--data-dir", type=str, help="Dossier du dataset (réutilisé si présent)")
+    parser.add_argument("--regenerate", action="store_true", help="Régénère le dataset")
+    parser.add_argument("--runs", type=int, default=5, help="Exécutions par benchmark")
+    parser.add_argument(
+        "--only",
+        type=str,
+        help=f"Benchmarks à exécuter (virgules) parmi : {', '.join(n for n, _ in BENCHMARKS)}",
+    )
+    parser.add_argument("--output", "-o", type=str, help="Fichier JSON du rapport")
+    parser.add_argument("--baseline", type=str, help="Rapport de référence pour le gating")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Hausse relative du p50 tolérée (défaut 0.20)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        help="Hausse absolue ignorée (bruit, défaut 5ms)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    spec = SyntheticSpec(
+        matches=args.matches or SCALES[args.scale],
+        players=args.players,
+        overlap=args.overlap,
+        seed=args.seed,
+    )
+    data_dir = (
+        Path(args.data_dir)
+        if args.data_dir
+        else (
+            Path(tempfile.gettempdir())
+            / f"levelup_bench_{spec.matches}m_{spec.players}p_{spec.seed}"
+        )
+    )
+
+    t0 = time.perf_counter()
+    dataset = generate_dataset(data_dir, spec, force=args.regenerate)
+    print(f"🧪 Dataset : {spec.matches} matchs, {spec.players} joueurs — {data_dir}")
+    print(f"   prêt en {time.perf_counter() - t0:.1f}s")
+    for player in dataset.players:
+        print(f"   {player.gamertag}: {player.matches} matchs")
+    print()
+
+    only = [n.strip() for n in args.only.split(",")] if args.only else None
+    report = run_benchmarks(dataset, runs=args.runs, only=only, progress=_print_result)
+
+    if args.output:
+        out_path = Path(args.output)
+        if not out_path.is_absolute():
+            out_path = PROJECT_ROOT / out_path
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Rapport sauvegardé: {out_path}")
+
+    if not args.baseline:
+        return 0 if all(b["success"] for b in report["benchmarks"]) else 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    try:
+        regressions = find_regressions(
+            baseline, report, threshold=args.threshold, min_delta_ms=args.min_delta_ms
+        )
+    except ValueError as e:
+        print(f"\n❌ Baseline incomparable : {e}")
+        return 1
+
+    print(f"\n📊 Baseline {baseline.get('timestamp', '?')} (git: {baseline.get('git_hash', '?')})")
+    if not regressions:
+        print(f"✅ Aucune régression (seuil +{args.threshold:.0%}, {args.min_delta_ms}ms)")
+        return 0
+    for reg in regressions:
+        if reg["current_ms"] is None:
+            print(f"  ❌ {reg['name']:<28} {reg['reason']}")
+        else:
+            print(
+                f"  ❌ {reg['name']:<28} {reg['baseline_ms']:.1f}ms → {reg['current_ms']:.1f}ms "
+                f"(+{reg['delta_pct']}%)"
+            )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Atlas d'icônes (médailles, citations) pour le static serving Streamlit.
+
+Assemble static/medals/icons/*.png et static/commendations/h5g/*.png en
+static/atlas/<nom>.png + index JSON des positions. Le dashboard reconstruit
+les atlas à la volée s'ils sont absents ou périmés ; ce script permet de les
+générer une fois (déploiement, image Docker) et d'afficher leur poids.
+
+Pré-requis: Pillow (pip install pillow).
+
+Usage:
+    python scripts/build_sprite_atlases.py
+    python scripts/build_sprite_atlases.py medals --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.ui.sprite_atlas import ATLAS_DIR, ATLAS_SPECS, build_atlas  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(description="Construit les atlas d'icônes dans static/atlas/")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help=f"Atlas à construire parmi {', '.join(sorted(ATLAS_SPECS))} (défaut: tous)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Reconstruit même si les sources n'ont pas changé"
+    )
+    args = parser.parse_args()
+    unknown = sorted(set(args.names) - set(ATLAS_SPECS))
+    if unknown:
+        parser.error(f"atlas inconnu(s): {', '.join(unknown)}")
+
+    failures = 0
+    for name in args.names or sorted(ATLAS_SPECS):
+        spec = ATLAS_SPECS[name]
+        index = build_atlas(name, force=args.force)
+        if index is None:
+            logger.error(f"{name}: aucune icône dans {spec.source_dir} ou Pillow absent")
+            failures += 1
+            continue
+        png = REPO_ROOT / ATLAS_DIR / f"{name}.png"
+        sources = REPO_ROOT / spec.source_dir
+        source_kb = sum(p.stat().st_size for p in sources.glob("*.png")) / 1024
+        logger.info(
+            f"{name}: {len(index['sprites'])} icônes, {index['columns']}x{index['rows']} "
+            f"tuiles de {index['tile']} px -> {png.stat().st_size / 1024:.0f} Ko "
+            f"(sources {source_kb:.0f} Ko, signature {index['signature']})"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
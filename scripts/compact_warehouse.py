@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compaction des segments Parquet du warehouse.
+
+Chaque écriture de ``ParquetWriter`` ajoute un segment immuable
+(``part-<uuid>.parquet``) à sa partition player/year/month. Ce script fusionne
+les segments des partitions qui dépassent un seuil en un seul fichier
+dédupliqué, puis publie le manifeste de façon atomique.
+
+Usage:
+    python scripts/compact_warehouse.py
+    python scripts/compact_warehouse.py --table medals --min-segments 4
+    python scripts/compact_warehouse.py --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.data.infrastructure.parquet.writer import (  # noqa: E402
+    DEFAULT_COMPACTION_THRESHOLD,
+    TABLE_KEYS,
+    ParquetWriter,
+)
+from src.utils.paths import WAREHOUSE_DIR  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(description="Compacte les segments Parquet du warehouse")
+    parser.add_argument(
+        "--warehouse",
+        type=Path,
+        default=WAREHOUSE_DIR,
+        help=f"Dossier warehouse (défaut: {WAREHOUSE_DIR})",
+    )
+    parser.add_argument(
+        "--table",
+        choices=sorted(TABLE_KEYS),
+        action="append",
+        help="Table à compacter (répétable, défaut: toutes)",
+    )
+    parser.add_argument(
+        "--min-segments",
+        type=int,
+        default=DEFAULT_COMPACTION_THRESHOLD,
+        help=f"Seuil de segments par partition (défaut: {DEFAULT_COMPACTION_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Afficher les statistiques sans compacter",
+    )
+    args = parser.parse_args()
+
+    if not args.warehouse.exists():
+        logger.error(f"Warehouse introuvable: {args.warehouse}")
+        return 1
+
+    writer = ParquetWriter(args.warehouse)
+    for table in args.table or sorted(TABLE_KEYS):
+        if args.stats:
+            logger.info(f"{table}: {writer.get_stats(table)}")
+            continue
+        result = writer.compact(table, min_segments=args.min_segments)
+        logger.info(
+            f"{table}: {result['partitions']} partitions compactées, "
+            f"{result['segments_removed']} segments fusionnés"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -44,6 +44,7 @@ import polars as pl
 
 from src.analysis.sessions import compute_sessions_with_context_polars
 from src.config import SESSION_CONFIG
+from src.data.infrastructure.database.snapshots import publish_written
 from src.ui.multiplayer import list_duckdb_v4_players
 from src.ui.sync import get_player_duckdb_path, is_duckdb_player
 
@@ -352,6 +353,7 @@ def process_player(
             # Rafraîchir les vues matérialisées
             results["mv_session_stats"] = refresh_session_stats(conn)
             results["sessions_table"] = populate_sessions_table(conn)
+            publish_written((db_path, conn))
 
         conn.close()
 
@@ -204,8 +204,10 @@ def _migrate_match_registry(
         ]
         insert_df = insert_df.select([c for c in cols_order if c in insert_df.columns])
 
+        # Colonnes explicites : les versions d'assets (absentes de match_stats) restent NULL
+        col_list = ", ".join(insert_df.columns)
         conn_shared.execute(
-            "INSERT INTO match_registry SELECT * FROM insert_df"
+            f"INSERT INTO match_registry ({col_list}) SELECT {col_list} FROM insert_df"
         )
 
     return stats
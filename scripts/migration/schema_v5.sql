@@ -29,6 +29,11 @@ CREATE TABLE match_registry (
     pair_name VARCHAR,
     game_variant_id VARCHAR,
     game_variant_name VARCHAR,
+    -- Versions des assets (MatchInfo.<asset>.VersionId), pour le peuplement Discovery
+    playlist_version_id VARCHAR,
+    map_version_id VARCHAR,
+    pair_version_id VARCHAR,
+    game_variant_version_id VARCHAR,
     mode_category VARCHAR,
     is_ranked BOOLEAN DEFAULT FALSE,
     is_firefight BOOLEAN DEFAULT FALSE,
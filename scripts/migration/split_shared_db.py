@@ -0,0 +1,160 @@
+"""Découpe shared_matches.duckdb en partitions par période (année ou trimestre).
+
+Les matchs antérieurs au cutoff (début de l'année courante par défaut) et
+toutes leurs lignes partagées (participants, events, médailles, paires
+killer/victim) sont déplacés vers
+`data/warehouse/shared_partitions/shared_<clé>.duckdb`, fichiers en lecture
+seule lus par `attach_shared` (voir
+`src/data/infrastructure/database/shared_partitions.py`).
+`shared_matches.duckdb` reste la partition courante où la sync écrit.
+
+Idempotent : relancer le script fusionne dans les partitions fermées les
+lignes arrivées depuis (backfill) et reprend un découpage interrompu.
+Aucune sync ne doit tourner pendant l'exécution.
+
+Usage :
+    python scripts/migration/split_shared_db.py --dry-run
+    python scripts/migration/split_shared_db.py --compact-current
+    python scripts/migration/split_shared_db.py --before 2025-07-01 --granularity quarter
+    python scripts/migration/split_shared_db.py --list
+    python scripts/migration/split_shared_db.py --compact 2023
+    python scripts/migration/split_shared_db.py --export 2023 --output data/export/shared_2023
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.data.infrastructure.database.shared_partitions import (  # noqa: E402
+    GRANULARITIES,
+    PartitionManifest,
+    compact_current,
+    compact_partition,
+    export_partition,
+    split_shared_db,
+)
+
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "warehouse" / "shared_matches.duckdb"
+
+logger = logging.getLogger(__name__)
+
+
+def _print_partitions(db_path: Path) -> None:
+    manifest = PartitionManifest.load(db_path)
+    if not manifest.entries:
+        print("Aucune partition fermée")
+        return
+    print(f"Partitions ({manifest.granularity}) :")
+    for entry in manifest.entries:
+        size_mb = (entry.size_bytes or 0) / (1024 * 1024)
+        print(
+            f"  {entry.key:<8} {entry.match_count:>8} matchs  {size_mb:>8.1f} Mo  "
+            f"{entry.min_start_time} → {entry.max_start_time}"
+        )
+    print(f"Partition courante : {db_path.stat().st_size / (1024 * 1024):.1f} Mo")
+
+
+def main() -> int:
+    """Point d'entrée CLI."""
+    parser = argparse.ArgumentParser(
+        description="Découpe shared_matches.duckdb en partitions par période"
+    )
+    parser.add_argument(
+        "--db-path",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help=f"Chemin de la base (défaut : {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--before",
+        type=datetime.fromisoformat,
+        help="Cutoff YYYY-MM-DD (défaut : début de la période courante)",
+    )
+    parser.add_argument(
+        "--granularity",
+        choices=GRANULARITIES,
+        help="Taille des partitions (défaut : celle des partitions existantes, sinon year)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Afficher les matchs à déplacer sans rien écrire",
+    )
+    parser.add_argument(
+        "--compact-current",
+        action="store_true",
+        help="Réécrire shared_matches.duckdb après le découpage (récupère l'espace)",
+    )
+    parser.add_argument("--list", action="store_true", help="Lister les partitions fermées")
+    parser.add_argument("--compact", metavar="CLE", help="Réécrire une partition fermée")
+    parser.add_argument("--export", metavar="CLE", help="Exporter une partition en Parquet")
+    parser.add_argument("--output", type=Path, help="Dossier de sortie de --export")
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Activer les logs détaillés",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    db_path: Path = args.db_path
+    if not db_path.exists():
+        logger.error(f"Base introuvable : {db_path}")
+        return 1
+
+    if args.list:
+        _print_partitions(db_path)
+        return 0
+
+    if args.compact:
+        entry = compact_partition(db_path, args.compact)
+        logger.info(f"Partition {entry.key} compactée : {entry.size_bytes} octets")
+        return 0
+
+    if args.export:
+        if args.output is None:
+            logger.error("--export exige --output")
+            return 1
+        files = export_partition(db_path, args.export, args.output)
+        logger.info(f"Partition {args.export} exportée : {len(files)} fichiers dans {args.output}")
+        return 0
+
+    report = split_shared_db(
+        db_path,
+        before=args.before,
+        granularity=args.granularity,
+        dry_run=args.dry_run,
+    )
+    if not report["partitions"]:
+        logger.info(f"Aucun match antérieur au {report['cutoff']} à déplacer")
+        return 0
+    for key, count in report["partitions"].items():
+        logger.info(f"{'[dry-run] ' if args.dry_run else ''}{key}: {count} matchs")
+    if args.dry_run:
+        return 0
+    for table, rows in report["rows_moved"].items():
+        logger.info(f"  {table}: {rows} lignes déplacées")
+
+    if args.compact_current:
+        size = compact_current(db_path)
+        logger.info(f"Partition courante réécrite : {size / (1024 * 1024):.1f} Mo")
+
+    _print_partitions(db_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -110,6 +110,9 @@ def main(argv: list[str] | None = None) -> int:
         "--requests-per-second", type=int, default=3, help="Rate limit SPNKr (par service)"
     )
     ap.add_argument("--timeout-seconds", type=int, default=12, help="Timeout HTTP")
+    ap.add_argument(
+        "--concurrency", type=int, default=6, help="Téléchargements d'images simultanés"
+    )
 
     args = ap.parse_args(argv)
 
@@ -144,14 +147,14 @@ def main(argv: list[str] | None = None) -> int:
     get_profile_api_cache_dir = profile_api_mod.get_profile_api_cache_dir
     get_xuid_for_gamertag = profile_api_mod.get_xuid_for_gamertag
 
-    download_image_to_cache = player_assets_mod.download_image_to_cache
-    ensure_local_image_path = player_assets_mod.ensure_local_image_path
+    download_images_to_cache = player_assets_mod.download_images_to_cache
     get_player_assets_cache_dir = player_assets_mod.get_player_assets_cache_dir
 
     enabled = not bool(args.offline)
     download_enabled = (not bool(args.no_download)) and enabled
 
     had_error = False
+    image_requests: list[tuple[str, str]] = []
 
     print(f"Cache API: {get_profile_api_cache_dir()}")
     print(f"Cache images: {get_player_assets_cache_dir()}")
@@ -220,36 +223,27 @@ def main(argv: list[str] | None = None) -> int:
             ("nameplate", appearance.nameplate_image_url),
             ("adornment", getattr(appearance, "adornment_image_url", None)),
         ):
-            if not url:
-                continue
-
-            if bool(args.force):
-                ok, err, out_path = download_image_to_cache(
-                    url,
-                    prefix=prefix,
-                    timeout_seconds=int(args.timeout_seconds),
-                )
-                if not ok:
-                    print(f"[WARN] Download {prefix}: {err}")
-                    if bool(args.strict):
-                        had_error = True
-                else:
-                    print(f"Downloaded {prefix}: {out_path}")
-                continue
+            if url:
+                image_requests.append((str(url), prefix))
 
-            local_path = ensure_local_image_path(
-                url,
-                prefix=prefix,
-                download_enabled=True,
-                auto_refresh_hours=int(args.assets_refresh_hours),
-                timeout_seconds=int(args.timeout_seconds),
-            )
-            if not local_path:
-                print(f"[WARN] Cache {prefix}: impossible de récupérer {url}")
+    # Un seul lot pour tous les gamertags: session partagée, téléchargements concurrents,
+    # fichiers déjà en cache ignorés (sauf --force).
+    if image_requests:
+        print("\n" + "=" * 60)
+        results = download_images_to_cache(
+            image_requests,
+            concurrency=int(args.concurrency),
+            timeout_seconds=int(args.timeout_seconds),
+            refresh_hours=int(args.assets_refresh_hours),
+            force=bool(args.force),
+        )
+        for (url, prefix), (ok, err, out_path) in results.items():
+            if not ok:
+                print(f"[WARN] Download {prefix}: {err} ({url})")
                 if bool(args.strict):
                     had_error = True
             else:
-                print(f"Cached {prefix}: {local_path}")
+                print(f"Cached {prefix}: {out_path}")
 
     if had_error:
         return 1
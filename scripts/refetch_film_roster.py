@@ -26,6 +26,7 @@ Pré-requis
 - Auth headers (le plus simple):
   - SPNKR_SPARTAN_TOKEN
   - SPNKR_CLEARANCE_TOKEN
+- Ou SPNKR_API_BASE_URL: serveur local (scripts/benchmark/api_standin.py), sans tokens.
 
 Exemples
 - Extraire le roster et écrire des alias:
@@ -52,6 +53,7 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 try:
     import aiohttp
@@ -64,6 +66,18 @@ except Exception as e:  # pragma: no cover
 
 CLEARANCE_COOKIE_RE = re.compile(r"(?:^|[;\s])343-clearance=([^;\s]+)", re.IGNORECASE)
 MARKER = b"\x2d\xc0"
+API_BASE_URL_ENV = "SPNKR_API_BASE_URL"
+
+
+def _api_url(url: str) -> str:
+    """Redirige `url` vers SPNKR_API_BASE_URL si défini (même règle que api_client.py)."""
+    base = os.environ.get(API_BASE_URL_ENV, "").strip().rstrip("/")
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if not base or not host.endswith(".halowaypoint.com"):
+        return url
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{base}/{host.split('.')[0]}{parts.path}{query}"
 
 
 def _load_dotenv_if_present() -> None:
@@ -114,6 +128,8 @@ class Tokens:
 
 
 async def _get_tokens(args: argparse.Namespace) -> Tokens:
+    if os.environ.get(API_BASE_URL_ENV, "").strip():
+        return Tokens(spartan_token="standin-spartan", clearance_token="standin-clearance")
     spartan = _normalize_token_value(
         getattr(args, "spartan_token", None) or os.environ.get("SPNKR_SPARTAN_TOKEN")
     )
@@ -504,7 +520,7 @@ def _zlib_decompress(data: bytes) -> bytes:
 
 
 async def _fetch_json(session: aiohttp.ClientSession, url: str) -> Any:
-    async with session.get(url) as resp:
+    async with session.get(_api_url(url)) as resp:
         if resp.status >= 400:
             text = await resp.text()
             raise RuntimeError(f"HTTP {resp.status} on {url}: {text[:400]}")
@@ -512,7 +528,7 @@ async def _fetch_json(session: aiohttp.ClientSession, url: str) -> Any:
 
 
 async def _fetch_bytes(session: aiohttp.ClientSession, url: str) -> bytes:
-    async with session.get(url) as resp:
+    async with session.get(_api_url(url)) as resp:
         if resp.status >= 400:
             text = await resp.text()
             raise RuntimeError(f"HTTP {resp.status} on {url}: {text[:400]}")
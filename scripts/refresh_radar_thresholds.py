@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Seuils du radar de participation dans shared_matches.duckdb.
+
+La sync pousse les nouveaux matchs après chaque exécution
+(``DuckDBSyncEngine.refresh_aggregates``). Ce script reprend toutes les DBs
+joueurs d'un coup (première mise en place, joueurs non resynchronisés) puis
+recalcule ``radar_thresholds``.
+
+``--benchmark`` compare, sur des DBs joueurs synthétiques, le scan historique
+(``compute_global_radar_thresholds``) et la lecture de la table précalculée.
+
+Usage:
+    python scripts/refresh_radar_thresholds.py
+    python scripts/refresh_radar_thresholds.py --show
+    python scripts/refresh_radar_thresholds.py --benchmark 5 20 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import duckdb  # noqa: E402
+
+from src.data.infrastructure.database.snapshots import publish_written  # noqa: E402
+from src.data.sync.radar_thresholds import (  # noqa: E402
+    RADAR_THRESHOLDS_TABLE,
+    backfill_radar_totals,
+)
+from src.utils.paths import PLAYERS_DIR, WAREHOUSE_DIR  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+_PAIRS = ("Arena:Slayer", "Arena:CTF", "Ranked:Oddball", "BTB:CTF", "Firefight:King")
+_CATEGORIES = ("kill", "assist", "objective", "vehicle", "penalty")
+
+
+def _create_synthetic_player(db_path: Path, xuid: str, n_matches: int, seed: int) -> None:
+    """Crée une DB joueur minimale (match_stats + personal_score_awards)."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    pairs = ", ".join(f"'{p}'" for p in _PAIRS)
+    categories = ", ".join(f"'{c}'" for c in _CATEGORIES)
+    conn = duckdb.connect(str(db_path))
+    try:
+        conn.execute(f"SELECT setseed({(seed % 1000) / 1000})")
+        conn.execute(f"""
+            CREATE TABLE match_stats AS
+            SELECT '{xuid}-m' || i AS match_id,
+                   ([{pairs}])[1 + CAST(floor(random() * {len(_PAIRS)}) AS INTEGER)] AS pair_name,
+                   CAST(300 + random() * 600 AS INTEGER) AS time_played_seconds
+            FROM range({n_matches}) t(i)
+            """)
+        conn.execute(f"""
+            CREATE TABLE personal_score_awards AS
+            SELECT m.match_id, '{xuid}' AS xuid, 'award-' || j AS award_name,
+                   ([{categories}])[1 + CAST(floor(random() * {len(_CATEGORIES)}) AS INTEGER)]
+                       AS award_category,
+                   1 AS award_count,
+                   CAST(random() * 450 - 50 AS INTEGER) AS award_score
+            FROM match_stats m, range(12) a(j)
+            """)
+    finally:
+        conn.close()
+
+
+def run_benchmark(player_counts: list[int], matches_per_player: int) -> None:
+    """Compare scan des DBs joueurs vs lecture de radar_thresholds."""
+    import src.visualization.participation_radar as radar
+
+    for n_players in player_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            players = Path(tmp) / "players"
+            for i in range(n_players):
+                _create_synthetic_player(
+                    players / f"player{i}" / "stats.duckdb", f"x{i}", matches_per_player, i
+                )
+            shared_path = Path(tmp) / "warehouse" / "shared_matches.duckdb"
+            shared_path.parent.mkdir()
+
+            radar._global_thresholds_cache = None
+            t0 = time.perf_counter()
+            legacy = radar.compute_global_radar_thresholds(players)
+            scan_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            conn = duckdb.connect(str(shared_path))
+            backfill_radar_totals(conn, players)
+            conn.close()
+            backfill_ms = (time.perf_counter() - t0) * 1000
+
+            radar._shared_thresholds_cache.clear()
+            t0 = time.perf_counter()
+            shared = radar.load_shared_radar_thresholds(shared_path)
+            read_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            radar.load_shared_radar_thresholds(shared_path)
+            cached_us = (time.perf_counter() - t0) * 1e6
+
+            same = shared is not None and all(abs(shared[k] - legacy[k]) < 1e-6 for k in legacy)
+            logger.info(
+                f"{n_players:>3} DBs : scan {scan_ms:8.1f} ms | lecture shared {read_ms:6.1f} ms "
+                f"(cache {cached_us:5.0f} µs) | backfill unique {backfill_ms:8.1f} ms | "
+                f"seuils identiques: {same}"
+            )
+            radar._global_thresholds_cache = None
+            radar._shared_thresholds_cache.clear()
+
+
+def main() -> int:
+    """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(
+        description="Reconstruit les seuils du radar dans shared_matches.duckdb"
+    )
+    parser.add_argument(
+        "--players",
+        type=Path,
+        default=PLAYERS_DIR,
+        help=f"Dossier des DBs joueurs (défaut: {PLAYERS_DIR})",
+    )
+    parser.add_argument(
+        "--shared",
+        type=Path,
+        default=WAREHOUSE_DIR / "shared_matches.duckdb",
+        help="Chemin de shared_matches.duckdb",
+    )
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="Afficher les seuils stockés sans recalculer",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="Benchmark sur N DBs joueurs synthétiques (ex. 5 20 50)",
+    )
+    parser.add_argument(
+        "--matches",
+        type=int,
+        default=1000,
+        help="Matchs par joueur synthétique pour --benchmark (défaut: 1000)",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.matches)
+        return 0
+
+    if not args.shared.exists():
+        logger.error(f"shared_matches.duckdb introuvable: {args.shared}")
+        return 1
+
+    conn = duckdb.connect(str(args.shared), read_only=args.show)
+    try:
+        if not args.show:
+            added = backfill_radar_totals(conn, args.players)
+            for player, n in added.items():
+                logger.info(f"{player}: {n} matchs ajoutés")
+            publish_written((args.shared, conn))
+        rows = conn.execute(
+            f"SELECT key, max_value, p99_value, sample_size FROM {RADAR_THRESHOLDS_TABLE} "
+            "ORDER BY key"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    for key, max_value, p99_value, sample in rows:
+        logger.info(f"{key:<20} max={max_value} p99={p99_value} (n={sample})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Index de co-présence des joueurs (teammate_pairs) dans shared_matches.duckdb.
+
+La sync met l'index à jour à chaque insertion de participants et rattrape les
+matchs non indexés à l'ouverture de shared. Ce script le reconstruit de zéro
+(première mise en place, participants réécrits hors sync, index compacté).
+
+``--benchmark`` compare, sur un dataset synthétique, l'auto-jointure de
+match_participants et la lecture de l'index pour les requêtes coéquipiers.
+
+Usage:
+    python scripts/refresh_teammate_index.py
+    python scripts/refresh_teammate_index.py --show 2533274800000000
+    python scripts/refresh_teammate_index.py --benchmark 2000 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import duckdb  # noqa: E402
+
+from src.data.infrastructure.database.snapshots import publish_written  # noqa: E402
+from src.data.infrastructure.database.teammate_index import (  # noqa: E402
+    TEAMMATE_ORDINALS_TABLE,
+    TEAMMATE_PAIRS_TABLE,
+    matches_with_sql,
+    rebuild_teammate_index,
+    top_teammates_sql,
+)
+from src.utils.paths import WAREHOUSE_DIR  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+_SELF_JOIN_TOP_SQL = """
+    SELECT mp2.xuid, COUNT(DISTINCT mp2.match_id) AS match_count
+    FROM match_participants mp1
+    JOIN match_participants mp2
+      ON mp1.match_id = mp2.match_id AND mp1.xuid != mp2.xuid AND mp1.team_id = mp2.team_id
+    WHERE mp1.xuid = ?
+    GROUP BY mp2.xuid
+    ORDER BY match_count DESC
+    LIMIT ?
+"""
+
+_SELF_JOIN_SAME_TEAM_SQL = """
+    SELECT DISTINCT me.match_id
+    FROM match_participants me
+    JOIN match_participants tm ON me.match_id = tm.match_id AND me.team_id = tm.team_id
+    WHERE me.xuid = ? AND tm.xuid = ?
+    ORDER BY me.match_id DESC
+"""
+
+
+def _best_ms(conn: duckdb.DuckDBPyConnection, sql: str, params: list, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+def run_benchmark(match_counts: list[int]) -> None:
+    """Compare auto-jointure et index sur des datasets synthétiques."""
+    from scripts.benchmark.synthetic import SyntheticSpec, generate_dataset, tracked_xuid
+
+    for n_matches in match_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            dataset = generate_dataset(Path(tmp), SyntheticSpec(matches=n_matches, players=2))
+            conn = duckdb.connect(str(dataset.shared_db_path))
+            try:
+                t0 = time.perf_counter()
+                rebuild_teammate_index(conn)
+                build_ms = (time.perf_counter() - t0) * 1000
+
+                xuid = str(tracked_xuid(0))
+                top = conn.execute(top_teammates_sql("main"), [xuid, 20]).fetchall()
+                friend = top[0][0] if top else xuid
+                join_top = _best_ms(conn, _SELF_JOIN_TOP_SQL, [xuid, 20])
+                index_top = _best_ms(conn, top_teammates_sql("main"), [xuid, 20])
+                join_with = _best_ms(conn, _SELF_JOIN_SAME_TEAM_SQL, [xuid, friend])
+                index_with = _best_ms(
+                    conn, matches_with_sql("main", same_team_only=True), [xuid, friend]
+                )
+                same = conn.execute(_SELF_JOIN_SAME_TEAM_SQL, [xuid, friend]).fetchall() == (
+                    conn.execute(
+                        matches_with_sql("main", same_team_only=True), [xuid, friend]
+                    ).fetchall()
+                )
+            finally:
+                conn.close()
+            logger.info(
+                f"{n_matches:>7} matchs : top coéquipiers {join_top:7.2f} → {index_top:6.2f} ms | "
+                f"avec ami {join_with:7.2f} → {index_with:6.2f} ms | "
+                f"construction {build_ms:8.1f} ms | résultats identiques: {same}"
+            )
+
+
+def main() -> int:
+    """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(
+        description="Reconstruit l'index des coéquipiers dans shared_matches.duckdb"
+    )
+    parser.add_argument(
+        "--shared",
+        type=Path,
+        default=WAREHOUSE_DIR / "shared_matches.duckdb",
+        help="Chemin de shared_matches.duckdb",
+    )
+    parser.add_argument(
+        "--show",
+        metavar="XUID",
+        help="Afficher les coéquipiers indexés d'un joueur sans reconstruire",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="Benchmark sur des datasets synthétiques de N matchs (ex. 2000 20000)",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return 0
+
+    if not args.shared.exists():
+        logger.error(f"shared_matches.duckdb introuvable: {args.shared}")
+        return 1
+
+    conn = duckdb.connect(str(args.shared), read_only=bool(args.show))
+    try:
+        if args.show:
+            for xuid, count in conn.execute(top_teammates_sql("main"), [args.show, 20]).fetchall():
+                logger.info(f"{xuid:<20} {count:>6} matchs")
+            return 0
+        t0 = time.perf_counter()
+        indexed = rebuild_teammate_index(conn)
+        conn.execute("CHECKPOINT")
+        publish_written((args.shared, conn))
+        pairs = conn.execute(f"SELECT COUNT(*) FROM {TEAMMATE_PAIRS_TABLE}").fetchone()[0]
+        ordinals = conn.execute(f"SELECT COUNT(*) FROM {TEAMMATE_ORDINALS_TABLE}").fetchone()[0]
+    finally:
+        conn.close()
+
+    logger.info(
+        f"{indexed} matchs indexés ({ordinals} ordinaux, {pairs} paires) "
+        f"en {time.perf_counter() - t0:.1f} s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
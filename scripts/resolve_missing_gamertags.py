@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Résout les XUIDs manquants vers gamertags via l'API SPNKr.
 
-Ce script utilise `client.profile.get_users_by_id()` pour résoudre
-les XUIDs qui n'ont pas de gamertag dans xuid_aliases.
+Passe globale : les XUIDs sans alias sont collectés dans toutes les DBs
+joueurs et dans shared_matches.duckdb, dédupliqués, complétés par les aliases
+déjà connus dans une autre DB, puis seuls les inconnus sont résolus via
+`client.profile.get_users_by_id()` (batches et concurrence adaptatifs).
+Les aliases sont écrits en bloc, une transaction par DB.
 
 Usage:
     # Pour un joueur
@@ -64,11 +67,13 @@ try:
 except Exception:
     pass
 
-try:
-    import duckdb
-except ImportError:
-    print("Error: duckdb not installed")
-    sys.exit(1)
+from src.data.sync.gamertag_resolution import (  # noqa: E402
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    GamertagResolver,
+    collect_alias_gaps,
+    write_aliases,
+)
 
 # Setup logging
 logging.basicConfig(
@@ -81,184 +86,30 @@ logger = logging.getLogger(__name__)
 # Paths
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 PLAYERS_DIR = DATA_DIR / "players"
+SHARED_DB_PATH = DATA_DIR / "warehouse" / "shared_matches.duckdb"
 
 
-def is_valid_xuid(xuid: str) -> bool:
-    """Vérifie si un XUID est valide (16 chiffres)."""
-    if not xuid:
-        return False
-    # XUID valide = 16-20 chiffres (format Xbox Live)
-    return xuid.isdigit() and 10 <= len(xuid) <= 20
-
-
-def find_missing_xuids(db_path: Path, limit: int | None = None) -> list[str]:
-    """Trouve les XUIDs sans gamertag dans xuid_aliases."""
-    conn = duckdb.connect(str(db_path), read_only=True)
-
-    try:
-        # XUIDs dans match_participants sans alias
-        query = """
-            SELECT DISTINCT mp.xuid
-            FROM match_participants mp
-            LEFT JOIN xuid_aliases xa ON mp.xuid = xa.xuid
-            WHERE xa.xuid IS NULL
-              AND mp.xuid IS NOT NULL
-              AND mp.xuid != ''
-        """
-
-        result = conn.execute(query).fetchall()
-        # Filtrer les XUIDs valides
-        valid_xuids = [row[0] for row in result if is_valid_xuid(row[0])]
-
-        if limit:
-            return valid_xuids[:limit]
-        return valid_xuids
-    finally:
-        conn.close()
-
-
-async def resolve_xuids_batch(
+async def resolve_xuids(
     xuids: list[str],
-    batch_size: int = 20,  # Réduit pour éviter rate limiting
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> dict[str, str]:
     """Résout une liste de XUIDs vers gamertags via SPNKr."""
     from src.data.sync.api_client import SPNKrAPIClient
 
-    resolved: dict[str, str] = {}
-
-    async with SPNKrAPIClient(requests_per_second=1) as api_client:
-        client = api_client.client
-
-        # Traiter par batches
-        total_batches = (len(xuids) + batch_size - 1) // batch_size
-        for i in range(0, len(xuids), batch_size):
-            batch = xuids[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-
-            retries = 3
-            for attempt in range(retries):
-                try:
-                    logger.info(f"  Batch {batch_num}/{total_batches}: {len(batch)} XUIDs...")
-                    resp = await client.profile.get_users_by_id(batch)
-
-                    # Extraire les données
-                    if hasattr(resp, "data"):
-                        users = resp.data
-                    else:
-                        users = await resp.parse()
-
-                    count = 0
-                    for user in users:
-                        xuid = str(getattr(user, "xuid", "") or "").strip()
-                        gamertag = str(getattr(user, "gamertag", "") or "").strip()
-                        if xuid and gamertag:
-                            resolved[xuid] = gamertag
-                            count += 1
-
-                    logger.info(f"    Resolu {count} gamertags")
-                    break  # Succès, sortir de la boucle retry
-
-                except Exception as e:
-                    err_str = str(e)
-                    if "429" in err_str and attempt < retries - 1:
-                        wait_time = 10 * (attempt + 1)  # 10s, 20s, 30s
-                        logger.warning(f"    Rate limited, attente {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.warning(f"    Erreur batch {batch_num}: {e}")
-                        break
-
-            # Pause entre batches (2 secondes)
-            await asyncio.sleep(2)
-
+    async with SPNKrAPIClient(requests_per_second=2) as api_client:
+        resolver = GamertagResolver(
+            api_client.client, batch_size=batch_size, concurrency=concurrency
+        )
+        resolved = await resolver.resolve(xuids)
+    logger.info(
+        f"  {resolver.requests} requêtes, {resolver.rate_limited} rate limit(s), "
+        f"batch final={resolver.batch_size}"
+    )
     return resolved
 
 
-def insert_aliases(db_path: Path, aliases: dict[str, str], dry_run: bool = False) -> int:
-    """Insère les aliases résolus dans DuckDB."""
-    if dry_run or not aliases:
-        return len(aliases)
-
-    conn = duckdb.connect(str(db_path))
-    inserted = 0
-
-    try:
-        for xuid, gamertag in aliases.items():
-            try:
-                existing = conn.execute(
-                    "SELECT gamertag FROM xuid_aliases WHERE xuid = ?", [xuid]
-                ).fetchone()
-
-                if not existing:
-                    conn.execute(
-                        """
-                        INSERT INTO xuid_aliases (xuid, gamertag, source, updated_at)
-                        VALUES (?, ?, 'api_resolve', NOW())
-                        """,
-                        [xuid, gamertag],
-                    )
-                    inserted += 1
-            except Exception:
-                pass
-    finally:
-        conn.close()
-
-    return inserted
-
-
-def resolve_for_player(
-    gamertag: str,
-    dry_run: bool = False,
-    limit: int | None = None,
-) -> dict:
-    """Résout les gamertags manquants pour un joueur."""
-    result = {
-        "gamertag": gamertag,
-        "missing_xuids": 0,
-        "resolved": 0,
-        "inserted": 0,
-        "errors": [],
-    }
-
-    db_path = PLAYERS_DIR / gamertag / "stats.duckdb"
-    if not db_path.exists():
-        result["errors"].append(f"DB non trouvée: {db_path}")
-        return result
-
-    # Trouver les XUIDs manquants
-    missing = find_missing_xuids(db_path, limit=limit)
-    result["missing_xuids"] = len(missing)
-
-    if not missing:
-        logger.info(f"  Aucun XUID manquant pour {gamertag}")
-        return result
-
-    logger.info(f"  {len(missing)} XUIDs sans gamertag")
-
-    if dry_run:
-        logger.info(f"  [DRY-RUN] Résolution de {len(missing)} XUIDs...")
-        result["resolved"] = len(missing)
-        return result
-
-    # Résoudre via API
-    try:
-        resolved = asyncio.run(resolve_xuids_batch(missing))
-        result["resolved"] = len(resolved)
-        logger.info(f"  {len(resolved)}/{len(missing)} XUIDs résolus")
-
-        # Insérer dans la DB
-        if resolved:
-            inserted = insert_aliases(db_path, resolved, dry_run=dry_run)
-            result["inserted"] = inserted
-            logger.info(f"  {inserted} aliases insérés")
-
-    except Exception as e:
-        result["errors"].append(str(e))
-        logger.error(f"  Erreur: {e}")
-
-    return result
-
-
 def find_all_players() -> list[str]:
     """Trouve tous les joueurs avec DuckDB."""
     players = []
@@ -280,6 +131,23 @@ def main():
     parser.add_argument("--all", "-a", action="store_true", help="Tous les joueurs")
     parser.add_argument("--dry-run", "-n", action="store_true", help="Mode simulation")
     parser.add_argument("--limit", "-l", type=int, help="Limiter le nombre de XUIDs")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Taille initiale des batches API (défaut: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Requêtes API simultanées max (défaut: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--no-shared",
+        action="store_true",
+        help="Ignorer shared_matches.duckdb",
+    )
 
     args = parser.parse_args()
 
@@ -296,36 +164,49 @@ def main():
     else:
         players = [args.gamertag]
 
-    # Traiter chaque joueur
-    total_resolved = 0
-    total_inserted = 0
-
-    for i, player in enumerate(players, 1):
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info(f"[{i}/{len(players)}] {player}")
-        logger.info("=" * 60)
-
-        result = resolve_for_player(
-            player,
-            dry_run=args.dry_run,
-            limit=args.limit,
-        )
-
-        total_resolved += result["resolved"]
-        total_inserted += result["inserted"]
+    db_paths = []
+    for player in players:
+        db_path = PLAYERS_DIR / player / "stats.duckdb"
+        if db_path.exists():
+            db_paths.append(db_path)
+        else:
+            logger.error(f"DB non trouvée: {db_path}")
+    shared = None if args.no_shared or not SHARED_DB_PATH.exists() else SHARED_DB_PATH
+
+    # Collecte globale (une requête sur toutes les DBs)
+    gaps = collect_alias_gaps(db_paths, shared_db_path=shared)
+    for db_path, missing in sorted(gaps.missing_by_db.items()):
+        logger.info(f"  {db_path.parent.name}: {len(missing)} XUIDs sans gamertag")
+
+    to_resolve = gaps.to_resolve
+    if args.limit:
+        to_resolve = to_resolve[: args.limit]
+    logger.info(
+        f"{len(gaps.known)} XUIDs connus dans une autre DB, {len(to_resolve)} à résoudre via l'API"
+    )
 
-        for err in result["errors"]:
-            logger.error(f"  Erreur: {err}")
+    prefix = "[DRY-RUN] " if args.dry_run else ""
+    resolved: dict[str, str] = {}
+    if to_resolve and not args.dry_run:
+        try:
+            resolved = asyncio.run(
+                resolve_xuids(to_resolve, batch_size=args.batch_size, concurrency=args.concurrency)
+            )
+        except Exception as e:
+            logger.error(f"Erreur résolution: {e}")
+        logger.info(f"{len(resolved)}/{len(to_resolve)} XUIDs résolus")
+
+    written = write_aliases(gaps, resolved, dry_run=args.dry_run)
+    for db_path, count in sorted(written.items()):
+        logger.info(f"  {prefix}{db_path.parent.name}: {count} aliases écrits")
 
     # Résumé
     logger.info("")
     logger.info("=" * 60)
     logger.info("RÉSUMÉ")
     logger.info("=" * 60)
-    prefix = "[DRY-RUN] " if args.dry_run else ""
-    logger.info(f"{prefix}XUIDs résolus: {total_resolved}")
-    logger.info(f"{prefix}Aliases insérés: {total_inserted}")
+    logger.info(f"{prefix}XUIDs résolus: {len(to_resolve) if args.dry_run else len(resolved)}")
+    logger.info(f"{prefix}Aliases insérés: {sum(written.values())}")
 
 
 if __name__ == "__main__":
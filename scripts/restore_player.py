@@ -4,10 +4,15 @@
 Restaure les données d'un backup Parquet vers une DB DuckDB.
 Supporte la restauration complète ou sélective.
 
+Si le dossier contient ``backup_manifest.json`` (backups incrémentaux), chaque
+table est reconstruite en rejouant sa base puis ses deltas ; ``--verify``
+contrôle les checksums et l'empreinte du contenu restauré.
+
 Usage:
     python scripts/restore_player.py --gamertag Chocoboflor --backup ./backups/Chocoboflor
     python scripts/restore_player.py --gamertag JGtm --backup ./backups/JGtm --tables match_stats,medals_earned
     python scripts/restore_player.py --gamertag Chocoboflor --backup ./backups/Chocoboflor --dry-run
+    python scripts/restore_player.py --gamertag Chocoboflor --backup ./backups/Chocoboflor --verify
 """
 
 from __future__ import annotations
@@ -97,6 +102,109 @@ def list_backup_tables(backup_dir: Path) -> list[tuple[str, str, int]]:
     return sorted(tables, key=lambda x: x[0])
 
 
+def _restore_from_manifest(
+    gamertag: str,
+    backup_dir: Path,
+    manifest,
+    *,
+    tables: list[str] | None,
+    replace: bool,
+    dry_run: bool,
+    backup_id: str | None,
+) -> tuple[bool, str, dict]:
+    """Restaure une chaîne de backups incrémentaux (base + deltas par table)."""
+    import duckdb
+
+    from src.data.infrastructure.database.backup import restore_table, verify_chain
+    from src.data.infrastructure.database.snapshots import publish_written
+
+    target = manifest.get(backup_id) if backup_id else manifest.latest
+    if target is None:
+        return False, f"Backup {backup_id} introuvable dans {backup_dir}", {}
+
+    selected = list(target.tables)
+    if tables:
+        tables_lower = {t.lower() for t in tables}
+        selected = [t for t in selected if t.lower() in tables_lower]
+        if not selected:
+            return False, f"Tables spécifiées non trouvées: {tables}", {}
+
+    logger.info(f"Backup {target.id} ({target.kind}): {len(selected)} tables")
+    chains = {t: manifest.table_chain(t, target.id) for t in selected}
+    stats = {"tables_restored": {}, "total_rows": 0}
+
+    db_path = get_player_db_path(gamertag, create_parent=True)
+    if dry_run:
+        logger.info("=== MODE DRY-RUN (simulation) ===")
+        logger.info(f"Destination: {db_path}")
+        for table_name, chain in chains.items():
+            logger.info(
+                f"  Restaurerait: {table_name} (base + {max(len(chain) - 1, 0)} delta(s), "
+                f"{target.tables[table_name].total_rows} lignes)"
+            )
+        return True, f"Dry-run: {len(chains)} tables seraient restaurées", stats
+
+    errors = verify_chain(backup_dir, target.id)
+    if errors:
+        for err in errors:
+            logger.error(f"  {err}")
+        return False, f"Chaîne de backup corrompue ({len(errors)} erreur(s))", stats
+
+    try:
+        conn = duckdb.connect(str(db_path), read_only=False)
+        try:
+            existing = {
+                r[0]
+                for r in conn.execute(
+                    "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
+                ).fetchall()
+            }
+            for table_name, chain in chains.items():
+                if not chain:
+                    logger.warning(f"  {table_name}: aucune base complète, skip")
+                    continue
+                if table_name in existing and not replace:
+                    logger.info(
+                        f"  {table_name}: table existante conservée (--replace pour écraser)"
+                    )
+                    continue
+
+                # Reconstruction dans une table de travail puis bascule
+                staging = f"_restore_{table_name}"
+                row_count = restore_table(conn, table_name, backup_dir, chain, target_table=staging)
+                conn.execute("BEGIN TRANSACTION")
+                conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{table_name}"')
+                conn.execute("COMMIT")
+
+                stats["tables_restored"][table_name] = {
+                    "rows": row_count,
+                    "columns": chain[-1].columns,
+                    "deltas": len(chain) - 1,
+                }
+                stats["total_rows"] += row_count
+                logger.info(
+                    f"  {table_name}: {row_count} lignes restaurées "
+                    f"(base + {len(chain) - 1} delta(s))"
+                )
+            # Sinon l'UI continue de servir le snapshot d'avant la restauration
+            publish_written((db_path, conn))
+        finally:
+            conn.close()
+    except Exception as e:
+        msg = f"Erreur restauration {gamertag}: {e}"
+        logger.error(msg)
+        return False, msg, stats
+
+    msg = (
+        f"Restauration {gamertag}: "
+        f"{len(stats['tables_restored'])} tables, "
+        f"{stats['total_rows']} lignes total"
+    )
+    logger.info(msg)
+    return True, msg, stats
+
+
 def restore_player(
     gamertag: str,
     backup_dir: Path,
@@ -104,6 +212,7 @@ def restore_player(
     tables: list[str] | None = None,
     replace: bool = False,
     dry_run: bool = False,
+    backup_id: str | None = None,
 ) -> tuple[bool, str, dict]:
     """Restaure les données d'un joueur depuis un backup Parquet.
 
@@ -113,12 +222,28 @@ def restore_player(
         tables: Liste des tables à restaurer (None = toutes).
         replace: Si True, remplace les données existantes.
         dry_run: Si True, simule sans écrire.
+        backup_id: Backup de la chaîne à restaurer (None = le plus récent).
 
     Returns:
         Tuple (success, message, stats).
     """
     import duckdb
 
+    from src.data.infrastructure.database.backup import BackupManifest
+    from src.data.infrastructure.database.snapshots import publish_written
+
+    manifest = BackupManifest.load(backup_dir) if backup_dir.exists() else None
+    if manifest is not None and manifest.backups:
+        return _restore_from_manifest(
+            gamertag,
+            backup_dir,
+            manifest,
+            tables=tables,
+            replace=replace,
+            dry_run=dry_run,
+            backup_id=backup_id,
+        )
+
     backup_path, metadata = find_latest_backup(backup_dir)
     if not backup_path:
         return False, f"Backup non trouvé dans {backup_dir}", {}
@@ -190,6 +315,7 @@ def restore_player(
 
             logger.info(f"  {table_name}: {row_count} lignes restaurées")
 
+        publish_written((db_path, conn))
         conn.close()
 
         msg = (
@@ -264,13 +390,45 @@ Notes:
         action="store_true",
         help="Lister les tables disponibles dans le backup et quitter",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Vérifier checksums et contenu du backup (sans restaurer) et quitter",
+    )
+    parser.add_argument(
+        "--backup-id",
+        type=str,
+        default=None,
+        help="Identifiant du backup à restaurer (défaut: le plus récent)",
+    )
 
     args = parser.parse_args()
 
     backup_dir = Path(args.backup)
 
+    if args.verify:
+        from src.data.infrastructure.database.backup import verify_backup
+
+        errors = verify_backup(backup_dir, args.backup_id)
+        for err in errors:
+            logger.error(f"  {err}")
+        if errors:
+            logger.error(f"Vérification échouée: {len(errors)} erreur(s)")
+            return 1
+        logger.info(f"Backup vérifié: {backup_dir}")
+        return 0
+
     # Lister les tables
     if args.list:
+        from src.data.infrastructure.database.backup import BackupManifest, describe_chain
+
+        manifest = BackupManifest.load(backup_dir) if backup_dir.exists() else None
+        if manifest is not None:
+            logger.info(f"Chaîne de backups dans {backup_dir}:")
+            for b in describe_chain(manifest):
+                logger.info(f"  - {b['id']} ({b['kind']}): {b['rows_written']} lignes écrites")
+            return 0
+
         tables = list_backup_tables(backup_dir)
         if tables:
             logger.info(f"Tables disponibles dans {backup_dir}:")
@@ -296,6 +454,7 @@ Notes:
         tables=tables,
         replace=args.replace,
         dry_run=args.dry_run,
+        backup_id=args.backup_id,
     )
 
     return 0 if ok else 1
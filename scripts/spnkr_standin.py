@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Serveur local imitant les services Halo Infinite (sync / backfill hors ligne).
+
+Mode serveur : sert N matchs générés (ou enregistrés) jusqu'à Ctrl+C ; pointer
+ensuite la sync ou le backfill dessus avec SPNKR_API_BASE_URL.
+Mode --load-test : démarre le serveur in-process et mesure une sync complète
+dans un dossier de données temporaire.
+
+Usage:
+    python scripts/spnkr_standin.py --matches 10000 --port 8765
+    SPNKR_API_BASE_URL=http://127.0.0.1:8765 python scripts/sync.py --gamertag SynPlayer0
+    python scripts/spnkr_standin.py --matches 500 --latency-ms 80 --latency-sigma 0.4 \\
+        --rate-429 0.02 --rate-5xx 0.01 --load-test --rps 50 --parallel 8
+    python scripts/spnkr_standin.py --recorded-dir data/recorded --gamertag Chocoboflor \\
+        --xuid 2533274823110022
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.benchmark.api_standin import (  # noqa: E402
+    FaultProfile,
+    RecordedPayloads,
+    StandinServer,
+    SyntheticPayloads,
+)
+from scripts.benchmark.synthetic import tracked_xuid  # noqa: E402
+
+
+async def _serve(payloads: SyntheticPayloads, faults: FaultProfile, port: int) -> None:
+    async with StandinServer(payloads, faults, port=port) as server:
+        print(f"🛰️  Stand-in SPNKr : {payloads.matches} matchs pour {payloads.gamertag}")
+        print(f"   export SPNKR_API_BASE_URL={server.base_url}")
+        print(f"   compteurs : {server.base_url}/_standin/stats")
+        await asyncio.Event().wait()
+
+
+def main() -> int:
+    """Point d'entrée du serveur stand-in."""
+    parser = argparse.ArgumentParser(description="Stand-in local des services Halo (SPNKr)")
+    parser.add_argument(
+        "--matches", type=int, default=1000, help="Matchs générés dans l'historique"
+    )
+    parser.add_argument("--gamertag", type=str, default="SynPlayer0", help="Joueur servi")
+    parser.add_argument("--xuid", type=str, default=tracked_xuid(0), help="XUID du joueur servi")
+    parser.add_argument("--seed", type=int, default=42, help="Graine de génération")
+    parser.add_argument(
+        "--recorded-dir", type=str, help="JSON MatchStats enregistrés (<match_id>.json)"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Port d'écoute (mode serveur)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latence médiane")
+    parser.add_argument(
+        "--latency-sigma", type=float, default=0.0, help="Dispersion log-normale de la latence"
+    )
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probabilité de 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Probabilité de 5xx")
+    parser.add_argument("--bandwidth-kbps", type=float, help="Débit sortant max (ko/s)")
+    parser.add_argument("--load-test", action="store_true", help="Mesure une sync complète")
+    parser.add_argument("--data-dir", type=str, help="Dossier de données du load test (vide)")
+    parser.add_argument("--rps", type=int, default=10, help="requests_per_second de la sync")
+    parser.add_argument("--parallel", type=int, default=5, help="parallel_matches de la sync")
+    parser.add_argument("--trace-dir", type=str, help="Traces par étape du load test")
+    parser.add_argument("--output", "-o", type=str, help="Rapport JSON du load test")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    if args.recorded_dir:
+        payloads = RecordedPayloads(
+            args.recorded_dir, gamertag=args.gamertag, xuid=args.xuid, seed=args.seed
+        )
+    else:
+        payloads = SyntheticPayloads(
+            matches=args.matches, gamertag=args.gamertag, xuid=args.xuid, seed=args.seed
+        )
+    faults = FaultProfile(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        bandwidth_bytes_per_s=args.bandwidth_kbps * 1000 if args.bandwidth_kbps else None,
+        seed=args.seed,
+    )
+
+    if not args.load_test:
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(_serve(payloads, faults, args.port))
+        return 0
+
+    from scripts.benchmark.sync_load import run_sync_load
+
+    root = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="standin_"))
+    if (root / "warehouse" / "shared_matches.duckdb").exists():
+        print(f"❌ {root} contient déjà des données : le load test exige un dossier vide")
+        return 1
+
+    print(f"🧪 Load test : {payloads.matches} matchs → {root}")
+    report = asyncio.run(
+        run_sync_load(
+            root,
+            payloads,
+            faults,
+            parallel_matches=args.parallel,
+            requests_per_second=args.rps,
+            trace_dir=args.trace_dir,
+        )
+    )
+    result = report["result"]
+    server = report["server"]
+    print(
+        f"   {result['matches_inserted']} matchs en {report['elapsed_seconds']:.1f}s "
+        f"({report['matches_per_second']} matchs/s)"
+    )
+    print(
+        f"   requêtes : {server.get('requests', 0)} — 429 : {server.get('status:429', 0)}, "
+        f"5xx : {sum(v for k, v in server.items() if k.startswith('status:5'))}"
+    )
+    if result.get("errors"):
+        print(f"   ⚠️ erreurs : {result['errors'][:5]}")
+
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Rapport sauvegardé: {out_path}")
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Rapport d'une trace de sync / backfill (src/data/sync/tracing.py).
+
+Lit un fichier JSONL écrit avec ``OPENSPARTAN_TRACE_DIR`` et affiche :
+- par étape : nombre de matchs, appels, total, p50/p90/p99 par match
+- les étapes hors match (refresh MV, scores, publication…)
+- les matchs les plus lents avec leur étape dominante
+
+Usage:
+    OPENSPARTAN_TRACE_DIR=data/traces python scripts/sync.py --delta
+    python scripts/trace_report.py data/traces/sync_20250601T200000_000000.jsonl
+    python scripts/trace_report.py data/traces/ --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def load_trace(path: Path) -> list[dict[str, Any]]:
+    """Lignes JSONL d'une trace (un dossier = trace la plus récente)."""
+    if path.is_dir():
+        candidates = sorted(path.glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+        if not candidates:
+            raise FileNotFoundError(f"Aucune trace .jsonl dans {path}")
+        path = candidates[-1]
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentile par interpolation linéaire (0 pour une liste vide)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def stage_summary(records: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """Statistiques par étape sur les lignes ``match`` (secondes par match)."""
+    per_stage: dict[str, list[float]] = {}
+    calls: dict[str, int] = {}
+    for record in records:
+        if record.get("type") != "match":
+            continue
+        per_stage.setdefault("match", []).append(record.get("total_seconds", 0.0))
+        for stage, values in record.get("stages", {}).items():
+            per_stage.setdefault(stage, []).append(values["seconds"])
+            calls[stage] = calls.get(stage, 0) + values["count"]
+    return {
+        stage: {
+            "matches": len(values),
+            "calls": calls.get(stage, len(values)),
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+        }
+        for stage, values in per_stage.items()
+    }
+
+
+def slowest_matches(records: list[dict[str, Any]], top: int) -> list[tuple[str, float, str]]:
+    """(match_id, durée totale, étape dominante) des `top` matchs les plus lents."""
+    matches = [r for r in records if r.get("type") == "match"]
+    matches.sort(key=lambda r: r.get("total_seconds", 0.0), reverse=True)
+    result = []
+    for record in matches[:top]:
+        stages = record.get("stages", {})
+        dominant = max(stages, key=lambda s: stages[s]["seconds"], default="-")
+        result.append((record["match_id"], record.get("total_seconds", 0.0), dominant))
+    return result
+
+
+def main() -> int:
+    """Point d'entrée du rapport."""
+    parser = argparse.ArgumentParser(description="Rapport d'une trace de sync / backfill")
+    parser.add_argument("trace", help="Fichier .jsonl (ou dossier : trace la plus récente)")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de matchs lents affichés")
+    args = parser.parse_args()
+
+    try:
+        records = load_trace(Path(args.trace))
+    except (OSError, ValueError) as e:
+        print(f"Trace illisible: {e}")
+        return 1
+
+    run = next((r for r in records if r.get("type") == "run"), {})
+    print("=" * 78)
+    attrs = ", ".join(
+        f"{k}={v}" for k, v in run.items() if k not in ("type", "kind", "duration_seconds")
+    )
+    print(f"  TRACE {run.get('kind', '?')} — {attrs}")
+    print(f"  Durée totale : {run.get('duration_seconds', 0.0):.2f}s")
+    print("=" * 78)
+
+    summary = stage_summary(records)
+    if summary:
+        print(
+            f"  {'étape':<22}{'matchs':>7}{'appels':>8}{'total s':>10}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+        )
+        ordered = sorted(summary.items(), key=lambda item: item[1]["total"], reverse=True)
+        for stage, s in ordered:
+            print(
+                f"  {stage:<22}{s['matches']:>7}{s['calls']:>8}{s['total']:>10.2f}"
+                f"{s['p50'] * 1000:>9.1f}{s['p90'] * 1000:>9.1f}{s['p99'] * 1000:>9.1f}"
+            )
+
+    run_stages = [r for r in records if r.get("type") == "stage"]
+    if run_stages:
+        print("\n  Étapes hors match :")
+        for record in sorted(run_stages, key=lambda r: r["seconds"], reverse=True):
+            print(f"  {record['stage']:<22}{record['count']:>15}{record['seconds']:>10.2f}")
+
+    slowest = slowest_matches(records, args.top)
+    if slowest:
+        print(f"\n  {len(slowest)} match(s) les plus lents :")
+        for match_id, seconds, dominant in slowest:
+            print(f"  {match_id:<40}{seconds * 1000:>10.1f} ms  ({dominant})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
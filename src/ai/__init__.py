@@ -7,6 +7,16 @@ Composants:
 - Router: Routage multi-LLM (futur)
 """
 
-from .rag import HaloKnowledgeBase, RAGConfig
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.ai.rag": (
+            "HaloKnowledgeBase",
+            "RAGConfig",
+        ),
+    },
+)
 
 __all__ = ["HaloKnowledgeBase", "RAGConfig"]
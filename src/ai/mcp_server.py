@@ -26,12 +26,29 @@ Outils exposés:
     - get_context: Génère un contexte pour un prompt LLM
     - index_file: Indexe un fichier local
     - get_stats: Statistiques de la base
+    - stats: Latences par outil (histogrammes) et état du serveur
+
+HOW IT WORKS:
+1. La base de connaissances est chargée au démarrage (tâche de fond) :
+   initialize / tools/list répondent sans l'attendre, les outils l'attendent
+2. Un thread dédié lit les requêtes JSON-RPC sur stdin ; chaque requête est
+   traitée dans sa propre tâche asyncio, les réponses sortent dans l'ordre
+   où elles sont prêtes (un index_file long ne bloque plus une recherche)
+3. Les outils s'exécutent dans un pool de threads ; les outils qui modifient
+   l'index (index_file) sont sérialisés par un verrou
+4. Chaque appel alimente un histogramme de latence par outil (outil ``stats``)
 """
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import json
 import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -40,26 +57,108 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 
+# Outils qui modifient l'index : exécutés un à la fois
+MUTATING_TOOLS = frozenset({"index_file"})
+# Threads du pool d'exécution des outils
+DEFAULT_WORKERS = 4
+# Bornes supérieures des buckets de latence (ms), la dernière couvre le reste
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Histogramme de latences à buckets fixes (ms)."""
+
+    def __init__(self, bounds_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float, *, ok: bool = True) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Borne supérieure du bucket contenant le quantile `q` (max pour le dernier)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(self.bounds_ms[i]) if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        labels = [f"<={b}ms" for b in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {label: n for label, n in zip(labels, self.counts, strict=True) if n},
+        }
+
+
 class MCPServer:
     """Serveur MCP simple pour le RAG."""
 
-    def __init__(self):
+    def __init__(self, kb_factory: Callable[[], Any] | None = None):
+        """
+        Args:
+            kb_factory: Construit la base de connaissances (défaut: HaloKnowledgeBase
+                sur data/rag).
+        """
         self.kb = None
         self._initialized = False
+        self._kb_factory = kb_factory
+        self._init_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._started_at = time.monotonic()
+        self.in_flight = 0
 
     def _ensure_initialized(self):
         """Initialise la base de connaissances si nécessaire."""
         if self._initialized:
             return
 
-        try:
-            from src.ai.rag import HaloKnowledgeBase, RAGConfig
+        with self._init_lock:
+            if self._initialized:
+                return
+            if self._kb_factory is not None:
+                self.kb = self._kb_factory()
+                self._initialized = True
+                return
+            try:
+                from src.ai.rag import HaloKnowledgeBase, RAGConfig
+
+                config = RAGConfig(persist_directory="data/rag")
+                self.kb = HaloKnowledgeBase(config)
+                self._initialized = True
+            except ImportError as e:
+                raise RuntimeError(f"LanceDB non installé: {e}") from e
+
+    def warm_up(self) -> None:
+        """Charge la base et son index en mémoire (appelé au démarrage)."""
+        self._ensure_initialized()
+        warm = getattr(self.kb, "warm", None)
+        if callable(warm):
+            warm()
 
-            config = RAGConfig(persist_directory="data/rag")
-            self.kb = HaloKnowledgeBase(config)
-            self._initialized = True
-        except ImportError as e:
-            raise RuntimeError(f"LanceDB non installé: {e}") from e
+    def record_latency(self, tool: str, elapsed_ms: float, *, ok: bool = True) -> None:
+        """Enregistre la durée d'un appel d'outil."""
+        with self._stats_lock:
+            self._latency.setdefault(tool, LatencyHistogram()).record(elapsed_ms, ok=ok)
 
     def get_tools(self) -> list[dict[str, Any]]:
         """Retourne la liste des outils disponibles."""
@@ -144,10 +243,18 @@ class MCPServer:
                 "description": "Retourne les statistiques de la base de connaissances.",
                 "inputSchema": {"type": "object", "properties": {}},
             },
+            {
+                "name": "stats",
+                "description": "Latences par outil (histogrammes, p50/p95) et état du serveur.",
+                "inputSchema": {"type": "object", "properties": {}},
+            },
         ]
 
     def call_tool(self, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """Exécute un outil et retourne le résultat."""
+        if name == "stats":
+            return self._get_server_stats()
+
         self._ensure_initialized()
 
         if name == "search_knowledge":
@@ -247,21 +354,141 @@ class MCPServer:
         """Retourne les stats."""
         return self.kb.get_stats()
 
+    def _get_server_stats(self) -> dict[str, Any]:
+        """Latences par outil et état du serveur."""
+        with self._stats_lock:
+            tools = {name: h.to_dict() for name, h in sorted(self._latency.items())}
+        return {
+            "kb_ready": self._initialized,
+            "in_flight": self.in_flight,
+            "uptime_s": round(time.monotonic() - self._started_at, 1),
+            "tools": tools,
+        }
 
-def run_stdio_server():
-    """Lance le serveur MCP en mode stdio (JSON-RPC)."""
-    server = MCPServer()
 
-    # Écrire les capabilities
-    capabilities = {
+def _text_result(request_id: Any, result: dict[str, Any]) -> dict[str, Any]:
+    return {
         "jsonrpc": "2.0",
+        "id": request_id,
         "result": {
-            "protocolVersion": "2024-11-05",
-            "serverInfo": {"name": "halo-rag", "version": "1.0.0"},
-            "capabilities": {"tools": {}},
+            "content": [
+                {
+                    "type": "text",
+                    "text": json.dumps(result, indent=2, ensure_ascii=False),
+                }
+            ]
         },
     }
 
+
+def _error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+async def serve(
+    server: MCPServer,
+    read_request: Callable[[], dict | None],
+    send_response: Callable[[dict], None],
+    *,
+    workers: int = DEFAULT_WORKERS,
+) -> None:
+    """Boucle JSON-RPC concurrente.
+
+    Args:
+        server: Serveur MCP (outils synchrones).
+        read_request: Lecture bloquante d'une requête (None = fin du flux).
+        send_response: Écriture d'une réponse (appelée depuis la boucle asyncio).
+        workers: Threads du pool d'exécution des outils.
+    """
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="mcp-tool")
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-stdin")
+    write_lock = asyncio.Lock()
+    pending: set[asyncio.Task] = set()
+
+    # Chargement de la base dès le démarrage, sans bloquer initialize/tools/list
+    warm = loop.run_in_executor(pool, server.warm_up)
+    # Une erreur de chargement est remontée par chaque outil qui l'attend
+    warm.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def call_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        if name == "stats":
+            return server.call_tool(name, arguments)
+        await asyncio.shield(warm)
+        if name in MUTATING_TOOLS:
+            async with write_lock:
+                return await loop.run_in_executor(pool, server.call_tool, name, arguments)
+        return await loop.run_in_executor(pool, server.call_tool, name, arguments)
+
+    async def handle(request: dict) -> None:
+        method = request.get("method", "")
+        request_id = request.get("id")
+        params = request.get("params", {})
+
+        if method == "initialize":
+            send_response(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": {
+                        "protocolVersion": "2024-11-05",
+                        "serverInfo": {"name": "halo-rag", "version": "1.0.0"},
+                        "capabilities": {"tools": {}},
+                    },
+                }
+            )
+        elif method == "tools/list":
+            send_response(
+                {"jsonrpc": "2.0", "id": request_id, "result": {"tools": server.get_tools()}}
+            )
+        elif method == "tools/call":
+            tool_name = params.get("name", "")
+            arguments = params.get("arguments", {})
+            server.in_flight += 1
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = await call_tool(tool_name, arguments)
+                ok = True
+                send_response(_text_result(request_id, result))
+            except Exception as e:
+                send_response(_error(request_id, -32603, str(e)))
+            finally:
+                server.in_flight -= 1
+                server.record_latency(tool_name, (time.perf_counter() - start) * 1000, ok=ok)
+        elif request_id is None:
+            # Notification (ex: notifications/initialized) : pas de réponse
+            return
+        else:
+            # Méthode non supportée
+            send_response(_error(request_id, -32601, f"Method not found: {method}"))
+
+    try:
+        while True:
+            try:
+                request = await loop.run_in_executor(reader, read_request)
+            except Exception as e:
+                # Erreur fatale
+                sys.stderr.write(f"Error: {e}\n")
+                break
+            if request is None:
+                break
+            task = asyncio.create_task(handle(request))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        warm.cancel()
+        reader.shutdown(wait=False)
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_stdio_server():
+    """Lance le serveur MCP en mode stdio (JSON-RPC)."""
+    server = MCPServer()
+
     def send_response(response: dict):
         """Envoie une réponse JSON-RPC."""
         msg = json.dumps(response)
@@ -274,6 +501,8 @@ def run_stdio_server():
         headers = {}
         while True:
             line = sys.stdin.readline()
+            if not line:
+                return None
             if line == "\r\n" or line == "\n":
                 break
             if ":" in line:
@@ -288,70 +517,7 @@ def run_stdio_server():
         content = sys.stdin.read(content_length)
         return json.loads(content)
 
-    # Boucle principale
-    while True:
-        try:
-            request = read_request()
-            if request is None:
-                break
-
-            method = request.get("method", "")
-            request_id = request.get("id")
-            params = request.get("params", {})
-
-            if method == "initialize":
-                send_response(
-                    {"jsonrpc": "2.0", "id": request_id, "result": capabilities["result"]}
-                )
-
-            elif method == "tools/list":
-                send_response(
-                    {"jsonrpc": "2.0", "id": request_id, "result": {"tools": server.get_tools()}}
-                )
-
-            elif method == "tools/call":
-                tool_name = params.get("name", "")
-                arguments = params.get("arguments", {})
-
-                try:
-                    result = server.call_tool(tool_name, arguments)
-                    send_response(
-                        {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "result": {
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": json.dumps(result, indent=2, ensure_ascii=False),
-                                    }
-                                ]
-                            },
-                        }
-                    )
-                except Exception as e:
-                    send_response(
-                        {
-                            "jsonrpc": "2.0",
-                            "id": request_id,
-                            "error": {"code": -32603, "message": str(e)},
-                        }
-                    )
-
-            else:
-                # Méthode non supportée
-                send_response(
-                    {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {"code": -32601, "message": f"Method not found: {method}"},
-                    }
-                )
-
-        except Exception as e:
-            # Erreur fatale
-            sys.stderr.write(f"Error: {e}\n")
-            break
+    asyncio.run(serve(server, read_request, send_response))
 
 
 if __name__ == "__main__":
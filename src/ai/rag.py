@@ -349,6 +349,9 @@ class HaloKnowledgeBase:
 
         self.db = lancedb.connect(str(persist_path))
 
+        # Snapshot pandas de la table, relu seulement après une écriture
+        self._frame_cache = None
+
         # Créer ou ouvrir la table
         self._init_table()
 
@@ -375,6 +378,17 @@ class HaloKnowledgeBase:
         else:
             # Ajouter à la table existante
             self.table.add(data)
+        self._frame_cache = None
+
+    def _frame(self):
+        """Contenu de la table en DataFrame (mis en cache jusqu'à la prochaine écriture)."""
+        if self._frame_cache is None and self.table is not None:
+            self._frame_cache = self.table.to_pandas()
+        return self._frame_cache
+
+    def warm(self) -> None:
+        """Charge la table en mémoire pour que la première recherche soit rapide."""
+        self._frame()
 
     @property
     def document_count(self) -> int:
@@ -561,8 +575,8 @@ class HaloKnowledgeBase:
 
         k = top_k or self.config.top_k
 
-        # Récupérer toutes les données
-        all_data = self.table.to_pandas()
+        # Récupérer toutes les données (snapshot en cache)
+        all_data = self._frame()
 
         # Filtrer par type de source si spécifié
         if source_type and "source_type" in all_data.columns:
@@ -662,6 +676,7 @@ class HaloKnowledgeBase:
         if table_name in self.db.table_names():
             self.db.drop_table(table_name)
         self.table = None
+        self._frame_cache = None
         self._indexed_count = 0
 
     def get_stats(self) -> dict[str, Any]:
@@ -690,7 +705,7 @@ class HaloKnowledgeBase:
             }
         else:
             # Récupérer tous les documents
-            all_data = self.table.to_pandas()
+            all_data = self._frame()
 
             sources = {}
             for _, row in all_data.iterrows():
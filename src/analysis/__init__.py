@@ -1,89 +1,96 @@
 """Module d'analyse des données."""
 
-from src.analysis.antagonists import (
-    AggregationResult,
-    AntagonistEntry,
-    aggregate_antagonists,
-    aggregate_antagonists_from_events,
-)
-from src.analysis.cumulative import (
-    CumulativeMetricsResult,
-    CumulativeSeriesResult,
-    compute_cumulative_kd_series_polars,
-    compute_cumulative_kda_series_polars,
-    compute_cumulative_metrics_polars,
-    compute_cumulative_net_score_series_polars,
-    compute_cumulative_objective_score_series_polars,
-    compute_rolling_kd_polars,
-    compute_session_trend_polars,
-    cumulative_series_to_dicts,
-)
-from src.analysis.filters import (
-    build_option_map,
-    build_xuid_option_map,
-    is_allowed_playlist_name,
-    mark_firefight,
-)
-from src.analysis.killer_victim import (
-    AntagonistsResult,
-    AntagonistsResultPolars,
-    EstimatedCount,
-    KVPair,
-    OpponentDuel,
-    compute_duel_history_polars,
-    compute_kd_timeseries_by_minute_polars,
-    compute_killer_victim_pairs,
-    compute_personal_antagonists,
-    compute_personal_antagonists_from_pairs_polars,
-    killer_victim_counts_long_polars,
-    killer_victim_matrix_polars,
-)
-from src.analysis.maps import compute_map_breakdown
-from src.analysis.objective_participation import (
-    AssistBreakdownResult,
-    ObjectiveParticipationResult,
-    PlayerObjectiveRanking,
-    PlayerProfileResult,
-    compute_assist_breakdown_polars,
-    compute_award_frequency_polars,
-    compute_objective_efficiency_polars,
-    compute_objective_kill_ratio_polars,
-    compute_objective_participation_score_polars,
-    compute_objective_summary_by_match_polars,
-    compute_player_profile_polars,
-    get_assist_awards_with_points,
-    get_objective_mode_awards,
-    is_objective_mode_match,
-    rank_players_by_objective_contribution_polars,
-)
-from src.analysis.performance_config import MIN_MATCHES_FOR_RELATIVE
-from src.analysis.performance_score import (
-    compute_performance_series,
-    compute_relative_performance_score,
-)
-from src.analysis.sessions import (
-    DEFAULT_SESSION_GAP_MINUTES,
-    SESSION_CUTOFF_HOUR,
-    compute_sessions,
-    compute_sessions_with_context_polars,
-    is_session_potentially_active,
-)
-from src.analysis.stats import (
-    compute_aggregated_stats,
-    compute_global_ratio,
-    compute_mode_category_averages,
-    compute_outcome_rates,
-    extract_mode_category,
-)
-from src.analysis.win_streaks import (
-    RollingStreakResult,
-    StreakRecord,
-    StreakSummary,
-    compute_rolling_win_rate_polars,
-    compute_streak_series_polars,
-    compute_streak_summary_polars,
-    compute_streaks_polars,
-    streak_series_to_dicts,
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.analysis.antagonists": (
+            "AggregationResult",
+            "AntagonistEntry",
+            "aggregate_antagonists",
+            "aggregate_antagonists_from_events",
+        ),
+        "src.analysis.cumulative": (
+            "CumulativeMetricsResult",
+            "CumulativeSeriesResult",
+            "compute_cumulative_kd_series_polars",
+            "compute_cumulative_kda_series_polars",
+            "compute_cumulative_metrics_polars",
+            "compute_cumulative_net_score_series_polars",
+            "compute_cumulative_objective_score_series_polars",
+            "compute_rolling_kd_polars",
+            "compute_session_trend_polars",
+            "cumulative_series_to_dicts",
+        ),
+        "src.analysis.filters": (
+            "build_option_map",
+            "build_xuid_option_map",
+            "is_allowed_playlist_name",
+            "mark_firefight",
+        ),
+        "src.analysis.killer_victim": (
+            "AntagonistsResult",
+            "AntagonistsResultPolars",
+            "EstimatedCount",
+            "KVPair",
+            "OpponentDuel",
+            "compute_duel_history_polars",
+            "compute_kd_timeseries_by_minute_polars",
+            "compute_killer_victim_pairs",
+            "compute_personal_antagonists",
+            "compute_personal_antagonists_from_pairs_polars",
+            "killer_victim_counts_long_polars",
+            "killer_victim_matrix_polars",
+        ),
+        "src.analysis.maps": ("compute_map_breakdown",),
+        "src.analysis.objective_participation": (
+            "AssistBreakdownResult",
+            "ObjectiveParticipationResult",
+            "PlayerObjectiveRanking",
+            "PlayerProfileResult",
+            "compute_assist_breakdown_polars",
+            "compute_award_frequency_polars",
+            "compute_objective_efficiency_polars",
+            "compute_objective_kill_ratio_polars",
+            "compute_objective_participation_score_polars",
+            "compute_objective_summary_by_match_polars",
+            "compute_player_profile_polars",
+            "get_assist_awards_with_points",
+            "get_objective_mode_awards",
+            "is_objective_mode_match",
+            "rank_players_by_objective_contribution_polars",
+        ),
+        "src.analysis.performance_config": ("MIN_MATCHES_FOR_RELATIVE",),
+        "src.analysis.performance_score": (
+            "compute_performance_series",
+            "compute_relative_performance_score",
+        ),
+        "src.analysis.sessions": (
+            "DEFAULT_SESSION_GAP_MINUTES",
+            "SESSION_CUTOFF_HOUR",
+            "compute_sessions",
+            "compute_sessions_with_context_polars",
+            "is_session_potentially_active",
+        ),
+        "src.analysis.stats": (
+            "compute_aggregated_stats",
+            "compute_global_ratio",
+            "compute_mode_category_averages",
+            "compute_outcome_rates",
+            "extract_mode_category",
+        ),
+        "src.analysis.win_streaks": (
+            "RollingStreakResult",
+            "StreakRecord",
+            "StreakSummary",
+            "compute_rolling_win_rate_polars",
+            "compute_streak_series_polars",
+            "compute_streak_summary_polars",
+            "compute_streaks_polars",
+            "streak_series_to_dicts",
+        ),
+    },
 )
 
 __all__ = [
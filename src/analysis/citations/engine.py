@@ -17,6 +17,8 @@ import duckdb
 import polars as pl
 
 from src.analysis.citations.custom_rules import CUSTOM_FUNCTIONS
+from src.data.infrastructure.database.shared_partitions import attach_shared
+from src.data.infrastructure.database.snapshots import connect_read_only, resolve_read_path
 
 logger = logging.getLogger(__name__)
 
@@ -87,11 +89,13 @@ class CitationEngine:
         """
         if self._shared_conn is not None:
             return self._shared_conn, False
-        conn = duckdb.connect(str(self._db_path), read_only=True)
+        conn = connect_read_only(self._db_path)
         # ATTACH shared_matches.duckdb pour lecture V5
         if self._shared_db_path is not None and self._shared_db_path.exists():
             try:
-                conn.execute(f"ATTACH '{self._shared_db_path}' AS shared (READ_ONLY)")
+                attach_shared(
+                    conn, self._shared_db_path, read_path=resolve_read_path(self._shared_db_path)
+                )
             except Exception as e:
                 err = str(e).lower()
                 if "already" not in err and "conflict" not in err:
@@ -144,7 +148,7 @@ class CitationEngine:
             self._mappings = {}
             return self._mappings
 
-        conn = duckdb.connect(str(meta_path), read_only=True)
+        conn = connect_read_only(meta_path)
         try:
             # Vérifier que la table existe
             exists = conn.execute(
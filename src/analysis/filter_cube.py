@@ -0,0 +1,360 @@
+"""Cube pré-agrégé pour les KPIs filtrés (sidebar) et les tableaux par période.
+
+À chaque rerun, les KPIs réagrégeaient toute la frame filtrée. Le cube contient
+une ligne par combinaison (jour, playlist, mode, carte, résultat, classé,
+Firefight) avec uniquement des mesures additives : toute combinaison des
+filtres date / cases à cocher se calcule en sommant quelques centaines de
+lignes au lieu de parcourir tous les matchs.
+
+HOW IT WORKS:
+1. ``build_filter_cube`` agrège une frame de matchs (celle de
+   ``load_matches_as_polars``) ; le jour est la date locale Paris, comme la
+   colonne ``date`` utilisée par le filtre de période
+2. Le cube est matérialisé au moment de la sync (``mv_filter_cube``, à côté
+   des autres tables ``mv_*``)
+3. ``slice_filter_cube`` applique l'état des filtres : les libellés UI
+   (playlist_ui, mode_ui, map_ui) sont calculés sur les noms *distincts* du
+   cube avec les mêmes fonctions que ``apply_filters`` ; les filtres classé /
+   Firefight portent directement sur les dimensions ``is_ranked`` /
+   ``is_firefight``
+4. ``cube_totals`` somme la tranche ; les moyennes (précision, durée de vie,
+   par partie, par minute) se déduisent des paires somme / effectif
+5. ``first_start`` / ``last_start`` (MIN / MAX, donc fusionnables) donnent
+   l'étendue temporelle d'une tranche, qui fixe la granularité du tableau
+   par période (``WinLossService.compute_period_table_from_cube``)
+
+Les métriques non additives (médianes, score de performance relatif, séries
+par match) restent calculées sur la frame brute.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date
+
+import polars as pl
+
+from src.data.domain.models.stats import AggregatedStats, OutcomeRates
+
+PARIS_TZ_NAME = "Europe/Paris"
+
+CUBE_KEYS = (
+    "day",
+    "playlist_name",
+    "pair_name",
+    "map_name",
+    "outcome",
+    "is_ranked",
+    "is_firefight",
+)
+
+CUBE_MEASURES = (
+    "matches",
+    "kills_sum",
+    "deaths_sum",
+    "assists_sum",
+    "time_played_sum",
+    "time_played_n",
+    "accuracy_sum",
+    "accuracy_n",
+    "life_sum",
+    "life_n",
+)
+
+CUBE_SCHEMA: dict[str, pl.DataType] = {
+    "day": pl.Date,
+    "playlist_name": pl.Utf8,
+    "pair_name": pl.Utf8,
+    "map_name": pl.Utf8,
+    "outcome": pl.Int64,
+    "is_ranked": pl.Boolean,
+    "is_firefight": pl.Boolean,
+    "matches": pl.Int64,
+    "kills_sum": pl.Int64,
+    "deaths_sum": pl.Int64,
+    "assists_sum": pl.Int64,
+    "time_played_sum": pl.Float64,
+    "time_played_n": pl.Int64,
+    "accuracy_sum": pl.Float64,
+    "accuracy_n": pl.Int64,
+    "life_sum": pl.Float64,
+    "life_n": pl.Int64,
+    "first_start": pl.Datetime("us"),
+    "last_start": pl.Datetime("us"),
+}
+
+
+def _local_start_expr(df: pl.DataFrame) -> pl.Expr:
+    """Heure de début locale Paris, naïve (même règle que l'enrichissement du loader).
+
+    Une frame déjà enrichie (colonne ``date``) porte des heures locales naïves ;
+    sinon ``start_time`` est en UTC.
+    """
+    dtype = df.schema.get("start_time")
+    start = pl.col("start_time")
+    if dtype == pl.Utf8:
+        start = start.str.to_datetime(time_zone="UTC")
+    elif not isinstance(dtype, pl.Datetime):
+        return pl.lit(None, dtype=pl.Datetime("us"))
+    elif "date" in df.columns:
+        return start.dt.replace_time_zone(None).cast(pl.Datetime("us"))
+    elif dtype.time_zone is None:
+        start = start.dt.replace_time_zone("UTC")
+    return (
+        start.dt.convert_time_zone(PARIS_TZ_NAME).dt.replace_time_zone(None).cast(pl.Datetime("us"))
+    )
+
+
+def _day_expr(df: pl.DataFrame) -> pl.Expr:
+    """Date locale Paris (colonne ``date`` si la frame est déjà enrichie)."""
+    if "date" in df.columns:
+        return pl.col("date").cast(pl.Date)
+    return _local_start_expr(df).dt.date()
+
+
+def _flag_expr(df: pl.DataFrame, name: str, fallback: pl.Expr) -> pl.Expr:
+    if name in df.columns:
+        return pl.col(name).cast(pl.Boolean).fill_null(False)
+    return fallback
+
+
+def _text_col(df: pl.DataFrame, name: str) -> pl.Expr:
+    if name in df.columns:
+        return pl.col(name).cast(pl.Utf8)
+    return pl.lit(None, dtype=pl.Utf8)
+
+
+def _float_col(df: pl.DataFrame, name: str) -> pl.Expr:
+    if name in df.columns:
+        return pl.col(name).cast(pl.Float64, strict=False)
+    return pl.lit(None, dtype=pl.Float64)
+
+
+def empty_filter_cube() -> pl.DataFrame:
+    """Cube vide au schéma attendu."""
+    return pl.DataFrame(schema=CUBE_SCHEMA)
+
+
+def build_filter_cube(df: pl.DataFrame) -> pl.DataFrame:
+    """Agrège une frame de matchs en cube (une ligne par combinaison de clés).
+
+    Args:
+        df: Matchs avec start_time (ou date), playlist_name, pair_name,
+            map_name, outcome, kills, deaths, assists, time_played_seconds,
+            accuracy, average_life_seconds / avg_life_seconds.
+            ``is_firefight`` / ``is_ranked`` sont déduits des libellés si absents.
+
+    Returns:
+        DataFrame au schéma ``CUBE_SCHEMA``.
+    """
+    if df.is_empty():
+        return empty_filter_cube()
+
+    from src.analysis.filters import mark_firefight
+    from src.analysis.mode_categories import infer_custom_category_from_pair_name
+
+    firefight = (
+        mark_firefight(
+            df.select(
+                [c for c in ("playlist_name", "pair_name", "game_variant_name") if c in df.columns]
+            )
+        )
+        if "is_firefight" not in df.columns
+        else None
+    )
+    if "is_ranked" in df.columns:
+        ranked_expr = pl.col("is_ranked").cast(pl.Boolean).fill_null(False)
+    else:
+        pairs = df["pair_name"].drop_nulls().unique().to_list() if "pair_name" in df.columns else []
+        ranked_pairs = [p for p in pairs if infer_custom_category_from_pair_name(p) == "Ranked"]
+        ranked_expr = (
+            pl.col("pair_name").is_in(ranked_pairs).fill_null(False)
+            if "pair_name" in df.columns
+            else pl.lit(False)
+        )
+
+    life_col = (
+        "average_life_seconds" if "average_life_seconds" in df.columns else "avg_life_seconds"
+    )
+    rows = df.select(
+        _day_expr(df).alias("day"),
+        _text_col(df, "playlist_name").alias("playlist_name"),
+        _text_col(df, "pair_name").alias("pair_name"),
+        _text_col(df, "map_name").alias("map_name"),
+        (
+            pl.col("outcome").cast(pl.Int64, strict=False).alias("outcome")
+            if "outcome" in df.columns
+            else pl.lit(None, dtype=pl.Int64).alias("outcome")
+        ),
+        ranked_expr.alias("is_ranked"),
+        (
+            pl.lit(firefight["is_firefight"])
+            if firefight is not None
+            else _flag_expr(df, "is_firefight", pl.lit(False))
+        ).alias("is_firefight"),
+        pl.col("kills").cast(pl.Int64, strict=False).fill_null(0).alias("kills"),
+        pl.col("deaths").cast(pl.Int64, strict=False).fill_null(0).alias("deaths"),
+        pl.col("assists").cast(pl.Int64, strict=False).fill_null(0).alias("assists"),
+        _float_col(df, "time_played_seconds").alias("time_played"),
+        _float_col(df, "accuracy").alias("accuracy"),
+        _float_col(df, life_col).alias("life"),
+        _local_start_expr(df).alias("start_local"),
+    )
+
+    return (
+        rows.group_by(list(CUBE_KEYS))
+        .agg(
+            pl.len().cast(pl.Int64).alias("matches"),
+            pl.col("kills").sum().alias("kills_sum"),
+            pl.col("deaths").sum().alias("deaths_sum"),
+            pl.col("assists").sum().alias("assists_sum"),
+            pl.col("time_played").sum().alias("time_played_sum"),
+            pl.col("time_played").count().cast(pl.Int64).alias("time_played_n"),
+            pl.col("accuracy").sum().alias("accuracy_sum"),
+            pl.col("accuracy").count().cast(pl.Int64).alias("accuracy_n"),
+            pl.col("life").sum().alias("life_sum"),
+            pl.col("life").count().cast(pl.Int64).alias("life_n"),
+            pl.col("start_local").min().alias("first_start"),
+            pl.col("start_local").max().alias("last_start"),
+        )
+        .select([pl.col(c).cast(t) for c, t in CUBE_SCHEMA.items()])
+        .sort(["day", "playlist_name", "pair_name", "map_name"], nulls_last=True)
+    )
+
+
+def _label_filter(
+    cube: pl.DataFrame,
+    column: str,
+    selected: Iterable[str] | None,
+    label_fn: Callable[[str], str] | None,
+) -> pl.DataFrame:
+    """Filtre sur le libellé UI d'une colonne de noms (règle de apply_filters)."""
+    wanted = set(selected or ())
+    if not wanted:
+        return cube
+    fn = label_fn or (lambda s: s)
+    names = cube[column].drop_nulls().unique().to_list()
+    kept = [name for name in names if (fn(name) or "") in wanted]
+    keep_expr = pl.col(column).is_in(kept)
+    if "" in wanted:
+        keep_expr = keep_expr | pl.col(column).is_null()
+    return cube.filter(keep_expr.fill_null(False))
+
+
+def slice_filter_cube(
+    cube: pl.DataFrame,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    playlists: Iterable[str] | None = None,
+    modes: Iterable[str] | None = None,
+    maps: Iterable[str] | None = None,
+    playlist_label_fn: Callable[[str], str] | None = None,
+    mode_label_fn: Callable[[str], str] | None = None,
+    map_label_fn: Callable[[str], str] | None = None,
+    is_ranked: bool | None = None,
+    is_firefight: bool | None = None,
+) -> pl.DataFrame:
+    """Lignes du cube retenues par l'état des filtres de la sidebar.
+
+    Une sélection vide signifie "tout" (comme ``apply_filters``) ;
+    ``is_ranked`` / ``is_firefight`` à None ne filtrent pas.
+    """
+    out = cube
+    if is_ranked is not None:
+        out = out.filter(pl.col("is_ranked") == is_ranked)
+    if is_firefight is not None:
+        out = out.filter(pl.col("is_firefight") == is_firefight)
+    if start_date is not None:
+        out = out.filter(pl.col("day") >= start_date)
+    if end_date is not None:
+        out = out.filter(pl.col("day") <= end_date)
+    out = _label_filter(out, "playlist_name", playlists, playlist_label_fn)
+    out = _label_filter(out, "pair_name", modes, mode_label_fn)
+    out = _label_filter(out, "map_name", maps, map_label_fn)
+    return out
+
+
+@dataclass(frozen=True)
+class CubeTotals:
+    """Sommes d'une tranche du cube et moyennes dérivées."""
+
+    matches: int = 0
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    no_finish: int = 0
+    outcome_total: int = 0
+    kills: int = 0
+    deaths: int = 0
+    assists: int = 0
+    time_played_sum: float = 0.0
+    time_played_n: int = 0
+    accuracy_sum: float = 0.0
+    accuracy_n: int = 0
+    life_sum: float = 0.0
+    life_n: int = 0
+
+    @property
+    def outcome_rates(self) -> OutcomeRates:
+        return OutcomeRates(
+            wins=self.wins,
+            losses=self.losses,
+            ties=self.ties,
+            no_finish=self.no_finish,
+            total=self.outcome_total,
+        )
+
+    @property
+    def aggregated(self) -> AggregatedStats:
+        return AggregatedStats(
+            total_kills=self.kills,
+            total_deaths=self.deaths,
+            total_assists=self.assists,
+            total_matches=self.matches,
+            total_time_seconds=self.time_played_sum,
+        )
+
+    @property
+    def avg_accuracy(self) -> float | None:
+        return self.accuracy_sum / self.accuracy_n if self.accuracy_n else None
+
+    @property
+    def avg_life_seconds(self) -> float | None:
+        return self.life_sum / self.life_n if self.life_n else None
+
+    @property
+    def avg_match_seconds(self) -> float | None:
+        return self.time_played_sum / self.time_played_n if self.time_played_n else None
+
+
+def cube_totals(cube: pl.DataFrame) -> CubeTotals:
+    """Somme une tranche du cube."""
+    if cube.is_empty():
+        return CubeTotals()
+    sums = cube.select(
+        [pl.col(c).sum() for c in CUBE_MEASURES]
+        + [
+            pl.col("matches").filter(pl.col("outcome") == code).sum().alias(name)
+            for code, name in ((2, "wins"), (3, "losses"), (1, "ties"), (4, "no_finish"))
+        ]
+        + [pl.col("matches").filter(pl.col("outcome").is_not_null()).sum().alias("outcome_total")]
+    ).row(0, named=True)
+    return CubeTotals(
+        matches=int(sums["matches"] or 0),
+        wins=int(sums["wins"] or 0),
+        losses=int(sums["losses"] or 0),
+        ties=int(sums["ties"] or 0),
+        no_finish=int(sums["no_finish"] or 0),
+        outcome_total=int(sums["outcome_total"] or 0),
+        kills=int(sums["kills_sum"] or 0),
+        deaths=int(sums["deaths_sum"] or 0),
+        assists=int(sums["assists_sum"] or 0),
+        time_played_sum=float(sums["time_played_sum"] or 0.0),
+        time_played_n=int(sums["time_played_n"] or 0),
+        accuracy_sum=float(sums["accuracy_sum"] or 0.0),
+        accuracy_n=int(sums["accuracy_n"] or 0),
+        life_sum=float(sums["life_sum"] or 0.0),
+        life_n=int(sums["life_n"] or 0),
+    )
@@ -135,7 +135,7 @@ def _pick_best_duckdb_v4_player() -> tuple[str, str] | None:
     Returns:
         Tuple (db_path, gamertag) du joueur avec le plus de matchs, ou None.
     """
-    import duckdb
+    from src.data.infrastructure.database.snapshots import connect_read_only
 
     players_dir = _get_duckdb_v4_players_dir()
     if not players_dir.exists():
@@ -154,7 +154,7 @@ def _pick_best_duckdb_v4_player() -> tuple[str, str] | None:
 
         gamertag = player_dir.name
         try:
-            con = duckdb.connect(str(db_path), read_only=True)
+            con = connect_read_only(str(db_path))
             try:
                 result = con.execute("SELECT COUNT(*) FROM match_stats").fetchone()
                 count = result[0] if result else 0
@@ -4,6 +4,7 @@ Ce module gère:
 - Le rendu complet de la section filtres dans la sidebar
 - La logique de sélection Période / Sessions
 - Les filtres cascade Playlists -> Modes -> Cartes
+- La tranche du cube pré-agrégé correspondant aux filtres (KPIs)
 """
 
 from __future__ import annotations
@@ -19,6 +20,7 @@ from src.app.filters import get_friends_xuids_for_sessions
 from src.ui import translate_pair_name, translate_playlist_name
 from src.ui.cache import (
     cached_compute_sessions_db,
+    cached_load_filter_cube,
     cached_same_team_match_ids_with_friend,
 )
 from src.ui.components import (
@@ -774,3 +776,55 @@ def apply_filters(
             )
 
     return dff
+
+
+def resolve_filter_cube(
+    filter_state: FilterState | dict | None,
+    db_path: str | None,
+    xuid: str | None,
+    db_key: tuple[int, int] | None = None,
+    clean_asset_label_fn: Callable[[str], str] | None = None,
+    normalize_mode_label_fn: Callable[[str], str] | None = None,
+    normalize_map_label_fn: Callable[[str], str] | None = None,
+    is_ranked: bool | None = None,
+    is_firefight: bool | None = None,
+) -> pl.DataFrame | None:
+    """Tranche du cube pré-agrégé (mv_filter_cube) pour l'état des filtres.
+
+    Seul le mode "Période" s'exprime en clés du cube (jour + cases à cocher,
+    classé / Firefight via ``is_ranked`` / ``is_firefight``, None = tous) ;
+    en mode "Sessions", ou si le cube est absent / en retard sur match_stats
+    (génération vérifiée au chargement, mis en cache par ``db_key``), retourne
+    None et les KPIs sont calculés sur la frame filtrée.
+
+    Returns:
+        DataFrame des lignes retenues du cube, ou None.
+    """
+    from src.analysis.filter_cube import slice_filter_cube
+    from src.ui.perf import perf_section
+
+    if not isinstance(filter_state, FilterState) or filter_state.filter_mode != "Période":
+        return None
+    if not db_path or not xuid:
+        return None
+
+    cube = cached_load_filter_cube(db_path, xuid.strip(), db_key)
+    if cube is None:
+        return None
+
+    clean_fn = clean_asset_label_fn or (lambda s: s)
+
+    with perf_section("filters/cube"):
+        return slice_filter_cube(
+            cube,
+            start_date=_safe_to_date(filter_state.start_d),
+            end_date=_safe_to_date(filter_state.end_d),
+            playlists=filter_state.playlists_selected,
+            modes=filter_state.modes_selected,
+            maps=filter_state.maps_selected,
+            playlist_label_fn=lambda x: translate_playlist_name(clean_fn(x)),
+            mode_label_fn=normalize_mode_label_fn,
+            map_label_fn=normalize_map_label_fn,
+            is_ranked=is_ranked,
+            is_firefight=is_firefight,
+        )
@@ -8,7 +8,7 @@ Ce module gère :
 
 from __future__ import annotations
 
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
 import polars as pl
 import streamlit as st
@@ -18,6 +18,9 @@ from src.analysis.stats import format_mmss
 from src.ui.components import render_kpi_cards, render_top_summary
 from src.ui.formatting import format_duration_dhm, format_duration_hms
 
+if TYPE_CHECKING:
+    from src.analysis.filter_cube import CubeTotals
+
 # =============================================================================
 # Helpers
 # =============================================================================
@@ -164,6 +167,44 @@ def compute_kpi_stats(df: pl.DataFrame) -> KPIStats:
     )
 
 
+def compute_kpi_stats_from_cube(totals: CubeTotals) -> KPIStats:
+    """Calcule les statistiques KPI depuis les sommes du cube de filtres.
+
+    Mêmes définitions que ``compute_kpi_stats`` (moyennes = somme / effectif
+    non nul), sans parcourir les matchs.
+
+    Args:
+        totals: Sommes d'une tranche du cube (``cube_totals``).
+
+    Returns:
+        KPIStats avec toutes les statistiques calculées.
+    """
+    rates = totals.outcome_rates
+    total_outcomes = max(1, rates.total)
+    stats = totals.aggregated
+    matches = totals.matches
+
+    return KPIStats(
+        win_rate=rates.wins / total_outcomes,
+        loss_rate=rates.losses / total_outcomes,
+        total_matches=rates.total,
+        wins=rates.wins,
+        losses=rates.losses,
+        ties=rates.ties,
+        avg_accuracy=totals.avg_accuracy,
+        global_ratio=stats.global_ratio,
+        avg_life_seconds=totals.avg_life_seconds,
+        kills_per_game=totals.kills / matches if matches else None,
+        deaths_per_game=totals.deaths / matches if matches else None,
+        assists_per_game=totals.assists / matches if matches else None,
+        kills_per_minute=stats.kills_per_minute,
+        deaths_per_minute=stats.deaths_per_minute,
+        assists_per_minute=stats.assists_per_minute,
+        avg_match_seconds=totals.avg_match_seconds,
+        total_play_seconds=totals.time_played_sum if matches else None,
+    )
+
+
 # =============================================================================
 # Rendu des KPIs
 # =============================================================================
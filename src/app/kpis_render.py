@@ -44,47 +44,71 @@ def _to_polars(df: pl.DataFrame) -> pl.DataFrame:
     return pl.from_pandas(df)
 
 
-def render_kpis_section(dff: pl.DataFrame) -> None:
+def render_kpis_section(dff: pl.DataFrame, filter_cube: pl.DataFrame | None = None) -> None:
     """Rend la section complète des KPIs.
 
     Args:
         dff: DataFrame (Pandas ou Polars) filtré des matchs.
+        filter_cube: Tranche du cube pré-agrégé correspondant aux mêmes filtres
+            (``resolve_filter_cube``). Si fournie, les KPIs sont des sommes de
+            lignes du cube au lieu d'agrégats sur ``dff``.
     """
     from src.ui.perf import perf_section
 
-    dff_pl = _to_polars(dff)
-
-    with perf_section("kpis"):
-        rates = compute_outcome_rates(dff_pl)
-        total_outcomes = max(1, rates.total)
-        win_rate = rates.wins / total_outcomes
-        loss_rate = rates.losses / total_outcomes
-
-        avg_acc = None
-        if not dff_pl.is_empty() and "accuracy" in dff_pl.columns:
-            avg_acc = dff_pl.select(pl.col("accuracy").drop_nulls().mean()).item()
-        global_ratio = compute_global_ratio(dff_pl)
-        avg_life = None
-        if not dff_pl.is_empty() and "average_life_seconds" in dff_pl.columns:
-            avg_life = dff_pl.select(pl.col("average_life_seconds").drop_nulls().mean()).item()
-
-    # Durées
-    avg_match_seconds = avg_match_duration_seconds(dff_pl)
-    total_play_seconds = compute_total_play_seconds(dff_pl)
+    if filter_cube is not None:
+        from src.analysis.filter_cube import cube_totals
+        from src.app.kpis import compute_kpi_stats_from_cube
+
+        with perf_section("kpis"):
+            totals = cube_totals(filter_cube)
+            kpis = compute_kpi_stats_from_cube(totals)
+        n_matches = totals.matches
+        rates = totals.outcome_rates
+        win_rate, loss_rate = kpis.win_rate, kpis.loss_rate
+        avg_acc, global_ratio, avg_life = (
+            kpis.avg_accuracy,
+            kpis.global_ratio,
+            kpis.avg_life_seconds,
+        )
+        avg_match_seconds, total_play_seconds = kpis.avg_match_seconds, kpis.total_play_seconds
+        stats = totals.aggregated
+        kpg, dpg, apg = kpis.kills_per_game, kpis.deaths_per_game, kpis.assists_per_game
+    else:
+        dff_pl = _to_polars(dff)
+        n_matches = len(dff_pl)
+
+        with perf_section("kpis"):
+            rates = compute_outcome_rates(dff_pl)
+            total_outcomes = max(1, rates.total)
+            win_rate = rates.wins / total_outcomes
+            loss_rate = rates.losses / total_outcomes
+
+            avg_acc = None
+            if not dff_pl.is_empty() and "accuracy" in dff_pl.columns:
+                avg_acc = dff_pl.select(pl.col("accuracy").drop_nulls().mean()).item()
+            global_ratio = compute_global_ratio(dff_pl)
+            avg_life = None
+            if not dff_pl.is_empty() and "average_life_seconds" in dff_pl.columns:
+                avg_life = dff_pl.select(pl.col("average_life_seconds").drop_nulls().mean()).item()
+
+        # Durées
+        avg_match_seconds = avg_match_duration_seconds(dff_pl)
+        total_play_seconds = compute_total_play_seconds(dff_pl)
+
+        # Stats par minute / totaux
+        stats = compute_aggregated_stats(dff_pl)
+
+        # Moyennes par partie
+        kpg = dff_pl.select(pl.col("kills").mean()).item() if not dff_pl.is_empty() else None
+        dpg = dff_pl.select(pl.col("deaths").mean()).item() if not dff_pl.is_empty() else None
+        apg = dff_pl.select(pl.col("assists").mean()).item() if not dff_pl.is_empty() else None
+
     avg_match_txt = format_duration_hms(avg_match_seconds)
     total_play_txt = format_duration_dhm(total_play_seconds)
 
-    # Stats par minute / totaux
-    stats = compute_aggregated_stats(dff_pl)
-
-    # Moyennes par partie
-    kpg = dff_pl.select(pl.col("kills").mean()).item() if not dff_pl.is_empty() else None
-    dpg = dff_pl.select(pl.col("deaths").mean()).item() if not dff_pl.is_empty() else None
-    apg = dff_pl.select(pl.col("assists").mean()).item() if not dff_pl.is_empty() else None
-
     # Rendu des sections
     st.subheader("Parties")
-    render_top_summary(len(dff_pl), rates)
+    render_top_summary(n_matches, rates)
     render_kpi_cards(
         [
             ("Durée moyenne / match", avg_match_txt),
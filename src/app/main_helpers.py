@@ -22,7 +22,7 @@ from src.ui import (
 )
 from src.ui.cache import clear_app_caches, db_cache_key, load_df_optimized
 from src.ui.multiplayer import render_player_selector
-from src.ui.player_assets import download_image_to_cache, ensure_local_image_path
+from src.ui.player_assets import prefetch_error, resolve_or_prefetch_images
 from src.ui.sync import (
     is_spnkr_db_path,
     pick_latest_spnkr_db_if_any,
@@ -313,28 +313,24 @@ def render_profile_hero(
     ):
         ensure_spnkr_tokens(timeout_seconds=12)
 
-    # Résolution des chemins locaux
-    banner_path = ensure_local_image_path(
-        banner_value, prefix="banner", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    emblem_path = ensure_local_image_path(
-        emblem_value, prefix="emblem", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    backdrop_path = ensure_local_image_path(
-        backdrop_value, prefix="backdrop", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    nameplate_path = ensure_local_image_path(
-        nameplate_value,
-        prefix="nameplate",
-        download_enabled=dl_enabled,
-        auto_refresh_hours=refresh_h,
-    )
-    rank_icon_path = ensure_local_image_path(
-        rank_icon_value, prefix="rank", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    adornment_path = ensure_local_image_path(
-        adornment_value,
-        prefix="adornment",
+    # Chemins en cache tout de suite; les images manquantes sont téléchargées
+    # en arrière-plan (rendu non bloquant) et apparaîtront au prochain rendu.
+    (
+        banner_path,
+        emblem_path,
+        backdrop_path,
+        nameplate_path,
+        rank_icon_path,
+        adornment_path,
+    ) = resolve_or_prefetch_images(
+        [
+            (banner_value, "banner"),
+            (emblem_value, "emblem"),
+            (backdrop_value, "backdrop"),
+            (nameplate_value, "nameplate"),
+            (rank_icon_value, "rank"),
+            (adornment_value, "adornment"),
+        ],
         download_enabled=dl_enabled,
         auto_refresh_hours=refresh_h,
     )
@@ -348,13 +344,15 @@ def render_profile_hero(
             return
         if path:
             return
+        # Le téléchargement se fait en arrière-plan: on ne signale que les échecs connus.
+        err = prefetch_error(u, prefix=prefix)
+        if not err:
+            return
         key = f"_warned_asset_{prefix}_{hash(u)}"
         if st.session_state.get(key):
             return
         st.session_state[key] = True
-        ok, err, _out = download_image_to_cache(u, prefix=prefix, timeout_seconds=12)
-        if not ok:
-            st.caption(f"Asset '{prefix}' non téléchargé: {err}")
+        st.caption(f"Asset '{prefix}' non téléchargé: {err}")
 
     _warn_asset("backdrop", backdrop_value, backdrop_path)
     _warn_asset("rank", rank_icon_value, rank_icon_path)
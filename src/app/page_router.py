@@ -3,7 +3,7 @@
 Ce module centralise:
 - La liste des pages disponibles
 - La construction des paramètres pour les pages de match
-- Le dispatch vers les différentes pages
+- Le dispatch vers les différentes pages (importées au premier affichage)
 """
 
 from __future__ import annotations
@@ -14,6 +14,7 @@ import polars as pl
 import streamlit as st
 
 from src.ui.settings import AppSettings
+from src.visualization.figure_cache import set_figure_cache_generation
 
 
 def _to_polars(df: pl.DataFrame) -> pl.DataFrame:
@@ -39,6 +40,37 @@ PAGES: list[str] = [
 ]
 
 
+def load_page_renderer(name: str) -> Callable:
+    """Importe la fonction de rendu d'une page à la demande.
+
+    ``src.ui.pages`` expose ses pages paresseusement : seul le module de la
+    page demandée (et ses dépendances Plotly / pandas) est chargé.
+
+    Args:
+        name: Nom exporté par ``src.ui.pages`` (ex. ``"render_win_loss_page"``).
+
+    Returns:
+        La fonction de rendu.
+    """
+    from src.ui import pages
+
+    return getattr(pages, name)
+
+
+def lazy_page_renderer(name: str) -> Callable:
+    """Proxy d'une fonction de rendu, importée à son premier appel.
+
+    Pour les fonctions passées en paramètre avant de savoir si elles serviront
+    (ex. ``render_match_view_fn`` dans ``build_match_view_params``).
+    """
+
+    def _render(*args, **kwargs):
+        return load_page_renderer(name)(*args, **kwargs)
+
+    _render.__name__ = name
+    return _render
+
+
 def build_match_view_params(
     db_path: str,
     xuid: str,
@@ -121,38 +153,60 @@ def dispatch_page(
     waypoint_player: str,
     gap_minutes: int,
     match_view_params: dict,
-    # Fonctions de rendu
-    render_last_match_page_fn: Callable,
-    render_match_search_page_fn: Callable,
-    render_citations_page_fn: Callable,
-    render_session_comparison_page_fn: Callable,
-    render_timeseries_page_fn: Callable,
-    render_win_loss_page_fn: Callable,
-    render_teammates_page_fn: Callable,
-    render_match_history_page_fn: Callable,
-    render_media_tab_fn: Callable,
-    render_career_page_fn: Callable,
-    render_settings_page_fn: Callable,
+    *,
+    # Fonctions de rendu (None = page importée à son premier affichage)
+    render_last_match_page_fn: Callable | None = None,
+    render_match_search_page_fn: Callable | None = None,
+    render_citations_page_fn: Callable | None = None,
+    render_session_comparison_page_fn: Callable | None = None,
+    render_timeseries_page_fn: Callable | None = None,
+    render_win_loss_page_fn: Callable | None = None,
+    render_teammates_page_fn: Callable | None = None,
+    render_match_history_page_fn: Callable | None = None,
+    render_media_tab_fn: Callable | None = None,
+    render_career_page_fn: Callable | None = None,
+    render_settings_page_fn: Callable | None = None,
     # Fonctions utilitaires
     cached_compute_sessions_db_fn: Callable,
     top_medals_fn: Callable,
     build_friends_opts_map_fn: Callable,
     assign_player_colors_fn: Callable,
-    plot_multi_metric_bars_fn: Callable,
+    plot_multi_metric_bars_fn: Callable | None = None,
     get_local_dbs_fn: Callable,
     clear_caches_fn: Callable,
+    filter_cube: pl.DataFrame | None = None,
 ) -> None:
-    """Dispatch vers la page appropriée."""
+    """Dispatch vers la page appropriée.
+
+    Les fonctions de rendu non fournies sont importées au premier affichage
+    de leur page (``load_page_renderer``) : le premier rendu ne charge que la
+    page demandée.
+
+    ``filter_cube`` est la tranche du cube pré-agrégé pour les filtres
+    courants (None en mode Sessions ou si le cube est indisponible).
+    """
+    # Les figures mises en cache sont liées à l'état de la DB joueur
+    set_figure_cache_generation((db_path, db_key))
+
     # Les fonctions de rendu attendent encore pandas, donc on garde df en l'état
     # La conversion se fera progressivement au niveau de chaque page
 
     if page == "Dernier match":
+        render_last_match_page_fn = render_last_match_page_fn or load_page_renderer(
+            "render_last_match_page"
+        )
         render_last_match_page_fn(dff=dff, **match_view_params)
 
     elif page == "Match":
+        render_match_search_page_fn = render_match_search_page_fn or load_page_renderer(
+            "render_match_search_page"
+        )
         render_match_search_page_fn(df=df, dff=dff, **match_view_params)
 
     elif page == "Citations":
+        render_citations_page_fn = render_citations_page_fn or load_page_renderer(
+            "render_citations_page"
+        )
         render_citations_page_fn(
             dff=dff,
             df_full=df,
@@ -190,12 +244,21 @@ def dispatch_page(
             )
         else:
             sessions_for_compare = all_sessions_pl
+        render_session_comparison_page_fn = render_session_comparison_page_fn or load_page_renderer(
+            "render_session_comparison_page"
+        )
         render_session_comparison_page_fn(sessions_for_compare, df_full=df)
 
     elif page == "Séries temporelles":
+        render_timeseries_page_fn = render_timeseries_page_fn or load_page_renderer(
+            "render_timeseries_page"
+        )
         render_timeseries_page_fn(dff, df_full=df, db_path=db_path, xuid=xuid)
 
     elif page == "Victoires/Défaites":
+        render_win_loss_page_fn = render_win_loss_page_fn or load_page_renderer(
+            "render_win_loss_page"
+        )
         render_win_loss_page_fn(
             dff=dff,
             base=base,
@@ -203,9 +266,17 @@ def dispatch_page(
             db_path=db_path,
             xuid=xuid,
             db_key=db_key,
+            filter_cube=filter_cube,
         )
 
     elif page == "Mes coéquipiers":
+        render_teammates_page_fn = render_teammates_page_fn or load_page_renderer(
+            "render_teammates_page"
+        )
+        if plot_multi_metric_bars_fn is None:
+            from src.visualization import plot_multi_metric_bars_by_match
+
+            plot_multi_metric_bars_fn = plot_multi_metric_bars_by_match
         render_teammates_page_fn(
             df=df,
             dff=dff,
@@ -226,6 +297,9 @@ def dispatch_page(
         )
 
     elif page == "Historique des parties":
+        render_match_history_page_fn = render_match_history_page_fn or load_page_renderer(
+            "render_match_history_page"
+        )
         render_match_history_page_fn(
             dff=dff,
             waypoint_player=waypoint_player,
@@ -236,12 +310,14 @@ def dispatch_page(
         )
 
     elif page == "Médias" or page == "Bibliothèque médias":
+        render_media_tab_fn = render_media_tab_fn or load_page_renderer("render_media_tab")
         render_media_tab_fn(
             df_full=df,
             settings=settings,
         )
 
     elif page == "Carrière":
+        render_career_page_fn = render_career_page_fn or load_page_renderer("render_career_page")
         render_career_page_fn(
             db_path=db_path,
             xuid=xuid,
@@ -249,6 +325,9 @@ def dispatch_page(
         )
 
     elif page == "Paramètres":
+        render_settings_page_fn = render_settings_page_fn or load_page_renderer(
+            "render_settings_page"
+        )
         render_settings_page_fn(
             settings,
             get_local_dbs_fn=get_local_dbs_fn,
@@ -26,7 +26,7 @@ from src.ui import (
     get_hero_html,
     get_profile_appearance,
 )
-from src.ui.player_assets import download_image_to_cache, ensure_local_image_path
+from src.ui.player_assets import prefetch_error, resolve_or_prefetch_images
 from src.utils import parse_xuid_input, resolve_xuid_from_db
 
 # =============================================================================
@@ -253,24 +253,20 @@ def load_profile_assets(
     ):
         ensure_spnkr_tokens(timeout_seconds=12)
 
-    # Téléchargement/résolution des chemins
-    banner_path = ensure_local_image_path(
-        banner_value, prefix="banner", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    emblem_path = ensure_local_image_path(
-        emblem_value, prefix="emblem", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    backdrop_path = ensure_local_image_path(
-        backdrop_value, prefix="backdrop", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
-    )
-    nameplate_path = ensure_local_image_path(
-        nameplate_value,
-        prefix="nameplate",
-        download_enabled=dl_enabled,
-        auto_refresh_hours=refresh_h,
-    )
-    rank_icon_path = ensure_local_image_path(
-        rank_icon_value, prefix="rank", download_enabled=dl_enabled, auto_refresh_hours=refresh_h
+    # Chemins en cache tout de suite; les images manquantes sont téléchargées
+    # en arrière-plan (rendu non bloquant) et apparaîtront au prochain rendu.
+    banner_path, emblem_path, backdrop_path, nameplate_path, rank_icon_path = (
+        resolve_or_prefetch_images(
+            [
+                (banner_value, "banner"),
+                (emblem_value, "emblem"),
+                (backdrop_value, "backdrop"),
+                (nameplate_value, "nameplate"),
+                (rank_icon_value, "rank"),
+            ],
+            download_enabled=dl_enabled,
+            auto_refresh_hours=refresh_h,
+        )
     )
 
     assets = ProfileAssets(
@@ -315,13 +311,15 @@ def warn_missing_assets(
             return
         if path:
             return
+        # Le téléchargement se fait en arrière-plan: on ne signale que les échecs connus.
+        err = prefetch_error(u, prefix=prefix)
+        if not err:
+            return
         key = f"_warned_asset_{prefix}_{hash(u)}"
         if st.session_state.get(key):
             return
         st.session_state[key] = True
-        ok, err, _out = download_image_to_cache(u, prefix=prefix, timeout_seconds=12)
-        if not ok:
-            st.caption(f"Asset '{prefix}' non téléchargé: {err}")
+        st.caption(f"Asset '{prefix}' non téléchargé: {err}")
 
     _warn_asset("backdrop", backdrop_value, backdrop_path)
     _warn_asset("rank", rank_icon_value, rank_icon_path)
@@ -277,6 +277,9 @@ class PlotConfig:
     bar_opacity_secondary: float = 0.65
     line_width: float = 2.2
 
+    # Budget de points par série temporelle (LTTB + enveloppe min/max, 0 = désactivé)
+    max_points: int = 2000
+
     margin_left: int = 40
     margin_right: int = 20
     margin_top: int = 30
@@ -26,42 +26,32 @@ Usage explicite:
     )
 """
 
-# Import différé de l'intégration UI (évite de charger streamlit_bridge/pandas
-# pour les scripts CLI comme backfill_data.py qui n'en ont pas besoin)
-_INTEGRATION_SYMBOLS = (
-    "get_analytics_for_ui",
-    "get_repository_for_player",
-    "get_repository_for_ui",
-    "get_repository_mode_from_settings",
-    "get_trends_for_ui",
-    "load_matches_df",
-    "matches_to_dataframe",
-)
-
-
-def __getattr__(name: str):
-    if name in _INTEGRATION_SYMBOLS:
-        from src.data.integration import (
-            get_analytics_for_ui,
-            get_repository_for_player,
-            get_repository_for_ui,
-            get_repository_mode_from_settings,
-            get_trends_for_ui,
-            load_matches_df,
-            matches_to_dataframe,
-        )
-
-        return locals()[name]
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
-
+# Imports différés : le repository (DuckDB) et l'intégration UI
+# (streamlit_bridge/pandas) ne sont chargés qu'au premier accès, ce qui évite
+# de les payer pour ``import src.data.domain.models`` ou les scripts CLI.
+from src.utils.lazy_imports import lazy_exports
 
-from src.data.repositories.factory import (
-    RepositoryMode,
-    get_repository,
-    get_repository_from_profile,
-    load_db_profiles,
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.data.repositories.factory": (
+            "RepositoryMode",
+            "get_repository",
+            "get_repository_from_profile",
+            "load_db_profiles",
+        ),
+        "src.data.repositories.protocol": ("DataRepository",),
+        "src.data.integration": (
+            "get_analytics_for_ui",
+            "get_repository_for_player",
+            "get_repository_for_ui",
+            "get_repository_mode_from_settings",
+            "get_trends_for_ui",
+            "load_matches_df",
+            "matches_to_dataframe",
+        ),
+    },
 )
-from src.data.repositories.protocol import DataRepository
 
 __all__ = [
     # Core
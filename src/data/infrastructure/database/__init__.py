@@ -5,6 +5,9 @@ Connecteurs de base de données.
 Ce module fournit :
 - DuckDBEngine : Moteur DuckDB pour requêtes analytiques
 - DuckDBConfig : Configuration centralisée DuckDB
+- snapshots : Snapshots publiés pour les lecteurs (import direct du module)
+- shared_partitions : Partitions par période de shared_matches.duckdb (import direct)
+- teammate_index : Index de co-présence des joueurs dans shared (import direct)
 """
 
 from src.data.infrastructure.database.duckdb_config import (
@@ -0,0 +1,630 @@
+"""Partitions par période de shared_matches.duckdb (historique ancien en lecture seule).
+(Period partitions of shared_matches.duckdb: old history kept read-only)
+
+HOW IT WORKS:
+1. ``shared_matches.duckdb`` reste la partition courante : la sync y écrit
+   comme avant, et les tables globales (xuid_aliases, radar_*, ...) n'en
+   sortent jamais
+2. ``split_shared_db`` déplace les matchs antérieurs à un cutoff (début de
+   l'année courante par défaut) vers ``shared_partitions/shared_<clé>.duckdb``
+   (une par année ou trimestre) : toutes les lignes des tables
+   ``PARTITIONED_TABLES`` liées au match suivent son ``start_time``. Les
+   fichiers sont écrits et détachés, puis enregistrés dans
+   ``shared_partitions/partitions.json`` (point de validation), et seulement
+   ensuite supprimés de la partition courante. Avec OPENSPARTAN_DB_SNAPSHOTS,
+   un nouveau snapshot de la partition courante est publié dans la foulée :
+   le précédent contient encore les matchs déplacés
+3. Une partition fermée est en lecture seule (fichier en 0o444). Une
+   nouvelle exécution y fusionne les lignes arrivées plus tard pour ses
+   matchs (backfill), qui remplacent les lignes de même clé primaire :
+   l'opération est idempotente et reprend un split interrompu
+4. ``attach_shared`` remplace ``ATTACH ... AS shared`` : sans partition,
+   c'est le même ATTACH qu'avant. Sinon la partition courante et les
+   partitions fermées qui chevauchent [start, end[ sont attachées en lecture
+   seule, et ``shared`` devient un catalogue en mémoire dont chaque table est
+   une vue ``UNION ALL BY NAME`` sur ces fichiers. Les requêtes existantes
+   (``shared.match_registry``...) sont inchangées ; un filtre sur
+   ``start_time`` est écarté des partitions hors plage par les statistiques
+   de colonne DuckDB, et une plage passée à l'ATTACH n'ouvre même pas les
+   autres fichiers
+5. ``compact_partition`` réécrit une partition fermée (COPY FROM DATABASE)
+   et ``export_partition`` la sort en Parquet (une table par fichier)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import stat
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.data.infrastructure.database.snapshots import publish_written
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+PARTITION_DIR_NAME = "shared_partitions"
+MANIFEST_FILENAME = "partitions.json"
+MANIFEST_VERSION = 1
+
+# Tables dont les lignes suivent le match (clé match_id) ; les autres restent courantes
+PARTITIONED_TABLES = (
+    "match_registry",
+    "match_participants",
+    "highlight_events",
+    "medals_earned",
+    "killer_victim_pairs",
+)
+GRANULARITIES = ("year", "quarter")
+
+_READ_ONLY_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+_WRITABLE_MODE = _READ_ONLY_MODE | stat.S_IWUSR
+
+
+@dataclass
+class PartitionEntry:
+    """
+    Une partition fermée et ses statistiques.
+    (A closed partition and its statistics)
+    """
+
+    key: str
+    file: str
+    match_count: int = 0
+    min_start_time: str | None = None
+    max_start_time: str | None = None
+    size_bytes: int | None = None
+    closed_at: str | None = None
+    table_rows: dict[str, int] = field(default_factory=dict)
+
+    def overlaps(self, start: datetime | None, end: datetime | None) -> bool:
+        """Indique si la partition peut contenir des matchs dans [start, end[."""
+        if self.min_start_time is None or self.max_start_time is None:
+            return True
+        if end is not None and datetime.fromisoformat(self.min_start_time) >= _naive(end):
+            return False
+        return not (
+            start is not None and datetime.fromisoformat(self.max_start_time) < _naive(start)
+        )
+
+
+def _naive(value: datetime) -> datetime:
+    """shared stocke des TIMESTAMP naïfs (UTC) : on compare sans tz."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def partition_dir(shared_db_path: Path | str) -> Path:
+    """Dossier des partitions fermées (à côté de shared_matches.duckdb)."""
+    return Path(shared_db_path).parent / PARTITION_DIR_NAME
+
+
+def partition_key(start_time: datetime, granularity: str = "year") -> str:
+    """Clé de partition d'un match : ``2024`` ou ``2024_Q1``."""
+    if granularity == "quarter":
+        return f"{start_time.year}_Q{(start_time.month - 1) // 3 + 1}"
+    return str(start_time.year)
+
+
+def period_start(value: datetime, granularity: str = "year") -> datetime:
+    """Début de la période contenant `value` (cutoff par défaut du split)."""
+    value = _naive(value)
+    month = 1 if granularity == "year" else 3 * ((value.month - 1) // 3) + 1
+    return datetime(value.year, month, 1)
+
+
+def _key_sql(granularity: str) -> str:
+    if granularity == "quarter":
+        return "CAST(year(start_time) AS VARCHAR) || '_Q' || CAST(quarter(start_time) AS VARCHAR)"
+    return "CAST(year(start_time) AS VARCHAR)"
+
+
+class PartitionManifest:
+    """
+    Catalogue des partitions fermées (``partitions.json``).
+    (Catalog of the closed partitions)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        entries: list[PartitionEntry] | None = None,
+        *,
+        granularity: str = "year",
+        generation: int = 0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.entries = entries or []
+        self.granularity = granularity
+        self.generation = generation
+
+    @property
+    def path(self) -> Path:
+        return self.directory / MANIFEST_FILENAME
+
+    @classmethod
+    def load(cls, shared_db_path: Path | str) -> PartitionManifest:
+        """Charge le catalogue de `shared_db_path` (vide si absent ou illisible)."""
+        manifest = cls(partition_dir(shared_db_path))
+        if not manifest.path.exists():
+            return manifest
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                data = json.load(f)
+            known = {f.name for f in fields(PartitionEntry)}
+            manifest.entries = [
+                PartitionEntry(**{k: v for k, v in raw.items() if k in known})
+                for raw in data.get("partitions", [])
+                if raw.get("key") and raw.get("file")
+            ]
+            manifest.granularity = data.get("granularity", "year")
+            manifest.generation = int(data.get("generation", 0))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Catalogue de partitions illisible {manifest.path}: {e}")
+        return manifest
+
+    def get(self, key: str) -> PartitionEntry | None:
+        return next((e for e in self.entries if e.key == key), None)
+
+    def files_for_range(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[tuple[PartitionEntry, Path]]:
+        """Partitions existantes dont la plage ``start_time`` chevauche [start, end[."""
+        selected = []
+        for entry in self.entries:
+            path = self.directory / entry.file
+            if not entry.overlaps(start, end):
+                continue
+            if not path.exists():
+                logger.warning(f"Partition shared absente: {path}")
+                continue
+            selected.append((entry, path))
+        return selected
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "granularity": self.granularity,
+            "generation": self.generation,
+            "partitions": [asdict(e) for e in self.entries],
+        }
+
+    def save(self) -> None:
+        """Écrit ``partitions.json`` de façon atomique (nouvelle génération)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.generation += 1
+        self.entries.sort(key=lambda e: e.key)
+        tmp = self.path.with_name(f".{MANIFEST_FILENAME}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp, self.path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+
+# =============================================================================
+# Lecture : couche de vues à l'ATTACH
+# =============================================================================
+
+
+def _sql_path(path: Path | str) -> str:
+    return str(path).replace("'", "''")
+
+
+def _tables(conn: duckdb.DuckDBPyConnection, catalog: str) -> list[str]:
+    rows = conn.execute(
+        "SELECT table_name FROM information_schema.tables "
+        "WHERE table_catalog = ? AND table_schema = 'main' ORDER BY table_name",
+        [catalog],
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def attach_partitions(
+    conn: duckdb.DuckDBPyConnection,
+    shared_db_path: Path | str,
+    *,
+    prefix: str = "shared",
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[str]:
+    """ATTACH en lecture seule des partitions fermées qui chevauchent [start, end[.
+
+    Returns:
+        Les alias attachés (``<prefix>_p<clé>``), du plus ancien au plus récent.
+    """
+    aliases = []
+    for entry, path in PartitionManifest.load(shared_db_path).files_for_range(start, end):
+        alias = f"{prefix}_p{entry.key}"
+        conn.execute(f"ATTACH '{_sql_path(path)}' AS {alias} (READ_ONLY)")
+        aliases.append(alias)
+    return aliases
+
+
+def attach_shared(
+    conn: duckdb.DuckDBPyConnection,
+    shared_db_path: Path | str,
+    *,
+    alias: str = "shared",
+    read_path: Path | str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[str]:
+    """ATTACH shared (lecture seule), partitions fermées comprises.
+
+    Sans partition fermée, équivaut à ``ATTACH '<shared>' AS <alias> (READ_ONLY)``.
+    Sinon `alias` est un catalogue en mémoire de vues sur la partition
+    courante (``<alias>_hot``) et les partitions ``<alias>_p<clé>``.
+
+    Args:
+        conn: Connexion DuckDB.
+        shared_db_path: shared_matches.duckdb (fichier de travail : situe les partitions).
+        alias: Nom du catalogue exposé aux requêtes.
+        read_path: Fichier à ouvrir pour la partition courante (snapshot publié).
+        start: Ignore les partitions fermées entièrement avant `start`.
+        end: Ignore les partitions fermées entièrement à partir de `end`.
+
+    Returns:
+        Catalogues attachés, à passer à ``detach_shared``.
+    """
+    hot_path = Path(read_path or shared_db_path)
+    if not PartitionManifest.load(shared_db_path).entries:
+        conn.execute(f"ATTACH '{_sql_path(hot_path)}' AS {alias} (READ_ONLY)")
+        return [alias]
+
+    hot = f"{alias}_hot"
+    attached: list[str] = []
+    try:
+        conn.execute(f"ATTACH '{_sql_path(hot_path)}' AS {hot} (READ_ONLY)")
+        attached.append(hot)
+        closed = attach_partitions(conn, shared_db_path, prefix=alias, start=start, end=end)
+        attached.extend(closed)
+        # READ_WRITE explicite : une connexion read_only attache en lecture seule par défaut
+        conn.execute(f"ATTACH ':memory:' AS {alias} (READ_WRITE)")
+        attached.append(alias)
+
+        closed_tables = {p: set(_tables(conn, p)) for p in closed}
+        for table in _tables(conn, hot):
+            sources = [hot]
+            if table in PARTITIONED_TABLES:
+                sources += [p for p in closed if table in closed_tables[p]]
+            union = " UNION ALL BY NAME ".join(f"SELECT * FROM {s}.main.{table}" for s in sources)
+            conn.execute(f"CREATE VIEW {alias}.main.{table} AS {union}")
+    except Exception:
+        detach_shared(conn, attached)
+        raise
+    logger.debug(f"shared attaché avec {len(closed)} partition(s) fermée(s)")
+    return attached
+
+
+def detach_shared(conn: duckdb.DuckDBPyConnection, aliases: list[str]) -> None:
+    """DETACH des catalogues retournés par ``attach_shared`` (erreurs ignorées)."""
+    for name in reversed(aliases):
+        with contextlib.suppress(Exception):
+            conn.execute(f"DETACH {name}")
+
+
+# =============================================================================
+# Écriture : split, compaction, export
+# =============================================================================
+
+
+def _set_read_only(path: Path, read_only: bool) -> None:
+    with contextlib.suppress(OSError):
+        os.chmod(path, _READ_ONLY_MODE if read_only else _WRITABLE_MODE)
+
+
+def _columns(conn: duckdb.DuckDBPyConnection, catalog: str, table: str) -> dict[str, str]:
+    rows = conn.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_catalog = ? AND table_schema = 'main' AND table_name = ? "
+        "ORDER BY ordinal_position",
+        [catalog, table],
+    ).fetchall()
+    return dict(rows)
+
+
+def _primary_key(conn: duckdb.DuckDBPyConnection, catalog: str, table: str) -> list[str]:
+    row = conn.execute(
+        "SELECT constraint_column_names FROM duckdb_constraints() "
+        "WHERE database_name = ? AND table_name = ? AND constraint_type = 'PRIMARY KEY'",
+        [catalog, table],
+    ).fetchone()
+    return list(row[0]) if row else []
+
+
+def _copy_table(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    target: str,
+    table: str,
+) -> int:
+    """Copie vers `target` les lignes de `table` des matchs de ``_moving_batch``.
+
+    Les lignes que `target` possédait déjà sont remplacées : même clé primaire
+    (clé de `source`), ou même match pour les tables sans clé.
+    """
+    selection = f"FROM {source}.main.{table} WHERE match_id IN (SELECT match_id FROM _moving_batch)"
+    target_columns = _columns(conn, target, table)
+    if not target_columns:
+        conn.execute(
+            f"CREATE TABLE {target}.main.{table} AS SELECT * {selection} ORDER BY match_id"
+        )
+        _copy_indexes(conn, source, target, table)
+    else:
+        for name, data_type in _columns(conn, source, table).items():
+            if name not in target_columns:
+                conn.execute(f'ALTER TABLE {target}.main.{table} ADD COLUMN "{name}" {data_type}')
+        key = ", ".join(f'"{c}"' for c in _primary_key(conn, source, table) or ["match_id"])
+        conn.execute(
+            f"DELETE FROM {target}.main.{table} WHERE ({key}) IN (SELECT ({key}) {selection})"
+        )
+        conn.execute(f"INSERT INTO {target}.main.{table} BY NAME SELECT * {selection}")
+    return conn.execute(f"SELECT COUNT(*) {selection}").fetchone()[0]
+
+
+def _copy_indexes(conn: duckdb.DuckDBPyConnection, source: str, target: str, table: str) -> None:
+    """Recrée dans `target` les index secondaires de `table` (lookups par xuid, match)."""
+    rows = conn.execute(
+        "SELECT sql FROM duckdb_indexes() WHERE database_name = ? AND table_name = ? "
+        "AND sql IS NOT NULL",
+        [source, table],
+    ).fetchall()
+    if not rows:
+        return
+    current = conn.execute("SELECT current_database()").fetchone()[0]
+    conn.execute(f"USE {target}")
+    try:
+        for (sql,) in rows:
+            try:
+                conn.execute(sql)
+            except Exception as e:
+                logger.debug(f"Index non recréé dans {target}.{table}: {e}")
+    finally:
+        conn.execute(f"USE {current}")
+
+
+def _partition_stats(conn: duckdb.DuckDBPyConnection, catalog: str) -> dict[str, Any]:
+    count, min_start, max_start = conn.execute(
+        f"SELECT COUNT(*), MIN(start_time), MAX(start_time) FROM {catalog}.main.match_registry"
+    ).fetchone()
+    return {
+        "match_count": int(count or 0),
+        "min_start_time": min_start.isoformat() if min_start else None,
+        "max_start_time": max_start.isoformat() if max_start else None,
+        "table_rows": {
+            t: conn.execute(f"SELECT COUNT(*) FROM {catalog}.main.{t}").fetchone()[0]
+            for t in _tables(conn, catalog)
+        },
+    }
+
+
+def _collect_moving(
+    conn: duckdb.DuckDBPyConnection,
+    shared_db_path: Path,
+    manifest: PartitionManifest,
+    cutoff: datetime,
+    granularity: str,
+    tables: list[str],
+) -> None:
+    """Remplit ``_moving(match_id, pkey)`` : matchs à sortir de la partition courante.
+
+    Comprend les matchs du registre antérieurs au cutoff et les lignes
+    arrivées après coup pour des matchs déjà dans une partition fermée.
+    """
+    conn.execute(
+        f"CREATE OR REPLACE TEMP TABLE _moving AS "
+        f"SELECT match_id, {_key_sql(granularity)} AS pkey FROM match_registry "
+        f"WHERE start_time < ?",
+        [cutoff],
+    )
+    others = [t for t in tables if t != "match_registry"]
+    if not manifest.entries or not others:
+        return
+    orphans = " UNION ".join(f"SELECT match_id FROM main.{t}" for t in others)
+    closed = attach_partitions(conn, shared_db_path, prefix="_split")
+    try:
+        for alias in closed:
+            key = alias.removeprefix("_split_p")
+            conn.execute(
+                f"INSERT INTO _moving "
+                f"SELECT DISTINCT r.match_id, '{key}' FROM {alias}.main.match_registry r "
+                f"WHERE r.match_id IN ({orphans}) "
+                f"AND r.match_id NOT IN (SELECT match_id FROM _moving)"
+            )
+    finally:
+        detach_shared(conn, closed)
+
+
+def split_shared_db(
+    shared_db_path: Path | str,
+    *,
+    before: datetime | None = None,
+    granularity: str | None = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Déplace les matchs antérieurs à `before` vers les partitions fermées.
+
+    Args:
+        shared_db_path: shared_matches.duckdb (ouvert en écriture : aucune sync en cours).
+        before: Cutoff (défaut : début de la période courante).
+        granularity: ``year`` ou ``quarter`` (défaut : celle du catalogue).
+        dry_run: Compte seulement les matchs par partition.
+
+    Returns:
+        Dict avec 'cutoff', 'granularity', 'partitions' ({clé: matchs déplacés})
+        et 'rows_moved' ({table: lignes}).
+    """
+    import duckdb
+
+    shared_db_path = Path(shared_db_path)
+    manifest = PartitionManifest.load(shared_db_path)
+    if granularity is None:
+        granularity = manifest.granularity
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularité inconnue: {granularity}")
+    if manifest.entries and granularity != manifest.granularity:
+        raise ValueError(
+            f"Les partitions existantes sont par '{manifest.granularity}', pas '{granularity}'"
+        )
+    manifest.granularity = granularity
+    cutoff = _naive(before) if before else period_start(datetime.now(timezone.utc), granularity)
+    report: dict[str, Any] = {
+        "cutoff": cutoff.isoformat(),
+        "granularity": granularity,
+        "partitions": {},
+        "rows_moved": {},
+    }
+
+    conn = duckdb.connect(str(shared_db_path))
+    try:
+        hot = conn.execute("SELECT current_database()").fetchone()[0]
+        tables = [t for t in PARTITIONED_TABLES if t in _tables(conn, hot)]
+        if "match_registry" not in tables:
+            raise ValueError(f"{shared_db_path} n'a pas de table match_registry")
+
+        _collect_moving(conn, shared_db_path, manifest, cutoff, granularity, tables)
+        counts = conn.execute(
+            "SELECT pkey, COUNT(*) FROM _moving GROUP BY pkey ORDER BY pkey"
+        ).fetchall()
+        report["partitions"] = dict(counts)
+        if dry_run or not counts:
+            return report
+
+        directory = partition_dir(shared_db_path)
+        directory.mkdir(parents=True, exist_ok=True)
+        for key, _ in counts:
+            path = directory / f"shared_{key}.duckdb"
+            if path.exists():
+                _set_read_only(path, False)
+            conn.execute(
+                "CREATE OR REPLACE TEMP TABLE _moving_batch AS "
+                "SELECT match_id FROM _moving WHERE pkey = ?",
+                [key],
+            )
+            conn.execute(f"ATTACH '{_sql_path(path)}' AS _part")
+            try:
+                for table in tables:
+                    moved = _copy_table(conn, hot, "_part", table)
+                    report["rows_moved"][table] = report["rows_moved"].get(table, 0) + moved
+                stats = _partition_stats(conn, "_part")
+                conn.execute("CHECKPOINT _part")
+            finally:
+                conn.execute("DETACH _part")
+            _set_read_only(path, True)
+
+            entry = manifest.get(key)
+            if entry is None:
+                entry = PartitionEntry(key=key, file=path.name)
+                manifest.entries.append(entry)
+            entry.match_count = stats["match_count"]
+            entry.min_start_time = stats["min_start_time"]
+            entry.max_start_time = stats["max_start_time"]
+            entry.table_rows = stats["table_rows"]
+            entry.size_bytes = path.stat().st_size
+            entry.closed_at = datetime.now().isoformat()
+            logger.info(f"Partition {key}: {entry.match_count} matchs ({path.name})")
+
+        # Point de validation : à partir d'ici les lecteurs voient les partitions
+        manifest.save()
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            for table in tables:
+                conn.execute(
+                    f"DELETE FROM main.{table} WHERE match_id IN (SELECT match_id FROM _moving)"
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("CHECKPOINT")
+        # Sinon les lecteurs unissent l'ancien snapshot et les partitions (doublons)
+        publish_written((shared_db_path, conn))
+    finally:
+        conn.close()
+
+    return report
+
+
+def _rewrite_database(source: Path) -> None:
+    """Réécrit `source` par COPY FROM DATABASE (récupère l'espace des lignes supprimées)."""
+    import duckdb
+
+    tmp = source.with_name(f".{source.name}.{uuid.uuid4().hex}.tmp")
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute(f"ATTACH '{_sql_path(source)}' AS _src (READ_ONLY)")
+        conn.execute(f"ATTACH '{_sql_path(tmp)}' AS _dst")
+        conn.execute("COPY FROM DATABASE _src TO _dst")
+        conn.execute("DETACH _dst")
+        conn.execute("DETACH _src")
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp, source)
+
+
+def compact_partition(shared_db_path: Path | str, key: str) -> PartitionEntry:
+    """Réécrit une partition fermée (après fusions de backfill) et met à jour sa taille."""
+    manifest = PartitionManifest.load(shared_db_path)
+    entry = manifest.get(key)
+    if entry is None:
+        raise KeyError(f"Partition inconnue: {key}")
+    path = manifest.directory / entry.file
+    _rewrite_database(path)
+    _set_read_only(path, True)
+    entry.size_bytes = path.stat().st_size
+    manifest.save()
+    return entry
+
+
+def compact_current(shared_db_path: Path | str) -> int:
+    """Réécrit la partition courante après un split (aucune connexion ouverte dessus).
+
+    Returns:
+        Taille du fichier après réécriture (octets).
+    """
+    path = Path(shared_db_path)
+    _rewrite_database(path)
+    return path.stat().st_size
+
+
+def export_partition(shared_db_path: Path | str, key: str, output_dir: Path | str) -> list[Path]:
+    """Exporte une partition fermée en Parquet (``<output_dir>/<table>.parquet``)."""
+    import duckdb
+
+    manifest = PartitionManifest.load(shared_db_path)
+    entry = manifest.get(key)
+    if entry is None:
+        raise KeyError(f"Partition inconnue: {key}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    conn = duckdb.connect(str(manifest.directory / entry.file), read_only=True)
+    try:
+        for table in _tables(conn, conn.execute("SELECT current_database()").fetchone()[0]):
+            target = output_dir / f"{table}.parquet"
+            conn.execute(
+                f"COPY (SELECT * FROM main.{table}) TO '{_sql_path(target)}' "
+                f"(FORMAT PARQUET, COMPRESSION ZSTD)"
+            )
+            written.append(target)
+    finally:
+        conn.close()
+    return written
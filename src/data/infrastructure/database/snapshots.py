@@ -0,0 +1,300 @@
+"""Snapshots publiés des bases DuckDB (lecteurs jamais bloqués par une sync).
+(Published DuckDB snapshots: readers are never blocked by a running sync)
+
+HOW IT WORKS:
+1. Le moteur de sync écrit dans le fichier de travail (stats.duckdb,
+   shared_matches.duckdb) comme avant, avec sa connexion lecture/écriture
+2. En fin d'écriture (sync, backfill, scripts de maintenance),
+   ``publish_written`` appelle ``publish_snapshot`` qui fait un CHECKPOINT puis
+   copie le fichier vers ``.snapshots/<nom>.g<génération>.duckdb`` (copie temporaire +
+   rename atomique), puis remplace atomiquement le pointeur
+   ``.snapshots/<nom>.current`` qui contient le numéro de génération. Le WAL
+   n'est jamais copié : si des écritures n'ont pas pu être reportées dans le
+   fichier (CHECKPOINT refusé, WAL non vide), la publication est reportée au
+   prochain ``publish_written``
+3. Les lecteurs (``connect_read_only``, ``DuckDBRepository`` en lecture seule)
+   ouvrent ``resolve_read_path(chemin)`` : la dernière génération publiée,
+   immuable, ou le fichier de travail si aucun snapshot n'existe. Ils
+   n'ouvrent jamais le fichier que la sync tient en écriture
+4. Les anciennes générations sont supprimées après publication si aucun
+   lecteur du processus ne les utilise (``reading``), si elles ont été
+   remplacées depuis plus de ``GC_GRACE_SECONDS`` (lecteurs d'autres
+   processus) et si le système accepte la suppression (Windows refuse de
+   supprimer un fichier encore ouvert : il sera retenté à la prochaine GC)
+
+La publication est activée par ``OPENSPARTAN_DB_SNAPSHOTS=1`` (serveur où
+l'UI tourne pendant les syncs). Sans snapshot publié, les lecteurs ouvrent
+le fichier de travail comme avant. Une fois un snapshot publié, les lecteurs
+ne voient plus le fichier de travail : tout point d'entrée qui écrit dans
+stats.duckdb ou shared_matches.duckdb doit donc finir par ``publish_written``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR_NAME = ".snapshots"
+# Générations conservées en plus de celles en cours de lecture
+KEEP_GENERATIONS = 2
+# Délai avant suppression d'une génération remplacée (lecteurs d'autres processus)
+GC_GRACE_SECONDS = 600.0
+
+_readers: Counter[Path] = Counter()
+_readers_lock = threading.Lock()
+
+
+def snapshots_enabled() -> bool:
+    """True si la publication de snapshots est activée (OPENSPARTAN_DB_SNAPSHOTS)."""
+    value = os.environ.get("OPENSPARTAN_DB_SNAPSHOTS", "")
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def snapshot_dir(db_path: Path | str) -> Path:
+    """Dossier des snapshots d'une base (à côté du fichier de travail)."""
+    return Path(db_path).parent / SNAPSHOT_DIR_NAME
+
+
+def _pointer_path(db_path: Path) -> Path:
+    return snapshot_dir(db_path) / f"{db_path.stem}.current"
+
+
+def generation_path(db_path: Path | str, generation: int) -> Path:
+    """Chemin du snapshot `generation` de `db_path`."""
+    db_path = Path(db_path)
+    return snapshot_dir(db_path) / f"{db_path.stem}.g{generation:06d}{db_path.suffix}"
+
+
+def _generation_re(db_path: Path) -> re.Pattern[str]:
+    return re.compile(rf"^{re.escape(db_path.stem)}\.g(\d+){re.escape(db_path.suffix)}$")
+
+
+def current_generation(db_path: Path | str) -> int | None:
+    """Dernière génération publiée de `db_path`, ou None."""
+    db_path = Path(db_path)
+    try:
+        generation = int(_pointer_path(db_path).read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+    return generation if generation_path(db_path, generation).exists() else None
+
+
+def resolve_read_path(db_path: Path | str) -> Path:
+    """Fichier à ouvrir en lecture : dernier snapshot publié, sinon le fichier de travail."""
+    db_path = Path(db_path)
+    generation = current_generation(db_path)
+    return db_path if generation is None else generation_path(db_path, generation)
+
+
+def acquire(db_path: Path | str) -> Path:
+    """Réserve le dernier snapshot pour une lecture (non supprimé par la GC du processus)."""
+    path = resolve_read_path(db_path)
+    with _readers_lock:
+        _readers[path] += 1
+    return path
+
+
+def release(path: Path) -> None:
+    """Libère un snapshot réservé par `acquire`."""
+    with _readers_lock:
+        _readers[path] -= 1
+        if _readers[path] <= 0:
+            del _readers[path]
+
+
+@contextlib.contextmanager
+def reading(db_path: Path | str) -> Iterator[Path]:
+    """Contexte de lecture : chemin du dernier snapshot, réservé jusqu'à la sortie."""
+    path = acquire(db_path)
+    try:
+        yield path
+    finally:
+        release(path)
+
+
+def connect_read_only(db_path: Path | str, **kwargs) -> duckdb.DuckDBPyConnection:
+    """Connexion DuckDB en lecture seule sur le dernier snapshot publié de `db_path`."""
+    import duckdb
+
+    return duckdb.connect(str(resolve_read_path(db_path)), read_only=True, **kwargs)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def publish_snapshot(
+    db_path: Path | str,
+    conn: duckdb.DuckDBPyConnection | None = None,
+) -> int | None:
+    """Publie une nouvelle génération immuable de `db_path`.
+
+    Args:
+        db_path: Fichier de travail (DuckDB).
+        conn: Connexion d'écriture ouverte sur `db_path` : un CHECKPOINT reporte
+            le WAL dans le fichier avant la copie. L'appelant ne doit pas écrire
+            pendant la publication.
+
+    Returns:
+        Numéro de la génération publiée, ou None si le fichier n'existe pas ou
+        si le WAL n'a pas pu être reporté (copie non cohérente, rien n'est publié).
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return None
+    if conn is not None:
+        try:
+            conn.execute("CHECKPOINT")
+        except Exception as e:
+            # Transaction ouverte ailleurs : le fichier seul serait incomplet
+            logger.warning(f"CHECKPOINT impossible, publication de {db_path.name} reportée: {e}")
+            return None
+    wal = _wal_path(db_path)
+    if wal.exists() and wal.stat().st_size > 0:
+        logger.warning(f"WAL non reporté, publication de {db_path.name} reportée")
+        return None
+
+    target_dir = snapshot_dir(db_path)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    generation = (
+        max([current_generation(db_path) or 0, *(g for g, _ in _list_generations(db_path))]) + 1
+    )
+    final = generation_path(db_path, generation)
+    _copy_atomic(db_path, final)
+    _write_atomic(_pointer_path(db_path), str(generation))
+    logger.debug(f"Snapshot publié: {final}")
+
+    collect_garbage(db_path)
+    return generation
+
+
+def _changed_since_publish(db_path: Path) -> bool:
+    """True si le fichier de travail (ou son WAL) est plus récent que la dernière génération."""
+    generation = current_generation(db_path)
+    if generation is None:
+        return True
+    published = generation_path(db_path, generation).stat().st_mtime
+    wal = _wal_path(db_path)
+    return db_path.stat().st_mtime > published or (wal.exists() and wal.stat().st_mtime > published)
+
+
+def publish_written(
+    *targets: Path | str | tuple[Path | str, duckdb.DuckDBPyConnection | None] | None,
+    always: bool = False,
+) -> dict[str, int]:
+    """Publie une génération de chaque base écrite, à appeler en fin d'écriture.
+
+    Sans effet si OPENSPARTAN_DB_SNAPSHOTS n'est pas actif. Les bases
+    inchangées depuis leur dernière génération ne sont pas recopiées.
+
+    Args:
+        targets: Chemins des bases écrites, ou tuples (chemin, connexion
+            d'écriture encore ouverte) pour publier sous le verrou de l'écrivain.
+            Les None sont ignorés.
+        always: Publie même si les snapshots sont désactivés ou la base inchangée.
+
+    Returns:
+        Dict {nom du fichier: génération publiée}.
+    """
+    if not always and not snapshots_enabled():
+        return {}
+    published: dict[str, int] = {}
+    for target in targets:
+        if target is None:
+            continue
+        path, conn = target if isinstance(target, tuple) else (target, None)
+        path = Path(path)
+        try:
+            if not path.exists() or (not always and not _changed_since_publish(path)):
+                continue
+            generation = publish_snapshot(path, conn)
+        except OSError as e:
+            logger.warning(f"Publication du snapshot {path.name} impossible: {e}")
+            continue
+        if generation is not None:
+            published[path.name] = generation
+    if published:
+        logger.info(f"Snapshots publiés: {published}")
+    return published
+
+
+def _wal_path(path: Path) -> Path:
+    return path.with_name(path.name + ".wal")
+
+
+def _copy_atomic(src: Path, dst: Path) -> None:
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+def _list_generations(db_path: Path) -> list[tuple[int, Path]]:
+    directory = snapshot_dir(db_path)
+    if not directory.is_dir():
+        return []
+    pattern = _generation_re(db_path)
+    found = []
+    for path in directory.iterdir():
+        m = pattern.match(path.name)
+        if m:
+            found.append((int(m.group(1)), path))
+    return sorted(found)
+
+
+def collect_garbage(
+    db_path: Path | str,
+    *,
+    keep: int = KEEP_GENERATIONS,
+    grace_seconds: float = GC_GRACE_SECONDS,
+) -> list[Path]:
+    """Supprime les générations remplacées qui ne sont plus lues.
+
+    Returns:
+        Les snapshots supprimés.
+    """
+    db_path = Path(db_path)
+    generations = _list_generations(db_path)
+    if len(generations) <= keep:
+        return []
+
+    with _readers_lock:
+        in_use = set(_readers)
+    now = time.time()
+    removed = []
+    # Une génération est « remplacée » depuis la création de la suivante
+    for (_, path), (_, successor) in zip(generations[:-keep], generations[1:], strict=False):
+        if path in in_use:
+            continue
+        try:
+            if now - successor.stat().st_mtime < grace_seconds:
+                continue
+            path.unlink()
+            _wal_path(path).unlink(missing_ok=True)
+        except OSError:
+            # Fichier encore ouvert (Windows) ou déjà supprimé : retenté plus tard
+            continue
+        removed.append(path)
+    return removed
@@ -0,0 +1,259 @@
+"""Index de co-présence des joueurs dans shared_matches.duckdb.
+
+Top coéquipiers et matchs « avec un ami » auto-joignaient
+``shared.match_participants`` sur (match_id, team_id) à chaque requête, et la
+page Coéquipiers / le mode ami des sessions rejouent cette jointure pour
+chaque ami.
+
+HOW IT WORKS:
+1. ``teammate_match_ordinals`` donne à chaque match indexé un ordinal entier
+   (un match y figure dès que ses paires sont dans l'index)
+2. ``teammate_pairs`` : une ligne par paire orientée (xuid_a, xuid_b,
+   same_team) avec le nombre de matchs et la liste triée de leurs ordinaux
+   (INTEGER[], 4 octets par match). Les deux sens sont stockés : toute
+   lecture est un lookup sur xuid_a
+3. ``update_teammate_index`` indexe les matchs de match_participants absents
+   des ordinaux (ou dont la signature d'équipes a changé : nombre de
+   participants et empreinte des paires (xuid, team_id)) : la sync et le
+   backfill (``insert_participant_rows``) l'appellent à chaque insertion de
+   participants (même transaction), et ``ensure_teammate_index`` rattrape
+   l'historique à l'ouverture de shared
+4. Les lecteurs (``DuckDBRepository``, sessions) lisent l'index si la table
+   existe et retombent sur l'auto-jointure sinon
+
+Les deux tables restent dans la partition courante : l'index couvre aussi les
+matchs déplacés dans les partitions fermées (voir shared_partitions.py).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+TEAMMATE_PAIRS_TABLE = "teammate_pairs"
+TEAMMATE_ORDINALS_TABLE = "teammate_match_ordinals"
+
+_DDL = f"""
+CREATE TABLE IF NOT EXISTS {TEAMMATE_ORDINALS_TABLE} (
+    match_id VARCHAR PRIMARY KEY,
+    ordinal INTEGER NOT NULL,
+    participant_count INTEGER NOT NULL,
+    team_signature UBIGINT
+);
+CREATE TABLE IF NOT EXISTS {TEAMMATE_PAIRS_TABLE} (
+    xuid_a VARCHAR NOT NULL,
+    xuid_b VARCHAR NOT NULL,
+    same_team BOOLEAN NOT NULL,
+    match_count INTEGER NOT NULL,
+    match_ordinals INTEGER[] NOT NULL,
+    PRIMARY KEY (xuid_a, xuid_b, same_team)
+);
+"""
+
+# Paires des matchs de _teammate_pending (même équipe : team_id égaux et non NULL)
+_NEW_PAIRS_SQL = """
+SELECT
+    a.xuid AS xuid_a,
+    b.xuid AS xuid_b,
+    COALESCE(a.team_id = b.team_id, FALSE) AS same_team,
+    COUNT(DISTINCT p.ordinal) AS match_count,
+    list_sort(list(DISTINCT p.ordinal)) AS match_ordinals
+FROM _teammate_pending p
+JOIN match_participants a ON a.match_id = p.match_id
+JOIN match_participants b ON b.match_id = p.match_id AND a.xuid <> b.xuid
+WHERE a.xuid IS NOT NULL AND a.xuid <> '' AND b.xuid IS NOT NULL AND b.xuid <> ''
+GROUP BY 1, 2, 3
+"""
+
+
+def teammate_index_exists(conn: duckdb.DuckDBPyConnection, catalog: str | None = None) -> bool:
+    """True si ``teammate_pairs`` existe (dans `catalog`, ou la base courante)."""
+    sql = "SELECT 1 FROM information_schema.tables WHERE table_name = ?"
+    params: list[str] = [TEAMMATE_PAIRS_TABLE]
+    if catalog is not None:
+        sql += " AND table_catalog = ?"
+        params.append(catalog)
+    else:
+        sql += " AND table_catalog = current_database()"
+    return conn.execute(sql, params).fetchone() is not None
+
+
+def ensure_teammate_index_columns(shared_conn: duckdb.DuckDBPyConnection) -> None:
+    """Ajoute ``team_signature`` à un index créé avant son introduction.
+
+    Les matchs déjà indexés gardent une signature NULL : ils sont réindexés
+    la prochaine fois qu'ils passent dans ``update_teammate_index``.
+    """
+    has_column = shared_conn.execute(
+        "SELECT 1 FROM information_schema.columns WHERE table_catalog = current_database() "
+        "AND table_name = ? AND column_name = 'team_signature'",
+        [TEAMMATE_ORDINALS_TABLE],
+    ).fetchone()
+    if has_column is None:
+        shared_conn.execute(
+            f"ALTER TABLE {TEAMMATE_ORDINALS_TABLE} ADD COLUMN team_signature UBIGINT"
+        )
+
+
+def ensure_teammate_index(shared_conn: duckdb.DuckDBPyConnection) -> int:
+    """Crée l'index s'il est absent et y rattrape les matchs non indexés.
+
+    Returns:
+        Nombre de matchs indexés.
+    """
+    if not teammate_index_exists(shared_conn):
+        shared_conn.execute(_DDL)
+    ensure_teammate_index_columns(shared_conn)
+    return update_teammate_index(shared_conn)
+
+
+def update_teammate_index(
+    shared_conn: duckdb.DuckDBPyConnection,
+    match_ids: Iterable[str] | None = None,
+) -> int:
+    """Indexe les matchs de match_participants nouveaux ou modifiés.
+
+    Idempotent : un match déjà indexé n'est recompté que s'il est passé dans
+    `match_ids` et que son nombre de participants ou sa signature d'équipes
+    (empreinte des paires (xuid, team_id)) a changé : backfill des
+    participants d'un match connu, équipes corrigées à participants
+    constants. Son ordinal est alors retiré des paires avant réindexation.
+    S'exécute
+    dans la transaction de l'appelant (group commit du writer) s'il y en a une.
+
+    Args:
+        shared_conn: Connexion vers shared_matches.duckdb (index créé).
+        match_ids: Matchs à indexer (None = tous les matchs de match_participants).
+
+    Returns:
+        Nombre de matchs (ré)indexés.
+    """
+    where = ""
+    params: list[object] = []
+    stale_filter = ""
+    if match_ids is not None:
+        ids = sorted({str(m) for m in match_ids if m})
+        if not ids:
+            return 0
+        where = "WHERE match_id IN ?"
+        params = [ids]
+        # Rattrapage global : pas de réindexation, les participants des matchs
+        # déplacés dans une partition fermée ne sont plus tous dans ce fichier
+        stale_filter = (
+            " OR o.participant_count <> c.participant_count"
+            " OR o.team_signature IS DISTINCT FROM c.team_signature"
+        )
+
+    shared_conn.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _teammate_pending AS
+        WITH counts AS (
+            SELECT match_id,
+                   CAST(COUNT(*) AS INTEGER) AS participant_count,
+                   hash(SUM(hash(xuid, team_id)::HUGEINT)) AS team_signature
+            FROM match_participants {where}
+            GROUP BY match_id
+        )
+        SELECT c.match_id,
+               c.participant_count,
+               c.team_signature,
+               o.ordinal IS NOT NULL AS reindex,
+               COALESCE(
+                   o.ordinal,
+                   (SELECT COALESCE(MAX(ordinal), 0) FROM {TEAMMATE_ORDINALS_TABLE})
+                   + CAST(row_number() OVER (PARTITION BY o.ordinal IS NULL
+                                             ORDER BY c.match_id) AS INTEGER)
+               ) AS ordinal
+        FROM counts c
+        LEFT JOIN {TEAMMATE_ORDINALS_TABLE} o ON o.match_id = c.match_id
+        WHERE o.match_id IS NULL{stale_filter}
+        """,
+        params,
+    )
+    try:
+        pending, stale = shared_conn.execute(
+            "SELECT COUNT(*), list(ordinal) FILTER (WHERE reindex) FROM _teammate_pending"
+        ).fetchone()
+        if not pending:
+            return 0
+        if stale:
+            logger.debug(f"Index coéquipiers : {len(stale)} matchs réindexés")
+            shared_conn.execute(
+                f"UPDATE {TEAMMATE_PAIRS_TABLE} SET "
+                f"match_ordinals = list_filter(match_ordinals, x -> NOT list_contains($1, x)), "
+                f"match_count = len(list_filter(match_ordinals, x -> NOT list_contains($1, x))) "
+                f"WHERE list_has_any(match_ordinals, $1)",
+                [stale],
+            )
+            shared_conn.execute(f"DELETE FROM {TEAMMATE_PAIRS_TABLE} WHERE match_count = 0")
+        shared_conn.execute(
+            f"INSERT INTO {TEAMMATE_PAIRS_TABLE} {_NEW_PAIRS_SQL} "
+            f"ON CONFLICT (xuid_a, xuid_b, same_team) DO UPDATE SET "
+            f"match_count = {TEAMMATE_PAIRS_TABLE}.match_count + EXCLUDED.match_count, "
+            f"match_ordinals = list_sort(list_concat("
+            f"{TEAMMATE_PAIRS_TABLE}.match_ordinals, EXCLUDED.match_ordinals))"
+        )
+        shared_conn.execute(
+            f"INSERT OR REPLACE INTO {TEAMMATE_ORDINALS_TABLE} "
+            f"(match_id, ordinal, participant_count, team_signature) "
+            f"SELECT match_id, ordinal, participant_count, team_signature FROM _teammate_pending"
+        )
+    finally:
+        shared_conn.execute("DROP TABLE IF EXISTS _teammate_pending")
+    return int(pending)
+
+
+def rebuild_teammate_index(shared_conn: duckdb.DuckDBPyConnection) -> int:
+    """Reconstruit l'index de zéro, trié par xuid_a (lookups sur row groups contigus).
+
+    Returns:
+        Nombre de matchs indexés.
+    """
+    shared_conn.execute("BEGIN TRANSACTION")
+    try:
+        shared_conn.execute(f"DROP TABLE IF EXISTS {TEAMMATE_PAIRS_TABLE}")
+        shared_conn.execute(f"DROP TABLE IF EXISTS {TEAMMATE_ORDINALS_TABLE}")
+        shared_conn.execute(_DDL)
+        indexed = update_teammate_index(shared_conn)
+        shared_conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE _teammate_sorted AS "
+            f"SELECT * FROM {TEAMMATE_PAIRS_TABLE} ORDER BY xuid_a, xuid_b, same_team"
+        )
+        shared_conn.execute(f"DELETE FROM {TEAMMATE_PAIRS_TABLE}")
+        shared_conn.execute(f"INSERT INTO {TEAMMATE_PAIRS_TABLE} SELECT * FROM _teammate_sorted")
+        shared_conn.execute("DROP TABLE _teammate_sorted")
+        shared_conn.execute("COMMIT")
+    except Exception:
+        shared_conn.execute("ROLLBACK")
+        raise
+    return indexed
+
+
+# =============================================================================
+# Lectures (catalogue shared attaché)
+# =============================================================================
+
+
+def top_teammates_sql(catalog: str = "shared") -> str:
+    """Top coéquipiers de ``?`` (paramètres : xuid, limite)."""
+    return (
+        f"SELECT xuid_b, match_count FROM {catalog}.{TEAMMATE_PAIRS_TABLE} "
+        f"WHERE xuid_a = ? AND same_team ORDER BY match_count DESC LIMIT ?"
+    )
+
+
+def matches_with_sql(catalog: str = "shared", *, same_team_only: bool) -> str:
+    """match_id joués avec ``?`` (paramètres : xuid, xuid de l'ami), du plus grand au plus petit."""
+    team_filter = " AND same_team" if same_team_only else ""
+    return (
+        f"SELECT match_id FROM {catalog}.{TEAMMATE_ORDINALS_TABLE} "
+        f"WHERE ordinal IN (SELECT unnest(match_ordinals) FROM {catalog}.{TEAMMATE_PAIRS_TABLE} "
+        f"WHERE xuid_a = ? AND xuid_b = ?{team_filter}) "
+        f"ORDER BY match_id DESC"
+    )
@@ -5,8 +5,18 @@ Gestion des fichiers Parquet.
 
 from src.data.infrastructure.parquet.writer import ParquetWriter
 from src.data.infrastructure.parquet.reader import ParquetReader
+from src.data.infrastructure.parquet.segments import (
+    PartitionManifest,
+    SegmentInfo,
+    compact_partition,
+    load_manifest,
+)
 
 __all__ = [
     "ParquetWriter",
     "ParquetReader",
+    "PartitionManifest",
+    "SegmentInfo",
+    "compact_partition",
+    "load_manifest",
 ]
@@ -0,0 +1,307 @@
+"""
+Catalogue des archives Parquet d'un joueur (archive_index.json).
+(Player Parquet archive catalog)
+
+HOW IT WORKS:
+1. ``scripts/archive_season.py`` écrit les fichiers ``archive/*.parquet``
+   et enregistre chaque fichier dans ``archive_index.json``
+2. Chaque entrée porte les statistiques de footer Parquet (nombre de lignes,
+   min/max ``start_time``) ainsi que taille et mtime pour détecter un fichier
+   modifié
+3. Les lecteurs n'ouvrent que les fichiers dont la plage de dates chevauche
+   la requête ; ``generation`` est incrémentée à chaque ``save`` et, avec
+   (fichier, taille, mtime), sert de clé de cache
+
+Les index v1 (sans statistiques) et les fichiers non indexés sont complétés
+à la volée depuis les footers Parquet (lecture des métadonnées uniquement).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import uuid
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from src.utils.paths import ARCHIVE_INDEX_FILENAME
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 2
+
+# Statistiques de footer déjà lues dans ce processus : (chemin, taille, mtime) → stats.
+# Évite de relire les footers des fichiers non indexés quand le catalogue
+# n'est pas persisté (lecteurs en lecture seule).
+_FOOTER_CACHE: dict[tuple[str, int, int], dict[str, Any]] = {}
+
+
+@dataclass
+class ArchiveEntry:
+    """
+    Une archive Parquet et ses statistiques de footer.
+    (A Parquet archive and its footer statistics)
+    """
+
+    file: str
+    row_count: int | None = None
+    min_start_time: str | None = None
+    max_start_time: str | None = None
+    size_bytes: int | None = None
+    mtime_ns: int | None = None
+    created_at: str | None = None
+    cutoff_date: str | None = None
+
+    def is_stale(self, path: Path) -> bool:
+        """True si les statistiques manquent ou ne correspondent plus au fichier."""
+        if self.row_count is None or self.size_bytes is None or self.mtime_ns is None:
+            return True
+        st = path.stat()
+        return st.st_size != self.size_bytes or st.st_mtime_ns != self.mtime_ns
+
+    def overlaps(self, start: datetime | None, end: datetime | None) -> bool:
+        """Indique si l'archive peut contenir des matchs dans [start, end[."""
+        if self.min_start_time is None or self.max_start_time is None:
+            return True
+        if end is not None and datetime.fromisoformat(self.min_start_time) >= _naive(end):
+            return False
+        return not (
+            start is not None and datetime.fromisoformat(self.max_start_time) < _naive(start)
+        )
+
+
+def _naive(value: datetime) -> datetime:
+    """Les archives stockent des TIMESTAMP naïfs (UTC) : on compare sans tz."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def read_footer_stats(path: Path, conn: duckdb.DuckDBPyConnection | None = None) -> dict[str, Any]:
+    """
+    Lit nombre de lignes et min/max ``start_time`` depuis le footer Parquet.
+    (Read row count and start_time bounds from the Parquet footer)
+
+    Seules les métadonnées sont lues ; si les statistiques de colonne sont
+    absentes, on retombe sur un agrégat (lecture de la seule colonne).
+    """
+    own_conn = conn is None
+    conn = conn or duckdb.connect(":memory:")
+    try:
+        conn.execute("SET TimeZone = 'UTC'")
+        file_sql = str(path).replace("'", "''")
+        row_count = conn.execute(
+            f"SELECT SUM(num_rows) FROM parquet_file_metadata('{file_sql}')"
+        ).fetchone()[0]
+        bounds = conn.execute(f"""
+            SELECT
+                MIN(CAST(TRY_CAST(stats_min AS TIMESTAMPTZ) AS TIMESTAMP)),
+                MAX(CAST(TRY_CAST(stats_max AS TIMESTAMPTZ) AS TIMESTAMP))
+            FROM parquet_metadata('{file_sql}')
+            WHERE path_in_schema = 'start_time'
+            """).fetchone()
+        if bounds is None or bounds[0] is None:
+            bounds = conn.execute(
+                f"SELECT CAST(MIN(start_time) AS TIMESTAMP), CAST(MAX(start_time) AS TIMESTAMP) "
+                f"FROM read_parquet('{file_sql}')"
+            ).fetchone()
+    finally:
+        if own_conn:
+            conn.close()
+
+    return {
+        "row_count": int(row_count or 0),
+        "min_start_time": bounds[0].isoformat() if bounds and bounds[0] else None,
+        "max_start_time": bounds[1].isoformat() if bounds and bounds[1] else None,
+    }
+
+
+class ArchiveCatalog:
+    """
+    Catalogue des archives d'un dossier ``archive/``.
+    (Catalog of the archives in an ``archive/`` directory)
+    """
+
+    def __init__(
+        self,
+        archive_dir: Path,
+        entries: list[ArchiveEntry] | None = None,
+        *,
+        generation: int = 0,
+        last_updated: str | None = None,
+    ) -> None:
+        self.archive_dir = Path(archive_dir)
+        self.entries = entries or []
+        self.generation = generation
+        self.last_updated = last_updated
+
+    @property
+    def index_path(self) -> Path:
+        return self.archive_dir / ARCHIVE_INDEX_FILENAME
+
+    @property
+    def total_rows(self) -> int:
+        return sum(e.row_count or 0 for e in self.entries)
+
+    @property
+    def fingerprint(self) -> tuple:
+        """Clé de cache : génération + (fichier, taille, mtime) de chaque archive."""
+        return (
+            str(self.archive_dir),
+            self.generation,
+            tuple((e.file, e.size_bytes, e.mtime_ns) for e in self.entries),
+        )
+
+    @classmethod
+    def load(cls, archive_dir: Path, *, refresh: bool = True) -> ArchiveCatalog:
+        """
+        Charge le catalogue (et le complète depuis le disque si ``refresh``).
+        (Load the catalog, completing it from disk when ``refresh``)
+        """
+        catalog = cls(archive_dir)
+        index_path = catalog.index_path
+        if index_path.exists():
+            try:
+                with open(index_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                known = {f.name for f in fields(ArchiveEntry)}
+                catalog.entries = [
+                    ArchiveEntry(**{k: v for k, v in raw.items() if k in known})
+                    for raw in data.get("archives", [])
+                    if raw.get("file")
+                ]
+                catalog.generation = int(data.get("generation", 0))
+                catalog.last_updated = data.get("last_updated")
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Index d'archives illisible {index_path}: {e}")
+        if refresh:
+            catalog.refresh()
+        return catalog
+
+    def refresh(self) -> bool:
+        """
+        Aligne le catalogue sur les fichiers présents.
+        (Reconcile the catalog with files on disk)
+
+        Ajoute les fichiers non indexés, recalcule les statistiques des
+        entrées périmées et retire les fichiers disparus. N'écrit rien sur
+        disque (voir ``save``).
+
+        Returns:
+            True si le catalogue a changé.
+        """
+        if not self.archive_dir.exists():
+            changed = bool(self.entries)
+            self.entries = []
+            return changed
+
+        on_disk = {p.name: p for p in self.archive_dir.glob("*.parquet")}
+        by_file = {e.file: e for e in self.entries}
+        changed = len(by_file) != len(self.entries) or bool(set(by_file) - set(on_disk))
+
+        entries: list[ArchiveEntry] = []
+        conn: duckdb.DuckDBPyConnection | None = None
+        try:
+            for name in sorted(on_disk):
+                path = on_disk[name]
+                entry = by_file.get(name) or ArchiveEntry(file=name)
+                if entry.is_stale(path):
+                    st = path.stat()
+                    cache_key = (str(path), st.st_size, st.st_mtime_ns)
+                    stats = _FOOTER_CACHE.get(cache_key)
+                    if stats is None:
+                        if conn is None:
+                            conn = duckdb.connect(":memory:")
+                        try:
+                            stats = read_footer_stats(path, conn)
+                        except Exception as e:
+                            logger.warning(f"Footer Parquet illisible {path}: {e}")
+                            continue
+                        _FOOTER_CACHE[cache_key] = stats
+                    entry.row_count = stats["row_count"]
+                    entry.min_start_time = stats["min_start_time"]
+                    entry.max_start_time = stats["max_start_time"]
+                    entry.size_bytes = st.st_size
+                    entry.mtime_ns = st.st_mtime_ns
+                    changed = True
+                entries.append(entry)
+        finally:
+            if conn is not None:
+                conn.close()
+
+        if changed:
+            self.entries = entries
+        return changed
+
+    def register(
+        self,
+        file_name: str,
+        *,
+        created_at: str | None = None,
+        cutoff_date: str | None = None,
+    ) -> ArchiveEntry:
+        """
+        Ajoute ou met à jour une archive avec ses statistiques.
+        (Add or update an archive with its statistics)
+        """
+        path = self.archive_dir / file_name
+        stats = read_footer_stats(path)
+        st = path.stat()
+        entry = next((e for e in self.entries if e.file == file_name), None)
+        if entry is None:
+            entry = ArchiveEntry(file=file_name)
+            self.entries.append(entry)
+        entry.row_count = stats["row_count"]
+        entry.min_start_time = stats["min_start_time"]
+        entry.max_start_time = stats["max_start_time"]
+        entry.size_bytes = st.st_size
+        entry.mtime_ns = st.st_mtime_ns
+        entry.created_at = created_at or entry.created_at or datetime.now().isoformat()
+        entry.cutoff_date = cutoff_date or entry.cutoff_date
+        self.entries.sort(key=lambda e: e.file)
+        return entry
+
+    def files_for_range(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Path]:
+        """
+        Fichiers dont la plage ``start_time`` chevauche [start, end[.
+        (Files whose start_time range overlaps [start, end[)
+        """
+        return [
+            self.archive_dir / e.file
+            for e in self.entries
+            if (e.row_count is None or e.row_count > 0) and e.overlaps(start, end)
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": CATALOG_VERSION,
+            "generation": self.generation,
+            "archives": [asdict(e) for e in self.entries],
+            "last_updated": self.last_updated,
+        }
+
+    def save(self) -> None:
+        """
+        Écrit ``archive_index.json`` de façon atomique (nouvelle génération).
+        (Atomically write ``archive_index.json`` as a new generation)
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.generation += 1
+        self.last_updated = datetime.now().isoformat()
+        tmp = self.index_path.with_name(f".{ARCHIVE_INDEX_FILENAME}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp, self.index_path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
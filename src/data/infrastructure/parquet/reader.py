@@ -4,8 +4,9 @@ Lecteur Parquet optimisé.
 
 HOW IT WORKS:
 1. Utilise le pruning de partitions pour ne lire que les données nécessaires
-2. Projette uniquement les colonnes demandées
-3. Pousse les filtres vers le bas pour optimiser les lectures
+2. Élague les segments via le manifeste de partition (min/max start_time)
+3. Projette uniquement les colonnes demandées
+4. Pousse les filtres vers le bas pour optimiser les lectures
 
 Note: Pour les requêtes complexes, préférer DuckDBEngine qui offre
 plus de flexibilité (jointures, agrégations SQL).
@@ -14,12 +15,13 @@ plus de flexibilité (jointures, agrégations SQL).
 from __future__ import annotations
 
 from collections.abc import Sequence
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 import polars as pl
 
 from src.data.domain.models.stats import MatchRow
+from src.data.infrastructure.parquet.segments import load_manifest, read_partition
 
 
 class ParquetReader:
@@ -64,31 +66,37 @@ class ParquetReader:
         if not player_path.exists():
             return pl.DataFrame()
 
-        # Construire le pattern de fichiers
         if start_date and end_date:
-            # Pruning de partitions par date
-            patterns = self._get_partition_patterns(player_path, start_date, end_date)
-            if not patterns:
-                return pl.DataFrame()
-
-            dfs = []
-            for pattern in patterns:
-                files = list(player_path.glob(pattern))
-                if files:
-                    df = pl.read_parquet(files, columns=columns)
-                    dfs.append(df)
-
-            if not dfs:
-                return pl.DataFrame()
-
-            return pl.concat(dfs)
+            # Pruning de partitions par date, puis de segments par manifeste
+            partitions = self._get_partition_dirs(player_path, start_date, end_date)
         else:
-            # Lire toutes les partitions
-            files = list(player_path.glob("**/*.parquet"))
-            if not files:
-                return pl.DataFrame()
+            partitions = self._list_partition_dirs(player_path)
 
-            return pl.read_parquet(files, columns=columns)
+        read_columns = list(columns) if columns else None
+        if read_columns and (start_date or end_date) and "start_time" not in read_columns:
+            read_columns.append("start_time")
+
+        dfs = []
+        for partition_path in partitions:
+            df = read_partition(
+                partition_path, columns=read_columns, start=start_date, end=end_date
+            )
+            if df is not None:
+                dfs.append(df)
+
+        if not dfs:
+            return pl.DataFrame()
+
+        result = pl.concat(dfs, how="vertical_relaxed")
+        if start_date or end_date:
+            ts = pl.col("start_time")
+            if start_date:
+                result = result.filter(ts >= self._as_ts_literal(start_date))
+            if end_date:
+                result = result.filter(ts <= self._as_ts_literal(end_date))
+            if columns and "start_time" not in columns:
+                result = result.drop("start_time")
+        return result
 
     def read_medals(
         self,
@@ -105,11 +113,15 @@ class ParquetReader:
         if not player_path.exists():
             return pl.DataFrame()
 
-        files = list(player_path.glob("**/*.parquet"))
-        if not files:
+        dfs = [
+            df
+            for partition_path in self._list_partition_dirs(player_path)
+            if (df := read_partition(partition_path)) is not None
+        ]
+        if not dfs:
             return pl.DataFrame()
 
-        df = pl.read_parquet(files)
+        df = pl.concat(dfs, how="vertical_relaxed")
 
         if match_ids:
             df = df.filter(pl.col("match_id").is_in(match_ids))
@@ -174,16 +186,37 @@ class ParquetReader:
         if not player_path.exists():
             return 0
 
-        files = list(player_path.glob("**/*.parquet"))
-        if not files:
-            return 0
+        # Le manifeste porte le nombre de lignes : aucun fichier n'est ouvert
+        return sum(
+            load_manifest(partition_path, reconcile=False).total_rows
+            for partition_path in self._list_partition_dirs(player_path)
+        )
 
-        total = 0
-        for f in files:
-            # Lecture lazy pour compter sans charger les données
-            total += pl.scan_parquet(f).select(pl.count()).collect().item()
+    @staticmethod
+    def _list_partition_dirs(player_path: Path) -> list[Path]:
+        """Liste les dossiers year=*/month=* d'un joueur. (List partition directories)"""
+        return sorted(p for p in player_path.glob("year=*/month=*") if p.is_dir())
 
-        return total
+    def _get_partition_dirs(
+        self,
+        player_path: Path,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[Path]:
+        """Dossiers de partition existants pour une plage de dates."""
+        dirs = []
+        for pattern in self._get_partition_patterns(player_path, start_date, end_date):
+            partition_path = player_path / pattern.rsplit("/", 1)[0]
+            if partition_path.is_dir():
+                dirs.append(partition_path)
+        return dirs
+
+    @staticmethod
+    def _as_ts_literal(value: datetime) -> pl.Expr:
+        """Littéral comparable à la colonne start_time (UTC)."""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return pl.lit(value).cast(pl.Datetime("us", "UTC"))
 
     def _get_partition_patterns(
         self,
@@ -0,0 +1,390 @@
+"""
+Segments Parquet immuables et manifeste de partition.
+(Immutable Parquet segments and partition manifest)
+
+HOW IT WORKS:
+1. Chaque écriture ajoute un fichier ``part-<uuid>.parquet`` à la partition
+   (écrit dans un fichier temporaire puis renommé atomiquement)
+2. Un petit manifeste ``_manifest.json`` décrit les segments (lignes,
+   match_ids distincts, min/max ``start_time``) pour le pruning à la lecture
+3. La compaction déclare le segment fusionné comme ``pending`` dans le
+   manifeste, l'écrit, publie le nouveau manifeste (bascule) puis supprime
+   les anciens segments
+4. Seuls les écrivains (writer, compaction) réconcilient le manifeste avec
+   le disque ; les lecteurs le lisent tel quel (``reconcile=False``)
+
+Structure d'une partition:
+    month=01/
+    ├── _manifest.json
+    ├── part-3f2a....parquet
+    └── part-9b41....parquet
+
+Les fichiers ``data.parquet`` hérités (avant segments) sont adoptés comme
+segments lors de la réconciliation du manifeste.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import uuid
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "_manifest.json"
+MANIFEST_VERSION = 1
+SEGMENT_PREFIX = "part-"
+
+
+@dataclass
+class SegmentInfo:
+    """
+    Statistiques d'un segment Parquet.
+    (Statistics of a Parquet segment)
+    """
+
+    file: str
+    rows: int
+    match_ids: int
+    min_start_time: str | None = None
+    max_start_time: str | None = None
+
+    def overlaps(self, start: datetime | None, end: datetime | None) -> bool:
+        """Indique si le segment peut contenir des lignes dans [start, end]."""
+        if self.min_start_time is None or self.max_start_time is None:
+            return True
+        if end is not None and datetime.fromisoformat(self.min_start_time) > _as_utc(end):
+            return False
+        return not (
+            start is not None and datetime.fromisoformat(self.max_start_time) < _as_utc(start)
+        )
+
+
+@dataclass
+class PartitionManifest:
+    """
+    Manifeste d'une partition (liste des segments actifs).
+    (Partition manifest listing active segments)
+    """
+
+    segments: list[SegmentInfo] = field(default_factory=list)
+    obsolete: list[str] = field(default_factory=list)
+    pending: list[str] = field(default_factory=list)
+    version: int = MANIFEST_VERSION
+
+    @property
+    def total_rows(self) -> int:
+        return sum(s.rows for s in self.segments)
+
+    def files(self, partition_path: Path) -> list[Path]:
+        return [partition_path / s.file for s in self.segments]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "segments": [asdict(s) for s in self.segments],
+            "obsolete": list(self.obsolete),
+            "pending": list(self.pending),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PartitionManifest:
+        return cls(
+            segments=[SegmentInfo(**s) for s in data.get("segments", [])],
+            obsolete=list(data.get("obsolete", [])),
+            pending=list(data.get("pending", [])),
+            version=int(data.get("version", MANIFEST_VERSION)),
+        )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalise une date naïve en UTC pour comparer avec le manifeste."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Écrit un fichier via un temporaire + ``os.replace`` (atomique)."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def compute_segment_info(file_name: str, df: pl.DataFrame) -> SegmentInfo:
+    """
+    Calcule les statistiques d'un segment à partir de son contenu.
+    (Compute segment statistics from its content)
+    """
+    min_ts = max_ts = None
+    if "start_time" in df.columns and not df.is_empty():
+        bounds = df.select(
+            pl.col("start_time").min().alias("lo"), pl.col("start_time").max().alias("hi")
+        ).row(0)
+        if bounds[0] is not None:
+            min_ts = _as_utc(bounds[0]).isoformat()
+            max_ts = _as_utc(bounds[1]).isoformat()
+    n_ids = df["match_id"].n_unique() if "match_id" in df.columns else 0
+    return SegmentInfo(
+        file=file_name,
+        rows=len(df),
+        match_ids=int(n_ids),
+        min_start_time=min_ts,
+        max_start_time=max_ts,
+    )
+
+
+def write_segment(
+    partition_path: Path,
+    df: pl.DataFrame,
+    *,
+    compression: str = "snappy",
+    row_group_size: int | None = None,
+    file_name: str | None = None,
+) -> SegmentInfo:
+    """
+    Écrit un nouveau segment immuable dans la partition (rename atomique).
+    (Write a new immutable segment to the partition with atomic rename)
+
+    Le fichier temporaire ne se termine pas par ``.parquet`` : il n'est
+    donc jamais visible des globs ``*.parquet`` pendant l'écriture.
+    ``file_name`` permet de réserver le nom au préalable (compaction).
+    """
+    partition_path.mkdir(parents=True, exist_ok=True)
+    file_name = file_name or new_segment_name()
+    final_path = partition_path / file_name
+    tmp_path = partition_path / f".{file_name}.tmp"
+    try:
+        df.write_parquet(tmp_path, compression=compression, row_group_size=row_group_size)
+        os.replace(tmp_path, final_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return compute_segment_info(file_name, df)
+
+
+def new_segment_name() -> str:
+    """Nom unique d'un nouveau segment. (Unique name for a new segment)"""
+    return f"{SEGMENT_PREFIX}{uuid.uuid4().hex}.parquet"
+
+
+def load_manifest(partition_path: Path, *, reconcile: bool = True) -> PartitionManifest:
+    """
+    Charge le manifeste d'une partition.
+    (Load a partition manifest)
+
+    Args:
+        partition_path: Dossier de la partition
+        reconcile: Si True, aligne le manifeste sur les fichiers présents
+            (adopte les segments orphelins / ``data.parquet`` hérités,
+            retire les entrées dont le fichier a disparu, purge les
+            segments obsolètes encore présents et les segments ``pending``
+            d'une compaction interrompue). Réservé aux écrivains : les
+            lecteurs passent ``reconcile=False`` et ne modifient jamais le
+            manifeste ni les fichiers.
+
+    Returns:
+        PartitionManifest (vide si la partition n'existe pas). Sans
+        manifeste sur disque (partition héritée), les fichiers présents
+        sont adoptés en mémoire même sans réconciliation.
+    """
+    manifest_path = partition_path / MANIFEST_FILENAME
+    manifest = PartitionManifest()
+    if manifest_path.exists():
+        try:
+            manifest = PartitionManifest.from_dict(
+                json.loads(manifest_path.read_text(encoding="utf-8"))
+            )
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Manifeste illisible {manifest_path}: {e}, reconstruction")
+            manifest = PartitionManifest()
+
+    if not partition_path.exists():
+        return manifest
+    if not reconcile:
+        if manifest_path.exists():
+            return manifest
+        # Partition héritée sans manifeste : adoption en mémoire, rien n'est écrit
+        return PartitionManifest(segments=_adopt(partition_path, sorted(_on_disk(partition_path))))
+
+    changed = False
+
+    # Segments remplacés par une compaction mais pas encore supprimés, et
+    # segments fusionnés d'une compaction interrompue avant la bascule
+    still_obsolete = [name for name in manifest.obsolete if not _try_unlink(partition_path / name)]
+    still_pending = [name for name in manifest.pending if not _try_unlink(partition_path / name)]
+    if still_obsolete != manifest.obsolete or still_pending != manifest.pending:
+        manifest.obsolete = still_obsolete
+        manifest.pending = still_pending
+        changed = True
+
+    on_disk = _on_disk(partition_path) - set(still_obsolete) - set(still_pending)
+    known = {s.file for s in manifest.segments}
+
+    kept = [s for s in manifest.segments if s.file in on_disk]
+    if len(kept) != len(manifest.segments):
+        manifest.segments = kept
+        changed = True
+
+    adopted = _adopt(partition_path, sorted(on_disk - known))
+    if adopted:
+        manifest.segments.extend(adopted)
+        changed = True
+
+    if changed and manifest_path.exists():
+        save_manifest(partition_path, manifest)
+    return manifest
+
+
+def _on_disk(partition_path: Path) -> set[str]:
+    return {p.name for p in partition_path.glob("*.parquet")}
+
+
+def _adopt(partition_path: Path, names: Sequence[str]) -> list[SegmentInfo]:
+    """Statistiques des fichiers absents du manifeste (orphelins, ``data.parquet``)."""
+    adopted = []
+    for name in names:
+        try:
+            df = pl.read_parquet(partition_path / name, columns=["match_id", "start_time"])
+        except Exception as e:
+            logger.warning(f"Segment illisible ignoré {partition_path / name}: {e}")
+            continue
+        adopted.append(compute_segment_info(name, df))
+    return adopted
+
+
+def _try_unlink(path: Path) -> bool:
+    """Supprime un fichier ; retourne True s'il n'existe plus."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        # Un lecteur (Windows) peut encore tenir le fichier ouvert
+        logger.debug(f"Suppression différée de {path}: {e}")
+        return False
+    return True
+
+
+def save_manifest(partition_path: Path, manifest: PartitionManifest) -> None:
+    """Publie le manifeste de façon atomique. (Atomically publish the manifest)"""
+    payload = json.dumps(manifest.to_dict(), indent=2).encode("utf-8")
+    _atomic_write_bytes(partition_path / MANIFEST_FILENAME, payload)
+
+
+def read_partition(
+    partition_path: Path,
+    *,
+    columns: Sequence[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> pl.DataFrame | None:
+    """
+    Lit les segments d'une partition qui chevauchent [start, end].
+    (Read partition segments overlapping [start, end])
+
+    Lecture seule : le manifeste n'est pas réconcilié (un segment pas encore
+    publié par un écrivain n'est jamais lu).
+
+    Returns:
+        DataFrame ou None si aucun segment ne correspond
+    """
+    manifest = load_manifest(partition_path, reconcile=False)
+    files = [partition_path / s.file for s in manifest.segments if s.overlaps(start, end)]
+    if not files:
+        return None
+    return pl.read_parquet(files, columns=list(columns) if columns else None)
+
+
+def compact_partition(
+    partition_path: Path,
+    key_columns: Sequence[str],
+    *,
+    compression: str = "snappy",
+    row_group_size: int | None = None,
+    min_segments: int = 2,
+) -> int:
+    """
+    Fusionne les segments d'une partition en un seul segment dédupliqué.
+    (Merge partition segments into a single deduplicated segment)
+
+    Ordre des opérations (sûr en cas d'interruption) :
+    1. réservation du nom du segment fusionné dans ``pending`` du manifeste
+    2. écriture du segment fusionné (rename atomique) ; tant qu'il est
+       ``pending``, ni les lecteurs ni la réconciliation ne l'adoptent
+    3. publication du nouveau manifeste (bascule, rename atomique)
+    4. suppression des anciens segments
+
+    Une interruption avant 3 laisse l'ancien manifeste intact ; le segment
+    ``pending`` est supprimé par la réconciliation suivante.
+
+    Args:
+        partition_path: Dossier de la partition
+        key_columns: Colonnes de déduplication (ex: ["match_id"])
+        min_segments: Nombre minimal de segments pour déclencher la fusion
+
+    Returns:
+        Nombre de segments supprimés (0 si rien à faire)
+    """
+    manifest = load_manifest(partition_path)
+    if len(manifest.segments) < min_segments:
+        return 0
+
+    old_files = manifest.files(partition_path)
+    merged = pl.read_parquet(old_files).unique(subset=list(key_columns), keep="last")
+    if "start_time" in merged.columns:
+        merged = merged.sort("start_time")
+
+    file_name = new_segment_name()
+    manifest.pending.append(file_name)
+    save_manifest(partition_path, manifest)
+    try:
+        info = write_segment(
+            partition_path,
+            merged,
+            compression=compression,
+            row_group_size=row_group_size,
+            file_name=file_name,
+        )
+    except Exception:
+        _try_unlink(partition_path / file_name)
+        manifest.pending.remove(file_name)
+        save_manifest(partition_path, manifest)
+        raise
+    retire_segments(
+        partition_path,
+        PartitionManifest(segments=[info], obsolete=manifest.obsolete),
+        old_files,
+    )
+    return len(old_files)
+
+
+def retire_segments(
+    partition_path: Path,
+    manifest: PartitionManifest,
+    old_files: Sequence[Path],
+) -> None:
+    """
+    Publie ``manifest`` puis supprime les segments remplacés.
+    (Publish ``manifest`` then delete replaced segments)
+
+    Les fichiers non supprimables sont gardés dans ``obsolete`` pour ne
+    jamais être relus, et purgés à la prochaine réconciliation.
+    """
+    manifest.obsolete = sorted(set(manifest.obsolete) | {p.name for p in old_files})
+    save_manifest(partition_path, manifest)
+    remaining = [name for name in manifest.obsolete if not _try_unlink(partition_path / name)]
+    if remaining != manifest.obsolete:
+        manifest.obsolete = remaining
+        save_manifest(partition_path, manifest)
@@ -6,7 +6,8 @@ HOW IT WORKS:
 1. Reçoit des MatchFact ou MedalAward depuis le transformateur
 2. Convertit en DataFrame Polars
 3. Écrit en Parquet avec partitionnement par player/year/month
-4. Utilise la compression Snappy pour l'équilibre vitesse/taille
+4. Chaque append ajoute un segment immuable (pas de réécriture de la partition)
+5. Utilise la compression Snappy pour l'équilibre vitesse/taille
 
 Structure des fichiers:
     warehouse/
@@ -14,11 +15,18 @@ Structure des fichiers:
         └── player=1234567890/
             └── year=2025/
                 └── month=01/
-                    └── data.parquet
+                    ├── _manifest.json
+                    ├── part-<uuid>.parquet
+                    └── part-<uuid>.parquet
+
+La compaction (``compact`` / ``compact_in_background``) fusionne les segments
+d'une partition dès qu'ils dépassent un seuil.
 """
 
 from __future__ import annotations
 
+import logging
+import threading
 from collections.abc import Sequence
 from pathlib import Path
 
@@ -26,6 +34,26 @@ import polars as pl
 
 from src.data.domain.models.match import MatchFact
 from src.data.domain.models.medal import MedalAward
+from src.data.infrastructure.parquet.segments import (
+    PartitionManifest,
+    compact_partition,
+    load_manifest,
+    read_partition,
+    retire_segments,
+    save_manifest,
+    write_segment,
+)
+
+logger = logging.getLogger(__name__)
+
+# Nombre de segments à partir duquel une partition est compactée
+DEFAULT_COMPACTION_THRESHOLD = 8
+
+# Clés de déduplication par table
+TABLE_KEYS: dict[str, tuple[str, ...]] = {
+    "match_facts": ("match_id",),
+    "medals": ("match_id", "medal_name_id"),
+}
 
 
 class ParquetWriter:
@@ -40,6 +68,7 @@ class ParquetWriter:
         *,
         compression: str = "snappy",
         row_group_size: int = 100_000,
+        compaction_threshold: int | None = None,
     ) -> None:
         """
         Initialise le writer Parquet.
@@ -49,10 +78,16 @@ class ParquetWriter:
             warehouse_path: Chemin vers le dossier warehouse
             compression: Algorithme de compression (snappy, zstd, gzip, lz4)
             row_group_size: Taille des row groups pour optimiser les lectures
+            compaction_threshold: Si défini, lance une compaction en arrière-plan
+                dès qu'une partition écrite atteint ce nombre de segments
         """
         self.warehouse_path = Path(warehouse_path)
         self.compression = compression
         self.row_group_size = row_group_size
+        self.compaction_threshold = compaction_threshold
+        # Sérialise les mises à jour de manifeste (écritures vs compaction)
+        self._lock = threading.RLock()
+        self._compaction_thread: threading.Thread | None = None
 
         # Créer le dossier warehouse
         self.warehouse_path.mkdir(parents=True, exist_ok=True)
@@ -69,7 +104,8 @@ class ParquetWriter:
 
         Args:
             facts: Liste de MatchFact à écrire
-            append: Si True, ajoute aux fichiers existants
+            append: Si True, ajoute un segment (les match_id déjà présents
+                sont ignorés) ; sinon remplace le contenu des partitions touchées
 
         Returns:
             Nombre de lignes écrites
@@ -84,49 +120,7 @@ class ParquetWriter:
         # Convertir les types pour Parquet
         df = self._prepare_match_facts_schema(df)
 
-        # Écrire avec partitionnement
-        table_path = self.warehouse_path / "match_facts"
-
-        # Obtenir les combinaisons uniques de partitions
-        partitions = df.select(["xuid", "year", "month"]).unique()
-
-        rows_written = 0
-        for row in partitions.iter_rows(named=True):
-            xuid = row["xuid"]
-            year = row["year"]
-            month = row["month"]
-
-            # Extraire les données de cette partition
-            partition_df = df.filter(
-                (pl.col("xuid") == xuid) & (pl.col("year") == year) & (pl.col("month") == month)
-            )
-
-            # Chemin de la partition
-            partition_path = table_path / f"player={xuid}" / f"year={year}" / f"month={month:02d}"
-            partition_path.mkdir(parents=True, exist_ok=True)
-
-            file_path = partition_path / "data.parquet"
-
-            if append and file_path.exists():
-                # Lire les données existantes et fusionner
-                existing_df = pl.read_parquet(file_path)
-                # Dédupliquer sur match_id
-                combined_df = pl.concat([existing_df, partition_df]).unique(subset=["match_id"])
-                combined_df.write_parquet(
-                    file_path,
-                    compression=self.compression,
-                    row_group_size=self.row_group_size,
-                )
-                rows_written += len(partition_df)
-            else:
-                partition_df.write_parquet(
-                    file_path,
-                    compression=self.compression,
-                    row_group_size=self.row_group_size,
-                )
-                rows_written += len(partition_df)
-
-        return rows_written
+        return self._write_partitioned(df, "match_facts", append=append)
 
     def write_medals(
         self,
@@ -155,38 +149,166 @@ class ParquetWriter:
             ]
         )
 
-        table_path = self.warehouse_path / "medals"
+        return self._write_partitioned(df, "medals", append=append)
 
-        # Grouper par partition
-        partitions = df.select(["xuid", "year", "month"]).unique()
+    def _write_partitioned(self, df: pl.DataFrame, table: str, *, append: bool) -> int:
+        """
+        Répartit un DataFrame par player/year/month et écrit un segment par partition.
+        (Split a DataFrame by player/year/month and write one segment per partition)
+        """
+        table_path = self.warehouse_path / table
+        key_columns = list(TABLE_KEYS[table])
 
         rows_written = 0
-        for row in partitions.iter_rows(named=True):
-            xuid = row["xuid"]
-            year = row["year"]
-            month = row["month"]
-
-            partition_df = df.filter(
-                (pl.col("xuid") == xuid) & (pl.col("year") == year) & (pl.col("month") == month)
+        to_compact: list[Path] = []
+        for (xuid, year, month), partition_df in df.partition_by(
+            ["xuid", "year", "month"], as_dict=True, maintain_order=True
+        ).items():
+            partition_path = table_path / f"player={xuid}" / f"year={year}" / f"month={month:02d}"
+            written, n_segments = self._write_partition(
+                partition_path, partition_df, key_columns, append=append
             )
+            rows_written += written
+            if self.compaction_threshold and n_segments >= self.compaction_threshold:
+                to_compact.append(partition_path)
 
-            partition_path = table_path / f"player={xuid}" / f"year={year}" / f"month={month:02d}"
-            partition_path.mkdir(parents=True, exist_ok=True)
+        if to_compact:
+            self._start_compaction(table, to_compact)
+        return rows_written
+
+    def _write_partition(
+        self,
+        partition_path: Path,
+        partition_df: pl.DataFrame,
+        key_columns: list[str],
+        *,
+        append: bool,
+    ) -> tuple[int, int]:
+        """
+        Ajoute un segment à une partition sans relire ni réécrire l'existant.
+        (Append a segment to a partition without rewriting existing data)
 
-            file_path = partition_path / "data.parquet"
+        En mode append, seules les clés absentes des segments dont la plage
+        ``start_time`` chevauche le lot sont écrites (lecture des colonnes clés
+        uniquement). Sans append, le segment remplace la partition.
 
-            if append and file_path.exists():
-                existing_df = pl.read_parquet(file_path)
-                combined_df = pl.concat([existing_df, partition_df]).unique(
-                    subset=["match_id", "medal_name_id"]
+        Returns:
+            Tuple (lignes écrites, nombre de segments de la partition)
+        """
+        partition_df = partition_df.unique(subset=key_columns, keep="last", maintain_order=True)
+
+        with self._lock:
+            manifest = load_manifest(partition_path)
+
+            if append and manifest.segments:
+                bounds = partition_df.select(
+                    pl.col("start_time").min().alias("lo"),
+                    pl.col("start_time").max().alias("hi"),
+                ).row(0)
+                existing = read_partition(
+                    partition_path, columns=key_columns, start=bounds[0], end=bounds[1]
                 )
-                combined_df.write_parquet(file_path, compression=self.compression)
-                rows_written += len(partition_df)
+                if existing is not None and not existing.is_empty():
+                    partition_df = partition_df.join(existing.unique(), on=key_columns, how="anti")
+
+            if partition_df.is_empty():
+                return 0, len(manifest.segments)
+
+            info = write_segment(
+                partition_path,
+                partition_df,
+                compression=self.compression,
+                row_group_size=self.row_group_size,
+            )
+
+            if append:
+                manifest.segments.append(info)
+                save_manifest(partition_path, manifest)
             else:
-                partition_df.write_parquet(file_path, compression=self.compression)
-                rows_written += len(partition_df)
+                old_files = manifest.files(partition_path)
+                retire_segments(
+                    partition_path,
+                    PartitionManifest(segments=[info], obsolete=manifest.obsolete),
+                    old_files,
+                )
+                manifest.segments = [info]
 
-        return rows_written
+        return len(partition_df), len(manifest.segments)
+
+    def compact(self, table: str = "match_facts", *, min_segments: int | None = None) -> dict:
+        """
+        Fusionne les segments des partitions d'une table.
+        (Merge the segments of a table's partitions)
+
+        Args:
+            table: Nom de la table (match_facts, medals)
+            min_segments: Seuil de segments pour compacter une partition
+                (défaut: compaction_threshold ou DEFAULT_COMPACTION_THRESHOLD)
+
+        Returns:
+            Dict {"partitions": n compactées, "segments_removed": n}
+        """
+        table_path = self.warehouse_path / table
+        partitions = sorted(p for p in table_path.glob("player=*/year=*/month=*") if p.is_dir())
+        return self._compact_partitions(table, partitions, min_segments=min_segments)
+
+    def compact_in_background(
+        self, table: str = "match_facts", *, min_segments: int | None = None
+    ) -> threading.Thread:
+        """
+        Lance ``compact`` dans un thread daemon.
+        (Run ``compact`` in a daemon thread)
+        """
+        thread = threading.Thread(
+            target=self.compact,
+            args=(table,),
+            kwargs={"min_segments": min_segments},
+            name=f"parquet-compaction-{table}",
+            daemon=True,
+        )
+        thread.start()
+        self._compaction_thread = thread
+        return thread
+
+    def wait_for_compaction(self, timeout: float | None = None) -> None:
+        """Attend la fin de la compaction en arrière-plan. (Wait for background compaction)"""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join(timeout)
+
+    def _start_compaction(self, table: str, partitions: list[Path]) -> None:
+        """Compacte des partitions précises en arrière-plan (une seule à la fois)."""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact_partitions,
+            args=(table, partitions),
+            name=f"parquet-compaction-{table}",
+            daemon=True,
+        )
+        self._compaction_thread.start()
+
+    def _compact_partitions(
+        self, table: str, partitions: Sequence[Path], *, min_segments: int | None = None
+    ) -> dict:
+        threshold = min_segments or self.compaction_threshold or DEFAULT_COMPACTION_THRESHOLD
+        stats = {"partitions": 0, "segments_removed": 0}
+        for partition_path in partitions:
+            try:
+                with self._lock:
+                    removed = compact_partition(
+                        partition_path,
+                        TABLE_KEYS[table],
+                        compression=self.compression,
+                        row_group_size=self.row_group_size,
+                        min_segments=threshold,
+                    )
+            except Exception as e:
+                logger.warning(f"Compaction échouée pour {partition_path}: {e}")
+                continue
+            if removed:
+                stats["partitions"] += 1
+                stats["segments_removed"] += removed
+        return stats
 
     def _prepare_match_facts_schema(self, df: pl.DataFrame) -> pl.DataFrame:
         """
@@ -228,10 +350,15 @@ class ParquetWriter:
 
         files = list(table_path.glob("**/*.parquet"))
         total_size = sum(f.stat().st_size for f in files)
+        month_dirs = [p for p in table_path.glob("player=*/year=*/month=*") if p.is_dir()]
+        max_segments = max(
+            (len(load_manifest(p, reconcile=False).segments) for p in month_dirs), default=0
+        )
 
         return {
             "exists": True,
             "files": len(files),
             "total_size_mb": round(total_size / (1024 * 1024), 2),
             "partitions": len(list(table_path.glob("player=*"))),
+            "max_segments_per_partition": max_segments,
         }
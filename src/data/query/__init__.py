@@ -9,6 +9,7 @@ HOW IT WORKS:
 1. QueryEngine : Moteur principal qui gère les connexions DuckDB
 2. AnalyticsQueries : Requêtes prédéfinies pour les analyses courantes
 3. TrendAnalyzer : Calculs de tendances et évolutions temporelles
+4. QueryResultCache : Cache des résultats partagé par tous les QueryEngine
 
 Usage:
     from src.data.query import QueryEngine, AnalyticsQueries
@@ -29,9 +30,12 @@ Usage:
 from src.data.query.engine import QueryEngine
 from src.data.query.analytics import AnalyticsQueries
 from src.data.query.trends import TrendAnalyzer
+from src.data.query.result_cache import QueryResultCache, get_query_result_cache
 
 __all__ = [
     "QueryEngine",
     "AnalyticsQueries", 
     "TrendAnalyzer",
+    "QueryResultCache",
+    "get_query_result_cache",
 ]
@@ -7,7 +7,9 @@ Ce moteur encapsule toutes les opérations DuckDB et fournit :
 1. Attachement automatique de la base SQLite metadata
 2. Construction de chemins Parquet avec partitionnement
 3. Exécution de requêtes SQL avec retour typé
-4. Gestion du cache et des optimisations
+4. Cache des résultats partagé par le processus (voir result_cache) : une
+   requête de lecture déjà exécutée sur les mêmes fichiers Parquet / metadata
+   est servie sans repasser par DuckDB
 
 Le moteur peut être utilisé directement pour des requêtes ad-hoc
 ou via les classes de haut niveau (AnalyticsQueries, TrendAnalyzer).
@@ -39,10 +41,38 @@ import duckdb
 import polars as pl
 
 from src.data.domain.models.stats import MatchRow
+from src.data.query.result_cache import (
+    QueryCacheStats,
+    QueryResultCache,
+    _Uncacheable,
+    cacheable_sql,
+    data_generation,
+    get_query_result_cache,
+    normalize_sql,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _arrow_to_rows(table: Any) -> list[dict[str, Any]]:
+    """Lignes Python d'une table Arrow, avec les types de ``fetchall()``."""
+    import pyarrow as pa
+
+    rows = table.to_pylist()
+    # HUGEINT (SUM d'entiers) sort en decimal128(38, 0) : fetchall() donne un int
+    hugeint_cols = [
+        f.name
+        for f in table.schema
+        if pa.types.is_decimal(f.type) and f.type.precision == 38 and f.type.scale == 0
+    ]
+    if hugeint_cols:
+        for row in rows:
+            for name in hugeint_cols:
+                if row[name] is not None:
+                    row[name] = int(row[name])
+    return rows
+
+
 class QueryEngine:
     """
     Moteur de requête DuckDB pour l'architecture hybride.
@@ -60,6 +90,7 @@ class QueryEngine:
         *,
         memory_limit: str = "1GB",
         threads: int | None = None,
+        result_cache: QueryResultCache | bool = True,
     ) -> None:
         """
         Initialise le moteur de requête.
@@ -69,8 +100,14 @@ class QueryEngine:
             warehouse_path: Chemin vers le dossier warehouse
             memory_limit: Limite mémoire DuckDB (défaut: 1GB)
             threads: Nombre de threads (None = auto-detect)
+            result_cache: Cache des résultats (True: cache du processus,
+                False: désactivé, ou une instance dédiée)
         """
         self.warehouse_path = Path(warehouse_path)
+        if isinstance(result_cache, QueryResultCache):
+            self._result_cache: QueryResultCache | None = result_cache
+        else:
+            self._result_cache = get_query_result_cache() if result_cache else None
         self._memory_limit = memory_limit
         self._threads = threads
         self._connection: duckdb.DuckDBPyConnection | None = None
@@ -236,6 +273,12 @@ class QueryEngine:
             )
         """
         conn = self.connection
+        cache_key = self._cache_key(sql, params) if return_type != "raw" else None
+
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)  # type: ignore[union-attr]
+            if cached is not None:
+                return pl.from_arrow(cached) if return_type == "polars" else _arrow_to_rows(cached)
 
         # Préparer les paramètres
         if params:
@@ -250,6 +293,12 @@ class QueryEngine:
 
             if return_type == "raw":
                 return result
+            elif cache_key is not None:
+                table = result.arrow()
+                if hasattr(table, "read_all"):  # DuckDB >= 1.4 : RecordBatchReader
+                    table = table.read_all()
+                self._result_cache.put(cache_key, table)  # type: ignore[union-attr]
+                return pl.from_arrow(table) if return_type == "polars" else _arrow_to_rows(table)
             elif return_type == "polars":
                 return result.pl()
             else:  # "list"
@@ -263,6 +312,33 @@ class QueryEngine:
                     with suppress(Exception):
                         conn.execute(f"RESET VARIABLE {key}")
 
+    def _cache_key(self, sql: str, params: dict[str, Any] | None) -> tuple | None:
+        """
+        Clé de cache de la requête, ou None si elle ne doit pas être mise en cache.
+        (Result cache key, or None when the query is not cacheable)
+        """
+        cache = self._result_cache
+        if cache is None:
+            return None
+        if not cacheable_sql(sql):
+            cache.record_bypass()
+            return None
+        try:
+            tables = self.connection.get_table_names(sql, qualified=True)
+            metadata = self.warehouse_path / "metadata.duckdb"
+            generation = data_generation(
+                sql, tables, str(metadata) if self._metadata_attached else None
+            )
+        except (_Uncacheable, duckdb.Error):
+            cache.record_bypass()
+            return None
+        param_key = tuple(sorted((k, repr(v)) for k, v in (params or {}).items()))
+        return (normalize_sql(sql), param_key, generation)
+
+    def cache_stats(self) -> QueryCacheStats | None:
+        """Compteurs du cache de résultats (None si désactivé)."""
+        return self._result_cache.stats() if self._result_cache is not None else None
+
     def execute_with_parquet(
         self,
         sql_template: str,
@@ -0,0 +1,205 @@
+"""
+Cache des résultats de requêtes du QueryEngine.
+(Query result cache for QueryEngine)
+
+HOW IT WORKS:
+1. La clé d'une requête est (SQL normalisé, paramètres, génération des données)
+2. La génération est l'empreinte (chemin, mtime, taille) des fichiers lus :
+   fichiers Parquet des ``read_parquet('...')`` et metadata.duckdb pour ``meta.*``.
+   Une sync qui réécrit un fichier change la clé : les anciennes entrées ne sont
+   plus servies et sortent par LRU
+3. Les résultats sont stockés en tables Arrow (immuables, taille connue) dans un
+   LRU borné en octets ; chaque hit reconstruit une liste de dicts ou un
+   DataFrame Polars neuf
+4. Le cache est partagé par tout le processus : les ``QueryEngine`` créés à la
+   volée par l'UI (``streamlit_bridge``) profitent des résultats des autres
+
+Ne sont jamais mis en cache (exécution directe, compteur ``bypassed``) :
+- les requêtes qui ne sont pas des lectures (SELECT / WITH / FROM)
+- les requêtes non déterministes (NOW(), random(), ...)
+- les requêtes qui lisent autre chose que read_parquet / meta.* (tables de la
+  connexion, autres fichiers) : leur génération est inconnue
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_QUOTED_RE = re.compile(r"('(?:[^']|'')*')")
+_READ_STATEMENT_RE = re.compile(r"^\(?\s*(select|with|from)\b", re.IGNORECASE)
+_VOLATILE_RE = re.compile(
+    r"\b(now|random|gen_random_uuid|uuid|get_current_timestamp|setseed|nextval|currval)\s*\("
+    r"|\b(current_timestamp|current_time|localtimestamp|localtime)\b",
+    re.IGNORECASE,
+)
+_CURRENT_DATE_RE = re.compile(r"\b(current_date|today)\b", re.IGNORECASE)
+_FOREIGN_SOURCE_RE = re.compile(
+    r"\b(read_(?!parquet\b)\w+|parquet_scan|sniff_csv|glob|query_table)\s*\(",
+    re.IGNORECASE,
+)
+_READ_PARQUET_RE = re.compile(r"read_parquet\s*\(\s*(\[[^\]]*\]|'(?:[^']|'')*')", re.IGNORECASE)
+
+
+class _Uncacheable(Exception):
+    """Requête dont la génération ne peut pas être déterminée."""
+
+
+@dataclass
+class QueryCacheStats:
+    """Compteurs du cache de résultats."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_sql(sql: str) -> str:
+    """Réduit les blancs hors littéraux : l'indentation ne change pas la clé."""
+    parts = _QUOTED_RE.split(sql)
+    # Indices pairs: SQL, impairs: littéraux '...' conservés tels quels
+    return "".join(p if i % 2 else " ".join(p.split()) for i, p in enumerate(parts)).strip()
+
+
+def _file_state(path: str) -> tuple[str, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _parquet_patterns(sql: str) -> list[str]:
+    patterns: list[str] = []
+    for m in _READ_PARQUET_RE.finditer(sql):
+        for literal in _QUOTED_RE.findall(m.group(1)):
+            patterns.append(literal[1:-1].replace("''", "'"))
+    return patterns
+
+
+def data_generation(sql: str, table_names: set[str], metadata_path: str | None) -> tuple[Any, ...]:
+    """Empreinte des fichiers lus par `sql`.
+
+    Args:
+        sql: Requête (SQL brut).
+        table_names: Tables référencées (``get_table_names(qualified=True)``).
+        metadata_path: Chemin de metadata.duckdb attachée comme ``meta``, ou None.
+
+    Raises:
+        _Uncacheable: si la requête lit une source dont la génération est inconnue.
+    """
+    for name in table_names:
+        if not name.lower().startswith("meta."):
+            raise _Uncacheable(name)
+
+    state: list[Any] = []
+    for pattern in _parquet_patterns(sql):
+        files = sorted(glob.glob(pattern, recursive=True))
+        state.append((pattern, tuple(s for s in map(_file_state, files) if s)))
+    if table_names:
+        if not metadata_path:
+            raise _Uncacheable("meta")
+        state.append(_file_state(metadata_path))
+        state.append(_file_state(metadata_path + ".wal"))
+    if _CURRENT_DATE_RE.search(sql):
+        state.append(date.today().isoformat())
+    return tuple(state)
+
+
+def cacheable_sql(sql: str) -> bool:
+    """Lecture déterministe sur des sources connues (avant analyse des tables)."""
+    code = " ".join(_QUOTED_RE.sub("''", sql).split())
+    return (
+        bool(_READ_STATEMENT_RE.match(code))
+        and not _VOLATILE_RE.search(code)
+        and not _FOREIGN_SOURCE_RE.search(code)
+    )
+
+
+class QueryResultCache:
+    """Cache LRU de tables Arrow, borné en entrées et en octets."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._bytes = 0
+        self._stats = QueryCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Any | None:
+        with self._lock:
+            table = self._entries.get(key)
+            if table is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return table
+
+    def put(self, key: tuple, table: Any) -> None:
+        size = int(table.nbytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= int(old.nbytes)
+            self._entries[key] = table
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= int(evicted.nbytes)
+                self._stats.evictions += 1
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats.bypassed += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats = QueryCacheStats()
+
+    def stats(self) -> QueryCacheStats:
+        with self._lock:
+            return QueryCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                bypassed=self._stats.bypassed,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+
+_QUERY_RESULT_CACHE = QueryResultCache()
+
+
+def get_query_result_cache() -> QueryResultCache:
+    """Retourne le cache de résultats du processus."""
+    return _QUERY_RESULT_CACHE
@@ -32,6 +32,15 @@ from typing import Any
 from src.data.query.engine import QueryEngine
 
 
+def _cutoff(delta: timedelta) -> datetime:
+    """Borne « maintenant - delta », arrondie à la minute.
+
+    Un SQL identique d'un rerun à l'autre permet au cache de résultats du
+    QueryEngine de resservir la requête (au lieu d'une clé à la microseconde).
+    """
+    return datetime.now().replace(second=0, microsecond=0) - delta
+
+
 @dataclass
 class TrendPoint:
     """
@@ -227,7 +236,7 @@ class TrendAnalyzer:
         Returns:
             Liste de dicts avec date, matches, avg_kda, win_rate, etc.
         """
-        cutoff = datetime.now() - timedelta(days=last_days)
+        cutoff = _cutoff(timedelta(days=last_days))
 
         sql = f"""
             SELECT
@@ -259,7 +268,7 @@ class TrendAnalyzer:
         Calcule les statistiques agrégées par semaine.
         (Calculate weekly aggregated statistics)
         """
-        cutoff = datetime.now() - timedelta(weeks=last_weeks)
+        cutoff = _cutoff(timedelta(weeks=last_weeks))
 
         sql = f"""
             SELECT
@@ -290,7 +299,7 @@ class TrendAnalyzer:
         Calcule les statistiques agrégées par mois.
         (Calculate monthly aggregated statistics)
         """
-        cutoff = datetime.now() - timedelta(days=last_months * 30)
+        cutoff = _cutoff(timedelta(days=last_months * 30))
 
         sql = f"""
             SELECT
@@ -335,8 +344,7 @@ class TrendAnalyzer:
         if metric not in VALID_METRICS:
             raise ValueError(f"Métrique invalide : {metric}. Valeurs autorisées : {VALID_METRICS}")
 
-        now = datetime.now()
-        current_start = now - timedelta(days=period_days)
+        current_start = _cutoff(timedelta(days=period_days))
         previous_start = current_start - timedelta(days=period_days)
 
         if metric == "win_rate":
@@ -402,15 +410,16 @@ class TrendAnalyzer:
         win_rate_trend = self.compare_periods("win_rate", 7)
 
         # Calculer les moyennes récentes
+        recent_cutoff = _cutoff(timedelta(days=7))
         recent_stats = self.engine.execute_with_parquet(
-            """
+            f"""
             SELECT
                 AVG(kda) as recent_kda,
                 AVG(accuracy) as recent_accuracy,
                 SUM(CASE WHEN outcome = 2 THEN 1.0 ELSE 0 END) / NULLIF(COUNT(*), 0) as recent_win_rate,
                 COUNT(*) as match_count
-            FROM {table}
-            WHERE start_time >= NOW() - INTERVAL '7 days'
+            FROM {{table}}
+            WHERE start_time >= '{recent_cutoff.isoformat()}'
             """,
             "match_facts",
             self.xuid,
@@ -0,0 +1,340 @@
+"""
+Mixin pour les archives Parquet (cold storage) d'un joueur.
+
+Regroupe les méthodes d'archive extraites de DuckDBRepository :
+- get_archive_info
+- load_archives_as_polars
+- load_matches_from_archives
+- load_all_matches_unified
+- get_total_match_count_with_archives
+
+Les lectures passent par le catalogue ``archive_index.json`` : seules les
+archives dont la plage de dates chevauche la requête sont ouvertes, et la
+vue unifiée (DB + archives) est mise en cache par génération d'archive.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import polars as pl
+
+from src.data.domain.models.stats import MatchRow
+from src.data.infrastructure.parquet.archive_catalog import ArchiveCatalog
+from src.data.repositories._arrow_bridge import result_to_polars
+
+logger = logging.getLogger(__name__)
+
+# Vue unifiée par (DB joueur, génération d'archive, état des fichiers DB)
+_UNIFIED_CACHE_MAX_ENTRIES = 8
+_unified_cache: OrderedDict[tuple, list[MatchRow]] = OrderedDict()
+
+
+def _file_state(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _archive_frame_to_match_rows(df: pl.DataFrame) -> list[MatchRow]:
+    """Convertit un DataFrame d'archive en MatchRow (accès par nom de colonne)."""
+    return [
+        MatchRow(
+            match_id=r["match_id"],
+            start_time=r["start_time"],
+            map_id=r.get("map_id"),
+            map_name=r.get("map_name"),
+            playlist_id=r.get("playlist_id"),
+            playlist_name=r.get("playlist_name"),
+            map_mode_pair_id=r.get("pair_id"),
+            map_mode_pair_name=r.get("pair_name"),
+            game_variant_id=r.get("game_variant_id"),
+            game_variant_name=r.get("game_variant_name"),
+            outcome=r.get("outcome"),
+            last_team_id=r.get("team_id"),
+            kda=r.get("kda"),
+            max_killing_spree=r.get("max_killing_spree"),
+            headshot_kills=r.get("headshot_kills"),
+            average_life_seconds=r.get("avg_life_seconds"),
+            time_played_seconds=r.get("time_played_seconds"),
+            kills=r.get("kills") or 0,
+            deaths=r.get("deaths") or 0,
+            assists=r.get("assists") or 0,
+            accuracy=r.get("accuracy"),
+            my_team_score=r.get("my_team_score"),
+            enemy_team_score=r.get("enemy_team_score"),
+            team_mmr=r.get("team_mmr"),
+            enemy_mmr=r.get("enemy_mmr"),
+            personal_score=r.get("personal_score"),
+        )
+        for r in df.iter_rows(named=True)
+    ]
+
+
+class ArchivesMixin:
+    """Mixin fournissant la lecture des archives Parquet pour DuckDBRepository."""
+
+    def _get_archive_dir(self) -> Path:
+        """Retourne le chemin vers le dossier archive du joueur.
+
+        Dans le layout standard, les archives sont stockées dans un dossier
+        `archive/` à côté de `stats.duckdb`.
+
+        Pour certains scénarios (notamment des fixtures de tests), le dossier
+        joueur peut être suffixé par un identifiant (ex: `TestPlayer_ab12cd34`).
+        Dans ce cas, on tente aussi de résoudre `players/<base>/archive`.
+        """
+
+        archive_dir = self._player_db_path.parent / "archive"
+        if archive_dir.exists():
+            return archive_dir
+
+        player_dir_name = self._player_db_path.parent.name
+        m = re.match(r"^(?P<base>.+)_[0-9a-f]{8}$", player_dir_name)
+        if m:
+            base_dir = m.group("base")
+            alternative = self._player_db_path.parent.parent / base_dir / "archive"
+            if alternative.exists():
+                return alternative
+
+        return archive_dir
+
+    def get_archive_catalog(self) -> ArchiveCatalog:
+        """Retourne le catalogue des archives, complété depuis les footers Parquet."""
+        return ArchiveCatalog.load(self._get_archive_dir())
+
+    def get_archive_info(self) -> dict[str, Any]:
+        """Retourne les informations sur les archives existantes.
+
+        Les nombres de lignes proviennent du catalogue (footers Parquet),
+        aucun fichier n'est scanné.
+
+        Returns:
+            Dict avec:
+                - has_archives: bool
+                - archive_count: int
+                - total_size_mb: float
+                - archives: list[dict] avec détails de chaque fichier
+                - last_updated: str (datetime ISO) ou None
+        """
+        catalog = self.get_archive_catalog()
+
+        if not catalog.entries:
+            return {
+                "has_archives": False,
+                "archive_count": 0,
+                "total_size_mb": 0.0,
+                "archives": [],
+                "last_updated": None,
+            }
+
+        archives = []
+        total_size = 0
+        for entry in catalog.entries:
+            path = catalog.archive_dir / entry.file
+            size = entry.size_bytes or 0
+            total_size += size
+            archives.append(
+                {
+                    "name": entry.file,
+                    "size_mb": round(size / (1024 * 1024), 2),
+                    "row_count": entry.row_count,
+                    "min_start_time": entry.min_start_time,
+                    "max_start_time": entry.max_start_time,
+                    "modified_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                }
+            )
+
+        return {
+            "has_archives": True,
+            "archive_count": len(archives),
+            "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "archives": archives,
+            "last_updated": catalog.last_updated,
+        }
+
+    def load_archives_as_polars(
+        self,
+        *,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        columns: Sequence[str] | None = None,
+        catalog: ArchiveCatalog | None = None,
+    ) -> pl.DataFrame:
+        """Charge les matchs archivés en DataFrame Polars (Arrow zero-copy).
+
+        Seules les archives dont la plage [min, max] de ``start_time``
+        (catalogue) chevauche [start_date, end_date[ sont ouvertes.
+
+        Args:
+            start_date: Date de début (incluse).
+            end_date: Date de fin (exclue).
+            columns: Colonnes à projeter (None = toutes).
+            catalog: Catalogue déjà chargé (évite un rechargement).
+
+        Returns:
+            DataFrame Polars trié par start_time (vide si aucune archive).
+        """
+        catalog = catalog or self.get_archive_catalog()
+        files = catalog.files_for_range(start_date, end_date)
+        if not files:
+            return pl.DataFrame()
+
+        where_clauses = []
+        params: list[Any] = []
+        if start_date:
+            where_clauses.append("start_time >= ?")
+            params.append(start_date)
+        if end_date:
+            where_clauses.append("start_time < ?")
+            params.append(end_date)
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        select_sql = ", ".join(columns) if columns else "*"
+        file_list_sql = ", ".join("'" + str(f).replace("'", "''") + "'" for f in files)
+
+        conn = duckdb.connect(":memory:")
+        try:
+            result = conn.execute(
+                f"""
+                SELECT {select_sql}
+                FROM read_parquet([{file_list_sql}], union_by_name = true)
+                WHERE {where_sql}
+                ORDER BY start_time ASC
+                """,
+                params,
+            )
+            return result_to_polars(result)
+        except Exception as e:
+            logger.warning(f"Erreur lecture archives: {e}")
+            return pl.DataFrame()
+        finally:
+            conn.close()
+
+    def load_matches_from_archives(
+        self,
+        *,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[MatchRow]:
+        """Charge les matchs depuis les fichiers Parquet archivés.
+
+        Args:
+            start_date: Date de début (incluse).
+            end_date: Date de fin (exclue).
+
+        Returns:
+            Liste de MatchRow depuis les archives.
+        """
+        df = self.load_archives_as_polars(start_date=start_date, end_date=end_date)
+        if df.is_empty() or "match_id" not in df.columns:
+            return []
+        return _archive_frame_to_match_rows(df)
+
+    def _unified_cache_key(self, catalog: ArchiveCatalog) -> tuple:
+        """Clé de la vue unifiée : génération d'archive + état des fichiers DB."""
+        db_path = self._player_db_path
+        return (
+            str(db_path),
+            catalog.fingerprint,
+            _file_state(db_path),
+            _file_state(db_path.with_name(db_path.name + ".wal")),
+            _file_state(self._shared_db_path),
+            _file_state(self._shared_db_path.with_name(self._shared_db_path.name + ".wal")),
+        )
+
+    def load_all_matches_unified(
+        self,
+        *,
+        include_archives: bool = True,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[MatchRow]:
+        """Charge tous les matchs (DB principale + archives).
+
+        Fournit une vue unifiée de l'historique complet du joueur,
+        combinant la DB principale (données récentes) et les archives
+        Parquet (données anciennes). Avec archives, l'historique complet est
+        mis en cache par génération d'archive et état des fichiers DB, puis
+        filtré par dates.
+
+        Args:
+            include_archives: Si True, inclut les matchs des archives.
+            start_date: Date de début (incluse).
+            end_date: Date de fin (exclue).
+
+        Returns:
+            Liste de MatchRow triée par start_time (chronologique).
+        """
+        if include_archives:
+            catalog = self.get_archive_catalog()
+            key = self._unified_cache_key(catalog)
+            unified = _unified_cache.get(key)
+            if unified is None:
+                unified = self._build_unified_matches(catalog)
+                _unified_cache[key] = unified
+                while len(_unified_cache) > _UNIFIED_CACHE_MAX_ENTRIES:
+                    _unified_cache.popitem(last=False)
+            else:
+                _unified_cache.move_to_end(key)
+                logger.debug("Vue unifiée servie depuis le cache")
+        else:
+            unified = sorted(self.load_matches(), key=lambda m: m.start_time)
+
+        if not (start_date or end_date):
+            return list(unified)
+        return [
+            m
+            for m in unified
+            if not (start_date and m.start_time < start_date)
+            and not (end_date and m.start_time >= end_date)
+        ]
+
+    def _build_unified_matches(self, catalog: ArchiveCatalog) -> list[MatchRow]:
+        """Fusionne archives + DB principale (dédupliqué, trié)."""
+        archive_df = self.load_archives_as_polars(catalog=catalog)
+        archive_matches = (
+            _archive_frame_to_match_rows(archive_df)
+            if not archive_df.is_empty() and "match_id" in archive_df.columns
+            else []
+        )
+        logger.debug(f"Archives: {len(archive_matches)} matchs chargés")
+
+        db_matches = self.load_matches()
+        logger.debug(f"DB principale: {len(db_matches)} matchs chargés")
+
+        # Dédupliquer (au cas où un match serait dans les deux)
+        seen_ids: set[str] = set()
+        unique_matches: list[MatchRow] = []
+        for m in (*archive_matches, *db_matches):
+            if m.match_id not in seen_ids:
+                seen_ids.add(m.match_id)
+                unique_matches.append(m)
+
+        unique_matches.sort(key=lambda m: m.start_time)
+        logger.debug(f"Total unifié: {len(unique_matches)} matchs")
+        return unique_matches
+
+    def get_total_match_count_with_archives(self) -> dict[str, int]:
+        """Retourne le compte des matchs (DB + archives).
+
+        Returns:
+            Dict avec 'db_count', 'archive_count', 'total'.
+        """
+        db_count = self.get_match_count()
+        archive_count = self.get_archive_catalog().total_rows
+
+        return {
+            "db_count": db_count,
+            "archive_count": archive_count,
+            "total": db_count + archive_count,
+        }
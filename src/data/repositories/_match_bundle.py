@@ -0,0 +1,347 @@
+"""
+Mixin et cache des bundles de la vue Match (toutes les données d'un match).
+
+Regroupe ce que la page Match charge pour un match :
+- MMR équipe / adverse (résultat joueur)
+- médailles du joueur principal
+- highlight events et gamertags des joueurs cités
+- rosters
+- PersonalScoreAwards (section Participation)
+
+HOW IT WORKS:
+1. ``MatchBundleMixin.load_match_bundles(match_ids)`` charge ces données
+   pour une liste de matchs avec une requête par table (``IN (...)``) sur une
+   seule connexion ; seuls les rosters et la résolution des gamertags restent
+   par match (leur logique de repli dépend du match)
+2. ``get_match_bundle(repo, ...)`` sert les bundles depuis un cache LRU
+   process-wide, indexé par (DB joueur, xuid, match) et invalidé quand les
+   fichiers lus changent (nouveau snapshot publié, écriture, WAL) ; les
+   absents sont lus avec le repository de l'appelant
+3. ``prefetch_match_bundles`` charge les matchs voisins (précédent/suivant de
+   l'historique) absents ou périmés sur un thread d'arrière-plan unique, avec
+   son propre repository (une connexion DuckDB ne se partage pas entre
+   threads), pendant que l'utilisateur lit le match courant
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.data.infrastructure.database.snapshots import resolve_read_path
+from src.data.repositories._roster_loader import _file_state
+
+if TYPE_CHECKING:
+    import polars as pl
+
+    from src.data.repositories.duckdb_repo import DuckDBRepository
+
+logger = logging.getLogger(__name__)
+
+# Cache des bundles : (DB joueur, xuid, match_id) → (état des DBs, bundle)
+_BUNDLE_CACHE_MAX_ENTRIES = 32
+_bundle_cache: OrderedDict[tuple[str, str, str], tuple[tuple, MatchBundle]] = OrderedDict()
+_bundle_lock = threading.Lock()
+
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_pending: set[tuple[str, str, str]] = set()
+
+
+@dataclass
+class MatchBundle:
+    """Données de la vue Match pour un match."""
+
+    match_id: str
+    team_mmr: float | None = None
+    enemy_mmr: float | None = None
+    medals: list[dict[str, int]] = field(default_factory=list)
+    highlight_events: list[dict[str, Any]] = field(default_factory=list)
+    gamertags: dict[str, str] = field(default_factory=dict)
+    rosters: dict[str, Any] | None = None
+    # None si la table personal_score_awards est absente ou vide
+    personal_scores: pl.DataFrame | None = None
+
+    def player_match_result(self) -> dict[str, Any]:
+        """Résultat joueur au format de ``cached_load_player_match_result``."""
+        return {
+            "team_id": None,
+            "team_mmr": self.team_mmr,
+            "enemy_mmr": self.enemy_mmr,
+            "team_mmrs": None,
+            "kills": {"count": None, "expected": None, "stddev": None},
+            "deaths": {"count": None, "expected": None, "stddev": None},
+            "assists": {"count": None, "expected": None, "stddev": None},
+        }
+
+
+class MatchBundleMixin:
+    """Mixin fournissant le chargement groupé des bundles Match pour DuckDBRepository."""
+
+    def load_match_bundles(self, match_ids: list[str]) -> dict[str, MatchBundle]:
+        """Charge les bundles de plusieurs matchs.
+
+        Args:
+            match_ids: IDs des matchs.
+
+        Returns:
+            Dict {match_id: MatchBundle} (un bundle par match demandé).
+        """
+        ids = list(dict.fromkeys(str(m).strip() for m in match_ids if m and str(m).strip()))
+        if not ids:
+            return {}
+        bundles = {mid: MatchBundle(match_id=mid) for mid in ids}
+
+        try:
+            for mid, (team_mmr, enemy_mmr) in self.load_match_mmr_batch(ids).items():
+                if mid in bundles:
+                    bundles[mid].team_mmr = team_mmr
+                    bundles[mid].enemy_mmr = enemy_mmr
+        except Exception as e:
+            logger.debug(f"Bundle: MMR indisponibles ({e})")
+
+        for mid, medals in self._load_medals_batch(ids).items():
+            bundles[mid].medals = medals
+
+        events = self._load_highlight_events_batch(ids)
+        for mid, match_events in events.items():
+            bundles[mid].highlight_events = match_events
+
+        if self.has_personal_score_awards():
+            try:
+                df = self.load_personal_score_awards_as_polars(match_ids=ids)
+                for mid in ids:
+                    bundles[mid].personal_scores = df.filter(df["match_id"] == mid)
+            except Exception as e:
+                logger.debug(f"Bundle: PersonalScores indisponibles ({e})")
+
+        for mid, bundle in bundles.items():
+            xuids = list(dict.fromkeys(e["xuid"] for e in bundle.highlight_events if e["xuid"]))
+            if xuids:
+                try:
+                    resolved = self.resolve_gamertags_batch(xuids, match_id=mid)
+                    bundle.gamertags = {x: gt for x, gt in resolved.items() if gt}
+                except Exception as e:
+                    logger.debug(f"Bundle: gamertags indisponibles pour {mid} ({e})")
+            try:
+                bundle.rosters = self.load_match_rosters(mid)
+            except Exception as e:
+                logger.debug(f"Bundle: rosters indisponibles pour {mid} ({e})")
+
+        return bundles
+
+    def _load_medals_batch(self, match_ids: list[str]) -> dict[str, list[dict[str, int]]]:
+        """Médailles du joueur principal par match (même cascade que load_match_medals)."""
+        conn = self._get_connection()
+        placeholders = ", ".join(["?" for _ in match_ids])
+        medals: dict[str, list[dict[str, int]]] = {}
+
+        # V5 : shared.medals_earned
+        if self._has_shared_table("medals_earned"):
+            try:
+                rows = conn.execute(
+                    f"SELECT match_id, medal_name_id, count FROM shared.medals_earned "
+                    f"WHERE match_id IN ({placeholders}) AND xuid = ?",
+                    [*match_ids, self._xuid],
+                ).fetchall()
+                for mid, name_id, count in rows:
+                    medals.setdefault(mid, []).append({"name_id": name_id, "count": count})
+            except Exception:
+                pass
+
+        # Fallback V4 : medals_earned locale pour les matchs sans médailles shared
+        missing = [mid for mid in match_ids if mid not in medals]
+        if missing:
+            try:
+                rows = conn.execute(
+                    "SELECT match_id, medal_name_id, count FROM medals_earned "
+                    f"WHERE match_id IN ({', '.join(['?' for _ in missing])})",
+                    missing,
+                ).fetchall()
+                for mid, name_id, count in rows:
+                    medals.setdefault(mid, []).append({"name_id": name_id, "count": count})
+            except Exception:
+                pass
+        return medals
+
+    def _load_highlight_events_batch(self, match_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+        """Highlight events par match (format de ``cached_load_highlight_events_for_match``)."""
+        if not self.has_table("highlight_events"):
+            return {}
+        conn = self._get_connection()
+        placeholders = ", ".join(["?" for _ in match_ids])
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT match_id, event_type, time_ms, xuid, gamertag, type_hint, raw_json
+                FROM highlight_events
+                WHERE match_id IN ({placeholders})
+                ORDER BY match_id, time_ms ASC
+                """,
+                match_ids,
+            ).fetchall()
+        except Exception as e:
+            logger.debug(f"Bundle: highlight events indisponibles ({e})")
+            return {}
+
+        events: dict[str, list[dict[str, Any]]] = {}
+        for mid, event_type, time_ms, xuid, gamertag, type_hint, raw_json in rows:
+            event = {
+                "event_type": event_type,
+                "time_ms": time_ms,
+                "xuid": xuid,
+                "gamertag": gamertag,
+                "type_hint": type_hint,
+            }
+            if raw_json:
+                try:
+                    extra = json.loads(raw_json) if isinstance(raw_json, str) else {}
+                    event.update(extra)
+                except Exception:
+                    pass
+            events.setdefault(mid, []).append(event)
+        return events
+
+
+# =============================================================================
+# Cache process-wide et préchargement
+# =============================================================================
+
+
+def _bundle_state(player_db_path: Path, shared_db_path: Path) -> tuple:
+    """État des fichiers lus (snapshots publiés ou fichiers de travail + WAL)."""
+    paths = (resolve_read_path(player_db_path), resolve_read_path(shared_db_path))
+    return (
+        *paths,
+        *(_file_state(p) for p in paths),
+        *(_file_state(p.with_name(p.name + ".wal")) for p in paths),
+    )
+
+
+def _cache_get(key: tuple[str, str, str], state: tuple) -> MatchBundle | None:
+    with _bundle_lock:
+        entry = _bundle_cache.get(key)
+        if entry is None or entry[0] != state:
+            return None
+        _bundle_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: tuple[str, str, str], state: tuple, bundle: MatchBundle) -> None:
+    with _bundle_lock:
+        _bundle_cache[key] = (state, bundle)
+        _bundle_cache.move_to_end(key)
+        while len(_bundle_cache) > _BUNDLE_CACHE_MAX_ENTRIES:
+            _bundle_cache.popitem(last=False)
+
+
+def _cache_key(repo: DuckDBRepository, match_id: str) -> tuple[str, str, str]:
+    return (str(repo._player_db_path), repo._xuid, match_id)
+
+
+def _load_into_cache(repo: DuckDBRepository, match_ids: list[str]) -> dict[str, MatchBundle]:
+    """Charge avec `repo` les bundles absents du cache (ou périmés)."""
+    state = _bundle_state(repo._player_db_path, repo._shared_db_path)
+    found: dict[str, MatchBundle] = {}
+    missing = []
+    for mid in match_ids:
+        cached = _cache_get(_cache_key(repo, mid), state)
+        if cached is not None:
+            found[mid] = cached
+        else:
+            missing.append(mid)
+    if missing:
+        for mid, bundle in repo.load_match_bundles(missing).items():
+            _cache_put(_cache_key(repo, mid), state, bundle)
+            found[mid] = bundle
+    return found
+
+
+def get_match_bundle(
+    repo: DuckDBRepository,
+    match_id: str,
+    *,
+    prefetch: Iterable[str] = (),
+) -> MatchBundle | None:
+    """Bundle d'un match (cache LRU), avec préchargement optionnel des voisins.
+
+    Args:
+        repo: Repository de l'appelant (lit les bundles absents du cache).
+        match_id: ID du match affiché.
+        prefetch: Matchs à précharger en arrière-plan (précédent/suivant).
+
+    Returns:
+        Le bundle, ou None si la DB est illisible.
+    """
+    match_id = str(match_id or "").strip()
+    if not match_id:
+        return None
+    try:
+        bundle = _load_into_cache(repo, [match_id]).get(match_id)
+    except Exception as e:
+        logger.debug(f"Bundle indisponible pour {match_id}: {e}")
+        return None
+    prefetch_match_bundles(repo, [m for m in prefetch if m and m != match_id])
+    return bundle
+
+
+def prefetch_match_bundles(repo: DuckDBRepository, match_ids: Iterable[str]) -> None:
+    """Précharge des bundles sur le thread d'arrière-plan (sans attendre).
+
+    Le thread lit avec son propre repository (mêmes chemins que `repo`) : la
+    connexion de l'appelant ne se partage pas entre threads.
+    """
+    global _prefetch_executor
+    state = _bundle_state(repo._player_db_path, repo._shared_db_path)
+    wanted = []
+    with _bundle_lock:
+        for mid in dict.fromkeys(str(m).strip() for m in match_ids if m):
+            key = _cache_key(repo, mid)
+            entry = _bundle_cache.get(key)
+            fresh = entry is not None and entry[0] == state
+            if mid and not fresh and key not in _prefetch_pending:
+                _prefetch_pending.add(key)
+                wanted.append(mid)
+        if not wanted:
+            return
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="match-bundle-prefetch"
+            )
+        executor = _prefetch_executor
+
+    from src.data.repositories.duckdb_repo import DuckDBRepository
+
+    player_db_path = repo._player_db_path
+    xuid = repo._xuid
+    keys = [_cache_key(repo, mid) for mid in wanted]
+    repo_kwargs = {
+        "read_only": True,
+        "metadata_db_path": repo._metadata_db_path,
+        "shared_db_path": repo._shared_db_path,
+    }
+
+    def _run() -> None:
+        prefetch_repo = DuckDBRepository(player_db_path, xuid, **repo_kwargs)
+        try:
+            _load_into_cache(prefetch_repo, wanted)
+        except Exception as e:
+            logger.debug(f"Préchargement des bundles échoué: {e}")
+        finally:
+            prefetch_repo.close()
+            with _bundle_lock:
+                _prefetch_pending.difference_update(keys)
+
+    executor.submit(_run)
+
+
+def clear_match_bundle_cache() -> None:
+    """Vide le cache des bundles."""
+    with _bundle_lock:
+        _bundle_cache.clear()
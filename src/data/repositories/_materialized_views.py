@@ -9,6 +9,7 @@ des vues matérialisées extraites de DuckDBRepository :
 - get_mode_category_stats
 - get_global_stats
 - get_session_stats
+- get_filter_cube
 - has_materialized_views
 """
 
@@ -20,10 +21,35 @@ from typing import TYPE_CHECKING
 import duckdb
 
 if TYPE_CHECKING:
-    pass
+    import polars as pl
 
 logger = logging.getLogger(__name__)
 
+# Colonnes de match_stats dont dépend le cube (clés et mesures)
+_FILTER_CUBE_SOURCE_COLUMNS = (
+    "match_id",
+    "start_time",
+    "playlist_name",
+    "pair_name",
+    "map_name",
+    "outcome",
+    "kills",
+    "deaths",
+    "assists",
+    "time_played_seconds",
+    "accuracy",
+    "avg_life_seconds",
+)
+
+
+def _filter_cube_generation(conn: duckdb.DuckDBPyConnection) -> str:
+    """Génération de match_stats vue par le cube (nombre de lignes + empreinte)."""
+    columns = ", ".join(_FILTER_CUBE_SOURCE_COLUMNS)
+    rows, fingerprint = conn.execute(
+        f"SELECT COUNT(*), COALESCE(hash(SUM(hash({columns})::HUGEINT)), 0) FROM match_stats"
+    ).fetchone()
+    return f"{rows}:{fingerprint}"
+
 
 class MaterializedViewsMixin:
     """Mixin fournissant la gestion des vues matérialisées pour DuckDBRepository."""
@@ -93,6 +119,40 @@ class MaterializedViewsMixin:
             )
         """)
 
+        # mv_filter_cube : Mesures additives par (jour, playlist, mode, carte,
+        # résultat, classé, Firefight) pour les KPIs filtrés de la sidebar
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS mv_filter_cube (
+                day DATE,
+                playlist_name VARCHAR,
+                pair_name VARCHAR,
+                map_name VARCHAR,
+                outcome BIGINT,
+                is_ranked BOOLEAN,
+                is_firefight BOOLEAN,
+                matches BIGINT,
+                kills_sum BIGINT,
+                deaths_sum BIGINT,
+                assists_sum BIGINT,
+                time_played_sum DOUBLE,
+                time_played_n BIGINT,
+                accuracy_sum DOUBLE,
+                accuracy_n BIGINT,
+                life_sum DOUBLE,
+                life_n BIGINT,
+                first_start TIMESTAMP,
+                last_start TIMESTAMP
+            )
+        """)
+
+        # mv_filter_cube_source : Génération de match_stats ayant servi au cube
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS mv_filter_cube_source (
+                source_generation VARCHAR,
+                updated_at TIMESTAMP
+            )
+        """)
+
     def refresh_materialized_views(self) -> dict[str, int]:
         """Rafraîchit toutes les vues matérialisées après sync.
 
@@ -146,6 +206,7 @@ class MaterializedViewsMixin:
 
         # ─── mv_mode_category_stats ───
         # Catégorisation basée sur pair_name ou playlist_name
+        # GROUP BY 1 : match_stats a aussi une colonne mode_category, qui masquerait l'alias
         conn.execute("DELETE FROM mv_mode_category_stats")
         conn.execute("""
             INSERT INTO mv_mode_category_stats
@@ -177,7 +238,7 @@ class MaterializedViewsMixin:
                      ELSE 0 END as win_rate,
                 CURRENT_TIMESTAMP as updated_at
             FROM match_stats
-            GROUP BY mode_category
+            GROUP BY 1
         """)
         results["mv_mode_category_stats"] = conn.execute(
             "SELECT COUNT(*) FROM mv_mode_category_stats"
@@ -268,9 +329,37 @@ class MaterializedViewsMixin:
         except Exception:
             results["mv_session_stats"] = 0
 
+        # ─── mv_filter_cube ───
+        try:
+            results["mv_filter_cube"] = self._refresh_filter_cube(conn)
+        except Exception as e:
+            logger.warning(f"mv_filter_cube non rafraîchi: {e}")
+            results["mv_filter_cube"] = 0
+
         logger.info(f"Vues matérialisées rafraîchies: {results}")
         return results
 
+    def _refresh_filter_cube(self, conn: duckdb.DuckDBPyConnection) -> int:
+        """Reconstruit mv_filter_cube depuis les matchs (Firefight inclus)."""
+        from src.analysis.filter_cube import CUBE_SCHEMA, build_filter_cube
+
+        generation = _filter_cube_generation(conn)
+        cube = build_filter_cube(self.load_matches_as_polars(include_firefight=True))
+        columns = ", ".join(CUBE_SCHEMA)
+        conn.execute("DELETE FROM mv_filter_cube")
+        conn.register("_filter_cube_batch", cube)
+        try:
+            conn.execute(
+                f"INSERT INTO mv_filter_cube ({columns}) SELECT {columns} FROM _filter_cube_batch"
+            )
+        finally:
+            conn.unregister("_filter_cube_batch")
+        conn.execute("DELETE FROM mv_filter_cube_source")
+        conn.execute(
+            "INSERT INTO mv_filter_cube_source VALUES (?, CURRENT_TIMESTAMP)", [generation]
+        )
+        return cube.height
+
     def get_map_stats(self, min_matches: int = 1) -> list[dict]:
         """Récupère les stats par carte depuis la vue matérialisée.
 
@@ -366,6 +455,37 @@ class MaterializedViewsMixin:
         except Exception:
             return []
 
+    def get_filter_cube(self) -> pl.DataFrame | None:
+        """Récupère le cube de filtres depuis la vue matérialisée.
+
+        Le cube n'est servi que si la génération de match_stats enregistrée à
+        sa construction est toujours celle de la base (l'appelant met le
+        résultat en cache par db_key : la vérification a lieu une fois par
+        version de la DB).
+
+        Returns:
+            DataFrame Polars (schéma ``CUBE_SCHEMA``), ou None si la table est
+            absente, vide ou en retard sur match_stats (l'appelant agrège alors
+            la frame brute).
+        """
+        from src.analysis.filter_cube import CUBE_SCHEMA
+
+        conn = self._get_connection()
+
+        try:
+            columns = ", ".join(CUBE_SCHEMA)
+            cube = conn.execute(f"SELECT {columns} FROM mv_filter_cube").pl()
+            built = conn.execute("SELECT source_generation FROM mv_filter_cube_source").fetchone()
+            current = _filter_cube_generation(conn)
+        except Exception:
+            return None
+        if cube.is_empty():
+            return None
+        if built is None or built[0] != current:
+            logger.debug("mv_filter_cube en retard sur match_stats, ignoré")
+            return None
+        return cube.cast(CUBE_SCHEMA)
+
     def has_materialized_views(self) -> bool:
         """Vérifie si les vues matérialisées sont disponibles et remplies.
 
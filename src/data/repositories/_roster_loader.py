@@ -12,6 +12,11 @@ de résolution XUID → Gamertag extraites de DuckDBRepository :
 - resolve_gamertags_batch
 - load_match_player_gamertags
 - load_match_players_stats
+
+La résolution des gamertags se fait par lot (une requête ``UNION ALL`` pour
+toutes les sources). Les réponses issues de ``xuid_aliases`` sont gardées dans
+un cache LRU process-wide, invalidé quand les fichiers DB changent ou via
+``invalidate_gamertag_cache()`` après une écriture d'alias.
 """
 
 from __future__ import annotations
@@ -19,13 +24,61 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from src.data.infrastructure.database.teammate_index import TEAMMATE_PAIRS_TABLE, matches_with_sql
+
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Cascade de résolution : (priorité, table shared ?, table)
+_GAMERTAG_SOURCES: tuple[tuple[int, bool, str], ...] = (
+    (1, True, "match_participants"),
+    (2, True, "xuid_aliases"),
+    (3, False, "match_participants"),
+    (4, False, "xuid_aliases"),
+    (5, False, "highlight_events"),
+)
+_ALIAS_SOURCES = frozenset({2, 4})
+_SOURCE_EVENTS = 5
+
+# Cache des alias : (DB joueur, xuid) → (état des DBs, (priorité, gamertag) | None)
+_ALIAS_CACHE_MAX_ENTRIES = 4096
+_alias_cache: OrderedDict[tuple[str, str], tuple[tuple, tuple[int, str] | None]] = OrderedDict()
+_alias_generation = 0
+_alias_lock = threading.Lock()
+
+
+def _file_state(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _alias_state(player_db_path: Path, shared_db_path: Path) -> tuple:
+    """État courant des sources d'alias (DB + WAL joueur et shared)."""
+    paths = (player_db_path, shared_db_path)
+    return (
+        _alias_generation,
+        *(_file_state(p) for p in paths),
+        *(_file_state(p.with_name(p.name + ".wal")) for p in paths),
+    )
+
+
+def invalidate_gamertag_cache() -> None:
+    """Vide le cache des alias (à appeler après une écriture dans xuid_aliases)."""
+    global _alias_generation
+    with _alias_lock:
+        _alias_generation += 1
+        _alias_cache.clear()
+
 
 class RosterLoaderMixin:
     """Mixin fournissant le chargement des rosters et la résolution des gamertags pour DuckDBRepository."""
@@ -378,7 +431,7 @@ class RosterLoaderMixin:
     ) -> list[str]:
         """Retourne les match_id joués avec un coéquipier.
 
-        V5 : Utilise shared.match_participants si disponible.
+        V5 : Index shared.teammate_pairs, sinon shared.match_participants.
         Fallback : highlight_events locale.
 
         Args:
@@ -389,6 +442,18 @@ class RosterLoaderMixin:
         """
         conn = self._get_connection()
 
+        # Index de co-présence shared.teammate_pairs (voir teammate_index.py)
+        if self._has_shared_table(TEAMMATE_PAIRS_TABLE):
+            try:
+                result = conn.execute(
+                    matches_with_sql(same_team_only=False), [self._xuid, teammate_xuid]
+                )
+                match_ids = [row[0] for row in result.fetchall()]
+                if match_ids:
+                    return match_ids
+            except Exception as e:
+                logger.debug(f"Erreur shared.teammate_pairs: {e}")
+
         # V5 : shared.match_participants (roster complet)
         if self._has_shared_table("match_participants"):
             try:
@@ -439,8 +504,8 @@ class RosterLoaderMixin:
     ) -> list[str]:
         """Retourne les match_id où les deux joueurs étaient dans la même équipe.
 
-        V5 : Utilise shared.match_participants si disponible (team_id fiable).
-        Fallback : match_participants locale puis highlight_events.
+        V5 : Index shared.teammate_pairs, sinon shared.match_participants
+        (team_id fiable). Fallback : match_participants locale puis highlight_events.
 
         Args:
             teammate_xuid: XUID du coéquipier.
@@ -450,6 +515,18 @@ class RosterLoaderMixin:
         """
         conn = self._get_connection()
 
+        # Index de co-présence shared.teammate_pairs (voir teammate_index.py)
+        if self._has_shared_table(TEAMMATE_PAIRS_TABLE):
+            try:
+                result = conn.execute(
+                    matches_with_sql(same_team_only=True), [self._xuid, teammate_xuid]
+                )
+                match_ids = [row[0] for row in result.fetchall()]
+                if match_ids:
+                    return match_ids
+            except Exception as e:
+                logger.debug(f"Erreur shared.teammate_pairs: {e}")
+
         # V5 : shared.match_participants (roster complet, team_id fiable)
         if self._has_shared_table("match_participants"):
             try:
@@ -553,6 +630,8 @@ class RosterLoaderMixin:
         4. xuid_aliases locale
         5. highlight_events (nettoyé avec extraction ASCII)
 
+        Délègue à ``resolve_gamertags_batch`` (même cascade, même cache).
+
         Args:
             xuid: XUID du joueur à résoudre.
             match_id: ID du match (optionnel, améliore la résolution contextuelle).
@@ -560,71 +639,7 @@ class RosterLoaderMixin:
         Returns:
             Gamertag propre ou None si non trouvé.
         """
-        conn = self._get_connection()
-        xuid = str(xuid).strip()
-
-        # 1. shared.match_participants (v5 — roster complet)
-        if match_id and self._has_shared_table("match_participants"):
-            try:
-                result = conn.execute(
-                    "SELECT gamertag FROM shared.match_participants WHERE match_id = ? AND xuid = ?",
-                    [match_id, xuid],
-                ).fetchone()
-                if result and result[0]:
-                    return result[0]
-            except Exception:
-                pass
-
-        # 2. shared.xuid_aliases (v5)
-        if self._has_shared_table("xuid_aliases"):
-            try:
-                result = conn.execute(
-                    "SELECT gamertag FROM shared.xuid_aliases WHERE xuid = ?",
-                    [xuid],
-                ).fetchone()
-                if result and result[0]:
-                    return result[0]
-            except Exception:
-                pass
-
-        # 3. match_participants locale (si match_id fourni et table existe)
-        if match_id and self._has_table("match_participants"):
-            try:
-                result = conn.execute(
-                    "SELECT gamertag FROM match_participants WHERE match_id = ? AND xuid = ?",
-                    [match_id, xuid],
-                ).fetchone()
-                if result and result[0]:
-                    return result[0]
-            except Exception:
-                pass
-
-        # 4. xuid_aliases locale
-        try:
-            result = conn.execute(
-                "SELECT gamertag FROM xuid_aliases WHERE xuid = ?",
-                [xuid],
-            ).fetchone()
-            if result and result[0]:
-                return result[0]
-        except Exception:
-            pass
-
-        # 5. highlight_events avec extraction ASCII
-        if match_id:
-            try:
-                result = conn.execute(
-                    "SELECT gamertag FROM highlight_events WHERE match_id = ? AND xuid = ? LIMIT 1",
-                    [match_id, xuid],
-                ).fetchone()
-                if result and result[0]:
-                    cleaned = self._extract_ascii_token(result[0])
-                    if cleaned:
-                        return cleaned
-            except Exception:
-                pass
-
-        return None
+        return self.resolve_gamertags_batch([xuid], match_id=match_id).get(xuid)
 
     def _extract_ascii_token(self, value: str | None) -> str | None:
         """Extrait un token ASCII plausible depuis un gamertag corrompu.
@@ -663,7 +678,13 @@ class RosterLoaderMixin:
         *,
         match_id: str | None = None,
     ) -> dict[str, str | None]:
-        """Résout plusieurs XUIDs en gamertags en batch.
+        """Résout plusieurs XUIDs en gamertags en une seule requête.
+
+        Applique la cascade de ``resolve_gamertag`` à tout le lot via un
+        ``UNION ALL`` des sources (chaque branche porte son rang de priorité).
+        Les réponses de ``xuid_aliases`` (indépendantes du match) sont servies
+        par le cache process-wide : sans ``match_id``, un lot entièrement en
+        cache ne déclenche aucune requête.
 
         Args:
             xuids: Liste des XUIDs à résoudre.
@@ -672,7 +693,115 @@ class RosterLoaderMixin:
         Returns:
             Dict {xuid: gamertag} pour chaque XUID.
         """
-        return {xuid: self.resolve_gamertag(xuid, match_id=match_id) for xuid in xuids}
+        keys = {xuid: str(xuid).strip() for xuid in xuids}
+        wanted = list(dict.fromkeys(k for k in keys.values() if k))
+        if not wanted:
+            return dict.fromkeys(keys)
+
+        scope = str(self._player_db_path)
+        state = _alias_state(self._player_db_path, self._shared_db_path)
+        best: dict[str, tuple[int, str]] = {}
+        misses: list[str] = []
+        with _alias_lock:
+            for xuid in wanted:
+                entry = _alias_cache.get((scope, xuid))
+                if entry is None or entry[0] != state:
+                    misses.append(xuid)
+                    continue
+                _alias_cache.move_to_end((scope, xuid))
+                if entry[1] is not None:
+                    best[xuid] = entry[1]
+
+        if misses or match_id:
+            try:
+                rows = self._query_gamertag_sources(wanted, misses, match_id)
+            except Exception as e:
+                logger.debug(f"Erreur resolve_gamertags_batch: {e}")
+                return {xuid: best[key][1] if key in best else None for xuid, key in keys.items()}
+
+            aliases: dict[str, tuple[int, str]] = {}
+            for priority, xuid, gamertag in rows:
+                if priority == _SOURCE_EVENTS:
+                    gamertag = self._extract_ascii_token(gamertag)
+                if not gamertag:
+                    continue
+                candidate = (priority, str(gamertag))
+                if xuid not in best or candidate < best[xuid]:
+                    best[xuid] = candidate
+                if priority in _ALIAS_SOURCES and (
+                    xuid not in aliases or candidate < aliases[xuid]
+                ):
+                    aliases[xuid] = candidate
+
+            with _alias_lock:
+                for xuid in misses:
+                    _alias_cache[(scope, xuid)] = (state, aliases.get(xuid))
+                    _alias_cache.move_to_end((scope, xuid))
+                while len(_alias_cache) > _ALIAS_CACHE_MAX_ENTRIES:
+                    _alias_cache.popitem(last=False)
+
+        return {xuid: best[key][1] if key in best else None for xuid, key in keys.items()}
+
+    def _query_gamertag_sources(
+        self,
+        xuids: list[str],
+        alias_xuids: list[str],
+        match_id: str | None,
+    ) -> list[tuple[int, str, str]]:
+        """Interroge toutes les sources de gamertags en un seul ``UNION ALL``.
+
+        Args:
+            xuids: XUIDs à chercher dans les sources liées au match.
+            alias_xuids: XUIDs à chercher dans xuid_aliases (absents du cache).
+            match_id: ID du match (sans lui, seules les tables d'alias servent).
+
+        Returns:
+            Lignes (priorité, xuid, gamertag brut).
+        """
+        conn = self._get_connection()
+        available = {
+            (catalog == "shared", name)
+            for catalog, name in conn.execute(
+                "SELECT table_catalog, table_name FROM information_schema.tables "
+                "WHERE table_schema = 'main' "
+                "AND table_catalog IN ('shared', current_database()) "
+                "AND table_name IN ('match_participants', 'xuid_aliases', 'highlight_events')"
+            ).fetchall()
+        }
+        if not self.has_shared:
+            available = {source for source in available if not source[0]}
+
+        branches: list[str] = []
+        for priority, shared, table in _GAMERTAG_SOURCES:
+            if (shared, table) not in available:
+                continue
+            qualified = f"shared.{table}" if shared else table
+            if table == "xuid_aliases":
+                if alias_xuids:
+                    branches.append(
+                        f"SELECT {priority} AS priority, xuid, gamertag FROM {qualified} "
+                        "WHERE xuid IN (SELECT UNNEST($alias_xuids::VARCHAR[]))"
+                    )
+            elif match_id:
+                branches.append(
+                    f"SELECT {priority} AS priority, xuid, gamertag FROM {qualified} "
+                    "WHERE match_id = $match_id AND xuid IN (SELECT UNNEST($xuids::VARCHAR[]))"
+                )
+        if not branches:
+            return []
+
+        sql = (
+            "SELECT DISTINCT priority, CAST(xuid AS VARCHAR), gamertag FROM ("
+            + " UNION ALL ".join(branches)
+            + ") WHERE gamertag IS NOT NULL AND gamertag <> '' ORDER BY priority, gamertag"
+        )
+        params: dict[str, Any] = {}
+        if "$alias_xuids" in sql:
+            params["alias_xuids"] = alias_xuids
+        if "$match_id" in sql:
+            params["match_id"] = match_id
+            params["xuids"] = xuids
+        return conn.execute(sql, params).fetchall()
 
     def load_match_player_gamertags(self, match_id: str) -> dict[str, str]:
         """Retourne un mapping XUID → Gamertag pour un match.
@@ -135,6 +135,81 @@ class WinLossService:
 
         return PeriodTable(table=out_tbl, bucket_label=bucket_label, is_empty=False)
 
+    @staticmethod
+    def compute_period_table_from_cube(
+        cube: pl.DataFrame,
+        bucket_label: str,
+    ) -> PeriodTable | None:
+        """Tableau par période depuis une tranche du cube de filtres.
+
+        Même bucketing que ``compute_period_table`` hors sessions. Les buckets
+        jour / semaine / mois se somment sur les lignes du cube ; en dessous du
+        seuil journalier (buckets par heure ou par match), retourne None et
+        l'appelant repasse par la frame brute.
+
+        Args:
+            cube: Lignes du cube retenues par les filtres (``slice_filter_cube``).
+            bucket_label: Label du bucket temporel (pour l'en-tête).
+
+        Returns:
+            PeriodTable, ou None si la granularité demande les matchs.
+        """
+        from src.config import SESSION_CONFIG
+
+        d = cube.filter(pl.col("outcome").is_not_null())
+        if d.is_empty():
+            return PeriodTable(table=pd.DataFrame(), bucket_label=bucket_label, is_empty=True)
+
+        tmin = d["first_start"].min()
+        tmax = d["last_start"].max()
+        days = (tmax - tmin).total_seconds() / 86400.0 if tmin and tmax else 999.0
+        cfg = SESSION_CONFIG
+        if days <= cfg.bucket_threshold_daily:
+            return None
+
+        day = pl.col("day")
+        if days <= cfg.bucket_threshold_weekly:
+            bucket = day.dt.strftime("%Y-%m-%d")
+        elif days <= cfg.bucket_threshold_monthly:
+            # Période pandas "W-MON" : semaine du mardi au lundi
+            week_end = day + pl.duration(days=(8 - day.dt.weekday()) % 7)
+            bucket = pl.concat_str(
+                [
+                    (week_end - pl.duration(days=6)).dt.strftime("%Y-%m-%d"),
+                    week_end.dt.strftime("%Y-%m-%d"),
+                ],
+                separator="/",
+            )
+        else:
+            bucket = day.dt.strftime("%Y-%m")
+
+        counts = d.group_by(bucket.alias("bucket")).agg(
+            pl.col("matches").filter(pl.col("outcome") == code).sum().alias(name)
+            for code, name in (
+                (2, "Victoires"),
+                (3, "Défaites"),
+                (1, "Égalités"),
+                (4, "Non terminés"),
+            )
+        )
+        counts = (
+            counts.with_columns(
+                pl.sum_horizontal("Victoires", "Défaites", "Égalités", "Non terminés").alias(
+                    "Total"
+                )
+            )
+            .with_columns(
+                pl.when(pl.col("Total") > 0)
+                .then(100.0 * pl.col("Victoires") / pl.col("Total"))
+                .otherwise(0.0)
+                .alias("Taux de victoires")
+            )
+            .sort("bucket")
+            .rename({"bucket": bucket_label.capitalize()})
+        )
+
+        return PeriodTable(table=counts.to_pandas(), bucket_label=bucket_label, is_empty=False)
+
     @staticmethod
     def compute_map_breakdown(
         base_scope: pl.DataFrame,
@@ -15,6 +15,13 @@ from typing import Any
 import duckdb
 import polars as pl
 
+from src.data.infrastructure.database.shared_partitions import attach_shared, detach_shared
+from src.data.infrastructure.database.snapshots import connect_read_only, resolve_read_path
+from src.data.infrastructure.database.teammate_index import (
+    teammate_index_exists,
+    top_teammates_sql,
+)
+
 
 def get_friends_xuids_for_backfill(
     db_path: str | Path,
@@ -59,7 +66,7 @@ def get_friends_xuids_for_backfill(
 
     own_conn = False
     if conn is None:
-        conn = duckdb.connect(str(path), read_only=True)
+        conn = connect_read_only(path)
         own_conn = True
     try:
         result = conn.execute(
@@ -105,7 +112,7 @@ def get_top_two_teammate_xuids(
     *,
     conn: duckdb.DuckDBPyConnection | None = None,
 ) -> frozenset[str]:
-    """Top N coéquipiers depuis shared.match_participants."""
+    """Top N coéquipiers (index shared.teammate_pairs, sinon shared.match_participants)."""
     path = Path(db_path)
     if not path.exists():
         return frozenset()
@@ -117,34 +124,39 @@ def get_top_two_teammate_xuids(
 
     own_conn = False
     if conn is None:
-        conn = duckdb.connect(str(path), read_only=True)
+        conn = connect_read_only(path)
         own_conn = True
     try:
-        # Attacher shared en read-only
+        # Attacher shared en read-only (partitions fermées comprises)
+        attached: list[str] = []
         with contextlib.suppress(Exception):
-            conn.execute(
-                "ATTACH ? AS shared_tmp (READ_ONLY)",
-                [str(shared_db)],
+            attached = attach_shared(
+                conn, shared_db, alias="shared_tmp", read_path=resolve_read_path(shared_db)
             )
 
-        result = conn.execute(
-            """
-            SELECT mp2.xuid, COUNT(DISTINCT mp2.match_id) AS match_count
-            FROM shared_tmp.match_participants mp1
-            JOIN shared_tmp.match_participants mp2
-              ON mp1.match_id = mp2.match_id
-             AND mp1.xuid != mp2.xuid
-             AND mp1.team_id = mp2.team_id
-            WHERE mp1.xuid = ?
-            GROUP BY mp2.xuid
-            ORDER BY match_count DESC
-            LIMIT ?
-            """,
-            [str(self_xuid).strip(), limit],
-        ).fetchall()
+        result = []
+        if teammate_index_exists(conn, "shared_tmp"):
+            result = conn.execute(
+                top_teammates_sql("shared_tmp"), [str(self_xuid).strip(), limit]
+            ).fetchall()
+        if not result:
+            result = conn.execute(
+                """
+                SELECT mp2.xuid, COUNT(DISTINCT mp2.match_id) AS match_count
+                FROM shared_tmp.match_participants mp1
+                JOIN shared_tmp.match_participants mp2
+                  ON mp1.match_id = mp2.match_id
+                 AND mp1.xuid != mp2.xuid
+                 AND mp1.team_id = mp2.team_id
+                WHERE mp1.xuid = ?
+                GROUP BY mp2.xuid
+                ORDER BY match_count DESC
+                LIMIT ?
+                """,
+                [str(self_xuid).strip(), limit],
+            ).fetchall()
 
-        with contextlib.suppress(Exception):
-            conn.execute("DETACH shared_tmp")
+        detach_shared(conn, attached)
 
         return frozenset(str(r[0]).strip() for r in result if r[0])
     except Exception:
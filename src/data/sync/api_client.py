@@ -11,6 +11,11 @@ Usage:
         history = await client.get_match_history("Chocoboflor")
         for item in history:
             data = await client.get_match_data(item.match_id, xuids)
+
+SPNKR_API_BASE_URL (ou ``base_url=``) redirige toutes les requêtes
+``*.halowaypoint.com`` vers un serveur local (scripts/benchmark/api_standin.py) :
+``https://halostats.svc.halowaypoint.com/hi/...`` → ``<base>/halostats/hi/...``.
+Des tokens factices sont alors utilisés (jamais les vrais tokens).
 """
 
 from __future__ import annotations
@@ -23,9 +28,19 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
+from src.data.sync import tracing
 from src.data.sync.models import CareerRankData, MatchData, MatchHistoryItem
 
+# orjson optionnel : décodage direct depuis les bytes (JSON MatchStats volumineux)
+try:
+    import orjson
+
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +50,15 @@ logger = logging.getLogger(__name__)
 
 XUID_RE = re.compile(r"(\d{12,20})")
 CLEARANCE_COOKIE_RE = re.compile(r"(?:^|[;\s])343-clearance=([^;\s]+)", re.IGNORECASE)
+API_BASE_URL_ENV = "SPNKR_API_BASE_URL"
+_HALO_DOMAIN = ".halowaypoint.com"
+
+
+async def _read_json(resp: Any) -> Any:
+    """Décode le corps JSON d'une réponse (orjson sur les bytes si disponible)."""
+    if _ORJSON_AVAILABLE and hasattr(resp, "read"):
+        return orjson.loads(await resp.read())
+    return await resp.json()
 
 
 def _load_dotenv_if_present() -> None:
@@ -94,6 +118,54 @@ class Tokens:
     clearance_token: str
 
 
+# Tokens envoyés au serveur local (SPNKR_API_BASE_URL)
+STANDIN_TOKENS = Tokens(spartan_token="standin-spartan", clearance_token="standin-clearance")
+
+
+def api_base_url() -> str | None:
+    """URL du serveur local remplaçant les services Halo (None = services réels)."""
+    value = os.environ.get(API_BASE_URL_ENV, "").strip().rstrip("/")
+    return value or None
+
+
+def redirect_url(url: Any, base_url: str | None) -> str:
+    """Réécrit une URL ``<service>.svc.halowaypoint.com`` vers ``<base_url>/<service>``."""
+    url = str(url)
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if not host.endswith(_HALO_DOMAIN):
+        return url
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{base_url}/{host.split('.')[0]}{parts.path}{query}"
+
+
+class _RedirectingSession:
+    """ClientSession dont les requêtes halowaypoint.com partent vers `base_url`.
+
+    SPNKr code ses hôtes en dur et n'utilise que ``get`` et ``headers``.
+    """
+
+    def __init__(self, session: Any, base_url: str) -> None:
+        self._session = session
+        self._base_url = base_url
+
+    @property
+    def headers(self) -> Any:
+        return self._session.headers
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    def get(self, url: Any, **kwargs: Any) -> Any:
+        return self._session.get(redirect_url(url, self._base_url), **kwargs)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
 async def get_tokens_from_env() -> Tokens:
     """Récupère les tokens depuis les variables d'environnement.
 
@@ -101,6 +173,8 @@ async def get_tokens_from_env() -> Tokens:
     1. Tokens manuels : SPNKR_SPARTAN_TOKEN + SPNKR_CLEARANCE_TOKEN
     2. OAuth Azure : SPNKR_AZURE_CLIENT_ID + SPNKR_AZURE_CLIENT_SECRET + SPNKR_OAUTH_REFRESH_TOKEN
 
+    Avec SPNKR_API_BASE_URL (serveur local), retourne STANDIN_TOKENS.
+
     Raises:
         SystemExit: Si les tokens sont manquants ou invalides.
 
@@ -109,6 +183,9 @@ async def get_tokens_from_env() -> Tokens:
     """
     _load_dotenv_if_present()
 
+    if api_base_url() is not None:
+        return STANDIN_TOKENS
+
     # Mode OAuth Azure
     azure_client_id = os.environ.get("SPNKR_AZURE_CLIENT_ID")
     azure_client_secret = os.environ.get("SPNKR_AZURE_CLIENT_SECRET")
@@ -225,6 +302,7 @@ async def request_with_retries(
     *,
     tries: int = 4,
     base_sleep: float = 0.8,
+    stage: str = "api",
 ) -> Any:
     """Exécute une coroutine avec retry et backoff exponentiel.
 
@@ -232,6 +310,7 @@ async def request_with_retries(
         coro_factory: Factory qui retourne la coroutine à exécuter.
         tries: Nombre maximum de tentatives.
         base_sleep: Délai de base entre les tentatives (secondes).
+        stage: Étape de trace de chaque tentative (voir tracing.py).
 
     Returns:
         Résultat de la coroutine.
@@ -243,7 +322,8 @@ async def request_with_retries(
 
     for i in range(tries):
         try:
-            return await coro_factory()
+            with tracing.span(stage):
+                return await coro_factory()
         except Exception as e:
             # Auth invalide: inutile de retry
             try:
@@ -262,7 +342,8 @@ async def request_with_retries(
                 pass
 
             last_err = e
-            await asyncio.sleep(base_sleep * (2**i))
+            with tracing.span("api.retry"):
+                await asyncio.sleep(base_sleep * (2**i))
 
     assert last_err is not None
     raise last_err
@@ -291,21 +372,27 @@ class SPNKrAPIClient:
         *,
         tokens: Tokens | None = None,
         requests_per_second: int = 5,
+        base_url: str | None = None,
     ) -> None:
         """
         Args:
             tokens: Tokens pré-fournis (sinon récupérés depuis env).
             requests_per_second: Rate limiting par service.
+            base_url: Serveur local remplaçant les services Halo
+                (défaut : SPNKR_API_BASE_URL, sinon services réels).
         """
         self._tokens = tokens
         self._requests_per_second = requests_per_second
+        self._base_url = (base_url or "").rstrip("/") or api_base_url()
         self._session = None
         self._client = None
         self._film_mod = None
 
     async def __aenter__(self) -> SPNKrAPIClient:
         """Initialise la session et le client."""
-        if self._tokens is None:
+        if self._base_url:
+            self._tokens = STANDIN_TOKENS
+        elif self._tokens is None:
             self._tokens = await get_tokens_from_env()
 
         try:
@@ -317,6 +404,8 @@ class SPNKrAPIClient:
             ) from e
 
         self._session = ClientSession(timeout=ClientTimeout(total=45))
+        if self._base_url:
+            self._session = _RedirectingSession(self._session, self._base_url)
         self._client = HaloInfiniteClient(
             session=self._session,
             spartan_token=self._tokens.spartan_token,
@@ -374,7 +463,7 @@ class SPNKrAPIClient:
             )
             return await resp.parse()
 
-        history = await request_with_retries(_fetch)
+        history = await request_with_retries(_fetch, stage="api.history")
 
         if not hasattr(history, "results") or not history.results:
             return []
@@ -403,10 +492,10 @@ class SPNKrAPIClient:
 
         async def _fetch():
             resp = await self.client.stats.get_match_stats(match_id)
-            return await resp.json()
+            return await _read_json(resp)
 
         try:
-            result = await request_with_retries(_fetch)
+            result = await request_with_retries(_fetch, stage="api.match_stats")
             return result if isinstance(result, dict) else None
         except Exception as e:
             logger.warning(f"Erreur get_match_stats({match_id}): {e}")
@@ -434,7 +523,7 @@ class SPNKrAPIClient:
             return await resp.json()
 
         try:
-            result = await request_with_retries(_fetch)
+            result = await request_with_retries(_fetch, stage="api.skill")
             return result if isinstance(result, dict) else None
         except Exception:
             # Non bloquant: certains matchs n'ont pas de skill
@@ -456,7 +545,7 @@ class SPNKrAPIClient:
             return await self._film_mod.read_highlight_events(self.client, match_id=match_id)
 
         try:
-            events = await request_with_retries(_fetch)
+            events = await request_with_retries(_fetch, stage="api.events")
             return events if events else []
         except Exception:
             # Non bloquant: certains matchs n'ont pas de film
@@ -541,7 +630,7 @@ class SPNKrAPIClient:
             return await resp.json()
 
         try:
-            result = await request_with_retries(_fetch)
+            result = await request_with_retries(_fetch, stage="api.asset")
             return result if isinstance(result, dict) else None
         except Exception:
             # Asset manquant ou supprimé
@@ -588,7 +677,7 @@ class SPNKrAPIClient:
                 return await resp.json()
 
         try:
-            json_data = await request_with_retries(_fetch)
+            json_data = await request_with_retries(_fetch, stage="api.career_rank")
             if json_data is None:
                 return None
 
@@ -794,7 +883,7 @@ class SPNKrAPIClient:
                 return await resp.json()
 
         try:
-            json_data = await request_with_retries(_fetch)
+            json_data = await request_with_retries(_fetch, stage="api.match_count")
             if json_data is None:
                 return None
 
@@ -828,7 +917,7 @@ class SPNKrAPIClient:
             return await resp.json()
 
         try:
-            result = await request_with_retries(_fetch)
+            result = await request_with_retries(_fetch, stage="api.customization")
             return result if isinstance(result, dict) else None
         except Exception as e:
             logger.warning(f"Erreur get_player_customization({xuid}): {e}")
@@ -874,34 +963,10 @@ class SPNKrAPIClient:
 async def enrich_match_info_with_assets(client: SPNKrAPIClient, stats_json: dict[str, Any]) -> None:
     """Enrichit MatchInfo avec les PublicName depuis Discovery UGC (in-place).
 
-    Utilisé par le moteur de sync et le script backfill pour récupérer
-    les noms des playlists, maps, pairs et game variants.
+    Utilisé par le script backfill pour récupérer les noms des playlists,
+    maps, pairs et game variants (demandés en parallèle). Le moteur de sync
+    passe par son propre ``DiscoveryAssetFetcher`` (assets partagés entre matchs).
     """
-    match_info = stats_json.get("MatchInfo")
-    if not isinstance(match_info, dict):
-        return
-
-    asset_keys = [
-        ("Playlist", "Playlists"),
-        ("MapVariant", "Maps"),
-        ("PlaylistMapModePair", "PlaylistMapModePairs"),
-        ("UgcGameVariant", "GameVariants"),
-    ]
-
-    for json_key, api_type in asset_keys:
-        ref = match_info.get(json_key)
-        if not isinstance(ref, dict):
-            continue
-        aid = ref.get("AssetId")
-        vid = ref.get("VersionId")
-        if not aid or not vid:
-            continue
+    from src.data.sync.discovery_metadata import DiscoveryAssetFetcher
 
-        try:
-            asset = await client.get_asset(api_type, aid, vid)
-            if isinstance(asset, dict):
-                name = asset.get("PublicName")
-                if isinstance(name, str) and name.strip():
-                    ref["PublicName"] = name.strip()
-        except Exception as e:
-            logger.debug(f"Asset {api_type} {aid}: {e}")
+    await DiscoveryAssetFetcher(client).enrich_match_info(stats_json)
@@ -169,6 +169,10 @@ CAST_PLAN: dict[str, dict[str, str]] = {
         "pair_name": "VARCHAR",
         "game_variant_id": "VARCHAR",
         "game_variant_name": "VARCHAR",
+        "playlist_version_id": "VARCHAR",
+        "map_version_id": "VARCHAR",
+        "pair_version_id": "VARCHAR",
+        "game_variant_version_id": "VARCHAR",
         "mode_category": "VARCHAR",
         "is_ranked": "BOOLEAN",
         "is_firefight": "BOOLEAN",
@@ -0,0 +1,241 @@
+"""Writer DuckDB dédié avec group commit (écritures hors event loop).
+(Dedicated DuckDB writer thread with group commit)
+
+HOW IT WORKS:
+1. Les tâches de sync (asyncio) préparent leurs lignes puis soumettent une
+   fonction d'écriture par match (``DBWriter.submit``) ; elles attendent son
+   commit sans bloquer l'event loop, les autres téléchargements continuent
+2. Un thread unique consomme une file bornée : il prend un lot, y ajoute les
+   lots arrivés entre-temps (jusqu'à ``max_group`` lots ou ``linger_seconds``)
+   et les applique dans une seule transaction par connexion (group commit)
+3. File pleine → ``submit`` attend dans un thread du pool : les fetchers
+   ralentissent (backpressure) mais l'event loop reste libre
+4. Si un lot échoue, la transaction du groupe est annulée et chaque lot est
+   rejoué seul en autocommit (comportement historique, les fallbacks ligne à
+   ligne de batch_insert restent valables) ; seul le lot fautif reçoit l'erreur.
+   Les connexions sont commitées l'une après l'autre : si un COMMIT échoue
+   alors qu'une connexion précédente est déjà commitée, le rejeu écrit sur
+   cette dernière dans une transaction annulée ensuite, seul le côté non
+   commité est donc réellement rejoué (les lots y retrouvent leurs lignes :
+   écritures en upsert / INSERT OR IGNORE, comme celles du moteur de sync)
+5. Chaque lot s'exécute dans le contexte (contextvars) de la tâche qui l'a
+   soumis : les spans de tracing.py restent attribués au bon match
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_MAX_GROUP = 10
+DEFAULT_LINGER_SECONDS = 0.01
+
+_STOP = object()
+
+
+@dataclass
+class WriterStats:
+    """Compteurs du writer depuis le dernier ``take_stats``."""
+
+    batches: int = 0
+    commits: int = 0
+    replayed_groups: int = 0
+    max_queue_depth: int = 0
+    commit_seconds_total: float = 0.0
+    commit_seconds_max: float = 0.0
+
+    @property
+    def commit_latency_ms_avg(self) -> float:
+        """Latence moyenne d'un commit de groupe (ms)."""
+        if not self.commits:
+            return 0.0
+        return 1000.0 * self.commit_seconds_total / self.commits
+
+
+@dataclass
+class _WriteBatch:
+    label: str
+    apply: Callable[[], Any]
+    future: Future = field(default_factory=Future)
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+
+class DBWriter:
+    """Thread d'écriture unique pour un ensemble de connexions DuckDB.
+
+    Les connexions ne doivent plus être utilisées par un autre thread tant que
+    des écritures sont en vol (les lectures passent par ``conn.cursor()``).
+
+    Args:
+        connections: Connexions écrites par les lots (player, shared).
+        max_queue: Nombre de lots en attente avant backpressure.
+        max_group: Nombre maximum de lots par transaction.
+        linger_seconds: Attente maximale de lots supplémentaires avant commit.
+    """
+
+    def __init__(
+        self,
+        connections: list[duckdb.DuckDBPyConnection],
+        *,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_group: int = DEFAULT_MAX_GROUP,
+        linger_seconds: float = DEFAULT_LINGER_SECONDS,
+    ) -> None:
+        self._connections = connections
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self.max_group = max(1, max_group)
+        self.linger_seconds = linger_seconds
+        self._stats = WriterStats()
+        self._stats_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de lots en attente d'écriture."""
+        return self._queue.qsize()
+
+    async def submit(self, label: str, apply: Callable[[], Any]) -> Any:
+        """Soumet une écriture et attend son commit.
+
+        Args:
+            label: Libellé du lot (logs), typiquement le match_id.
+            apply: Fonction exécutée sur le thread writer (sans commit).
+
+        Returns:
+            La valeur retournée par `apply`.
+        """
+        self._ensure_started()
+        batch = _WriteBatch(label, apply)
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._queue.put, batch)
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats.batches += 1
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, depth)
+        return await asyncio.wrap_future(batch.future)
+
+    def take_stats(self) -> WriterStats:
+        """Retourne les compteurs courants et les remet à zéro."""
+        with self._stats_lock:
+            stats, self._stats = self._stats, WriterStats()
+        return stats
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Écrit les lots en attente puis arrête le thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Thread writer
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="duckdb-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            group = [item]
+            stop = self._fill_group(group)
+            self._apply_group(group)
+            if stop:
+                return
+
+    def _fill_group(self, group: list[_WriteBatch]) -> bool:
+        """Ajoute au groupe les lots disponibles. Retourne True si arrêt demandé."""
+        deadline = time.monotonic() + self.linger_seconds
+        while len(group) < self.max_group:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            group.append(item)
+        return False
+
+    def _apply_group(self, group: list[_WriteBatch]) -> None:
+        start = time.perf_counter()
+        results = []
+        committed: list[duckdb.DuckDBPyConnection] = []
+        try:
+            for conn in self._connections:
+                conn.begin()
+            for batch in group:
+                results.append(batch.context.run(batch.apply))
+            for conn in self._connections:
+                # Une erreur avalée par un lot invalide la transaction sans lever :
+                # COMMIT annulerait alors silencieusement tout le groupe
+                conn.execute("SELECT 1")
+            for conn in self._connections:
+                conn.commit()
+                committed.append(conn)
+        except Exception as e:
+            for conn in self._connections:
+                if conn in committed:
+                    continue
+                with contextlib.suppress(Exception):
+                    conn.rollback()
+            logger.debug(f"Group commit de {len(group)} lots annulé ({e}), rejeu individuel")
+            self._replay(group, committed)
+            return
+
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._stats.commits += 1
+            self._stats.commit_seconds_total += elapsed
+            self._stats.commit_seconds_max = max(self._stats.commit_seconds_max, elapsed)
+        for batch, value in zip(group, results, strict=True):
+            batch.future.set_result(value)
+
+    def _replay(
+        self,
+        group: list[_WriteBatch],
+        committed: list[duckdb.DuckDBPyConnection] | None = None,
+    ) -> None:
+        """Rejoue chaque lot seul, sans réécrire les connexions déjà commitées."""
+        with self._stats_lock:
+            self._stats.replayed_groups += 1
+        committed = committed or []
+        for batch in group:
+            try:
+                for conn in committed:
+                    conn.begin()
+                try:
+                    value = batch.context.run(batch.apply)
+                finally:
+                    for conn in committed:
+                        with contextlib.suppress(Exception):
+                            conn.rollback()
+            except Exception as e:
+                logger.warning(f"Écriture échouée pour {batch.label}: {e}")
+                batch.future.set_exception(e)
+            else:
+                batch.future.set_result(value)
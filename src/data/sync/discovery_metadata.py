@@ -0,0 +1,477 @@
+"""Peuplement de metadata.duckdb depuis Discovery UGC.
+(Discovery UGC metadata population)
+
+Utilisé par ``scripts/populate_metadata_from_discovery.py`` (déploiement
+initial) et par le moteur de sync (assets absents de metadata.duckdb).
+
+HOW IT WORKS:
+1. ``collect_asset_refs`` : une seule requête UNION sur shared.match_registry
+   et/ou les match_stats des DBs joueurs attachées en lecture seule
+2. Les (asset, version) déjà présents dans metadata.duckdb sont exclus dans la
+   même requête ; la version vient des colonnes ``*_version_id`` de
+   match_registry (un match sans version ignore l'asset s'il existe déjà)
+3. ``DiscoveryAssetFetcher`` récupère les assets manquants en parallèle
+   (``asyncio.Semaphore`` borné, derrière le rate limiter du client SPNKr),
+   chaque (type, asset, version) n'étant demandé qu'une fois
+4. ``upsert_assets`` insère les résultats en bloc (``batch_upsert_rows``)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.data.infrastructure.database.shared_partitions import attach_shared, detach_shared
+from src.data.sync.batch_insert import batch_upsert_rows
+
+if TYPE_CHECKING:
+    import duckdb
+
+    from src.data.sync.api_client import SPNKrAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Requêtes Discovery simultanées (le client limite en plus le débit par seconde)
+DEFAULT_CONCURRENCY = 8
+
+AssetRef = tuple[str, str]  # (asset_id, version_id) ; version "" = inconnue
+
+
+@dataclass(frozen=True)
+class AssetKind:
+    """Type d'asset Discovery UGC et son stockage."""
+
+    api_type: str
+    table: str
+    id_column: str
+    match_info_key: str
+    resolver_type: str
+    extra_columns: tuple[str, ...] = ()
+
+    @property
+    def version_column(self) -> str:
+        """Colonne de version dans match_registry (ex: ``map_version_id``)."""
+        return self.id_column.removesuffix("_id") + "_version_id"
+
+
+ASSET_KINDS: dict[str, AssetKind] = {
+    "playlists": AssetKind(
+        "Playlists", "playlists", "playlist_id", "Playlist", "playlist", ("is_ranked", "category")
+    ),
+    "maps": AssetKind("Maps", "maps", "map_id", "MapVariant", "map", ("thumbnail_path",)),
+    "pairs": AssetKind(
+        "PlaylistMapModePairs",
+        "playlist_map_mode_pairs",
+        "pair_id",
+        "PlaylistMapModePair",
+        "pair",
+    ),
+    "variants": AssetKind(
+        "GameVariants",
+        "game_variants",
+        "game_variant_id",
+        "UgcGameVariant",
+        "game_variant",
+        ("category",),
+    ),
+}
+
+# Schéma des tables metadata
+METADATA_SCHEMA_DDL = """
+-- Table playlists
+CREATE TABLE IF NOT EXISTS playlists (
+    asset_id VARCHAR NOT NULL,
+    version_id VARCHAR NOT NULL,
+    public_name VARCHAR,
+    description VARCHAR,
+    is_ranked BOOLEAN DEFAULT FALSE,
+    category VARCHAR,
+    raw_json JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (asset_id, version_id)
+);
+
+-- Table maps
+CREATE TABLE IF NOT EXISTS maps (
+    asset_id VARCHAR NOT NULL,
+    version_id VARCHAR NOT NULL,
+    public_name VARCHAR,
+    description VARCHAR,
+    thumbnail_path VARCHAR,
+    raw_json JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (asset_id, version_id)
+);
+
+-- Table playlist_map_mode_pairs
+CREATE TABLE IF NOT EXISTS playlist_map_mode_pairs (
+    asset_id VARCHAR NOT NULL,
+    version_id VARCHAR NOT NULL,
+    public_name VARCHAR,
+    description VARCHAR,
+    raw_json JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (asset_id, version_id)
+);
+
+-- Table game_variants
+CREATE TABLE IF NOT EXISTS game_variants (
+    asset_id VARCHAR NOT NULL,
+    version_id VARCHAR NOT NULL,
+    public_name VARCHAR,
+    description VARCHAR,
+    category VARCHAR,
+    raw_json JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (asset_id, version_id)
+);
+
+-- Index pour recherche rapide
+CREATE INDEX IF NOT EXISTS idx_playlists_asset_id ON playlists(asset_id);
+CREATE INDEX IF NOT EXISTS idx_maps_asset_id ON maps(asset_id);
+CREATE INDEX IF NOT EXISTS idx_pairs_asset_id ON playlist_map_mode_pairs(asset_id);
+CREATE INDEX IF NOT EXISTS idx_variants_asset_id ON game_variants(asset_id);
+"""
+
+
+def empty_refs() -> dict[str, set[AssetRef]]:
+    """Dict vide {type: set de (asset_id, version_id)}."""
+    return {kind: set() for kind in ASSET_KINDS}
+
+
+# =============================================================================
+# Collecte des asset IDs
+# =============================================================================
+
+
+def _has_table(conn: duckdb.DuckDBPyConnection, catalog: str, table: str) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_catalog = ? AND table_name = ?",
+            [catalog, table],
+        ).fetchone()
+        is not None
+    )
+
+
+def _has_column(conn: duckdb.DuckDBPyConnection, catalog: str, table: str, column: str) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_catalog = ? AND table_name = ? AND column_name = ?",
+            [catalog, table, column],
+        ).fetchone()
+        is not None
+    )
+
+
+def collect_asset_refs(
+    conn: duckdb.DuckDBPyConnection,
+    player_db_paths: Iterable[Path] = (),
+    *,
+    shared_db_path: Path | None = None,
+    skip_known: bool = True,
+) -> dict[str, set[AssetRef]]:
+    """Collecte les asset IDs référencés par les matchs, en une requête.
+
+    Les DBs sont attachées en lecture seule à ``conn`` (la connexion
+    metadata.duckdb) puis détachées.
+
+    Args:
+        conn: Connexion metadata.duckdb (schéma ``METADATA_SCHEMA_DDL`` créé).
+        player_db_paths: stats.duckdb des joueurs à parcourir.
+        shared_db_path: shared_matches.duckdb (match_registry couvre tous les joueurs).
+        skip_known: Exclure les (asset_id, version_id) déjà présents dans
+            metadata.duckdb ; sans version connue, l'asset est exclu s'il existe.
+
+    Returns:
+        Dict {type: set de (asset_id, version_id)} ; version_id vaut "" quand la
+        source ne la stocke pas (match_stats, anciennes lignes de match_registry).
+    """
+    sources: list[tuple[str, str]] = []
+    attached: list[str] = []
+    candidates: list[tuple[str, Path, str]] = []
+    if shared_db_path is not None:
+        candidates.append(("disc_shared", Path(shared_db_path), "match_registry"))
+    candidates.extend(
+        (f"disc_p{i}", Path(path), "match_stats") for i, path in enumerate(player_db_paths)
+    )
+
+    refs = empty_refs()
+    try:
+        for alias, path, table in candidates:
+            if not path.exists():
+                continue
+            try:
+                if alias == "disc_shared":
+                    attached.extend(attach_shared(conn, path, alias=alias))
+                else:
+                    sql_path = str(path).replace("'", "''")
+                    conn.execute(f"ATTACH '{sql_path}' AS {alias} (READ_ONLY)")
+                    attached.append(alias)
+            except Exception as e:
+                logger.warning(f"Impossible d'ouvrir {path}: {e}")
+                continue
+            if _has_table(conn, alias, table):
+                sources.append((alias, table))
+
+        if not sources:
+            return refs
+
+        selects = []
+        for alias, table in sources:
+            for kind, spec in ASSET_KINDS.items():
+                version = (
+                    f"COALESCE({spec.version_column}, '')"
+                    if _has_column(conn, alias, table, spec.version_column)
+                    else "''"
+                )
+                selects.append(
+                    f"SELECT '{kind}' AS kind, {spec.id_column} AS asset_id, "
+                    f"{version} AS version_id FROM {alias}.{table} "
+                    f"WHERE {spec.id_column} IS NOT NULL AND {spec.id_column} <> ''"
+                )
+        sql = (
+            "SELECT DISTINCT kind, asset_id, version_id FROM ("
+            + " UNION ".join(selects)
+            + ") refs"
+        )
+        if skip_known:
+            known = [
+                f"SELECT '{kind}' AS kind, asset_id, COALESCE(version_id, '') AS version_id "
+                f"FROM {spec.table}"
+                for kind, spec in ASSET_KINDS.items()
+                if _has_table(conn, _current_catalog(conn), spec.table)
+            ]
+            if known:
+                sql += (
+                    " WHERE NOT EXISTS (SELECT 1 FROM ("
+                    + " UNION ALL ".join(known)
+                    + ") k WHERE k.kind = refs.kind AND k.asset_id = refs.asset_id"
+                    " AND (refs.version_id = '' OR k.version_id = refs.version_id))"
+                )
+
+        for kind, asset_id, version_id in conn.execute(sql).fetchall():
+            refs[kind].add((str(asset_id), str(version_id)))
+    finally:
+        detach_shared(conn, attached)
+
+    return refs
+
+
+def _current_catalog(conn: duckdb.DuckDBPyConnection) -> str:
+    return conn.execute("SELECT current_database()").fetchone()[0]
+
+
+def load_known_assets(conn: duckdb.DuckDBPyConnection) -> dict[str, dict[AssetRef, str | None]]:
+    """Charge les (asset_id, version_id) → public_name déjà présents dans metadata.duckdb."""
+    known: dict[str, dict[AssetRef, str | None]] = {kind: {} for kind in ASSET_KINDS}
+    catalog = _current_catalog(conn)
+    selects = [
+        f"SELECT '{kind}', asset_id, version_id, public_name FROM {spec.table}"
+        for kind, spec in ASSET_KINDS.items()
+        if _has_table(conn, catalog, spec.table)
+    ]
+    if not selects:
+        return known
+    try:
+        rows = conn.execute(" UNION ALL ".join(selects)).fetchall()
+    except Exception as e:
+        # Ancien schéma metadata (uuid / name_fr) : rien à réutiliser
+        logger.debug(f"Lecture des assets connus impossible: {e}")
+        return known
+    for kind, asset_id, version_id, name in rows:
+        known[kind][(str(asset_id), str(version_id or ""))] = name
+    return known
+
+
+# =============================================================================
+# Insertion en bloc
+# =============================================================================
+
+
+def asset_row(kind: str, asset_id: str, version_id: str, asset_json: Mapping[str, Any]) -> dict:
+    """Construit la ligne metadata d'un asset Discovery UGC."""
+    row: dict[str, Any] = {
+        "asset_id": asset_id,
+        "version_id": asset_json.get("VersionId") or version_id or "",
+        "public_name": asset_json.get("PublicName", ""),
+        "description": asset_json.get("Description", ""),
+        "raw_json": json.dumps(asset_json, ensure_ascii=False, default=str),
+    }
+    if kind == "playlists":
+        tags = asset_json.get("Tags") or []
+        row["is_ranked"] = "ranked" in [t.lower() for t in tags if isinstance(t, str)]
+        row["category"] = asset_json.get("Category", "")
+    elif kind == "maps":
+        row["thumbnail_path"] = asset_json.get("ThumbnailPath", "")
+    elif kind == "variants":
+        row["category"] = asset_json.get("Category", "")
+    return row
+
+
+def upsert_assets(
+    conn: duckdb.DuckDBPyConnection,
+    assets: Mapping[str, Mapping[AssetRef, Mapping[str, Any]]],
+) -> dict[str, int]:
+    """Insère en bloc les assets récupérés (un ``executemany`` par table).
+
+    Args:
+        conn: Connexion metadata.duckdb.
+        assets: {type: {(asset_id, version_id): JSON de l'asset}}.
+
+    Returns:
+        Nombre de lignes écrites par type.
+    """
+    written: dict[str, int] = dict.fromkeys(ASSET_KINDS, 0)
+    for kind, fetched in assets.items():
+        spec = ASSET_KINDS[kind]
+        rows = [
+            asset_row(kind, asset_id, version_id, asset_json)
+            for (asset_id, version_id), asset_json in fetched.items()
+        ]
+        if not rows:
+            continue
+        columns = [
+            "asset_id",
+            "version_id",
+            "public_name",
+            "description",
+            *spec.extra_columns,
+            "raw_json",
+        ]
+        written[kind] = batch_upsert_rows(conn, spec.table, rows, columns)
+    return written
+
+
+# =============================================================================
+# Récupération concurrente
+# =============================================================================
+
+
+class DiscoveryAssetFetcher:
+    """Récupère des assets Discovery UGC en parallèle, une seule fois chacun.
+
+    Usage:
+        fetcher = DiscoveryAssetFetcher(client, known=load_known_assets(conn))
+        fetched = await fetcher.fetch_many(refs)
+        upsert_assets(conn, fetcher.drain())
+    """
+
+    def __init__(
+        self,
+        client: SPNKrAPIClient,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        known: Mapping[str, Mapping[AssetRef, str | None]] | None = None,
+    ) -> None:
+        """
+        Args:
+            client: Client SPNKr ouvert (``async with``).
+            concurrency: Requêtes simultanées maximum.
+            known: Assets déjà en base ({type: {(asset_id, version_id): nom}}).
+        """
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._known = {kind: dict((known or {}).get(kind, {})) for kind in ASSET_KINDS}
+        self._tasks: dict[tuple[str, str, str], asyncio.Task] = {}
+        self._pending: dict[str, dict[AssetRef, dict[str, Any]]] = {k: {} for k in ASSET_KINDS}
+
+    def known_name(self, kind: str, asset_id: str, version_id: str = "") -> str | None:
+        """Nom connu d'un asset (version exacte, ou n'importe laquelle si inconnue)."""
+        names = self._known[kind]
+        if version_id:
+            return names.get((asset_id, version_id))
+        return next((n for (aid, _), n in names.items() if aid == asset_id and n), None)
+
+    async def _fetch(self, kind: str, asset_id: str, version_id: str) -> dict[str, Any] | None:
+        async with self._semaphore:
+            try:
+                asset = await self.client.get_asset(
+                    ASSET_KINDS[kind].api_type, asset_id, version_id
+                )
+            except Exception as e:
+                logger.debug(f"Erreur récupération {kind} {asset_id}: {e}")
+                return None
+        if isinstance(asset, dict):
+            ref = (asset_id, str(asset.get("VersionId") or version_id))
+            self._pending[kind][ref] = asset
+            self._known[kind][ref] = asset.get("PublicName")
+            return asset
+        return None
+
+    async def fetch(self, kind: str, asset_id: str, version_id: str = "") -> dict[str, Any] | None:
+        """Récupère un asset (requête partagée si déjà en cours ou faite)."""
+        key = (kind, asset_id, version_id)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(kind, asset_id, version_id))
+            self._tasks[key] = task
+        return await task
+
+    async def fetch_many(
+        self,
+        refs: Mapping[str, Iterable[AssetRef]],
+    ) -> dict[str, dict[AssetRef, dict[str, Any]]]:
+        """Récupère tous les assets demandés, en parallèle.
+
+        Returns:
+            {type: {(asset_id, version_id demandée): JSON}} (assets introuvables omis).
+        """
+        keys = [
+            (kind, asset_id, version_id)
+            for kind, kind_refs in refs.items()
+            for asset_id, version_id in kind_refs
+        ]
+        results = await asyncio.gather(*(self.fetch(*key) for key in keys))
+        fetched: dict[str, dict[AssetRef, dict[str, Any]]] = {kind: {} for kind in ASSET_KINDS}
+        for (kind, asset_id, version_id), asset in zip(keys, results, strict=True):
+            if asset is not None:
+                fetched[kind][(asset_id, version_id)] = asset
+        return fetched
+
+    async def enrich_match_info(self, stats_json: dict[str, Any]) -> None:
+        """Renseigne les PublicName de MatchInfo (in-place).
+
+        Les versions déjà connues de metadata.duckdb ne sont pas redemandées.
+        """
+        match_info = stats_json.get("MatchInfo")
+        if not isinstance(match_info, dict):
+            return
+
+        missing: list[tuple[dict[str, Any], str, str, str]] = []
+        for kind, spec in ASSET_KINDS.items():
+            ref = match_info.get(spec.match_info_key)
+            if not isinstance(ref, dict):
+                continue
+            asset_id, version_id = ref.get("AssetId"), ref.get("VersionId")
+            if not asset_id or not version_id:
+                continue
+            name = self.known_name(kind, str(asset_id), str(version_id))
+            if name:
+                ref["PublicName"] = name
+            else:
+                missing.append((ref, kind, str(asset_id), str(version_id)))
+
+        if not missing:
+            return
+        assets = await asyncio.gather(*(self.fetch(k, a, v) for _, k, a, v in missing))
+        for (ref, *_), asset in zip(missing, assets, strict=True):
+            name = asset.get("PublicName") if asset else None
+            if isinstance(name, str) and name.strip():
+                ref["PublicName"] = name.strip()
+
+    def drain(self) -> dict[str, dict[AssetRef, dict[str, Any]]]:
+        """Retourne les assets récupérés depuis le dernier appel (à insérer)."""
+        pending = self._pending
+        self._pending = {kind: {} for kind in ASSET_KINDS}
+        return pending
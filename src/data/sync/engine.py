@@ -31,10 +31,16 @@ from typing import Any
 
 import duckdb
 
+from src.data.infrastructure.database.shared_partitions import attach_partitions
+from src.data.infrastructure.database.snapshots import publish_written, snapshots_enabled
+from src.data.infrastructure.database.teammate_index import (
+    ensure_teammate_index,
+    update_teammate_index,
+)
+from src.data.sync import tracing
 from src.data.sync.api_client import (
     SPNKrAPIClient,
     Tokens,
-    enrich_match_info_with_assets,
     get_tokens_from_env,
 )
 from src.data.sync.batch_insert import (
@@ -47,6 +53,10 @@ from src.data.sync.batch_insert import (
     batch_insert_rows,
     batch_upsert_rows,
 )
+from src.data.sync.db_writer import DEFAULT_MAX_GROUP, DBWriter
+from src.data.sync.discovery_metadata import DiscoveryAssetFetcher
+from src.data.sync.match_decoder import decode_match, scan_match
+from src.data.sync.metadata_resolver import MetadataResolver
 from src.data.sync.migrations import (
     BACKFILL_FLAGS,
     ensure_backfill_completed_column,
@@ -60,15 +70,7 @@ from src.data.sync.models import (
     SyncResult,
 )
 from src.data.sync.transformers import (
-    create_metadata_resolver,
-    extract_aliases,
-    extract_all_medals,
-    extract_match_registry_data,
-    extract_participants,
-    extract_personal_score_awards,
-    extract_xuids_from_match,
     transform_highlight_events,
-    transform_match_stats,
     transform_personal_score_awards,
     transform_skill_stats,
 )
@@ -276,12 +278,20 @@ class DuckDBSyncEngine:
 
         self._connection: duckdb.DuckDBPyConnection | None = None
         self._shared_connection: duckdb.DuckDBPyConnection | None = None
-        self._db_lock = asyncio.Lock()
-        self._shared_db_lock = asyncio.Lock()
+        # Écritures DuckDB sur un thread dédié (group commit), lectures shared via cursor
+        self._writer: DBWriter | None = None
+        self._shared_read_cursor: duckdb.DuckDBPyConnection | None = None
+        # Partitions shared fermées (lecture seule), attachées à la connexion shared
+        self._closed_partitions: list[str] = []
+        # Index teammate_pairs prêt sur la connexion shared (voir teammate_index.py)
+        self._teammate_index_ready = False
         self._existing_match_ids: set[str] | None = None
 
         # Créer le resolver pour les métadonnées
-        self._metadata_resolver = create_metadata_resolver(self._metadata_db_path)
+        self._metadata = MetadataResolver(self._metadata_db_path)
+        self._metadata_resolver = self._metadata.resolve if self._metadata.connected else None
+        # Assets Discovery absents de metadata.duckdb (créé par client API)
+        self._asset_fetcher: DiscoveryAssetFetcher | None = None
 
     def _get_connection(self) -> duckdb.DuckDBPyConnection:
         """Retourne une connexion DuckDB (lecture/écriture)."""
@@ -325,14 +335,57 @@ class DuckDBSyncEngine:
 
         # Appliquer les migrations de colonnes sur les tables shared (v5)
         try:
-            from src.data.sync.migrations import ensure_match_participants_columns
+            from src.data.sync.migrations import (
+                ensure_match_participants_columns,
+                ensure_match_registry_columns,
+            )
 
             ensure_match_participants_columns(self._shared_connection)
+            ensure_match_registry_columns(self._shared_connection)
         except Exception as e:
             logger.debug(f"Migration match_participants shared: {e}")
 
+        # Index de co-présence : créé au besoin, rattrape les matchs non indexés
+        try:
+            ensure_teammate_index(self._shared_connection)
+            self._teammate_index_ready = True
+        except Exception as e:
+            logger.warning(f"Index coéquipiers shared non mis à jour: {e}")
+
+        # Matchs des périodes fermées : déjà complets, jamais réécrits
+        try:
+            self._closed_partitions = attach_partitions(
+                self._shared_connection, self._shared_db_path, prefix="shared_closed"
+            )
+        except Exception as e:
+            logger.warning(f"Partitions shared fermées non attachées: {e}")
+            self._closed_partitions = []
+
         return self._shared_connection
 
+    def _get_shared_reader(self) -> duckdb.DuckDBPyConnection | None:
+        """Cursor de lecture sur shared, utilisable pendant les écritures du writer."""
+        if self._shared_read_cursor is None:
+            shared_conn = self._get_shared_connection()
+            if shared_conn is None:
+                return None
+            self._shared_read_cursor = shared_conn.cursor()
+        return self._shared_read_cursor
+
+    def _get_writer(self) -> DBWriter:
+        """Retourne le writer DuckDB (thread dédié, démarré à la première écriture).
+
+        Les connexions player et shared sont ouvertes ici, avant que le thread
+        writer ne les utilise.
+        """
+        if self._writer is None:
+            connections = [self._get_connection()]
+            shared_conn = self._get_shared_connection()
+            if shared_conn is not None:
+                connections.append(shared_conn)
+            self._writer = DBWriter(connections)
+        return self._writer
+
     @property
     def shared_enabled(self) -> bool:
         """Indique si le mode shared_matches est activé."""
@@ -640,6 +693,12 @@ class DuckDBSyncEngine:
         result = SyncResult()
         result.started_at = datetime.now(timezone.utc)
         start_time = time.time()
+        trace_token = tracing.start_trace(
+            "sync",
+            directory=options.trace_dir,
+            gamertag=self._gamertag,
+            mode="delta" if delta_mode else "full",
+        )
 
         try:
             # Récupérer les tokens si nécessaire
@@ -666,9 +725,14 @@ class DuckDBSyncEngine:
                     progress_callback=progress_callback,
                 )
 
+            # Assets Discovery récupérés pendant la sync → metadata.duckdb
+            if self._asset_fetcher is not None:
+                self._metadata.store_assets(self._asset_fetcher.drain())
+
             # Rafraîchir les agrégats après sync
             if result.matches_inserted > 0:
-                await self._refresh_aggregates_async()
+                with tracing.span("mv_refresh"):
+                    await self._refresh_aggregates_async()
 
             # Sprint 6 : Calcul batch des performance scores post-sync
             if (
@@ -676,7 +740,8 @@ class DuckDBSyncEngine:
                 and options.defer_performance_score
                 and _PERF_SCORE_AVAILABLE
             ):
-                perf_count = self.batch_compute_performance_scores()
+                with tracing.span("performance_scores"):
+                    perf_count = self.batch_compute_performance_scores()
                 logger.info(f"Performance scores calculés en batch : {perf_count}")
 
             # Mettre à jour les métadonnées
@@ -694,15 +759,40 @@ class DuckDBSyncEngine:
             conn = self._get_connection()
             conn.commit()
 
+            # Nouvelle génération lisible par l'UI (OPENSPARTAN_DB_SNAPSHOTS)
+            if snapshots_enabled():
+                with tracing.span("publish_snapshots"):
+                    self.publish_snapshots()
+
         except Exception as e:
             result.errors.append(str(e))
             logger.error(f"Erreur sync: {e}")
 
         result.finished_at = datetime.now(timezone.utc)
         result.duration_seconds = time.time() - start_time
+        trace_path = tracing.finish_trace(trace_token)
+        if trace_path is not None:
+            result.trace_path = str(trace_path)
 
         return result
 
+    async def _enrich_match_assets(
+        self,
+        client: SPNKrAPIClient,
+        stats_json: dict[str, Any],
+    ) -> None:
+        """Renseigne les PublicName de MatchInfo depuis metadata puis Discovery UGC.
+
+        Les versions déjà dans metadata.duckdb ne sont pas redemandées ; les
+        autres sont récupérées une seule fois par sync, même si plusieurs
+        matchs (traités en parallèle) les référencent.
+        """
+        fetcher = self._asset_fetcher
+        if fetcher is None or fetcher.client is not client:
+            fetcher = DiscoveryAssetFetcher(client, known=self._metadata.known_assets())
+            self._asset_fetcher = fetcher
+        await fetcher.enrich_match_info(stats_json)
+
     async def _process_matches(
         self,
         client: SPNKrAPIClient,
@@ -718,84 +808,95 @@ class DuckDBSyncEngine:
 
         start = 0
         remaining = options.max_matches
+        processed = 0
         semaphore = asyncio.Semaphore(options.parallel_matches)
+        # Transaction du writer : au plus batch_commit_size matchs (group commit)
+        writer = self._get_writer()
+        writer.max_group = options.batch_commit_size or DEFAULT_MAX_GROUP
+
+        async def _fetch_and_write(match_id: str) -> None:
+            nonlocal processed
+            async with semaphore:
+                with tracing.match_scope(match_id):
+                    match_result = await self._process_single_match(
+                        client,
+                        match_id,
+                        options,
+                    )
 
-        while remaining > 0:
-            # Récupérer un batch d'historique
-            batch_size = min(25, remaining)
+            if match_result.get("inserted"):
+                result.matches_inserted += 1
+                result.highlight_events_inserted += match_result.get("events", 0)
+                result.skill_records_inserted += match_result.get("skill", 0)
+                result.aliases_updated += match_result.get("aliases", 0)
+                existing_ids.add(match_id)
 
-            history = await client.get_match_history(
-                self._gamertag,
-                match_type=options.match_type,
-                start=start,
-                count=batch_size,
-            )
+            if match_result.get("error"):
+                result.warnings.append(match_result["error"])
 
-            if not history:
-                break
+            processed += 1
 
-            # Traiter les matchs
-            for item in history:
-                if remaining <= 0:
-                    break
+            # Callback de progression
+            if progress_callback:
+                progress_callback(processed + result.matches_skipped, options.max_matches)
+
+            # Log de progression
+            if result.matches_inserted > 0 and result.matches_inserted % 10 == 0:
+                logger.info(f"Importé {result.matches_inserted} matchs...")
+
+        try:
+            while remaining > 0:
+                # Récupérer un batch d'historique
+                batch_size = min(25, remaining)
+
+                history = await client.get_match_history(
+                    self._gamertag,
+                    match_type=options.match_type,
+                    start=start,
+                    count=batch_size,
+                )
 
-                match_id = item.match_id
+                if not history:
+                    break
 
-                # Vérifier si le match existe déjà
-                if match_id in existing_ids:
-                    if delta_mode:
-                        logger.info(f"[DELTA] Match {match_id} déjà connu — arrêt")
-                        return result
-                    else:
+                # Traiter les matchs du batch en parallèle (parallel_matches) :
+                # les écritures partent au writer pendant que les suivants se téléchargent
+                tasks: list[asyncio.Task] = []
+                reached_known = False
+                for item in history:
+                    if remaining <= 0:
+                        break
+
+                    match_id = item.match_id
+
+                    # Vérifier si le match existe déjà
+                    if match_id in existing_ids:
+                        if delta_mode:
+                            logger.info(f"[DELTA] Match {match_id} déjà connu — arrêt")
+                            reached_known = True
+                            break
                         result.matches_skipped += 1
                         remaining -= 1
                         start += 1
                         continue
 
-                # Récupérer et traiter le match
-                async with semaphore:
-                    match_result = await self._process_single_match(
-                        client,
-                        match_id,
-                        options,
-                    )
+                    tasks.append(asyncio.ensure_future(_fetch_and_write(match_id)))
+                    remaining -= 1
+                    start += 1
 
-                if match_result.get("inserted"):
-                    result.matches_inserted += 1
-                    result.highlight_events_inserted += match_result.get("events", 0)
-                    result.skill_records_inserted += match_result.get("skill", 0)
-                    result.aliases_updated += match_result.get("aliases", 0)
-                    existing_ids.add(match_id)
-
-                    # Sprint 6 : Commit intermédiaire tous les N matchs
-                    if (
-                        options.batch_commit_size > 0
-                        and result.matches_inserted % options.batch_commit_size == 0
-                    ):
-                        conn = self._get_connection()
-                        conn.commit()
-                        logger.debug(f"Commit intermédiaire après {result.matches_inserted} matchs")
-
-                if match_result.get("error"):
-                    result.warnings.append(match_result["error"])
-
-                remaining -= 1
-                start += 1
-
-                # Callback de progression
-                if progress_callback:
-                    progress_callback(
-                        options.max_matches - remaining,
-                        options.max_matches,
-                    )
+                if tasks:
+                    await asyncio.gather(*tasks)
 
-                # Log de progression
-                if result.matches_inserted > 0 and result.matches_inserted % 10 == 0:
-                    logger.info(f"Importé {result.matches_inserted} matchs...")
-
-            # Fin du batch
-            if len(history) < batch_size:
-                break
+                # Fin du batch
+                if reached_known or len(history) < batch_size:
+                    break
+        finally:
+            stats = writer.take_stats()
+            result.write_batches = stats.batches
+            result.write_commits = stats.commits
+            result.write_queue_max_depth = stats.max_queue_depth
+            result.commit_latency_ms_avg = stats.commit_latency_ms_avg
+            result.commit_latency_ms_max = 1000.0 * stats.commit_seconds_max
 
         return result
 
@@ -812,10 +913,10 @@ class DuckDBSyncEngine:
         registre partagé.
         """
         # ── Mode shared v5 ─────────────────────────────────────────
-        shared_conn = self._get_shared_connection()
-        if shared_conn is not None:
+        shared_reader = self._get_shared_reader()
+        if shared_reader is not None:
             try:
-                registry = shared_conn.execute(
+                registry = shared_reader.execute(
                     """SELECT
                         backfill_completed,
                         participants_loaded,
@@ -828,6 +929,8 @@ class DuckDBSyncEngine:
                 ).fetchone()
             except Exception:
                 registry = None
+            if registry is None and self._closed_partitions:
+                registry = self._closed_registry_entry(shared_reader, match_id)
 
             if registry is not None:
                 logger.info(
@@ -854,6 +957,35 @@ class DuckDBSyncEngine:
             options,
         )
 
+    def _closed_registry_entry(
+        self,
+        shared_reader: duckdb.DuckDBPyConnection,
+        match_id: str,
+    ) -> tuple | None:
+        """Ligne match_registry d'un match rangé dans une partition fermée.
+
+        Les flags *_loaded des partitions fermées sont figés : le match est
+        traité comme connu et seule la DB joueur est écrite.
+        """
+        for alias in self._closed_partitions:
+            try:
+                row = shared_reader.execute(
+                    f"""SELECT
+                        backfill_completed,
+                        participants_loaded,
+                        events_loaded,
+                        medals_loaded,
+                        player_count
+                    FROM {alias}.main.match_registry
+                    WHERE match_id = ?""",
+                    (match_id,),
+                ).fetchone()
+            except Exception:
+                continue
+            if row is not None:
+                return row
+        return None
+
     async def _process_single_match_legacy(
         self,
         client: SPNKrAPIClient,
@@ -878,10 +1010,11 @@ class DuckDBSyncEngine:
 
             # Enrichir MatchInfo avec les PublicName depuis Discovery UGC (noms cartes/playlists)
             if options.with_assets:
-                await enrich_match_info_with_assets(client, stats_json)
+                await self._enrich_match_assets(client, stats_json)
 
-            # Extraire les XUIDs pour l'appel skill
-            xuids = extract_xuids_from_match(stats_json)
+            # Scan unique du JSON (XUIDs pour l'appel skill, vues par joueur)
+            scan = scan_match(stats_json)
+            xuids = scan.xuids
 
             # Récupérer skill et events en parallèle (Sprint 6 — asyncio.gather)
             skill_json = None
@@ -908,13 +1041,17 @@ class DuckDBSyncEngine:
                     elif key == "events":
                         highlight_events = res if res else []
 
-            # Transformer les données
-            match_row = transform_match_stats(
-                stats_json,
-                self._xuid,
-                skill_json=skill_json,
-                metadata_resolver=self._metadata_resolver,
-            )
+            # Transformer les données (toutes les lignes en une passe)
+            with tracing.span("transform"):
+                decoded = decode_match(
+                    scan,
+                    self._xuid,
+                    skill_json=skill_json,
+                    metadata_resolver=self._metadata_resolver,
+                    with_registry=False,
+                    with_aliases=options.with_aliases,
+                )
+            match_row = decoded.match_row
             if match_row is None:
                 result["error"] = f"Transformation échouée pour {match_id}"
                 return result
@@ -927,96 +1064,95 @@ class DuckDBSyncEngine:
             if highlight_events:
                 event_rows = transform_highlight_events(highlight_events, match_id)
 
-            alias_rows = []
-            if options.with_aliases:
-                alias_rows = extract_aliases(stats_json)
+            alias_rows = decoded.aliases
 
             # Sprint Gamertag Roster Fix: Extraire les participants (roster complet)
             participant_rows = []
             if options.with_participants:
-                participant_rows = extract_participants(stats_json)
+                participant_rows = decoded.participants
 
             # Sprint 8.2: Extraire PersonalScores
-            personal_scores = extract_personal_score_awards(stats_json, self._xuid)
             personal_score_rows = []
-            if personal_scores:
+            if decoded.personal_scores:
                 personal_score_rows = transform_personal_score_awards(
-                    match_id, self._xuid, personal_scores
+                    match_id, self._xuid, decoded.personal_scores
                 )
 
             # Extraire les médailles
-            from src.data.sync.transformers import extract_medals
-
-            medal_rows = extract_medals(stats_json, self._xuid)
-
-            # Insérer dans DuckDB (protégé par lock)
-            async with self._db_lock:
-                self._insert_match_row(match_row)
-
-                if skill_row:
-                    self._insert_skill_row(skill_row)
-                    result["skill"] = 1
-
-                if event_rows:
-                    self._insert_event_rows(event_rows)
-                    result["events"] = len(event_rows)
-
-                if personal_score_rows:
-                    self._insert_personal_score_rows(personal_score_rows)
-                    result["personal_scores"] = len(personal_score_rows)
-
-                if medal_rows:
-                    self._insert_medal_rows(medal_rows)
-                    result["medals"] = len(medal_rows)
-
-                if participant_rows:
-                    self._insert_participant_rows(participant_rows)
-                    result["participants"] = len(participant_rows)
-
-                if alias_rows:
-                    self._insert_alias_rows(alias_rows)
-                    result["aliases"] = len(alias_rows)
-
-                # Calculer et mettre à jour le score de performance
-                # Sprint 6 : si defer_performance_score, on skip le calcul inline
-                # (sera fait en batch post-sync via batch_compute_performance_scores)
-                if not options.defer_performance_score:
-                    self._compute_and_update_performance_score(match_id, match_row)
+            medal_rows = decoded.medals
+
+            # Insérer dans DuckDB (thread writer, group commit)
+            def _write() -> None:
+                with tracing.span("write.player"):
+                    self._insert_match_row(match_row)
+
+                    if skill_row:
+                        self._insert_skill_row(skill_row)
+                        result["skill"] = 1
+
+                    if event_rows:
+                        self._insert_event_rows(event_rows)
+                        result["events"] = len(event_rows)
+
+                    if personal_score_rows:
+                        self._insert_personal_score_rows(personal_score_rows)
+                        result["personal_scores"] = len(personal_score_rows)
+
+                    if medal_rows:
+                        self._insert_medal_rows(medal_rows)
+                        result["medals"] = len(medal_rows)
+
+                    if participant_rows:
+                        self._insert_participant_rows(participant_rows)
+                        result["participants"] = len(participant_rows)
+
+                    if alias_rows:
+                        self._insert_alias_rows(alias_rows)
+                        result["aliases"] = len(alias_rows)
+
+                    # Calculer et mettre à jour le score de performance
+                    # Sprint 6 : si defer_performance_score, on skip le calcul inline
+                    # (sera fait en batch post-sync via batch_compute_performance_scores)
+                    if not options.defer_performance_score:
+                        self._compute_and_update_performance_score(match_id, match_row)
+
+                    # ── Bitmask backfill_completed ──────────────────────────
+                    # Marquer les types de données effectivement traités lors
+                    # de cette sync pour que le backfill ne les re-détecte pas.
+                    bf_mask = 0
+                    # Toujours extraits depuis match_stats JSON :
+                    bf_mask |= BACKFILL_FLAGS["medals"]
+                    bf_mask |= BACKFILL_FLAGS["personal_scores"]
+                    bf_mask |= BACKFILL_FLAGS["performance_scores"]
+                    bf_mask |= BACKFILL_FLAGS["accuracy"]
+                    bf_mask |= BACKFILL_FLAGS["shots"]
+                    # Conditionnels selon SyncOptions :
+                    if options.with_skill:
+                        bf_mask |= BACKFILL_FLAGS["skill"]
+                        bf_mask |= BACKFILL_FLAGS["enemy_mmr"]
+                    if options.with_highlight_events:
+                        bf_mask |= BACKFILL_FLAGS["events"]
+                    if options.with_participants:
+                        bf_mask |= BACKFILL_FLAGS["participants"]
+                        bf_mask |= BACKFILL_FLAGS["participants_scores"]
+                        bf_mask |= BACKFILL_FLAGS["participants_kda"]
+                        bf_mask |= BACKFILL_FLAGS["participants_shots"]
+                        bf_mask |= BACKFILL_FLAGS["participants_damage"]
+                    if options.with_aliases:
+                        bf_mask |= BACKFILL_FLAGS["aliases"]
+                    if options.with_assets:
+                        bf_mask |= BACKFILL_FLAGS["assets"]
+                    # UPDATE atomique (OR pour ne pas écraser les bits existants)
+                    conn = self._get_connection()
+                    conn.execute(
+                        "UPDATE match_stats "
+                        "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
+                        "WHERE match_id = ?",
+                        [bf_mask, match_id],
+                    )
 
-                # ── Bitmask backfill_completed ──────────────────────────
-                # Marquer les types de données effectivement traités lors
-                # de cette sync pour que le backfill ne les re-détecte pas.
-                bf_mask = 0
-                # Toujours extraits depuis match_stats JSON :
-                bf_mask |= BACKFILL_FLAGS["medals"]
-                bf_mask |= BACKFILL_FLAGS["personal_scores"]
-                bf_mask |= BACKFILL_FLAGS["performance_scores"]
-                bf_mask |= BACKFILL_FLAGS["accuracy"]
-                bf_mask |= BACKFILL_FLAGS["shots"]
-                # Conditionnels selon SyncOptions :
-                if options.with_skill:
-                    bf_mask |= BACKFILL_FLAGS["skill"]
-                    bf_mask |= BACKFILL_FLAGS["enemy_mmr"]
-                if options.with_highlight_events:
-                    bf_mask |= BACKFILL_FLAGS["events"]
-                if options.with_participants:
-                    bf_mask |= BACKFILL_FLAGS["participants"]
-                    bf_mask |= BACKFILL_FLAGS["participants_scores"]
-                    bf_mask |= BACKFILL_FLAGS["participants_kda"]
-                    bf_mask |= BACKFILL_FLAGS["participants_shots"]
-                    bf_mask |= BACKFILL_FLAGS["participants_damage"]
-                if options.with_aliases:
-                    bf_mask |= BACKFILL_FLAGS["aliases"]
-                if options.with_assets:
-                    bf_mask |= BACKFILL_FLAGS["assets"]
-                # UPDATE atomique (OR pour ne pas écraser les bits existants)
-                conn = self._get_connection()
-                conn.execute(
-                    "UPDATE match_stats "
-                    "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
-                    "WHERE match_id = ?",
-                    [bf_mask, match_id],
-                )
+            with tracing.span("write.wait"):
+                await self._get_writer().submit(match_id, _write)
 
             result["inserted"] = True
 
@@ -1073,10 +1209,11 @@ class DuckDBSyncEngine:
                 return result
 
             if options.with_assets:
-                await enrich_match_info_with_assets(client, stats_json)
+                await self._enrich_match_assets(client, stats_json)
 
             # 2. Transformer en match_row pour la player DB (mode legacy)
-            xuids = extract_xuids_from_match(stats_json)
+            scan = scan_match(stats_json)
+            xuids = scan.xuids
             skill_json = None
             highlight_events: list = []
 
@@ -1090,12 +1227,16 @@ class DuckDBSyncEngine:
             elif events_loaded:
                 result["api_calls_saved"] += 1
 
-            match_row = transform_match_stats(
-                stats_json,
-                self._xuid,
-                skill_json=skill_json,
-                metadata_resolver=self._metadata_resolver,
-            )
+            with tracing.span("transform"):
+                decoded = decode_match(
+                    scan,
+                    self._xuid,
+                    skill_json=skill_json,
+                    metadata_resolver=self._metadata_resolver,
+                    with_registry=False,
+                    with_aliases=options.with_aliases,
+                )
+            match_row = decoded.match_row
             if match_row is None:
                 result["error"] = f"Transformation échouée pour {match_id}"
                 return result
@@ -1104,110 +1245,108 @@ class DuckDBSyncEngine:
             if skill_json:
                 skill_row = transform_skill_stats(skill_json, match_id, self._xuid)
 
-            # Extraire les médailles perso (player DB)
-            from src.data.sync.transformers import extract_medals
-
-            medal_rows = extract_medals(stats_json, self._xuid)
+            # Médailles perso (player DB)
+            medal_rows = decoded.medals
 
             # PersonalScores
-            personal_scores = extract_personal_score_awards(stats_json, self._xuid)
             personal_score_rows = []
-            if personal_scores:
+            if decoded.personal_scores:
                 personal_score_rows = transform_personal_score_awards(
                     match_id,
                     self._xuid,
-                    personal_scores,
+                    decoded.personal_scores,
                 )
 
-            alias_rows = []
-            if options.with_aliases:
-                alias_rows = extract_aliases(stats_json)
+            alias_rows = decoded.aliases
 
             participant_rows = []
             if options.with_participants:
-                participant_rows = extract_participants(stats_json)
+                participant_rows = decoded.participants
 
-            # 3. Insérer dans la player DB (tout comme le legacy)
-            async with self._db_lock:
-                self._insert_match_row(match_row)
+            shared_conn = self._get_shared_connection()
+            if shared_conn is None:
+                result["error"] = "shared_connection perdue"
+                return result
 
-                if skill_row:
-                    self._insert_skill_row(skill_row)
-                    result["skill"] = 1
+            backfill_needed: list[str] = []
 
-                if medal_rows:
-                    self._insert_medal_rows(medal_rows)
+            # 3 + 4. Player DB puis backfill shared, dans le même group commit
+            def _write() -> None:
+                with tracing.span("write.player"):
+                    self._insert_match_row(match_row)
 
-                if personal_score_rows:
-                    self._insert_personal_score_rows(personal_score_rows)
+                    if skill_row:
+                        self._insert_skill_row(skill_row)
+                        result["skill"] = 1
 
-                if participant_rows:
-                    self._insert_participant_rows(participant_rows)
+                    if medal_rows:
+                        self._insert_medal_rows(medal_rows)
 
-                if alias_rows:
-                    self._insert_alias_rows(alias_rows)
-                    result["aliases"] = len(alias_rows)
+                    if personal_score_rows:
+                        self._insert_personal_score_rows(personal_score_rows)
 
-                self._compute_and_update_performance_score(match_id, match_row)
+                    if participant_rows:
+                        self._insert_participant_rows(participant_rows)
 
-                # Bitmask backfill_completed
-                bf_mask = self._compute_backfill_mask(options)
-                conn = self._get_connection()
-                conn.execute(
-                    "UPDATE match_stats "
-                    "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
-                    "WHERE match_id = ?",
-                    [bf_mask, match_id],
-                )
+                    if alias_rows:
+                        self._insert_alias_rows(alias_rows)
+                        result["aliases"] = len(alias_rows)
 
-            # 4. Backfill sélectif dans shared si des données manquent
-            backfill_needed: list[str] = []
-            async with self._shared_db_lock:
-                shared_conn = self._get_shared_connection()
-                if shared_conn is None:
-                    result["error"] = "shared_connection perdue"
-                    return result
+                    self._compute_and_update_performance_score(match_id, match_row)
 
-                if not participants_loaded:
-                    participants = extract_participants(stats_json)
-                    self._insert_shared_participants(shared_conn, participants)
-                    shared_conn.execute(
-                        "UPDATE match_registry SET participants_loaded = TRUE WHERE match_id = ?",
-                        (match_id,),
+                    # Bitmask backfill_completed
+                    bf_mask = self._compute_backfill_mask(options)
+                    conn = self._get_connection()
+                    conn.execute(
+                        "UPDATE match_stats "
+                        "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
+                        "WHERE match_id = ?",
+                        [bf_mask, match_id],
                     )
-                    backfill_needed.append("participants")
 
-                if not events_loaded and highlight_events:
-                    event_rows_shared = transform_highlight_events(highlight_events, match_id)
-                    self._insert_shared_events(shared_conn, event_rows_shared)
+                with tracing.span("write.shared"):
+                    # Backfill sélectif dans shared si des données manquent
+                    if not participants_loaded:
+                        self._insert_shared_participants(shared_conn, decoded.participants)
+                        shared_conn.execute(
+                            "UPDATE match_registry SET participants_loaded = TRUE WHERE match_id = ?",
+                            (match_id,),
+                        )
+                        backfill_needed.append("participants")
+
+                    if not events_loaded and highlight_events:
+                        event_rows_shared = transform_highlight_events(highlight_events, match_id)
+                        self._insert_shared_events(shared_conn, event_rows_shared)
+                        shared_conn.execute(
+                            "UPDATE match_registry SET events_loaded = TRUE WHERE match_id = ?",
+                            (match_id,),
+                        )
+                        result["events"] = len(event_rows_shared)
+                        backfill_needed.append("events")
+
+                    if not medals_loaded:
+                        self._insert_shared_medals(shared_conn, decoded.all_medals)
+                        shared_conn.execute(
+                            "UPDATE match_registry SET medals_loaded = TRUE WHERE match_id = ?",
+                            (match_id,),
+                        )
+                        backfill_needed.append("medals")
+
+                    # Aliases vers shared
+                    if alias_rows:
+                        self._insert_shared_aliases(shared_conn, alias_rows)
+
+                    # Incrémenter player_count
                     shared_conn.execute(
-                        "UPDATE match_registry SET events_loaded = TRUE WHERE match_id = ?",
+                        "UPDATE match_registry "
+                        "SET player_count = player_count + 1, "
+                        "    last_updated_at = CURRENT_TIMESTAMP "
+                        "WHERE match_id = ?",
                         (match_id,),
                     )
-                    result["events"] = len(event_rows_shared)
-                    backfill_needed.append("events")
 
-                if not medals_loaded:
-                    medals_all = extract_all_medals(stats_json)
-                    self._insert_shared_medals(shared_conn, medals_all)
-                    shared_conn.execute(
-                        "UPDATE match_registry SET medals_loaded = TRUE WHERE match_id = ?",
-                        (match_id,),
-                    )
-                    backfill_needed.append("medals")
-
-                # Aliases vers shared
-                if alias_rows:
-                    self._insert_shared_aliases(shared_conn, alias_rows)
-
-                # Incrémenter player_count
-                shared_conn.execute(
-                    "UPDATE match_registry "
-                    "SET player_count = player_count + 1, "
-                    "    last_updated_at = CURRENT_TIMESTAMP "
-                    "WHERE match_id = ?",
-                    (match_id,),
-                )
+            with tracing.span("write.wait"):
+                await self._get_writer().submit(match_id, _write)
 
             if backfill_needed:
                 logger.info(f"Backfill shared pour {match_id}: {', '.join(backfill_needed)}")
@@ -1256,10 +1395,11 @@ class DuckDBSyncEngine:
                 return result
 
             if options.with_assets:
-                await enrich_match_info_with_assets(client, stats_json)
+                await self._enrich_match_assets(client, stats_json)
 
             # 2. Télécharger events et skill
-            xuids = extract_xuids_from_match(stats_json)
+            scan = scan_match(stats_json)
+            xuids = scan.xuids
             skill_json = None
             highlight_events: list = []
 
@@ -1269,121 +1409,126 @@ class DuckDBSyncEngine:
             if options.with_highlight_events:
                 highlight_events = await client.get_highlight_events(match_id)
 
-            # 3. Extraire les données communes pour shared
-            registry_data = extract_match_registry_data(
-                stats_json,
-                metadata_resolver=self._metadata_resolver,
-            )
+            # 3. Décoder toutes les lignes (shared + player) en une passe
+            with tracing.span("transform"):
+                decoded = decode_match(
+                    scan,
+                    self._xuid,
+                    skill_json=skill_json,
+                    metadata_resolver=self._metadata_resolver,
+                    with_aliases=options.with_aliases,
+                )
+            registry_data = decoded.registry
             if registry_data is None:
                 result["error"] = f"Extraction registry échouée pour {match_id}"
                 return result
 
-            participants = extract_participants(stats_json)
-            medals_all = extract_all_medals(stats_json)
-            alias_rows = extract_aliases(stats_json) if options.with_aliases else []
+            participants = decoded.participants
+            medals_all = decoded.all_medals
+            alias_rows = decoded.aliases
 
             event_rows_shared = []
             if highlight_events:
                 event_rows_shared = transform_highlight_events(highlight_events, match_id)
 
-            # 4. Insérer dans shared_matches
-            async with self._shared_db_lock:
-                shared_conn = self._get_shared_connection()
-                if shared_conn is None:
-                    result["error"] = "shared_connection indisponible"
-                    return result
-
-                self._insert_shared_registry(shared_conn, registry_data)
-                self._insert_shared_participants(shared_conn, participants)
-                self._insert_shared_medals(shared_conn, medals_all)
-
-                if event_rows_shared:
-                    self._insert_shared_events(shared_conn, event_rows_shared)
-                    result["events"] = len(event_rows_shared)
-
-                if alias_rows:
-                    self._insert_shared_aliases(shared_conn, alias_rows)
-                    result["aliases"] = len(alias_rows)
-
-                # Mettre à jour les flags du registre
-                shared_conn.execute(
-                    """UPDATE match_registry SET
-                        participants_loaded = TRUE,
-                        events_loaded = ?,
-                        medals_loaded = TRUE,
-                        first_sync_by = ?,
-                        first_sync_at = CURRENT_TIMESTAMP,
-                        player_count = 1
-                    WHERE match_id = ?""",
-                    (
-                        len(event_rows_shared) > 0,
-                        self._gamertag,
-                        match_id,
-                    ),
-                )
-
-            # 5. Insérer les données personnelles dans la player DB
-            match_row = transform_match_stats(
-                stats_json,
-                self._xuid,
-                skill_json=skill_json,
-                metadata_resolver=self._metadata_resolver,
-            )
-            if match_row is None:
-                result["error"] = f"Transformation match_stats échouée pour {match_id}"
-                return result
+            # 4. Données personnelles pour la player DB
+            match_row = decoded.match_row
 
             skill_row = None
             if skill_json:
                 skill_row = transform_skill_stats(skill_json, match_id, self._xuid)
 
-            from src.data.sync.transformers import extract_medals
-
-            medal_rows_personal = extract_medals(stats_json, self._xuid)
+            medal_rows_personal = decoded.medals
 
-            personal_scores = extract_personal_score_awards(stats_json, self._xuid)
             personal_score_rows = []
-            if personal_scores:
+            if decoded.personal_scores:
                 personal_score_rows = transform_personal_score_awards(
                     match_id,
                     self._xuid,
-                    personal_scores,
+                    decoded.personal_scores,
                 )
 
             participant_rows_player = []
             if options.with_participants:
                 participant_rows_player = participants  # Réutiliser l'extraction
 
-            async with self._db_lock:
-                self._insert_match_row(match_row)
+            shared_conn = self._get_shared_connection()
+            if shared_conn is None:
+                result["error"] = "shared_connection indisponible"
+                return result
 
-                if skill_row:
-                    self._insert_skill_row(skill_row)
-                    result["skill"] = 1
+            # 5. shared_matches puis player DB, dans le même group commit
+            def _write() -> None:
+                with tracing.span("write.shared"):
+                    self._insert_shared_registry(shared_conn, registry_data)
+                    self._insert_shared_participants(shared_conn, participants)
+                    self._insert_shared_medals(shared_conn, medals_all)
 
-                if medal_rows_personal:
-                    self._insert_medal_rows(medal_rows_personal)
+                    if event_rows_shared:
+                        self._insert_shared_events(shared_conn, event_rows_shared)
+                        result["events"] = len(event_rows_shared)
 
-                if personal_score_rows:
-                    self._insert_personal_score_rows(personal_score_rows)
+                    if alias_rows:
+                        self._insert_shared_aliases(shared_conn, alias_rows)
+                        result["aliases"] = len(alias_rows)
 
-                if participant_rows_player:
-                    self._insert_participant_rows(participant_rows_player)
+                    # Mettre à jour les flags du registre
+                    shared_conn.execute(
+                        """UPDATE match_registry SET
+                            participants_loaded = TRUE,
+                            events_loaded = ?,
+                            medals_loaded = TRUE,
+                            first_sync_by = ?,
+                            first_sync_at = CURRENT_TIMESTAMP,
+                            player_count = 1
+                        WHERE match_id = ?""",
+                        (
+                            len(event_rows_shared) > 0,
+                            self._gamertag,
+                            match_id,
+                        ),
+                    )
 
-                if alias_rows:
-                    self._insert_alias_rows(alias_rows)
+                if match_row is None:
+                    return
 
-                self._compute_and_update_performance_score(match_id, match_row)
+                with tracing.span("write.player"):
+                    self._insert_match_row(match_row)
 
-                # Bitmask backfill_completed
-                bf_mask = self._compute_backfill_mask(options)
-                conn = self._get_connection()
-                conn.execute(
-                    "UPDATE match_stats "
-                    "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
-                    "WHERE match_id = ?",
-                    [bf_mask, match_id],
-                )
+                    if skill_row:
+                        self._insert_skill_row(skill_row)
+                        result["skill"] = 1
+
+                    if medal_rows_personal:
+                        self._insert_medal_rows(medal_rows_personal)
+
+                    if personal_score_rows:
+                        self._insert_personal_score_rows(personal_score_rows)
+
+                    if participant_rows_player:
+                        self._insert_participant_rows(participant_rows_player)
+
+                    if alias_rows:
+                        self._insert_alias_rows(alias_rows)
+
+                    self._compute_and_update_performance_score(match_id, match_row)
+
+                    # Bitmask backfill_completed
+                    bf_mask = self._compute_backfill_mask(options)
+                    conn = self._get_connection()
+                    conn.execute(
+                        "UPDATE match_stats "
+                        "SET backfill_completed = COALESCE(backfill_completed, 0) | ? "
+                        "WHERE match_id = ?",
+                        [bf_mask, match_id],
+                    )
+
+            with tracing.span("write.wait"):
+                await self._get_writer().submit(match_id, _write)
+
+            if match_row is None:
+                result["error"] = f"Transformation match_stats échouée pour {match_id}"
+                return result
 
             result["inserted"] = True
 
@@ -1447,11 +1592,14 @@ class DuckDBSyncEngine:
                 map_id, map_name,
                 pair_id, pair_name,
                 game_variant_id, game_variant_name,
+                playlist_version_id, map_version_id,
+                pair_version_id, game_variant_version_id,
                 mode_category, is_ranked, is_firefight,
                 duration_seconds,
                 team_0_score, team_1_score,
                 created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)""",
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)""",
             (
                 data["match_id"],
                 data["start_time"],
@@ -1464,6 +1612,10 @@ class DuckDBSyncEngine:
                 data["pair_name"],
                 data["game_variant_id"],
                 data["game_variant_name"],
+                data.get("playlist_version_id"),
+                data.get("map_version_id"),
+                data.get("pair_version_id"),
+                data.get("game_variant_version_id"),
                 data["mode_category"],
                 data["is_ranked"],
                 data["is_firefight"],
@@ -1489,6 +1641,8 @@ class DuckDBSyncEngine:
         from src.data.sync.batch_insert import PARTICIPANT_COLUMNS, batch_upsert_rows
 
         batch_upsert_rows(shared_conn, "match_participants", participants, PARTICIPANT_COLUMNS)
+        if self._teammate_index_ready:
+            update_teammate_index(shared_conn, {p.match_id for p in participants})
 
     def _insert_shared_events(
         self,
@@ -1538,6 +1692,7 @@ class DuckDBSyncEngine:
         """
         if not alias_rows:
             return
+        from src.data.repositories._roster_loader import invalidate_gamertag_cache
         from src.data.sync.batch_insert import ALIAS_COLUMNS, batch_upsert_rows
 
         now = datetime.now(timezone.utc)
@@ -1552,6 +1707,7 @@ class DuckDBSyncEngine:
             for row in alias_rows
         ]
         batch_upsert_rows(shared_conn, "xuid_aliases", alias_dicts, ALIAS_COLUMNS)
+        invalidate_gamertag_cache()
 
     def _ensure_performance_score_column(self) -> None:
         """S'assure que la colonne performance_score existe dans match_stats."""
@@ -1836,6 +1992,8 @@ class DuckDBSyncEngine:
         """Insère des lignes xuid_aliases en batch avec upsert (Sprint 15)."""
         if not rows:
             return
+        from src.data.repositories._roster_loader import invalidate_gamertag_cache
+
         conn = self._get_connection()
         now = datetime.now(timezone.utc)
         # Enrichir les rows avec updated_at avant l'upsert
@@ -1851,6 +2009,7 @@ class DuckDBSyncEngine:
                 }
             )
         batch_upsert_rows(conn, "xuid_aliases", alias_dicts, ALIAS_COLUMNS)
+        invalidate_gamertag_cache()
 
     def _insert_personal_score_rows(self, rows: list) -> None:
         """Insère des lignes personal_score_awards en batch (Sprint 15)."""
@@ -1906,6 +2065,7 @@ class DuckDBSyncEngine:
 
         Met à jour :
         - Vues matérialisées (mv_*)
+        - Seuils du radar de participation (shared.radar_thresholds)
 
         Returns:
             Dict table_name → rows_affected.
@@ -1928,6 +2088,18 @@ class DuckDBSyncEngine:
             except Exception as e:
                 logger.debug(f"refresh_materialized_views non disponible: {e}")
 
+            # Seuils radar : seuls les nouveaux matchs sont poussés dans le shared
+            shared_conn = self._get_shared_connection()
+            if shared_conn is not None:
+                try:
+                    from src.data.sync.radar_thresholds import sync_player_radar_totals
+
+                    result["radar_match_totals"] = sync_player_radar_totals(
+                        self._get_connection(), shared_conn
+                    )
+                except Exception as e:
+                    logger.warning(f"Rafraîchissement des seuils radar impossible: {e}")
+
         except Exception as e:
             logger.warning(f"Erreur refresh_aggregates: {e}")
 
@@ -2080,8 +2252,29 @@ class DuckDBSyncEngine:
         history = self.get_career_rank_history(limit=1)
         return history[0] if history else None
 
+    def publish_snapshots(self) -> dict[str, int]:
+        """Publie un snapshot des DBs écrites par cette sync (player + shared).
+
+        Les lecteurs (UI) ouvrent ensuite ces snapshots immuables au lieu des
+        fichiers de travail (voir ``src/data/infrastructure/database/snapshots.py``).
+
+        Returns:
+            Dict {nom du fichier: génération publiée}.
+        """
+        targets = [(self._player_db_path, self._connection)]
+        if self._shared_db_path is not None and self._shared_connection is not None:
+            targets.append((self._shared_db_path, self._shared_connection))
+        return publish_written(*targets, always=True)
+
     def close(self) -> None:
         """Ferme les connexions DuckDB (player + shared)."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._shared_read_cursor is not None:
+            with contextlib.suppress(Exception):
+                self._shared_read_cursor.close()
+            self._shared_read_cursor = None
         if self._connection:
             with contextlib.suppress(Exception):
                 self._connection.close()
@@ -2090,3 +2283,5 @@ class DuckDBSyncEngine:
             with contextlib.suppress(Exception):
                 self._shared_connection.close()
             self._shared_connection = None
+            self._closed_partitions = []
+            self._teammate_index_ready = False
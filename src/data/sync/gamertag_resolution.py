@@ -0,0 +1,404 @@
+"""Résolution globale XUID → gamertag (toutes DBs joueurs + base partagée).
+(Global XUID → gamertag resolution)
+
+Utilisé par ``scripts/resolve_missing_gamertags.py``.
+
+HOW IT WORKS:
+1. ``collect_alias_gaps`` attache en lecture seule toutes les DBs joueurs et
+   shared_matches.duckdb, puis trouve en une requête les XUIDs de
+   match_participants sans alias dans leur propre DB
+2. Les aliases déjà connus ailleurs (une autre DB joueur, la base partagée)
+   comblent ces trous sans appel API ; seuls les XUIDs inconnus partout sont
+   à résoudre, une seule fois chacun même s'ils manquent dans cinq DBs
+3. ``GamertagResolver`` interroge ``profile.get_users_by_id`` avec des batches
+   et une concurrence adaptatives : ils augmentent tant que l'API répond, sont
+   divisés par deux sur un 429 (avec une pause commune à tous les workers)
+4. ``write_aliases`` écrit les aliases en bloc, une transaction par DB
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.data.infrastructure.database.shared_partitions import attach_shared
+from src.data.infrastructure.database.snapshots import publish_written
+from src.data.sync.batch_insert import ALIAS_COLUMNS, batch_upsert_rows
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+ALIAS_SOURCE = "api_resolve"
+
+# Taille des batches get_users_by_id : départ prudent, plafond, plancher
+DEFAULT_BATCH_SIZE = 20
+MAX_BATCH_SIZE = 100
+MIN_BATCH_SIZE = 5
+# Requêtes simultanées (le client SPNKr limite en plus le débit par seconde)
+DEFAULT_CONCURRENCY = 4
+# Pause après un 429 (doublée à chaque 429 consécutif)
+RATE_LIMIT_BACKOFF_SECONDS = 10.0
+MAX_BACKOFF_SECONDS = 120.0
+# 429 tolérés pour un même batch avant de l'abandonner (XUIDs non résolus)
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def is_valid_xuid(xuid: str | None) -> bool:
+    """Vérifie si un XUID est valide (10 à 20 chiffres, format Xbox Live)."""
+    if not xuid:
+        return False
+    return xuid.isdigit() and 10 <= len(xuid) <= 20
+
+
+# =============================================================================
+# Collecte des XUIDs sans alias
+# =============================================================================
+
+
+@dataclass
+class AliasGaps:
+    """XUIDs sans alias, par DB, et ce qui est déjà connu ailleurs.
+
+    Attributes:
+        missing_by_db: {chemin DB: XUIDs de match_participants sans alias local}.
+        known: {xuid: gamertag} trouvés dans une autre DB (pas d'appel API).
+    """
+
+    missing_by_db: dict[Path, set[str]] = field(default_factory=dict)
+    known: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def to_resolve(self) -> list[str]:
+        """XUIDs inconnus partout, dédupliqués (ordre stable)."""
+        missing = set().union(*self.missing_by_db.values()) if self.missing_by_db else set()
+        return sorted(x for x in missing - self.known.keys() if is_valid_xuid(x))
+
+
+def _has_table(conn: duckdb.DuckDBPyConnection, catalog: str, table: str) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_catalog = ? AND table_name = ?",
+            [catalog, table],
+        ).fetchone()
+        is not None
+    )
+
+
+def collect_alias_gaps(
+    player_db_paths: Iterable[Path] = (),
+    *,
+    shared_db_path: Path | None = None,
+) -> AliasGaps:
+    """Collecte les XUIDs sans alias de toutes les DBs, en une requête.
+
+    Args:
+        player_db_paths: stats.duckdb des joueurs.
+        shared_db_path: shared_matches.duckdb (participants et aliases partagés).
+
+    Returns:
+        AliasGaps (DBs absentes ou illisibles ignorées).
+    """
+    import duckdb
+
+    candidates: list[Path] = []
+    if shared_db_path is not None:
+        candidates.append(Path(shared_db_path))
+    candidates.extend(Path(p) for p in player_db_paths)
+
+    gaps = AliasGaps()
+    conn = duckdb.connect(":memory:")
+    try:
+        catalogs: dict[str, Path] = {}
+        for i, path in enumerate(candidates):
+            if not path.exists() or path in catalogs.values():
+                continue
+            alias = f"gt_db{i}"
+            try:
+                if shared_db_path is not None and path == Path(shared_db_path):
+                    attach_shared(conn, path, alias=alias)
+                else:
+                    conn.execute(f"ATTACH '{path}' AS {alias} (READ_ONLY)")
+            except Exception as e:
+                logger.warning(f"Impossible d'ouvrir {path}: {e}")
+                continue
+            catalogs[alias] = path
+
+        with_aliases = [c for c in catalogs if _has_table(conn, c, "xuid_aliases")]
+        missing_selects = []
+        for catalog in catalogs:
+            if not _has_table(conn, catalog, "match_participants"):
+                continue
+            local = (
+                f"AND NOT EXISTS (SELECT 1 FROM {catalog}.xuid_aliases xa "
+                f"WHERE xa.xuid = mp.xuid AND xa.gamertag IS NOT NULL AND xa.gamertag <> '')"
+                if catalog in with_aliases
+                else ""
+            )
+            missing_selects.append(
+                f"SELECT DISTINCT '{catalog}' AS db, mp.xuid FROM {catalog}.match_participants mp "
+                f"WHERE mp.xuid IS NOT NULL AND mp.xuid <> '' {local}"
+            )
+        if not missing_selects:
+            return gaps
+
+        conn.execute("CREATE TEMP TABLE gt_missing AS " + " UNION ALL ".join(missing_selects))
+        for catalog, xuid in conn.execute("SELECT db, xuid FROM gt_missing").fetchall():
+            gaps.missing_by_db.setdefault(catalogs[catalog], set()).add(str(xuid))
+
+        if with_aliases:
+            aliases = " UNION ALL ".join(
+                f"SELECT xuid, gamertag, updated_at FROM {c}.xuid_aliases "
+                f"WHERE gamertag IS NOT NULL AND gamertag <> ''"
+                for c in with_aliases
+            )
+            rows = conn.execute(
+                f"SELECT a.xuid, arg_max(a.gamertag, a.updated_at) FROM ({aliases}) a "
+                f"WHERE a.xuid IN (SELECT xuid FROM gt_missing) GROUP BY a.xuid"
+            ).fetchall()
+            gaps.known = {str(x): str(g) for x, g in rows if g}
+    finally:
+        conn.close()
+
+    return gaps
+
+
+# =============================================================================
+# Résolution via l'API profile
+# =============================================================================
+
+
+def _is_rate_limited(err: Exception) -> bool:
+    # Statut HTTP seulement (aiohttp.ClientResponseError.status) : le texte d'une
+    # erreur peut contenir « 429 » (XUID, URL, taille)
+    return getattr(err, "status", None) == 429
+
+
+async def _parse_users(resp: Any) -> list[Any]:
+    if hasattr(resp, "data"):
+        return list(resp.data or [])
+    return list(await resp.parse() or [])
+
+
+class GamertagResolver:
+    """Résout des XUIDs via ``profile.get_users_by_id``, batches et concurrence adaptatifs.
+
+    Usage:
+        async with SPNKrAPIClient() as api:
+            resolved = await GamertagResolver(api.client).resolve(gaps.to_resolve)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        backoff_seconds: float = RATE_LIMIT_BACKOFF_SECONDS,
+        max_rate_limit_retries: int = MAX_RATE_LIMIT_RETRIES,
+    ) -> None:
+        """
+        Args:
+            client: HaloInfiniteClient (``SPNKrAPIClient.client``).
+            batch_size: Taille initiale des batches.
+            max_batch_size: Taille maximale des batches.
+            concurrency: Requêtes simultanées maximum.
+            backoff_seconds: Pause initiale après un 429.
+            max_rate_limit_retries: 429 tolérés par batch avant abandon.
+        """
+        self.client = client
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_size = min(max(1, batch_size), self.max_batch_size)
+        self.max_concurrency = max(1, concurrency)
+        self.concurrency = self.max_concurrency
+        self._backoff_base = backoff_seconds
+        self._backoff = backoff_seconds
+        self.max_rate_limit_retries = max(0, max_rate_limit_retries)
+        self._pause_until = 0.0
+        self._in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+
+    def _on_success(self) -> None:
+        self._backoff = self._backoff_base
+        self.batch_size = min(self.max_batch_size, self.batch_size + MIN_BATCH_SIZE)
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def _on_rate_limited(self) -> None:
+        self.rate_limited += 1
+        self.batch_size = max(MIN_BATCH_SIZE, self.batch_size // 2)
+        self.concurrency = max(1, self.concurrency // 2)
+        self._pause_until = max(self._pause_until, time.monotonic() + self._backoff)
+        logger.warning(
+            f"Rate limited : pause {self._backoff:.0f}s, batch={self.batch_size}, "
+            f"concurrence={self.concurrency}"
+        )
+        self._backoff = min(MAX_BACKOFF_SECONDS, self._backoff * 2)
+
+    async def resolve(self, xuids: Iterable[str]) -> dict[str, str]:
+        """Résout les XUIDs (dédupliqués) et retourne {xuid: gamertag}.
+
+        Un XUID introuvable est simplement absent du résultat ; un batch en
+        erreur (hors 429) est scindé pour isoler le XUID fautif. Un batch
+        limité plus de ``max_rate_limit_retries`` fois est abandonné.
+        """
+        pending: deque[list[str]] = deque()
+        retries: dict[tuple[str, ...], int] = {}
+        queue = list(dict.fromkeys(x for x in xuids if x))
+        resolved: dict[str, str] = {}
+        if not queue:
+            return resolved
+
+        def next_batch() -> list[str] | None:
+            if pending:
+                return pending.popleft()
+            if queue:
+                batch = queue[: self.batch_size]
+                del queue[: self.batch_size]
+                return batch
+            return None
+
+        async def worker(slot: int) -> None:
+            while True:
+                wait = self._pause_until - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                if slot >= self.concurrency:
+                    # Slot suspendu par un 429 : il reprend si la concurrence remonte
+                    if self._in_flight == 0 and not pending and not queue:
+                        return
+                    await asyncio.sleep(0.05)
+                    continue
+                batch = next_batch()
+                if batch is None:
+                    if self._in_flight == 0:
+                        return
+                    # Un batch en cours peut encore être remis en file
+                    await asyncio.sleep(0.05)
+                    continue
+
+                self._in_flight += 1
+                self.requests += 1
+                try:
+                    users = await _parse_users(await self.client.profile.get_users_by_id(batch))
+                except Exception as e:
+                    if _is_rate_limited(e):
+                        self._on_rate_limited()
+                        key = tuple(batch)
+                        retries[key] = retries.get(key, 0) + 1
+                        if retries[key] <= self.max_rate_limit_retries:
+                            pending.appendleft(batch)
+                        else:
+                            logger.warning(
+                                f"{len(batch)} XUIDs abandonnés après "
+                                f"{self.max_rate_limit_retries} rate limits"
+                            )
+                    elif len(batch) > 1:
+                        mid = len(batch) // 2
+                        pending.extend([batch[:mid], batch[mid:]])
+                    else:
+                        logger.debug(f"XUID non résolu {batch[0]}: {e}")
+                else:
+                    for user in users:
+                        xuid = str(getattr(user, "xuid", "") or "").strip()
+                        gamertag = str(getattr(user, "gamertag", "") or "").strip()
+                        if xuid and gamertag:
+                            resolved[xuid] = gamertag
+                    self._on_success()
+                finally:
+                    self._in_flight -= 1
+
+        await asyncio.gather(*(worker(slot) for slot in range(self.max_concurrency)))
+        return resolved
+
+
+# =============================================================================
+# Écriture
+# =============================================================================
+
+
+def upsert_aliases(
+    conn: duckdb.DuckDBPyConnection,
+    aliases: Mapping[str, str],
+    *,
+    source: str = ALIAS_SOURCE,
+) -> int:
+    """Upsert en bloc dans xuid_aliases, dans une transaction.
+
+    Returns:
+        Nombre d'aliases écrits.
+    """
+    if not aliases:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"xuid": x, "gamertag": g, "last_seen": None, "source": source, "updated_at": now}
+        for x, g in aliases.items()
+    ]
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        written = batch_upsert_rows(conn, "xuid_aliases", rows, ALIAS_COLUMNS)
+        conn.execute("COMMIT")
+    except Exception:
+        with contextlib.suppress(Exception):
+            conn.execute("ROLLBACK")
+        raise
+    return written
+
+
+def write_aliases(
+    gaps: AliasGaps,
+    resolved: Mapping[str, str],
+    *,
+    dry_run: bool = False,
+) -> dict[Path, int]:
+    """Comble les trous de chaque DB avec les aliases connus ou résolus.
+
+    Args:
+        gaps: Résultat de ``collect_alias_gaps``.
+        resolved: {xuid: gamertag} résolus via l'API.
+        dry_run: Compter sans écrire.
+
+    Returns:
+        {chemin DB: nombre d'aliases écrits (ou à écrire en dry-run)}.
+    """
+    import duckdb
+
+    names = {**gaps.known, **resolved}
+    written: dict[Path, int] = {}
+    for db_path, missing in gaps.missing_by_db.items():
+        aliases = {x: names[x] for x in sorted(missing) if x in names}
+        if not aliases:
+            continue
+        if dry_run:
+            written[db_path] = len(aliases)
+            continue
+        try:
+            conn = duckdb.connect(str(db_path))
+        except Exception as e:
+            logger.warning(f"Impossible d'ouvrir {db_path} en écriture: {e}")
+            continue
+        try:
+            written[db_path] = upsert_aliases(conn, aliases)
+            publish_written((db_path, conn))
+        except Exception as e:
+            logger.warning(f"Écriture des aliases échouée pour {db_path}: {e}")
+        finally:
+            conn.close()
+
+    if written and not dry_run:
+        from src.data.repositories._roster_loader import invalidate_gamertag_cache
+
+        invalidate_gamertag_cache()
+    return written
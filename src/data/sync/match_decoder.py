@@ -0,0 +1,210 @@
+"""Décodage en une passe du JSON MatchStats vers toutes les lignes DuckDB.
+(Single-pass MatchStats decoder producing every row bundle at once)
+
+HOW IT WORKS:
+1. ``scan_match`` parcourt une seule fois ``Players[]`` et construit une
+   ``PlayerView`` par joueur : XUID, PlayerId sérialisé, dict CoreStats et
+   PersonalScores (les deux recherches récursives coûteuses de transformers.py)
+2. ``decode_match`` active ce scan puis appelle les extracteurs existants
+   (transform_match_stats, extract_participants, extract_all_medals, …) :
+   leurs helpers (_find_player, _find_core_stats_dict, _extract_xuid,
+   _find_personal_scores) lisent les vues au lieu de re-parcourir le JSON
+3. Le résultat ``DecodedMatch`` regroupe toutes les lignes dont le moteur de
+   sync a besoin ; hors ``decode_match`` les extracteurs gardent leur
+   comportement autonome
+
+Le scan est en deux temps car les XUIDs servent à l'appel skill, dont la
+réponse alimente ensuite transform_match_stats :
+
+    scan = scan_match(stats_json)
+    skill_json = await client.get_skill_stats(match_id, scan.xuids)
+    decoded = decode_match(scan, xuid, skill_json=skill_json)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.data.sync.models import (
+    MatchParticipantRow,
+    MatchStatsRow,
+    MedalEarnedRow,
+    SharedMedalEarnedRow,
+    XuidAliasRow,
+)
+
+# Scan actif pendant decode_match (consulté par les helpers de transformers.py)
+_ACTIVE_SCAN: ContextVar[MatchScan | None] = ContextVar("_ACTIVE_SCAN", default=None)
+
+
+@dataclass(slots=True)
+class PlayerView:
+    """Données d'un joueur extraites une seule fois de ``Players[]``."""
+
+    obj: dict[str, Any]
+    xuid: str | None
+    pid_text: str | None
+    core_stats: dict[str, Any] | None
+    personal_scores: list[dict[str, Any]]
+
+
+@dataclass(slots=True)
+class MatchScan:
+    """Index d'un JSON MatchStats (une PlayerView par joueur dict)."""
+
+    match_json: dict[str, Any]
+    players: list[PlayerView]
+    xuids: list[int]
+    _by_id: dict[int, PlayerView] = field(default_factory=dict, repr=False)
+
+    def view(self, player_obj: dict[str, Any]) -> PlayerView | None:
+        """Vue d'un objet joueur de ce match (identité), ou None."""
+        view = self._by_id.get(id(player_obj))
+        return view if view is not None and view.obj is player_obj else None
+
+    def find(self, xuid: str) -> PlayerView | None:
+        """Premier joueur dont le PlayerId contient `xuid` (comme _find_player)."""
+        for view in self.players:
+            if view.pid_text is not None and xuid in view.pid_text:
+                return view
+        return None
+
+
+@dataclass
+class DecodedMatch:
+    """Toutes les lignes produites par un match pour la DB joueur et shared."""
+
+    match_id: str | None
+    xuids: list[int]
+    match_row: MatchStatsRow | None
+    registry: dict[str, Any] | None
+    participants: list[MatchParticipantRow]
+    all_medals: list[SharedMedalEarnedRow]
+    medals: list[MedalEarnedRow]
+    aliases: list[XuidAliasRow]
+    personal_scores: list[dict[str, Any]]
+
+
+def active_scan() -> MatchScan | None:
+    """Scan en cours d'utilisation par decode_match (None hors décodage)."""
+    return _ACTIVE_SCAN.get()
+
+
+def scan_match(match_json: dict[str, Any]) -> MatchScan:
+    """Parcourt ``Players[]`` une fois et indexe chaque joueur."""
+    from src.data.sync.transformers import (
+        XUID_RE,
+        _extract_xuid,
+        _find_core_stats_dict,
+        _find_personal_scores,
+    )
+
+    views: list[PlayerView] = []
+    by_id: dict[int, PlayerView] = {}
+    xuids: list[int] = []
+    seen: set[int] = set()
+
+    players = match_json.get("Players")
+    for player in players if isinstance(players, list) else ():
+        if not isinstance(player, dict):
+            continue
+        pid = player.get("PlayerId")
+        pid_text = None
+        if pid is not None:
+            pid_text = pid if isinstance(pid, str) else json.dumps(pid)
+
+        view = PlayerView(
+            obj=player,
+            xuid=_extract_xuid(player),
+            pid_text=pid_text,
+            core_stats=_find_core_stats_dict(player),
+            personal_scores=_find_personal_scores(player),
+        )
+        views.append(view)
+        by_id[id(player)] = view
+
+        # Même règle qu'extract_xuids_from_match (regex sur le PlayerId sérialisé)
+        m = XUID_RE.search(pid_text) if pid else None
+        if m:
+            value = int(m.group(1))
+            if value not in seen:
+                seen.add(value)
+                xuids.append(value)
+
+    return MatchScan(match_json=match_json, players=views, xuids=xuids, _by_id=by_id)
+
+
+@contextlib.contextmanager
+def using_scan(scan: MatchScan) -> Iterator[MatchScan]:
+    """Active `scan` pour les extracteurs de transformers.py appelés dans le bloc."""
+    token = _ACTIVE_SCAN.set(scan)
+    try:
+        yield scan
+    finally:
+        _ACTIVE_SCAN.reset(token)
+
+
+def decode_match(
+    match: MatchScan | dict[str, Any],
+    xuid: str,
+    *,
+    skill_json: dict[str, Any] | None = None,
+    metadata_resolver: Callable[[str, str | None], str | None] | None = None,
+    with_registry: bool = True,
+    with_aliases: bool = True,
+) -> DecodedMatch:
+    """Produit toutes les lignes d'un match en un seul parcours des joueurs.
+
+    Args:
+        match: JSON MatchStats ou son scan (``scan_match``).
+        xuid: XUID du joueur principal.
+        skill_json: JSON skill optionnel (MMR dans match_stats).
+        metadata_resolver: Résolveur de noms depuis metadata.duckdb.
+        with_registry: Extraire la ligne match_registry (mode shared).
+        with_aliases: Extraire les aliases XUID → gamertag.
+
+    Returns:
+        DecodedMatch.
+    """
+    from src.data.sync.transformers import (
+        extract_aliases,
+        extract_all_medals,
+        extract_match_registry_data,
+        extract_medals,
+        extract_participants,
+        extract_personal_score_awards,
+        transform_match_stats,
+    )
+
+    scan = match if isinstance(match, MatchScan) else scan_match(match)
+    match_json = scan.match_json
+    match_id = match_json.get("MatchId")
+
+    with using_scan(scan):
+        match_row = transform_match_stats(
+            match_json,
+            xuid,
+            skill_json=skill_json,
+            metadata_resolver=metadata_resolver,
+        )
+        registry = (
+            extract_match_registry_data(match_json, metadata_resolver=metadata_resolver)
+            if with_registry
+            else None
+        )
+        return DecodedMatch(
+            match_id=match_id if isinstance(match_id, str) else None,
+            xuids=scan.xuids,
+            match_row=match_row,
+            registry=registry,
+            participants=extract_participants(match_json),
+            all_medals=extract_all_medals(match_json),
+            medals=extract_medals(match_json, xuid),
+            aliases=extract_aliases(match_json) if with_aliases else [],
+            personal_scores=extract_personal_score_awards(match_json, xuid),
+        )
@@ -2,17 +2,29 @@
 
 Ce module fournit MetadataResolver pour résoudre les noms d'assets (maps, playlists, etc.)
 depuis metadata.duckdb ou depuis Discovery UGC en temps réel.
+
+Pendant la sync, les assets absents de metadata.duckdb sont récupérés par
+``DiscoveryAssetFetcher`` puis enregistrés via ``store_assets`` (qui alimente
+aussi le cache du résolveur).
 """
 
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from typing import Any
 
 import duckdb
 
+from src.data.sync.discovery_metadata import (
+    ASSET_KINDS,
+    METADATA_SCHEMA_DDL,
+    AssetRef,
+    load_known_assets,
+    upsert_assets,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -194,6 +206,43 @@ class MetadataResolver:
             logger.debug(f"Erreur résolution {asset_type} {asset_id}: {e}")
             return None
 
+    @property
+    def connected(self) -> bool:
+        """True si metadata.duckdb est ouvert (résolution et enregistrement possibles)."""
+        return self._conn is not None
+
+    def known_assets(self) -> dict[str, dict[AssetRef, str | None]]:
+        """Assets présents dans metadata.duckdb ({type: {(asset_id, version_id): nom}})."""
+        if not self._conn:
+            return {}
+        return load_known_assets(self._conn)
+
+    def store_assets(self, assets: Mapping[str, Mapping[AssetRef, Mapping[str, Any]]]) -> int:
+        """Enregistre des assets Discovery UGC récupérés pendant la sync.
+
+        Args:
+            assets: {type: {(asset_id, version_id): JSON de l'asset}}.
+
+        Returns:
+            Nombre de lignes écrites (0 sans metadata.duckdb).
+        """
+        if not self._conn or not any(assets.values()):
+            return 0
+        try:
+            self._conn.execute(METADATA_SCHEMA_DDL)
+            written = upsert_assets(self._conn, assets)
+        except Exception as e:
+            logger.debug(f"Enregistrement des assets Discovery impossible: {e}")
+            return 0
+
+        for kind, fetched in assets.items():
+            resolver_type = ASSET_KINDS[kind].resolver_type
+            for (asset_id, _version_id), asset in fetched.items():
+                name = asset.get("PublicName")
+                if isinstance(name, str) and name.strip():
+                    self._cache[(resolver_type, asset_id)] = name.strip()
+        return sum(written.values())
+
     def close(self) -> None:
         """Ferme la connexion DuckDB."""
         if self._conn:
@@ -204,6 +204,26 @@ def ensure_match_participants_columns(conn: duckdb.DuckDBPyConnection) -> None:
         _add_column_if_missing(conn, "match_participants", col_name, col_type, col_names)
 
 
+def ensure_match_registry_columns(conn: duckdb.DuckDBPyConnection) -> None:
+    """Ajoute les versions d'assets à match_registry si absentes.
+
+    Colonnes ajoutées si manquantes (VARCHAR, NULL pour les matchs déjà
+    synchronisés) : playlist_version_id, map_version_id, pair_version_id,
+    game_variant_version_id.
+    """
+    if not table_exists(conn, "match_registry"):
+        return
+
+    col_names = get_table_columns(conn, "match_registry")
+    for col_name in (
+        "playlist_version_id",
+        "map_version_id",
+        "pair_version_id",
+        "game_variant_version_id",
+    ):
+        _add_column_if_missing(conn, "match_registry", col_name, "VARCHAR", col_names)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Migration highlight_events : id DEFAULT nextval(séquence)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -34,6 +34,7 @@ class SyncOptions:
         parallel_matches: Nombre de matchs traités en parallèle.
         defer_performance_score: Différer le calcul du score de performance en batch post-sync.
         batch_commit_size: Nombre de matchs entre chaque commit intermédiaire (0 = commit final uniquement).
+        trace_dir: Dossier des traces JSONL par étape (défaut : OPENSPARTAN_TRACE_DIR, sinon désactivé).
     """
 
     match_type: str = "matchmaking"
@@ -47,6 +48,7 @@ class SyncOptions:
     parallel_matches: int = 5  # Sprint 6: augmenté de 3 à 5
     defer_performance_score: bool = True  # Sprint 6: calcul batch post-sync
     batch_commit_size: int = 10  # Sprint 6: commit tous les 10 matchs
+    trace_dir: str | None = None
 
 
 @dataclass
@@ -63,6 +65,14 @@ class SyncResult:
     skill_records_inserted: int = 0
     aliases_updated: int = 0
     assets_imported: int = 0
+    # Writer DuckDB (group commit) : lots écrits, transactions, file, latence
+    write_batches: int = 0
+    write_commits: int = 0
+    write_queue_max_depth: int = 0
+    commit_latency_ms_avg: float = 0.0
+    commit_latency_ms_max: float = 0.0
+    # Trace JSONL par étape (None si le tracing est désactivé)
+    trace_path: str | None = None
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
     duration_seconds: float = 0.0
@@ -116,6 +126,11 @@ class SyncResult:
             "skill_records_inserted": self.skill_records_inserted,
             "aliases_updated": self.aliases_updated,
             "assets_imported": self.assets_imported,
+            "write_batches": self.write_batches,
+            "write_commits": self.write_commits,
+            "write_queue_max_depth": self.write_queue_max_depth,
+            "commit_latency_ms_avg": round(self.commit_latency_ms_avg, 2),
+            "commit_latency_ms_max": round(self.commit_latency_ms_max, 2),
             "errors": self.errors,
             "warnings": self.warnings,
             "duration_seconds": self.duration_seconds,
@@ -0,0 +1,313 @@
+"""Seuils du radar de participation précalculés dans shared_matches.duckdb.
+
+Le radar normalise chaque axe par rapport au "meilleur match" connu. Sans
+table dédiée, ``compute_global_radar_thresholds`` ouvre chaque
+``data/players/*/stats.duckdb`` et y rejoue trois agrégats : le coût croît
+avec le nombre de joueurs suivis et se répète dans chaque processus.
+
+HOW IT WORKS:
+1. ``radar_match_totals`` (shared) : une ligne par (match_id, xuid) avec les
+   sommes PersonalScores par catégorie, le score positif, le temps joué et un
+   drapeau ``excluded`` (Firefight / BTB, comme le scan historique)
+2. Après chaque sync, ``sync_player_radar_totals`` agrège les
+   personal_score_awards de la DB joueur et n'écrit que les lignes absentes
+   du shared ou dont les totaux ont changé (awards backfillés après coup),
+   en upsert sur la clé primaire
+3. ``refresh_radar_thresholds`` recalcule ``radar_thresholds`` en une requête
+   (MAX + ``quantile_cont`` p99 + taille d'échantillon par axe) ; la table ne
+   contient que 5 lignes
+4. Le radar lit ``radar_thresholds`` (``read_radar_maxima``) : coût constant,
+   indépendant du nombre de DBs joueurs
+
+Les seuils affichés restent ``max × 0.85`` (parité avec le scan historique) ;
+le p99 est stocké pour diagnostic et pour un éventuel passage aux percentiles.
+
+Les DBs joueurs jamais resynchronisées sont reprises par
+``backfill_radar_totals`` (voir scripts/refresh_radar_thresholds.py).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+    import polars as pl
+
+logger = logging.getLogger(__name__)
+
+RADAR_TOTALS_TABLE = "radar_match_totals"
+RADAR_THRESHOLDS_TABLE = "radar_thresholds"
+RADAR_PERCENTILE = 0.99
+
+# Axes stockés dans radar_thresholds (clés du dict de seuils du radar)
+RADAR_AXES = ("objectifs", "combat", "support", "score", "impact_pts_per_min")
+
+_EXCLUDED_PAIR_PATTERNS = ("%firefight%", "%btb%", "%big team%", "%grande équipe%")
+
+_EXCLUDED_PAIR_SQL = " OR ".join(
+    f"LOWER(COALESCE(pair_name, '')) LIKE '{pattern}'" for pattern in _EXCLUDED_PAIR_PATTERNS
+)
+
+_TOTALS_COLUMNS = (
+    "match_id",
+    "xuid",
+    "kill_score",
+    "assist_score",
+    "objective_score",
+    "vehicle_score",
+    "positive_score",
+    "impact_score",
+    "time_played_seconds",
+    "excluded",
+)
+
+_TOTALS_VALUE_COLUMNS = tuple(c for c in _TOTALS_COLUMNS if c not in ("match_id", "xuid"))
+
+_DDL = f"""
+CREATE TABLE IF NOT EXISTS {RADAR_TOTALS_TABLE} (
+    match_id VARCHAR NOT NULL,
+    xuid VARCHAR NOT NULL,
+    kill_score DOUBLE,
+    assist_score DOUBLE,
+    objective_score DOUBLE,
+    vehicle_score DOUBLE,
+    positive_score DOUBLE,
+    impact_score DOUBLE,
+    time_played_seconds DOUBLE,
+    excluded BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (match_id, xuid)
+);
+CREATE TABLE IF NOT EXISTS {RADAR_THRESHOLDS_TABLE} (
+    key VARCHAR PRIMARY KEY,
+    max_value DOUBLE,
+    p99_value DOUBLE,
+    sample_size BIGINT,
+    updated_at TIMESTAMP
+);
+"""
+
+# Agrégat par match côté DB joueur (mêmes règles que le scan historique)
+_PLAYER_TOTALS_SQL = f"""
+WITH ms AS (
+    SELECT match_id,
+           ANY_VALUE(time_played_seconds) AS time_played_seconds,
+           BOOL_OR({_EXCLUDED_PAIR_SQL}) AS excluded_pair
+    FROM match_stats
+    GROUP BY match_id
+)
+SELECT
+    p.match_id,
+    p.xuid,
+    SUM(p.award_score) FILTER (WHERE p.award_category = 'kill') AS kill_score,
+    SUM(p.award_score) FILTER (WHERE p.award_category = 'assist') AS assist_score,
+    SUM(p.award_score) FILTER (WHERE p.award_category = 'objective') AS objective_score,
+    SUM(p.award_score) FILTER (WHERE p.award_category = 'vehicle') AS vehicle_score,
+    GREATEST(0, SUM(CASE WHEN p.award_score > 0 THEN p.award_score ELSE 0 END)) AS positive_score,
+    SUM(CASE WHEN p.award_category IN ('kill', 'assist', 'objective', 'vehicle')
+             AND p.award_score > 0 THEN p.award_score ELSE 0 END) AS impact_score,
+    ANY_VALUE(ms.time_played_seconds) AS time_played_seconds,
+    COALESCE(BOOL_OR(ms.excluded_pair), TRUE) AS excluded
+FROM personal_score_awards p
+LEFT JOIN ms ON ms.match_id = p.match_id
+GROUP BY p.match_id, p.xuid
+"""
+
+_THRESHOLDS_AGGREGATES = ", ".join(
+    f"MAX({axis}), quantile_cont({axis}, {RADAR_PERCENTILE}), COUNT({axis})" for axis in RADAR_AXES
+)
+
+_THRESHOLDS_SQL = f"""
+WITH t AS (
+    SELECT
+        GREATEST(objective_score, kill_score) AS objectifs,
+        kill_score AS combat,
+        assist_score AS support,
+        positive_score AS score,
+        CASE WHEN time_played_seconds > 0
+             THEN impact_score / (time_played_seconds / 60.0) END AS impact_pts_per_min
+    FROM {RADAR_TOTALS_TABLE}
+    WHERE NOT excluded
+)
+SELECT {_THRESHOLDS_AGGREGATES}
+FROM t
+"""
+
+
+def ensure_radar_tables(shared_conn: duckdb.DuckDBPyConnection) -> None:
+    """Crée radar_match_totals et radar_thresholds si absentes (idempotent)."""
+    shared_conn.execute(_DDL)
+
+
+def collect_player_radar_totals(
+    player_conn: duckdb.DuckDBPyConnection,
+) -> pl.DataFrame | None:
+    """Agrège les personal_score_awards d'une DB joueur par (match_id, xuid).
+
+    Returns:
+        DataFrame aux colonnes de radar_match_totals, ou None si la DB n'a pas
+        de personal_score_awards / match_stats.
+    """
+    from src.data.sync.migrations import table_exists
+
+    if not table_exists(player_conn, "personal_score_awards"):
+        return None
+    if not table_exists(player_conn, "match_stats"):
+        return None
+    return player_conn.execute(_PLAYER_TOTALS_SQL).pl()
+
+
+def insert_radar_totals(
+    shared_conn: duckdb.DuckDBPyConnection,
+    totals: pl.DataFrame | None,
+) -> int:
+    """Insère les totaux absents du shared et met à jour ceux qui ont changé.
+
+    Les lignes identiques à celles du shared ne sont pas réécrites. Le lot
+    passe par Arrow (``register``) : une requête quel que soit le nombre de
+    matchs.
+
+    Returns:
+        Nombre de lignes ajoutées ou mises à jour.
+    """
+    if totals is None or totals.is_empty():
+        return 0
+    columns = ", ".join(_TOTALS_COLUMNS)
+    unchanged = " AND ".join(f"t.{c} IS NOT DISTINCT FROM b.{c}" for c in _TOTALS_VALUE_COLUMNS)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in _TOTALS_VALUE_COLUMNS)
+    shared_conn.register("_radar_totals_batch", totals)
+    try:
+        shared_conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE _radar_totals_changed AS "
+            f"SELECT {', '.join(f'b.{c}' for c in _TOTALS_COLUMNS)} "
+            f"FROM _radar_totals_batch b WHERE NOT EXISTS ("
+            f"SELECT 1 FROM {RADAR_TOTALS_TABLE} t "
+            f"WHERE t.match_id = b.match_id AND t.xuid = b.xuid AND {unchanged})"
+        )
+    finally:
+        shared_conn.unregister("_radar_totals_batch")
+    try:
+        changed = shared_conn.execute("SELECT COUNT(*) FROM _radar_totals_changed").fetchone()[0]
+        if changed:
+            shared_conn.execute(
+                f"INSERT INTO {RADAR_TOTALS_TABLE} ({columns}) "
+                f"SELECT {columns} FROM _radar_totals_changed "
+                f"ON CONFLICT (match_id, xuid) DO UPDATE SET {updates}"
+            )
+    finally:
+        shared_conn.execute("DROP TABLE IF EXISTS _radar_totals_changed")
+    return int(changed)
+
+
+def refresh_radar_thresholds(shared_conn: duckdb.DuckDBPyConnection) -> int:
+    """Recalcule radar_thresholds depuis radar_match_totals (une requête).
+
+    Returns:
+        Taille de l'échantillon (matchs hors Firefight/BTB).
+    """
+    row = shared_conn.execute(_THRESHOLDS_SQL).fetchone()
+    now = datetime.now(timezone.utc)
+    values = []
+    sample = 0
+    for i, axis in enumerate(RADAR_AXES):
+        max_value, p99_value, count = row[3 * i : 3 * i + 3]
+        sample = max(sample, int(count or 0))
+        values.append([axis, max_value, p99_value, int(count or 0), now])
+    shared_conn.execute("BEGIN TRANSACTION")
+    try:
+        shared_conn.execute(f"DELETE FROM {RADAR_THRESHOLDS_TABLE}")
+        shared_conn.executemany(
+            f"INSERT INTO {RADAR_THRESHOLDS_TABLE} VALUES (?, ?, ?, ?, ?)",
+            values,
+        )
+        shared_conn.execute("COMMIT")
+    except Exception:
+        shared_conn.execute("ROLLBACK")
+        raise
+    return sample
+
+
+def sync_player_radar_totals(
+    player_conn: duckdb.DuckDBPyConnection,
+    shared_conn: duckdb.DuckDBPyConnection,
+) -> int:
+    """Pousse les matchs nouveaux ou modifiés d'une DB joueur et rafraîchit les seuils.
+
+    Appelé après chaque sync (``DuckDBSyncEngine.refresh_aggregates``).
+    Les seuils ne sont recalculés que si des lignes ont changé.
+
+    Returns:
+        Nombre de lignes ajoutées ou mises à jour dans radar_match_totals.
+    """
+    ensure_radar_tables(shared_conn)
+    added = insert_radar_totals(shared_conn, collect_player_radar_totals(player_conn))
+    stale = shared_conn.execute(f"SELECT COUNT(*) FROM {RADAR_THRESHOLDS_TABLE}").fetchone()[0] == 0
+    if added or stale:
+        refresh_radar_thresholds(shared_conn)
+    return added
+
+
+def backfill_radar_totals(
+    shared_conn: duckdb.DuckDBPyConnection,
+    players_base_path: str | Path,
+) -> dict[str, int]:
+    """Reprend toutes les DBs joueurs (une fois) puis rafraîchit les seuils.
+
+    Returns:
+        Dict joueur → lignes ajoutées ou mises à jour.
+    """
+    from src.data.infrastructure.database.snapshots import connect_read_only
+
+    ensure_radar_tables(shared_conn)
+    result: dict[str, int] = {}
+    base = Path(players_base_path)
+    if not base.is_dir():
+        return result
+
+    for db_path in sorted(base.glob("*/stats.duckdb")):
+        try:
+            conn = connect_read_only(db_path)
+            try:
+                totals = collect_player_radar_totals(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Radar backfill ignoré pour {db_path.parent.name}: {e}")
+            continue
+        result[db_path.parent.name] = insert_radar_totals(shared_conn, totals)
+
+    refresh_radar_thresholds(shared_conn)
+    return result
+
+
+def read_radar_maxima(shared_db_path: str | Path) -> dict[str, float] | None:
+    """Lit les maxima par axe depuis radar_thresholds (lecture seule).
+
+    Returns:
+        Dict axe → max, ou None si la table est absente ou vide
+        (l'appelant retombe alors sur le scan des DBs joueurs).
+    """
+    from src.data.infrastructure.database.snapshots import connect_read_only
+
+    path = Path(shared_db_path)
+    if not path.exists():
+        return None
+    conn = connect_read_only(path)
+    try:
+        from src.data.sync.migrations import table_exists
+
+        if not table_exists(conn, RADAR_THRESHOLDS_TABLE):
+            return None
+        rows = conn.execute(
+            f"SELECT key, max_value, sample_size FROM {RADAR_THRESHOLDS_TABLE}"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not rows or not any(sample for _, _, sample in rows):
+        return None
+    return {key: float(value or 0.0) for key, value, _ in rows}
@@ -0,0 +1,204 @@
+"""Traces par étape des syncs et backfills (durées et compteurs par match).
+(Stage-level tracing for sync and backfill runs)
+
+HOW IT WORKS:
+1. ``start_trace(kind, ...)`` active un ``RunTrace`` pour le run courant
+   (ContextVar : les tâches asyncio créées pendant le run en héritent, le
+   writer DuckDB exécute chaque lot dans le contexte de sa tâche)
+2. ``match_scope(match_id)`` désigne le match courant ; ``span("stage")``
+   chronomètre un bloc et l'ajoute à ce match (ou au run hors match),
+   ``count("stage")`` incrémente un compteur sans durée
+3. Sans trace active, ``span`` renvoie un contexte nul partagé et ``count``
+   ne fait rien : le coût est une lecture de ContextVar
+4. ``finish_trace`` écrit la trace en JSONL : une ligne ``run``, une ligne
+   ``stage`` par étape hors match et une ligne ``match`` par match
+   ({"stages": {nom: {"seconds": s, "count": n}}, "total_seconds": s})
+
+Activation : ``OPENSPARTAN_TRACE_DIR=<dossier>`` (ou ``SyncOptions.trace_dir``),
+un fichier ``<kind>_<horodatage>.jsonl`` par run. Rapport :
+``python scripts/trace_report.py <fichier.jsonl>``.
+
+Étapes utilisées : ``api.<endpoint>`` (attente API, une par tentative),
+``api.retry`` (attente du backoff), ``transform``, ``write.wait`` (file +
+commit vus par le match), ``write.shared``, ``write.player``, ``mv_refresh``,
+``performance_scores``, ``publish_snapshots``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TRACE_DIR_ENV = "OPENSPARTAN_TRACE_DIR"
+
+_ACTIVE_TRACE: ContextVar[RunTrace | None] = ContextVar("_ACTIVE_TRACE", default=None)
+_CURRENT_MATCH: ContextVar[str | None] = ContextVar("_CURRENT_MATCH", default=None)
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class RunTrace:
+    """Durées et compteurs par étape d'un run (sync ou backfill)."""
+
+    def __init__(self, kind: str, path: Path, **attrs: Any) -> None:
+        self.kind = kind
+        self.path = path
+        self.attrs = attrs
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        # clé None = étapes hors match (MV, scores, publication…)
+        self._stages: dict[str | None, dict[str, list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, match_id: str | None, n: int = 1) -> None:
+        """Ajoute `n` occurrences et `seconds` secondes à `stage`."""
+        with self._lock:
+            entry = self._stages.setdefault(match_id, {}).setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += n
+
+    def records(self) -> list[dict[str, Any]]:
+        """Lignes JSONL de la trace."""
+        with self._lock:
+            stages = {mid: {k: list(v) for k, v in s.items()} for mid, s in self._stages.items()}
+        lines: list[dict[str, Any]] = [
+            {
+                "type": "run",
+                "kind": self.kind,
+                "started_at": self.started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self._start, 6),
+                "matches": sum(1 for mid in stages if mid is not None),
+                **self.attrs,
+            }
+        ]
+        for stage, (seconds, n) in sorted(stages.pop(None, {}).items()):
+            lines.append(
+                {"type": "stage", "stage": stage, "seconds": round(seconds, 6), "count": n}
+            )
+        for mid, match_stages in stages.items():
+            total = match_stages.pop("match", [0.0, 0])[0]
+            lines.append(
+                {
+                    "type": "match",
+                    "match_id": mid,
+                    "total_seconds": round(total, 6),
+                    "stages": {
+                        stage: {"seconds": round(seconds, 6), "count": n}
+                        for stage, (seconds, n) in sorted(match_stages.items())
+                    },
+                }
+            )
+        return lines
+
+    def write(self) -> Path:
+        """Écrit la trace JSONL et retourne son chemin."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for record in self.records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return self.path
+
+
+class _Span:
+    __slots__ = ("_trace", "_stage", "_match_id", "_start")
+
+    def __init__(self, trace: RunTrace, stage: str, match_id: str | None) -> None:
+        self._trace = trace
+        self._stage = stage
+        self._match_id = match_id
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._trace.add(self._stage, time.perf_counter() - self._start, self._match_id)
+
+
+def active_trace() -> RunTrace | None:
+    """Trace du run courant (None si le tracing est désactivé)."""
+    return _ACTIVE_TRACE.get()
+
+
+def span(stage: str) -> contextlib.AbstractContextManager:
+    """Chronomètre un bloc pour le match courant (no-op sans trace active)."""
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, stage, _CURRENT_MATCH.get())
+
+
+def count(stage: str, n: int = 1) -> None:
+    """Compte `n` occurrences de `stage` (sans durée) pour le match courant."""
+    trace = _ACTIVE_TRACE.get()
+    if trace is not None:
+        trace.add(stage, 0.0, _CURRENT_MATCH.get(), n)
+
+
+@contextlib.contextmanager
+def match_scope(match_id: str) -> Iterator[None]:
+    """Attribue les spans du bloc à `match_id` (durée totale dans l'étape ``match``)."""
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        yield
+        return
+    token = _CURRENT_MATCH.set(match_id)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add("match", time.perf_counter() - start, match_id)
+        _CURRENT_MATCH.reset(token)
+
+
+def trace_dir(explicit: str | Path | None = None) -> Path | None:
+    """Dossier des traces (argument explicite, sinon OPENSPARTAN_TRACE_DIR)."""
+    value = explicit or os.environ.get(TRACE_DIR_ENV, "").strip()
+    return Path(value) if value else None
+
+
+def start_trace(kind: str, *, directory: str | Path | None = None, **attrs: Any):
+    """Active une trace pour le run courant si le tracing est configuré.
+
+    Args:
+        kind: Type de run (``sync``, ``backfill``).
+        directory: Dossier des traces (défaut : OPENSPARTAN_TRACE_DIR).
+        **attrs: Attributs ajoutés à la ligne ``run`` (joueur, mode…).
+
+    Returns:
+        Jeton à passer à ``finish_trace`` (None si désactivé).
+    """
+    folder = trace_dir(directory)
+    if folder is None:
+        return None
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S_%f")
+    trace = RunTrace(kind, folder / f"{kind}_{stamp}.jsonl", **attrs)
+    return _ACTIVE_TRACE.set(trace)
+
+
+def finish_trace(token) -> Path | None:
+    """Écrit et désactive la trace ouverte par ``start_trace``."""
+    if token is None:
+        return None
+    trace = _ACTIVE_TRACE.get()
+    _ACTIVE_TRACE.reset(token)
+    if trace is None:
+        return None
+    try:
+        path = trace.write()
+    except OSError as e:
+        logger.warning(f"Écriture de la trace impossible ({trace.path}): {e}")
+        return None
+    logger.info(f"Trace écrite: {path}")
+    return path
@@ -8,6 +8,10 @@ Architecture:
 - transform_skill_stats() : JSON skill → PlayerMatchStatsRow
 - transform_highlight_events() : Events → [HighlightEventRow]
 - extract_aliases() : JSON match → {xuid: gamertag}
+
+Appelés depuis ``match_decoder.decode_match``, les helpers par joueur
+(_find_player, _find_core_stats_dict, _extract_xuid, _find_personal_scores)
+lisent le scan unique du match au lieu de re-parcourir Players[].
 """
 
 from __future__ import annotations
@@ -23,6 +27,7 @@ from typing import Any
 
 from src.analysis.mode_categories import infer_custom_category_from_pair_name
 from src.data.domain.refdata import PERSONAL_SCORE_POINTS
+from src.data.sync.match_decoder import PlayerView, active_scan
 from src.data.sync.metadata_resolver import create_metadata_resolver_function
 from src.data.sync.models import (
     HighlightEventRow,
@@ -102,8 +107,18 @@ def _parse_iso_utc(s: str | None) -> datetime | None:
         return None
 
 
+def _scanned(player_obj: dict[str, Any]) -> PlayerView | None:
+    """Vue du joueur dans le scan actif (decode_match), ou None."""
+    scan = active_scan()
+    return scan.view(player_obj) if scan is not None else None
+
+
 def _find_player(players: list[dict[str, Any]], xuid: str) -> dict[str, Any] | None:
     """Trouve un joueur dans la liste par son XUID."""
+    scan = active_scan()
+    if scan is not None and scan.match_json.get("Players") is players:
+        view = scan.find(xuid)
+        return view.obj if view is not None else None
     for pl in players:
         pid = pl.get("PlayerId")
         if pid is None:
@@ -118,6 +133,10 @@ def _find_core_stats_dict(player_obj: dict[str, Any]) -> dict[str, Any] | None:
 
     Parcourt récursivement PlayerTeamStats pour trouver le dict avec les stats.
     """
+    view = _scanned(player_obj)
+    if view is not None:
+        return view.core_stats
+
     targets = {"Kills", "Deaths", "Assists", "ShotsFired", "ShotsHit", "Accuracy"}
 
     def find_stats_dict(x: Any) -> dict[str, Any] | None:
@@ -303,6 +322,16 @@ def _extract_asset_id(match_info: dict[str, Any], key: str) -> str | None:
     return None
 
 
+def _extract_version_id(match_info: dict[str, Any], key: str) -> str | None:
+    """Extrait le VersionId d'un objet (Playlist, MapVariant, etc.)."""
+    obj = match_info.get(key)
+    if isinstance(obj, dict):
+        version_id = obj.get("VersionId")
+        if isinstance(version_id, str):
+            return version_id
+    return None
+
+
 def _extract_public_name(match_info: dict[str, Any], key: str) -> str | None:
     """Extrait le PublicName d'un objet si disponible."""
     obj = match_info.get(key)
@@ -864,27 +893,10 @@ def extract_aliases(
         if not isinstance(player, dict):
             continue
 
-        pid = player.get("PlayerId")
         gamertag_raw = player.get("PlayerGamertag") or player.get("Gamertag")
 
         # Extraire le XUID (aligné legacy: str ou json.dumps pour dict)
-        xuid = None
-        if isinstance(pid, str):
-            m = XUID_RE.search(pid)
-            if m:
-                xuid = m.group(1)
-        elif isinstance(pid, dict):
-            xuid_val = pid.get("Xuid") or pid.get("xuid")
-            if xuid_val is not None:
-                xuid = str(xuid_val)
-            else:
-                try:
-                    s = json.dumps(pid)
-                    m = XUID_RE.search(s)
-                    if m:
-                        xuid = m.group(1)
-                except (TypeError, ValueError):
-                    pass
+        xuid = _extract_xuid(player)
 
         if not xuid or xuid in seen_xuids:
             continue
@@ -978,6 +990,11 @@ def _extract_xuid(player: dict[str, Any] | str) -> str | None:
     Returns:
         XUID (str) ou None.
     """
+    if isinstance(player, dict):
+        view = _scanned(player)
+        if view is not None:
+            return view.xuid
+
     pid = player if isinstance(player, str) else player.get("PlayerId")
 
     if not pid:
@@ -1051,6 +1068,10 @@ def extract_xuids_from_match(match_json: dict[str, Any]) -> list[int]:
     Returns:
         Liste d'entiers XUID.
     """
+    scan = active_scan()
+    if scan is not None and scan.match_json is match_json:
+        return list(scan.xuids)
+
     players = match_json.get("Players")
     if not isinstance(players, list):
         return []
@@ -1118,24 +1139,7 @@ def extract_participants(match_json: dict[str, Any]) -> list[MatchParticipantRow
             continue
 
         # Extraire le XUID
-        pid = player.get("PlayerId")
-        xuid = None
-        if isinstance(pid, str):
-            m = XUID_RE.search(pid)
-            if m:
-                xuid = m.group(1)
-        elif isinstance(pid, dict):
-            xuid_val = pid.get("Xuid") or pid.get("xuid")
-            if xuid_val is not None:
-                xuid = str(xuid_val)
-            else:
-                try:
-                    s = json.dumps(pid)
-                    m = XUID_RE.search(s)
-                    if m:
-                        xuid = m.group(1)
-                except (TypeError, ValueError):
-                    pass
+        xuid = _extract_xuid(player)
 
         if not xuid or xuid in seen_xuids:
             continue
@@ -1345,24 +1349,7 @@ def extract_all_medals(
             continue
 
         # Extraire le XUID du joueur
-        pid = player.get("PlayerId")
-        xuid: str | None = None
-        if isinstance(pid, str):
-            m = XUID_RE.search(pid)
-            if m:
-                xuid = m.group(1)
-        elif isinstance(pid, dict):
-            xuid_val = pid.get("Xuid") or pid.get("xuid")
-            if xuid_val is not None:
-                xuid = str(xuid_val)
-            else:
-                try:
-                    s = json.dumps(pid)
-                    m = XUID_RE.search(s)
-                    if m:
-                        xuid = m.group(1)
-                except (TypeError, ValueError):
-                    pass
+        xuid = _extract_xuid(player)
 
         if not xuid:
             continue
@@ -1476,6 +1463,9 @@ def _find_personal_scores(player_obj: dict[str, Any]) -> list[dict[str, Any]]:
 
     Parcourt récursivement PlayerTeamStats pour trouver PersonalScores[].
     """
+    view = _scanned(player_obj)
+    if view is not None:
+        return view.personal_scores
 
     def find_ps(x: Any) -> list[dict[str, Any]] | None:
         if isinstance(x, dict):
@@ -1672,6 +1662,10 @@ def extract_match_registry_data(
         "pair_name": pair_name,
         "game_variant_id": game_variant_id,
         "game_variant_name": game_variant_name,
+        "playlist_version_id": _extract_version_id(match_info, "Playlist"),
+        "map_version_id": _extract_version_id(match_info, "MapVariant"),
+        "pair_version_id": _extract_version_id(match_info, "PlaylistMapModePair"),
+        "game_variant_version_id": _extract_version_id(match_info, "UgcGameVariant"),
         "mode_category": mode_category,
         "is_ranked": is_ranked,
         "is_firefight": is_firefight,
@@ -1,27 +1,54 @@
 """Module UI - Gestion des alias, médailles et helpers d'interface."""
 
-from src.ui.aliases import (
-    display_name_from_xuid,
-    get_xuid_aliases,
-    load_aliases_file,
-    save_aliases_file,
-)
-from src.ui.formatting import format_date_fr, format_mmss
-from src.ui.medals import (
-    get_local_medals_icons_dir,
-    get_medals_cache_dir,
-    load_medal_name_maps,
-    medal_has_known_label,
-    medal_icon_path,
-    medal_label,
-    render_medals_grid,
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.ui.aliases": (
+            "display_name_from_xuid",
+            "get_xuid_aliases",
+            "load_aliases_file",
+            "save_aliases_file",
+        ),
+        "src.ui.formatting": (
+            "format_date_fr",
+            "format_mmss",
+        ),
+        "src.ui.medals": (
+            "get_local_medals_icons_dir",
+            "get_medals_cache_dir",
+            "load_medal_name_maps",
+            "medal_has_known_label",
+            "medal_icon_path",
+            "medal_label",
+            "render_medals_grid",
+        ),
+        "src.ui.path_picker": (
+            "directory_input",
+            "file_input",
+        ),
+        "src.ui.profile_api": (
+            "ProfileAppearance",
+            "get_profile_appearance",
+            "get_xuid_for_gamertag",
+        ),
+        "src.ui.profile_api_tokens": ("ensure_spnkr_tokens",),
+        "src.ui.settings": (
+            "AppSettings",
+            "load_settings",
+            "save_settings",
+        ),
+        "src.ui.styles": (
+            "get_hero_html",
+            "load_css",
+        ),
+        "src.ui.translations": (
+            "translate_pair_name",
+            "translate_playlist_name",
+        ),
+    },
 )
-from src.ui.path_picker import directory_input, file_input
-from src.ui.profile_api import ProfileAppearance, get_profile_appearance, get_xuid_for_gamertag
-from src.ui.profile_api_tokens import ensure_spnkr_tokens
-from src.ui.settings import AppSettings, load_settings, save_settings
-from src.ui.styles import get_hero_html, load_css
-from src.ui.translations import translate_pair_name, translate_playlist_name
 
 __all__ = [
     # aliases
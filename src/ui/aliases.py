@@ -57,9 +57,9 @@ def load_aliases_from_db(db_path: str) -> dict[str, str]:
 def _load_aliases_from_duckdb_cached(db_path: str, mtime: float | None) -> dict[str, str]:
     """Version cachée pour DuckDB."""
     try:
-        import duckdb
+        from src.data.infrastructure.database.snapshots import connect_read_only
 
-        con = duckdb.connect(db_path, read_only=True)
+        con = connect_read_only(db_path)
         # Vérifie si la table existe
         tables = con.execute(
             "SELECT table_name FROM information_schema.tables WHERE table_name = 'xuid_aliases'"
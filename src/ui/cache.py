@@ -16,6 +16,7 @@ from src.ui.cache_filters import (  # noqa: F401
     cached_get_match_count_duckdb,
     cached_get_migration_status,
     cached_get_performance_by_map_duckdb,
+    cached_load_filter_cube,
     cached_load_matches_paginated,
     cached_load_recent_matches,
     load_df_hybrid,
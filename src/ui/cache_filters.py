@@ -52,9 +52,9 @@ def cached_compute_sessions_db(
         try:
             from datetime import datetime, timezone
 
-            import duckdb
+            from src.data.infrastructure.database.snapshots import connect_read_only
 
-            conn = duckdb.connect(db_path, read_only=True)
+            conn = connect_read_only(db_path)
             firefight_filter = "" if include_firefight else "AND is_firefight = FALSE"
 
             query = f"""
@@ -658,3 +658,40 @@ def cached_get_match_count_duckdb(
 
     except Exception:
         return 0
+
+
+@st.cache_data(show_spinner=False, ttl=600)
+def cached_load_filter_cube(
+    player_db_path: str,
+    xuid: str,
+    db_key: tuple[int, int] | None = None,
+) -> pl.DataFrame | None:
+    """Charge le cube de filtres pré-agrégé (mv_filter_cube).
+
+    Args:
+        player_db_path: Chemin vers stats.duckdb du joueur.
+        xuid: XUID du joueur.
+        db_key: Clé de cache pour invalidation.
+
+    Returns:
+        Cube Polars, ou None si absent (KPIs calculés sur la frame brute).
+    """
+    _ = db_key
+
+    try:
+        from pathlib import Path
+
+        from src.data.repositories.duckdb_repo import DuckDBRepository
+
+        db_path = Path(player_db_path)
+        if not db_path.exists():
+            return None
+
+        repo = DuckDBRepository(db_path, xuid)
+        try:
+            return repo.get_filter_cube()
+        finally:
+            repo.close()
+
+    except Exception:
+        return None
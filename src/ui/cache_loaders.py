@@ -109,10 +109,10 @@ def _resolve_player_xuid(db_path: str) -> str:
     Returns:
         XUID en string, ou "" si introuvable.
     """
-    import duckdb
+    from src.data.infrastructure.database.snapshots import connect_read_only
 
     try:
-        conn = duckdb.connect(db_path, read_only=True)
+        conn = connect_read_only(db_path)
 
         # Stratégie 1 : sync_meta (source canonique v5)
         try:
@@ -385,9 +385,9 @@ def cached_load_highlight_events_for_match(
     # DuckDB v4 : charger depuis la table highlight_events
     if _is_duckdb_v4_path(db_path):
         try:
-            import duckdb
+            from src.data.infrastructure.database.snapshots import connect_read_only
 
-            conn = duckdb.connect(db_path, read_only=True)
+            conn = connect_read_only(db_path)
             # Vérifier si la table existe (DuckDB utilise information_schema)
             tables = conn.execute(
                 "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main' AND table_name = 'highlight_events'"
@@ -450,11 +450,10 @@ def cached_load_match_player_gamertags(
     # DuckDB v4 : utiliser le repository pour résolution centralisée
     if _is_duckdb_v4_path(db_path):
         try:
-            import duckdb
-
+            from src.data.infrastructure.database.snapshots import connect_read_only
             from src.data.repositories.duckdb_repo import DuckDBRepository
 
-            conn = duckdb.connect(db_path, read_only=True)
+            conn = connect_read_only(db_path)
 
             # Récupérer tous les XUIDs du match depuis highlight_events
             try:
@@ -559,6 +558,10 @@ def clear_app_caches() -> None:
     with contextlib.suppress(Exception):
         st.cache_data.clear()
 
+    from src.visualization.figure_cache import get_figure_cache
+
+    get_figure_cache().clear()
+
 
 @st.cache_data(show_spinner=False)
 def cached_list_other_xuids(
@@ -571,9 +574,9 @@ def cached_list_other_xuids(
     # DuckDB v4 : utiliser la table xuid_aliases ou teammates
     if _is_duckdb_v4_path(db_path):
         try:
-            import duckdb
+            from src.data.infrastructure.database.snapshots import connect_read_only
 
-            conn = duckdb.connect(db_path, read_only=True)
+            conn = connect_read_only(db_path)
             # Essayer depuis xuid_aliases (tous les joueurs rencontrés)
             try:
                 result = conn.execute(
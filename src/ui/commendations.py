@@ -5,7 +5,7 @@ Cette UI s'appuie sur le référentiel offline généré par:
 
 Fichiers attendus:
 - data/wiki/halo5_commendations_fr.json
-- static/commendations/h5g/*.png
+- static/commendations/h5g/*.png (servies via l'atlas static/atlas/commendations.png)
 """
 
 from __future__ import annotations
@@ -21,6 +21,7 @@ from typing import Any
 import streamlit as st
 
 from src.config import get_repo_root
+from src.ui.sprite_atlas import get_sprite
 
 DEFAULT_H5G_JSON_PATH = os.path.join("data", "wiki", "halo5_commendations_fr.json")
 DEFAULT_H5G_EXCLUDE_PATH = os.path.join("data", "wiki", "halo5_commendations_exclude.json")
@@ -464,18 +465,25 @@ def render_h5g_commendations_section(
 
         with col:
             st.markdown("<div class='os-citation-top-gap'></div>", unsafe_allow_html=True)
-            data_uri = None
+            # Icône: sprite de l'atlas statique (image unique mise en cache par le
+            # navigateur), sinon data URI base64 (Pillow ou static serving absents).
+            img_css = None
             if img:
-                try:
-                    mtime = os.path.getmtime(img)
-                except OSError:
-                    mtime = None
-                data_uri = _img_data_uri(img, mtime)
+                sprite = get_sprite("commendations", os.path.splitext(os.path.basename(img))[0])
+                if sprite is not None:
+                    img_css = sprite.css_vars()
+                else:
+                    try:
+                        mtime = os.path.getmtime(img)
+                    except OSError:
+                        mtime = None
+                    data_uri = _img_data_uri(img, mtime)
+                    img_css = f"--img:url('{data_uri}')" if data_uri else None
 
             # Tooltip avec la description de la citation.
             tip = html.escape(desc) if desc else html.escape(name)
 
-            if data_uri:
+            if img_css:
                 ring_class = (
                     "os-citation-ring os-citation-ring--master" if is_master else "os-citation-ring"
                 )
@@ -490,9 +498,9 @@ def render_h5g_commendations_section(
                     + str(float(progress_ratio))
                     + ";--ring-color:"
                     + ring_color
-                    + ";--img:url('"
-                    + data_uri
-                    + "')\"></div>",
+                    + ";"
+                    + img_css
+                    + '"></div>',
                     unsafe_allow_html=True,
                 )
             else:
@@ -10,9 +10,11 @@ from typing import Any
 import plotly.graph_objects as go
 
 from src.config import THEME_COLORS
+from src.visualization.figure_cache import cached_figure
 from src.visualization.theme import apply_halo_plot_style
 
 
+@cached_figure
 def create_radar_chart(
     data: list[dict[str, Any]],
     *,
@@ -433,6 +435,7 @@ def create_participation_radar(
 # =============================================================================
 
 
+@cached_figure
 def create_participation_profile_radar(
     profiles: list[dict[str, Any]],
     *,
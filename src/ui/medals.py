@@ -2,17 +2,21 @@
 
 Ce module centralise les fonctions liées aux médailles Halo Infinite :
 - Chargement des fichiers de traduction (FR/EN)
-- Récupération des icônes depuis le cache OpenSpartan.Workshop
+- Récupération des icônes (atlas static/atlas/medals.png, sinon PNG locaux
+  ou cache OpenSpartan.Workshop)
 - Affichage d'une grille de médailles dans Streamlit
 """
 
 from __future__ import annotations
 
+import html
 import json
 import os
 
 import streamlit as st
 
+from src.ui.sprite_atlas import get_sprite
+
 __all__ = [
     "load_medal_name_maps",
     "medal_has_known_label",
@@ -202,9 +206,17 @@ def render_medals_grid(
         nid = int(m.get("name_id", 0))
         cnt = int(m.get("count", 0))
         name = medal_label(nid)
-        icon = medal_icon_path(nid)
+        sprite = get_sprite("medals", str(nid))
+        icon = None if sprite is not None else medal_icon_path(nid)
 
-        if icon:
+        if sprite is not None:
+            # Atlas statique: une seule image pour toute la grille (cache navigateur)
+            col.markdown(
+                f"<div class='os-medal-sprite' title='{html.escape(name)}' "
+                f'style="{sprite.css()}"></div>',
+                unsafe_allow_html=True,
+            )
+        elif icon:
             col.image(icon, width="stretch")
         else:
             col.markdown(
@@ -40,9 +40,9 @@ def _is_duckdb_file(db_path: str) -> bool:
 
 def _get_duckdb_connection(db_path: str):
     """Retourne une connexion DuckDB."""
-    import duckdb
+    from src.data.infrastructure.database.snapshots import connect_read_only
 
-    return duckdb.connect(db_path, read_only=True)
+    return connect_read_only(db_path)
 
 
 @dataclass
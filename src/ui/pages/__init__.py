@@ -1,21 +1,31 @@
 """Pages UI du dashboard."""
 
-from src.ui.pages.career import render_career_page
-from src.ui.pages.citations import render_citations_page
-from src.ui.pages.last_match import render_last_match_page, render_match_search_page
-from src.ui.pages.match_history import render_match_history_page
-from src.ui.pages.match_view import render_match_view
-from src.ui.pages.media_library import render_media_library_page
-from src.ui.pages.media_tab import render_media_tab
-from src.ui.pages.objective_analysis import (
-    render_objective_analysis_page,
-    render_objective_analysis_page_from_session_state,
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.ui.pages.career": ("render_career_page",),
+        "src.ui.pages.citations": ("render_citations_page",),
+        "src.ui.pages.last_match": (
+            "render_last_match_page",
+            "render_match_search_page",
+        ),
+        "src.ui.pages.match_history": ("render_match_history_page",),
+        "src.ui.pages.match_view": ("render_match_view",),
+        "src.ui.pages.media_library": ("render_media_library_page",),
+        "src.ui.pages.media_tab": ("render_media_tab",),
+        "src.ui.pages.objective_analysis": (
+            "render_objective_analysis_page",
+            "render_objective_analysis_page_from_session_state",
+        ),
+        "src.ui.pages.session_compare": ("render_session_comparison_page",),
+        "src.ui.pages.settings": ("render_settings_page",),
+        "src.ui.pages.teammates": ("render_teammates_page",),
+        "src.ui.pages.timeseries": ("render_timeseries_page",),
+        "src.ui.pages.win_loss": ("render_win_loss_page",),
+    },
 )
-from src.ui.pages.session_compare import render_session_comparison_page
-from src.ui.pages.settings import render_settings_page
-from src.ui.pages.teammates import render_teammates_page
-from src.ui.pages.timeseries import render_timeseries_page
-from src.ui.pages.win_loss import render_win_loss_page
 
 __all__ = [
     "render_session_comparison_page",
@@ -17,7 +17,7 @@ from src.ui.career_ranks import (
     get_rank_icon_path,
 )
 from src.ui.components.career_progress_circle import create_career_progress_gauge
-from src.ui.player_assets import ensure_local_image_path
+from src.ui.player_assets import resolve_or_prefetch_images
 from src.visualization.theme import apply_halo_plot_style
 
 logger = logging.getLogger(__name__)
@@ -33,9 +33,9 @@ def _load_career_data(db_path: str, xuid: str) -> dict | None:
         Dict avec rank, rank_name, rank_tier, current_xp, etc. ou None.
     """
     try:
-        import duckdb
+        from src.data.infrastructure.database.snapshots import connect_read_only
 
-        conn = duckdb.connect(db_path, read_only=True)
+        conn = connect_read_only(db_path)
         try:
             result = conn.execute(
                 """SELECT rank, rank_name, rank_tier, current_xp,
@@ -78,9 +78,9 @@ def _load_career_history(db_path: str, xuid: str, limit: int = 50) -> list[dict]
         Liste de dicts ordonnés par date croissante.
     """
     try:
-        import duckdb
+        from src.data.infrastructure.database.snapshots import connect_read_only
 
-        conn = duckdb.connect(db_path, read_only=True)
+        conn = connect_read_only(db_path)
         try:
             rows = conn.execute(
                 """SELECT rank, rank_name, rank_tier, current_xp,
@@ -215,11 +215,9 @@ def render_career_page(
 
         if adornment_db_path:
             # L'adornment_path peut être une URL ou un chemin CMSlocal
-            local_adornment = ensure_local_image_path(
-                adornment_db_path,
-                prefix="adornment",
-                download_enabled=True,
-                auto_refresh_hours=0,
+            # Téléchargement éventuel en arrière-plan (visible au prochain rendu)
+            (local_adornment,) = resolve_or_prefetch_images(
+                [(adornment_db_path, "adornment")], download_enabled=True
             )
             if local_adornment:
                 st.image(local_adornment, width=140)
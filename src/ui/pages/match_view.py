@@ -20,6 +20,7 @@ from src.analysis.performance_config import SCORE_THRESHOLDS
 from src.analysis.performance_score import compute_relative_performance_score
 from src.app.helpers import normalize_map_label
 from src.config import HALO_COLORS, OUTCOME_CODES
+from src.data.repositories._match_bundle import MatchBundle, get_match_bundle
 from src.ui import (
     AppSettings,
     translate_pair_name,
@@ -32,6 +33,7 @@ from src.ui.pages.match_view_charts import render_expected_vs_actual
 # Imports depuis les sous-modules
 from src.ui.pages.match_view_helpers import (
     map_thumb_path,
+    neighbor_match_ids,
     os_card,
     render_media_section,
 )
@@ -47,6 +49,17 @@ from src.visualization._compat import DataFrameLike, ensure_polars
 # =============================================================================
 
 
+def _bundle_loader(bundle: MatchBundle, attr: str, fallback: Callable) -> Callable:
+    """Chargeur servant `attr` du bundle pour son match, `fallback` pour les autres."""
+
+    def _load(db_path: str, match_id: str, *args, **kwargs):
+        if str(match_id or "").strip() == bundle.match_id:
+            return getattr(bundle, attr)
+        return fallback(db_path, match_id, *args, **kwargs)
+
+    return _load
+
+
 def render_match_view(
     *,
     row: dict[str, Any],
@@ -226,10 +239,29 @@ def render_match_view(
         with c[1], contextlib.suppress(Exception):
             st.image(thumb, width=400)
 
-    # Stats détaillées
+    # Stats détaillées : un bundle par match (peu de requêtes), voisins préchargés
+    bundle = None
     with st.spinner("Lecture des stats détaillées (attendu vs réel, médailles)…"):
-        pm = load_player_match_result_fn(db_path, match_id, xuid.strip(), db_key=db_key)
-        medals_last = load_match_medals_fn(db_path, match_id, xuid.strip(), db_key=db_key)
+        if str(db_path or "").endswith(".duckdb"):
+            from src.data.repositories.duckdb_repo import DuckDBRepository
+
+            with DuckDBRepository(db_path, xuid.strip(), read_only=True) as repo:
+                bundle = get_match_bundle(
+                    repo,
+                    match_id,
+                    prefetch=neighbor_match_ids(df_full, match_id),
+                )
+        if bundle is not None:
+            pm = bundle.player_match_result()
+            medals_last = bundle.medals
+            load_highlight_events_fn = _bundle_loader(
+                bundle, "highlight_events", load_highlight_events_fn
+            )
+            load_match_gamertags_fn = _bundle_loader(bundle, "gamertags", load_match_gamertags_fn)
+            load_match_rosters_fn = _bundle_loader(bundle, "rosters", load_match_rosters_fn)
+        else:
+            pm = load_player_match_result_fn(db_path, match_id, xuid.strip(), db_key=db_key)
+            medals_last = load_match_medals_fn(db_path, match_id, xuid.strip(), db_key=db_key)
 
     if not pm:
         st.info(
@@ -265,6 +297,8 @@ def render_match_view(
         xuid=xuid,
         db_key=db_key,
         match_row=row,
+        awards_df=bundle.personal_scores if bundle is not None else None,
+        awards_loaded=bundle is not None,
     )
 
     # Némésis / Souffre-douleur
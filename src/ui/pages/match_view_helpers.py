@@ -321,3 +321,15 @@ __all__ = [
     "os_card",
     "map_thumb_path",
 ]
+
+
+def neighbor_match_ids(df: pl.DataFrame | None, match_id: str) -> list[str]:
+    """MatchIds précédent et suivant de `match_id` dans l'historique (par start_time)."""
+    if df is None or df.is_empty() or not {"match_id", "start_time"} <= set(df.columns):
+        return []
+    ids = df.sort("start_time")["match_id"].cast(pl.Utf8).to_list()
+    try:
+        idx = ids.index(match_id)
+    except ValueError:
+        return []
+    return [ids[i] for i in (idx - 1, idx + 1) if 0 <= i < len(ids) and ids[i]]
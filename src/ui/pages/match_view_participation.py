@@ -6,10 +6,13 @@ Support, Score, Impact, Survie. Réutilisable dans Mes coéquipiers.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import streamlit as st
 
+if TYPE_CHECKING:
+    import polars as pl
+
 
 def render_participation_section(
     db_path: str,
@@ -18,6 +21,8 @@ def render_participation_section(
     db_key: tuple[int, int] | None = None,
     *,
     match_row: dict[str, Any] | None = None,
+    awards_df: pl.DataFrame | None = None,
+    awards_loaded: bool = False,
 ) -> None:
     """Affiche la section Participation au match (radar unifié 6 axes).
 
@@ -31,6 +36,8 @@ def render_participation_section(
         db_key: Clé de cache pour la DB.
         match_row: Ligne match_stats (pair_name, deaths, time_played_seconds)
                    pour Impact et Survie. Optionnel.
+        awards_df: PersonalScoreAwards du match déjà chargés (bundle Match).
+        awards_loaded: True si `awards_df` vient d'un bundle (None = aucune donnée).
     """
     from src.data.repositories import DuckDBRepository
     from src.ui.components.radar_chart import create_participation_profile_radar
@@ -40,19 +47,24 @@ def render_participation_section(
         get_radar_thresholds,
     )
 
-    # Charger les données
-    try:
-        repo = DuckDBRepository(db_path, xuid)
-        if not repo.has_personal_score_awards():
+    # Charger les données (sauf si le bundle Match les fournit)
+    if awards_loaded:
+        if awards_df is None or awards_df.is_empty():
             return
+        df = awards_df
+    else:
+        try:
+            repo = DuckDBRepository(db_path, xuid)
+            if not repo.has_personal_score_awards():
+                return
 
-        df = repo.load_personal_score_awards_as_polars(match_id=match_id)
+            df = repo.load_personal_score_awards_as_polars(match_id=match_id)
 
-        if df.is_empty():
-            return
+            if df.is_empty():
+                return
 
-    except Exception:
-        return
+        except Exception:
+            return
 
     # Convertir match_row en dict si Series
     row_dict = None
@@ -425,18 +425,24 @@ def _load_match_windows_from_db(db_path: str) -> pl.DataFrame:
     try:
         import duckdb
 
+        from src.data.infrastructure.database.shared_partitions import attach_shared
+        from src.data.infrastructure.database.snapshots import (
+            connect_read_only,
+            resolve_read_path,
+        )
         from src.utils.paths import PLAYERS_DIR
 
-        # --- V5 : requête unique via shared_matches.duckdb ---
+        # --- V5 : requête unique via shared_matches.duckdb (partitions comprises) ---
         shared_db = PLAYERS_DIR.parent / "warehouse" / "shared_matches.duckdb"
         if shared_db.exists():
             try:
-                conn = duckdb.connect(str(shared_db), read_only=True)
+                conn = duckdb.connect(":memory:")
                 try:
+                    attach_shared(conn, shared_db, read_path=resolve_read_path(shared_db))
                     matches = conn.execute(
                         """
                         SELECT match_id, start_time, duration_seconds
-                        FROM match_registry
+                        FROM shared.match_registry
                         WHERE start_time IS NOT NULL
                         """
                     ).fetchall()
@@ -498,7 +504,7 @@ def _load_match_windows_from_db(db_path: str) -> pl.DataFrame:
                     continue
 
                 try:
-                    conn = duckdb.connect(str(player_db), read_only=True)
+                    conn = connect_read_only(str(player_db))
                     try:
                         # Vérifier si la table existe
                         tables = conn.execute(
@@ -619,9 +625,9 @@ def _load_media_from_db(
         "xuid",
     ]
     try:
-        import duckdb
+        from src.data.infrastructure.database.snapshots import connect_read_only
 
-        conn = duckdb.connect(db_path, read_only=True)
+        conn = connect_read_only(db_path)
         try:
             # Vérifier si les tables existent
             tables = conn.execute(
@@ -90,9 +90,9 @@ def _get_friends_names(df_session: DataFrameLike) -> set[str]:
             # Détection du type de DB (DuckDB vs SQLite)
             if db_path.endswith(".duckdb"):
                 # DuckDB : la table Friends peut ne pas exister
-                import duckdb
+                from src.data.infrastructure.database.snapshots import connect_read_only
 
-                con = duckdb.connect(db_path, read_only=True)
+                con = connect_read_only(db_path)
                 try:
                     # Vérifier si la table existe
                     tables = con.execute(
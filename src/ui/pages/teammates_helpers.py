@@ -19,7 +19,7 @@ from src.ui import (
     translate_playlist_name,
 )
 from src.ui.cache import cached_load_player_match_result
-from src.ui.player_assets import ensure_local_image_path
+from src.ui.player_assets import resolve_or_prefetch_images
 from src.visualization._compat import DataFrameLike, ensure_polars
 
 
@@ -96,6 +96,13 @@ def _get_teammate_card_data(
     }
 
 
+_CARD_IMAGE_FIELDS = (
+    ("emblem_url", "emblem"),
+    ("backdrop_url", "backdrop"),
+    ("nameplate_url", "nameplate"),
+)
+
+
 def render_teammate_cards(picked_xuids: list[str], settings: object) -> None:
     """Affiche les cartes Spartan des coéquipiers sélectionnés.
 
@@ -115,28 +122,18 @@ def render_teammate_cards(picked_xuids: list[str], settings: object) -> None:
     refresh_h = int(getattr(settings, "profile_assets_auto_refresh_hours", 0) or 0)
     api_refresh_h = int(getattr(settings, "profile_api_auto_refresh_hours", 0) or 0)
 
-    for t_xuid in picked_xuids:
-        # Utiliser la fonction cachée pour les données de profil
-        card_data = _get_teammate_card_data(t_xuid, api_refresh_h)
+    # Utiliser la fonction cachée pour les données de profil
+    cards = [_get_teammate_card_data(t_xuid, api_refresh_h) for t_xuid in picked_xuids]
+    # Un seul lot pour toutes les cartes: les images manquantes sont
+    # téléchargées en arrière-plan, sans bloquer le rendu.
+    image_paths = resolve_or_prefetch_images(
+        [(card_data[key], prefix) for card_data in cards for key, prefix in _CARD_IMAGE_FIELDS],
+        download_enabled=dl_enabled,
+        auto_refresh_hours=refresh_h,
+    )
 
-        t_emblem_path = ensure_local_image_path(
-            card_data["emblem_url"],
-            prefix="emblem",
-            download_enabled=dl_enabled,
-            auto_refresh_hours=refresh_h,
-        )
-        t_backdrop_path = ensure_local_image_path(
-            card_data["backdrop_url"],
-            prefix="backdrop",
-            download_enabled=dl_enabled,
-            auto_refresh_hours=refresh_h,
-        )
-        t_nameplate_path = ensure_local_image_path(
-            card_data["nameplate_url"],
-            prefix="nameplate",
-            download_enabled=dl_enabled,
-            auto_refresh_hours=refresh_h,
-        )
+    for i, card_data in enumerate(cards):
+        t_emblem_path, t_backdrop_path, t_nameplate_path = image_paths[3 * i : 3 * i + 3]
 
         card_html = get_hero_html(
             player_name=card_data["name"],
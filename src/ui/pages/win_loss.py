@@ -89,6 +89,7 @@ def render_win_loss_page(
     db_path: str,
     xuid: str,
     db_key: tuple[int, int] | None,
+    filter_cube: pl.DataFrame | None = None,
 ) -> None:
     """Affiche la page Victoires/Défaites.
 
@@ -99,6 +100,7 @@ def render_win_loss_page(
         db_path: Chemin vers la base de données.
         xuid: XUID du joueur.
         db_key: Clé de cache de la DB.
+        filter_cube: Tranche du cube pré-agrégé pour les mêmes filtres (optionnel).
     """
     dff = ensure_polars(dff)
     base = ensure_polars(base)
@@ -116,7 +118,7 @@ def render_win_loss_page(
         _render_top_by_week(dff)
         _render_streak_section(dff)
         _render_personal_score_section(dff)
-        _render_period_section(dff, bucket_label, is_session_scope)
+        _render_period_section(dff, bucket_label, is_session_scope, filter_cube)
         _render_ratio_by_map_section(dff, base, db_path, xuid, db_key)
 
 
@@ -292,11 +294,18 @@ def _render_period_section(
     dff: pl.DataFrame,
     bucket_label: str,
     is_session_scope: bool,
+    filter_cube: pl.DataFrame | None = None,
 ) -> None:
-    """Affiche le tableau par période."""
+    """Affiche le tableau par période (depuis le cube si la granularité le permet)."""
     st.divider()
     st.subheader("Par période")
-    period = WinLossService.compute_period_table(dff.to_pandas(), bucket_label, is_session_scope)
+    period = None
+    if filter_cube is not None and not is_session_scope:
+        period = WinLossService.compute_period_table_from_cube(filter_cube, bucket_label)
+    if period is None:
+        period = WinLossService.compute_period_table(
+            dff.to_pandas(), bucket_label, is_session_scope
+        )
     if period.is_empty:
         st.info("Aucune donnée pour construire le tableau.")
         return
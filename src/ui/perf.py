@@ -2,7 +2,7 @@
 
 Streamlit rerun le script à chaque interaction. Ce module fournit un mode
 "perf" simple pour mesurer les sections clés (sidebar, chargement DB, filtres,
-charts) sans dépendance externe.
+charts) sans dépendance externe, ainsi que l'efficacité du cache de figures.
 """
 
 from __future__ import annotations
@@ -14,6 +14,8 @@ from contextlib import contextmanager
 import polars as pl
 import streamlit as st
 
+from src.visualization.figure_cache import get_figure_cache
+
 _PERF_ENABLED_KEY = "perf_enabled"
 _PERF_TIMINGS_KEY = "_perf_timings_ms"
 
@@ -50,6 +52,16 @@ def perf_dataframe() -> pl.DataFrame:
     return pl.DataFrame(rows)
 
 
+def figure_cache_caption() -> str:
+    """Résumé des statistiques du cache de figures."""
+    stats = get_figure_cache().stats()
+    return (
+        f"Cache figures: {stats.hits} hits / {stats.misses} misses "
+        f"({stats.hit_rate:.0%}), {stats.entries} entrées, "
+        f"{stats.bytes / (1024 * 1024):.1f} MB, {stats.evictions} évictions"
+    )
+
+
 def render_perf_panel(*, location: str = "sidebar") -> None:
     container = st.sidebar if location == "sidebar" else st
 
@@ -63,6 +75,8 @@ def render_perf_panel(*, location: str = "sidebar") -> None:
         st.session_state[_PERF_TIMINGS_KEY] = []
         st.rerun()
 
+    container.caption(figure_cache_caption())
+
     df_pl = perf_dataframe()
     if df_pl.is_empty():
         c[1].caption("En attente…")
@@ -3,6 +3,13 @@
 Contraintes:
 - Aucun accès réseau implicite: le téléchargement doit être déclenché explicitement par l'utilisateur.
 - Le rendu doit fonctionner offline si les fichiers sont déjà présents en cache ou fournis en chemin local.
+
+Téléchargements:
+- `download_images_to_cache` traite un lot (url, prefix) avec une seule session
+  aiohttp, une concurrence bornée, le saut des fichiers déjà en cache et une
+  écriture atomique.
+- `resolve_or_prefetch_images` sert le rendu Streamlit: chemins en cache tout de
+  suite, téléchargements manquants en arrière-plan.
 """
 
 from __future__ import annotations
@@ -10,14 +17,30 @@ from __future__ import annotations
 import asyncio
 import base64
 import concurrent.futures
+import contextlib
 import hashlib
 import json
 import mimetypes
 import os
+import tempfile
+import threading
 import time
 import urllib.parse
 import urllib.request
+from collections.abc import Awaitable, Callable, Iterable
 from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# (url, prefix) -> fichier cache `<prefix>_<sha256[:20]><ext>`
+ImageRequest = tuple[str, str]
+# (ok, message, local_path)
+DownloadResult = tuple[bool, str, str | None]
+
+DEFAULT_DOWNLOAD_CONCURRENCY = 6
+PREFETCH_RETRY_SECONDS = 300.0
+_MAX_MANIFEST_HOPS = 5
 
 
 def get_player_assets_cache_dir() -> str:
@@ -45,6 +68,23 @@ def _hashed_name(url: str, *, prefix: str) -> str:
     return f"{prefix}_{h}{_url_ext(url)}"
 
 
+def _alias_name(url: str, *, prefix: str) -> str:
+    """Alias d'une URL redirigée par manifeste (contient le nom du fichier de l'URL finale)."""
+    return f"{Path(_hashed_name(url, prefix=prefix)).stem}.alias"
+
+
+def _cached_file(url: str, *, prefix: str) -> str | None:
+    """Fichier cache de `url` (image finale via l'alias de redirection, sinon direct)."""
+    cache_dir = get_player_assets_cache_dir()
+    with contextlib.suppress(OSError):
+        target = Path(cache_dir, _alias_name(url, prefix=prefix)).read_text("utf-8").strip()
+        aliased = os.path.join(cache_dir, os.path.basename(target))
+        if target and os.path.isfile(aliased):
+            return aliased
+    cached = os.path.join(cache_dir, _hashed_name(url, prefix=prefix))
+    return cached if os.path.isfile(cached) else None
+
+
 def is_http_url(value: str | None) -> bool:
     s = str(value or "").strip().lower()
     return s.startswith("http://") or s.startswith("https://")
@@ -66,123 +106,254 @@ def resolve_local_image_path(value: str | None) -> str | None:
 
     # URL => on regarde si déjà en cache
     if is_http_url(s):
-        cache_dir = get_player_assets_cache_dir()
         # Compat: selon les usages, les téléchargements ont pu être faits
         # avec différents préfixes (banner/emblem/backdrop/nameplate).
         # On tente plusieurs noms déterministes.
         for prefix in ("asset", "banner", "emblem", "backdrop", "nameplate"):
-            fname = _hashed_name(s, prefix=prefix)
-            cached = os.path.join(cache_dir, fname)
-            if os.path.exists(cached) and os.path.isfile(cached):
+            cached = _cached_file(s, prefix=prefix)
+            if cached:
                 return cached
 
     return None
 
 
-def download_image_to_cache(
-    url: str, *, prefix: str, timeout_seconds: int = 12
-) -> tuple[bool, str, str | None]:
-    """Télécharge une image depuis une URL dans le cache local.
+def _auth_headers_for_url(target_url: str) -> dict[str, str]:
+    headers: dict[str, str] = {
+        "Accept": "image/png, image/*;q=0.9, */*;q=0.8",
+        "User-Agent": "OpenSpartan-Graphs",
+    }
+
+    # Certains endpoints Halo Waypoint (hi/images/file/...) exigent une auth (343-clearance).
+    clearance = str(os.environ.get("SPNKR_CLEARANCE_TOKEN") or "").strip()
+    spartan = str(os.environ.get("SPNKR_SPARTAN_TOKEN") or "").strip()
+    if clearance:
+        # Les deux existent dans la nature; on fournit les deux.
+        headers.setdefault("Cookie", f"343-clearance={clearance}")
+        headers.setdefault("343-clearance", clearance)
+    if spartan:
+        headers.setdefault("x-343-authorization-spartan", spartan)
+    return headers
+
+
+def _spnkr_tokens() -> tuple[str, str]:
+    st = str(os.environ.get("SPNKR_SPARTAN_TOKEN") or "").strip()
+    ct = str(os.environ.get("SPNKR_CLEARANCE_TOKEN") or "").strip()
+    return st, ct
+
+
+def _needs_auth(target_url: str) -> bool:
+    # Inclut: /hi/images/file/, /hi/Waypoint/file/images/ (ALL sous-chemins), et Inventory/
+    url_lower = str(target_url).lower()
+    return (
+        ("/hi/images/file/" in url_lower)
+        or ("/hi/waypoint/file/images/" in url_lower)
+        or url_lower.strip().startswith("inventory/")
+        or str(target_url).strip().startswith("/Inventory/")
+    )
+
+
+def _spnkr_route(target: str) -> tuple[str, str] | None:
+    """Choisit la méthode SPNKr pour `target`.
+
+    `target` peut être:
+    - une URL complète https://gamecms-hacs.../hi/images/file/<relative>
+    - une URL complète https://gamecms-hacs.../hi/Waypoint/file/images/<relative>
+    - un chemin relatif Inventory/... (ou /Inventory/...)
 
-    Retourne (ok, message, local_path).
+    Retourne ("direct", url) ou ("image", chemin relatif), ou None.
+
+    Stratégie:
+    1. URL complète → GET direct avec headers auth (préserve le path exact)
+    2. Chemin /hi/images/file/ → extrait le rel et utilise get_image()
+    3. Chemin relatif (Inventory/...) → utilise get_image()
     """
-    u = str(url or "").strip()
-    if not is_http_url(u):
-        return False, "URL invalide (http/https attendu).", None
+    raw = str(target or "").strip()
+    if not raw:
+        return None
 
-    cache_dir = get_player_assets_cache_dir()
-    _safe_mkdir(cache_dir)
+    if not (raw.startswith("http://") or raw.startswith("https://")):
+        # Chemin relatif (Inventory/...) → get_image()
+        rel = raw.lstrip("/")
+        return ("image", rel) if rel else None
 
-    fname = _hashed_name(u, prefix=prefix)
-    out_path = os.path.join(cache_dir, fname)
+    try:
+        p = urllib.parse.urlparse(raw)
+        path_lower = (p.path or "").lower()
+    except Exception:
+        return "direct", raw
+
+    # URLs /hi/Waypoint/file/images/... : GET direct obligatoire
+    # car get_image() réécrit en /hi/images/file/ (mauvais endpoint)
+    if "/hi/waypoint/file/images/" in path_lower:
+        return "direct", raw
+    # URLs /hi/images/file/... : get_image() fonctionne, mais
+    # GET direct est aussi valide. On utilise get_image() pour
+    # conserver la compatibilité.
+    if "/hi/images/file/" in path_lower:
+        marker = "/hi/images/file/"
+        rel = (p.path or "")[path_lower.index(marker) + len(marker) :].lstrip("/")
+        return ("image", rel) if rel else None
+    # URL inconnue → GET direct en best-effort
+    return "direct", raw
+
+
+def _run_sync(make_coro: Callable[[], Awaitable[T]], *, timeout_seconds: float) -> T:
+    """Exécute une coroutine depuis du code synchrone (même sous une boucle active)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(make_coro())
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+        fut = ex.submit(lambda: asyncio.run(make_coro()))
+        return fut.result(timeout=float(timeout_seconds) + 20.0)
+
+
+def _extract_image_url_from_json(obj: object) -> str | None:
+    candidates: list[str] = []
+
+    def walk(x: object) -> None:
+        if isinstance(x, dict):
+            for v in x.values():
+                walk(v)
+            return
+        if isinstance(x, list):
+            for v in x[:200]:
+                walk(v)
+            return
+        if isinstance(x, str):
+            s = x.strip()
+            if not s:
+                return
+            candidates.append(s)
+
+    walk(obj)
+
+    image_exts = (".png", ".jpg", ".jpeg", ".webp")
+    # Priorité: URL explicite d'image
+    for s in candidates:
+        if (s.startswith("http://") or s.startswith("https://")) and s.lower().endswith(image_exts):
+            return s
+
+    # Sinon: chemin vers /hi/Waypoint/file/images/ (souvent public)
+    host = "https://gamecms-hacs.svc.halowaypoint.com"
+    for s in candidates:
+        if "/hi/Waypoint/file/images/" in s and s.lower().endswith(image_exts):
+            rel = s[s.index("/hi/Waypoint/file/images/") :]
+            return f"{host}{rel}"
+
+    # Sinon: chemin vers /hi/images/file/
+    for s in candidates:
+        s_lower = s.lower()
+        marker = "/hi/images/file/"
+        if marker in s_lower and s_lower.endswith(image_exts):
+            rel = s[s_lower.index(marker) :]
+            rel = rel.replace("/hi/images/file/", "/hi/Images/file/")
+            return f"{host}{rel}"
+
+    # Dernier recours: chemin relatif "Inventory/...png"
+    for s in candidates:
+        if s.lower().startswith("inventory/") and s.lower().endswith(image_exts):
+            return f"{host}/hi/Images/file/{s.lstrip('/')}"
+
+    return None
 
-    def _auth_headers_for_url(target_url: str) -> dict[str, str]:
-        headers: dict[str, str] = {"User-Agent": "OpenSpartan-Graphs"}
-
-        # Certains endpoints Halo Waypoint (hi/images/file/...) exigent une auth (343-clearance).
-        clearance = str(os.environ.get("SPNKR_CLEARANCE_TOKEN") or "").strip()
-        spartan = str(os.environ.get("SPNKR_SPARTAN_TOKEN") or "").strip()
-        if clearance:
-            # Les deux existent dans la nature; on fournit les deux.
-            headers.setdefault("Cookie", f"343-clearance={clearance}")
-            headers.setdefault("343-clearance", clearance)
-        if spartan:
-            headers.setdefault("x-343-authorization-spartan", spartan)
-        return headers
-
-    def _run_sync(coro):
+
+def _interpret_payload(
+    data: bytes | None, content_type: str
+) -> tuple[bytes | None, str | None, str | None]:
+    """Retourne (image, url_suivante, erreur) pour une réponse brute.
+
+    Une réponse JSON est un manifeste : on en extrait l'URL d'image à suivre.
+    """
+    if not data:
+        return None, None, "Téléchargement vide."
+    # On ne se fie pas seulement au content-type (parfois absent)
+    if "application/json" in content_type or data.lstrip()[:1] in (b"{", b"["):
         try:
-            return asyncio.run(coro)
-        except RuntimeError as e:
-            msg = str(e)
-            if "asyncio.run() cannot be called" not in msg:
-                raise
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-                fut = ex.submit(lambda: asyncio.run(coro))
-                return fut.result(timeout=float(timeout_seconds) + 20.0)
+            obj = json.loads(data.decode("utf-8", errors="ignore"))
+        except Exception:
+            return None, None, "Réponse JSON illisible."
+        img = _extract_image_url_from_json(obj)
+        if img:
+            # Signale au caller qu'il faut re-télécharger cette URL.
+            return None, img, None
+        return None, None, "Manifeste JSON sans URL d'image exploitable."
+    return data, None, None
+
+
+def _write_atomic(out_path: str, data: bytes) -> None:
+    """Écrit via un fichier temporaire + os.replace (jamais d'image tronquée en cache)."""
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".tmp_", suffix=Path(out_path).suffix, dir=os.path.dirname(out_path)
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
 
-    def _try_spnkr_fetch_bytes(target: str) -> tuple[bytes | None, str | None]:
-        """Best-effort: télécharge via SPNKr (auth) pour contourner 401/403.
 
-        `target` peut être:
-        - une URL complète https://gamecms-hacs.../hi/images/file/<relative>
-        - une URL complète https://gamecms-hacs.../hi/Waypoint/file/images/<relative>
-        - un chemin relatif Inventory/... (ou /Inventory/...)
+def _store_download(
+    url: str, final_url: str, *, prefix: str, data: bytes | None, err: str | None
+) -> DownloadResult:
+    if data is None:
+        return False, err or "Téléchargement impossible.", None
 
-        Stratégie:
-        1. URL complète → GET direct avec headers auth (préserve le path exact)
-        2. Chemin /hi/images/file/ → extrait le rel et utilise get_image()
-        3. Chemin relatif (Inventory/...) → utilise get_image()
-        """
+    # Si on a suivi une redirection, on cache avec l'URL finale (extension + hash)
+    # et un alias URL demandée → fichier final sert les lectures suivantes
+    cache_dir = get_player_assets_cache_dir()
+    fname = _hashed_name(final_url, prefix=prefix)
+    out_path = os.path.join(cache_dir, fname)
+    try:
+        _write_atomic(out_path, data)
+        if final_url != url:
+            alias = os.path.join(cache_dir, _alias_name(url, prefix=prefix))
+            _write_atomic(alias, fname.encode("utf-8"))
+        return True, "", out_path
+    except Exception as e:
+        return False, f"Écriture cache impossible: {e}", None
 
-        st = str(os.environ.get("SPNKR_SPARTAN_TOKEN") or "").strip()
-        ct = str(os.environ.get("SPNKR_CLEARANCE_TOKEN") or "").strip()
-        if not (st and ct):
-            return None, None
 
-        raw = str(target or "").strip()
-        if not raw:
-            return None, None
+def _fresh_cached_path(url: str, *, prefix: str, refresh_hours: int = 0) -> str | None:
+    """Chemin cache de `url` s'il existe et a moins de `refresh_hours` (0 = sans limite)."""
+    cached = _cached_file(url, prefix=prefix)
+    if cached is None:
+        return None
+    try:
+        mtime = os.path.getmtime(cached)
+    except OSError:
+        return None
+    if int(refresh_hours) > 0 and time.time() - mtime >= float(refresh_hours) * 3600.0:
+        return None
+    return cached
 
-        is_full_url = raw.startswith("http://") or raw.startswith("https://")
 
-        # Déterminer si on peut utiliser un GET direct (URL complète)
-        # ou si on doit passer par get_image() (chemin relatif)
-        use_direct_get = False
-        direct_url = ""
-        rel = raw
+def download_image_to_cache(url: str, *, prefix: str, timeout_seconds: int = 12) -> DownloadResult:
+    """Télécharge une image depuis une URL dans le cache local.
 
-        if is_full_url:
-            try:
-                p = urllib.parse.urlparse(raw)
-                path_lower = (p.path or "").lower()
-
-                # URLs /hi/Waypoint/file/images/... : GET direct obligatoire
-                # car get_image() réécrit en /hi/images/file/ (mauvais endpoint)
-                if "/hi/waypoint/file/images/" in path_lower:
-                    use_direct_get = True
-                    direct_url = raw
-                # URLs /hi/images/file/... : get_image() fonctionne, mais
-                # GET direct est aussi valide. On utilise get_image() pour
-                # conserver la compatibilité.
-                elif "/hi/images/file/" in path_lower:
-                    marker = "/hi/images/file/"
-                    rel = (p.path or "")[path_lower.index(marker) + len(marker) :]
-                else:
-                    # URL inconnue → GET direct en best-effort
-                    use_direct_get = True
-                    direct_url = raw
-            except Exception:
-                use_direct_get = True
-                direct_url = raw
-        else:
-            # Chemin relatif (Inventory/...) → get_image()
-            rel = raw.lstrip("/")
+    Retourne (ok, message, local_path). Pour plusieurs images, préférer
+    `download_images_to_cache` (session et connexions partagées).
+    """
+    u = str(url or "").strip()
+    if not is_http_url(u):
+        return False, "URL invalide (http/https attendu).", None
 
-        if not use_direct_get:
-            rel = rel.lstrip("/")
-            if not rel:
-                return None, None
+    _safe_mkdir(get_player_assets_cache_dir())
+
+    def _try_spnkr_fetch_bytes(target: str) -> tuple[bytes | None, str | None]:
+        """Best-effort: télécharge via SPNKr (auth) pour contourner 401/403."""
+
+        st, ct = _spnkr_tokens()
+        if not (st and ct):
+            return None, None
+
+        route = _spnkr_route(target)
+        if route is None:
+            return None, None
+        method, arg = route
 
         async def _run_get_image() -> bytes:
             """Télécharge via gamecms_hacs.get_image() (chemin /hi/images/file/)."""
@@ -197,89 +368,28 @@ def download_image_to_cache(
                     clearance_token=ct,
                     requests_per_second=3,
                 )
-                img_resp = await client.gamecms_hacs.get_image(rel)
+                img_resp = await client.gamecms_hacs.get_image(arg)
                 return await img_resp.read()
 
         async def _run_direct_get() -> bytes:
             """Télécharge via GET direct avec headers auth (URL complète)."""
             import aiohttp
 
-            headers = {
-                "Accept": "image/png, image/*;q=0.9, */*;q=0.8",
-                "User-Agent": "OpenSpartan-Graphs",
-            }
-            if st:
-                headers["x-343-authorization-spartan"] = st
-            if ct:
-                headers["343-clearance"] = ct
-                headers["Cookie"] = f"343-clearance={ct}"
-
             timeout_obj = aiohttp.ClientTimeout(total=float(timeout_seconds))
             async with (
                 aiohttp.ClientSession(timeout=timeout_obj) as session,
-                session.get(direct_url, headers=headers) as resp,
+                session.get(arg, headers=_auth_headers_for_url(arg)) as resp,
             ):
                 resp.raise_for_status()
                 return await resp.read()
 
         try:
-            coro = _run_direct_get() if use_direct_get else _run_get_image()
-            data = _run_sync(coro)
+            make_coro = _run_direct_get if method == "direct" else _run_get_image
+            data = _run_sync(make_coro, timeout_seconds=timeout_seconds)
             return (data if isinstance(data, bytes | bytearray) else None), None
         except Exception as e:
-            method = "direct GET" if use_direct_get else "get_image"
-            return None, f"SPNKr {method} KO: {e}"
-
-    def _extract_image_url_from_json(obj: object) -> str | None:
-        candidates: list[str] = []
-
-        def walk(x: object) -> None:
-            if isinstance(x, dict):
-                for v in x.values():
-                    walk(v)
-                return
-            if isinstance(x, list):
-                for v in x[:200]:
-                    walk(v)
-                return
-            if isinstance(x, str):
-                s = x.strip()
-                if not s:
-                    return
-                candidates.append(s)
-
-        walk(obj)
-
-        image_exts = (".png", ".jpg", ".jpeg", ".webp")
-        # Priorité: URL explicite d'image
-        for s in candidates:
-            if (s.startswith("http://") or s.startswith("https://")) and s.lower().endswith(
-                image_exts
-            ):
-                return s
-
-        # Sinon: chemin vers /hi/Waypoint/file/images/ (souvent public)
-        host = "https://gamecms-hacs.svc.halowaypoint.com"
-        for s in candidates:
-            if "/hi/Waypoint/file/images/" in s and s.lower().endswith(image_exts):
-                rel = s[s.index("/hi/Waypoint/file/images/") :]
-                return f"{host}{rel}"
-
-        # Sinon: chemin vers /hi/images/file/
-        for s in candidates:
-            s_lower = s.lower()
-            marker = "/hi/images/file/"
-            if marker in s_lower and s_lower.endswith(image_exts):
-                rel = s[s_lower.index(marker) :]
-                rel = rel.replace("/hi/images/file/", "/hi/Images/file/")
-                return f"{host}{rel}"
-
-        # Dernier recours: chemin relatif "Inventory/...png"
-        for s in candidates:
-            if s.lower().startswith("inventory/") and s.lower().endswith(image_exts):
-                return f"{host}/hi/Images/file/{s.lstrip('/')}"
-
-        return None
+            label = "direct GET" if method == "direct" else "get_image"
+            return None, f"SPNKr {label} KO: {e}"
 
     def _download_once(target_url: str) -> tuple[bytes | None, str | None, str | None]:
         try:
@@ -287,48 +397,19 @@ def download_image_to_cache(
             content_type = ""
 
             # Certains endpoints renvoient 401/403 en accès direct; on tente SPNKr en fallback.
-            # Inclut: /hi/images/file/, /hi/Waypoint/file/images/ (ALL sous-chemins), et Inventory/
-            url_lower = str(target_url).lower()
-            needs_auth = (
-                ("/hi/images/file/" in url_lower)
-                or ("/hi/waypoint/file/images/" in url_lower)
-                or url_lower.strip().startswith("inventory/")
-                or str(target_url).strip().startswith("/Inventory/")
-            )
-
-            if needs_auth:
-                data_spnkr, spnkr_err = _try_spnkr_fetch_bytes(target_url)
+            if _needs_auth(target_url):
+                data_spnkr, _spnkr_err = _try_spnkr_fetch_bytes(target_url)
                 if data_spnkr:
                     data = bytes(data_spnkr)
-                else:
-                    # Fallback urllib (ex: si SPNKr non installé / tokens absents)
-                    req = urllib.request.Request(
-                        target_url, headers=_auth_headers_for_url(target_url)
-                    )
-                    with urllib.request.urlopen(req, timeout=float(timeout_seconds)) as resp:
-                        data = resp.read()
-                        content_type = str(resp.headers.get("content-type") or "").lower()
-            else:
-                # Cas standard (ex: Waypoint/file/images/*.png)
+            if data is None:
+                # Cas standard (ex: Waypoint/file/images/*.png), ou fallback urllib
+                # (ex: si SPNKr non installé / tokens absents)
                 req = urllib.request.Request(target_url, headers=_auth_headers_for_url(target_url))
                 with urllib.request.urlopen(req, timeout=float(timeout_seconds)) as resp:
                     data = resp.read()
                     content_type = str(resp.headers.get("content-type") or "").lower()
 
-            if not data:
-                return None, None, "Téléchargement vide."
-            # On ne se fie pas seulement au content-type (parfois absent)
-            if "application/json" in content_type or data.lstrip()[:1] in (b"{", b"["):
-                try:
-                    obj = json.loads(data.decode("utf-8", errors="ignore"))
-                except Exception:
-                    return None, None, "Réponse JSON illisible."
-                img = _extract_image_url_from_json(obj)
-                if img:
-                    # Signale au caller qu'il faut re-télécharger cette URL.
-                    return None, img, None
-                return None, None, "Manifeste JSON sans URL d'image exploitable."
-            return data, None, None
+            return _interpret_payload(data, content_type)
         except Exception as e:
             return None, None, f"Téléchargement impossible: {e}"
 
@@ -338,36 +419,289 @@ def download_image_to_cache(
     data: bytes | None = None
     last_err: str | None = None
 
-    for _ in range(5):
+    for _ in range(_MAX_MANIFEST_HOPS):
         if current in visited:
             return False, "Boucle de redirection inattendue.", None
         visited.add(current)
 
-        data, next_url, err = _download_once(current)
-        last_err = err
-        if next_url:
+        data, next_url, last_err = _download_once(current)
+        if not next_url:
+            # Image obtenue, ou erreur terminale sans redirection: inutile de boucler.
+            break
+        current = next_url
+
+    return _store_download(u, current, prefix=prefix, data=data, err=last_err)
+
+
+class _SessionFetcher:
+    """Transport d'un lot: une session aiohttp (pool de connexions) + un client SPNKr."""
+
+    def __init__(self, session) -> None:
+        self._session = session
+        self._halo_client = None
+
+    def _image_client(self):
+        if self._halo_client is None:
+            st, ct = _spnkr_tokens()
+            if not (st and ct):
+                return None
+            try:
+                from spnkr.client import HaloInfiniteClient
+            except ImportError:
+                return None
+            self._halo_client = HaloInfiniteClient(
+                self._session, spartan_token=st, clearance_token=ct, requests_per_second=3
+            )
+        return self._halo_client
+
+    async def fetch_once(self, target_url: str) -> tuple[bytes | None, str | None, str | None]:
+        try:
+            route = _spnkr_route(target_url) if _needs_auth(target_url) else None
+            client = self._image_client() if route and route[0] == "image" else None
+            if client is not None:
+                img_resp = await client.gamecms_hacs.get_image(route[1])
+                return _interpret_payload(await img_resp.read(), "")
+            async with self._session.get(
+                target_url, headers=_auth_headers_for_url(target_url)
+            ) as resp:
+                resp.raise_for_status()
+                data = await resp.read()
+                content_type = str(resp.headers.get("content-type") or "").lower()
+            return _interpret_payload(data, content_type)
+        except Exception as e:
+            return None, None, f"Téléchargement impossible: {e}"
+
+    async def download(self, url: str, *, prefix: str) -> DownloadResult:
+        current = url
+        visited: set[str] = set()
+        data: bytes | None = None
+        err: str | None = None
+        for _ in range(_MAX_MANIFEST_HOPS):
+            if current in visited:
+                return False, "Boucle de redirection inattendue.", None
+            visited.add(current)
+            data, next_url, err = await self.fetch_once(current)
+            if not next_url:
+                break
             current = next_url
+        return _store_download(url, current, prefix=prefix, data=data, err=err)
+
+
+def _normalize_requests(items: Iterable[ImageRequest]) -> list[ImageRequest]:
+    return list(dict.fromkeys((str(u or "").strip(), str(p)) for u, p in items))
+
+
+async def download_images_to_cache_async(
+    items: Iterable[ImageRequest],
+    *,
+    concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+    timeout_seconds: int = 12,
+    refresh_hours: int = 0,
+    force: bool = False,
+    session=None,
+) -> dict[ImageRequest, DownloadResult]:
+    """Télécharge un lot d'images (url, prefix) dans le cache local.
+
+    - une seule session aiohttp (et son pool de connexions) pour tout le lot,
+      au plus `concurrency` téléchargements simultanés ;
+    - les fichiers déjà en cache (nom haché, plus récents que `refresh_hours`)
+      ne sont pas re-téléchargés, sauf `force=True` ;
+    - écriture atomique (fichier temporaire + os.replace).
+
+    Returns:
+        {(url, prefix): (ok, message, local_path)} pour chaque requête distincte.
+    """
+    results: dict[ImageRequest, DownloadResult] = {}
+    pending: list[ImageRequest] = []
+    for url, prefix in _normalize_requests(items):
+        if not is_http_url(url):
+            results[(url, prefix)] = (False, "URL invalide (http/https attendu).", None)
             continue
-        if data is not None:
-            break
-        # Erreur terminale sans redirection: inutile de boucler.
-        break
+        cached = (
+            None if force else _fresh_cached_path(url, prefix=prefix, refresh_hours=refresh_hours)
+        )
+        if cached:
+            results[(url, prefix)] = (True, "", cached)
+        else:
+            pending.append((url, prefix))
+    if not pending:
+        return results
 
-    if data is None:
-        return False, last_err or "Téléchargement impossible.", None
+    _safe_mkdir(get_player_assets_cache_dir())
+    limit = max(1, int(concurrency))
 
-    # Si on a suivi une redirection, on cache avec l'URL finale (extension + hash)
-    if current != u:
-        u = current
-        fname = _hashed_name(u, prefix=prefix)
-        out_path = os.path.join(cache_dir, fname)
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+
+    if aiohttp is None and session is None:
+        # Sans aiohttp: chemin unitaire (urllib) dans des threads, même limite.
+        sem = asyncio.Semaphore(limit)
+
+        async def _one_thread(url: str, prefix: str) -> DownloadResult:
+            async with sem:
+                return await asyncio.to_thread(
+                    download_image_to_cache, url, prefix=prefix, timeout_seconds=timeout_seconds
+                )
+
+        done = await asyncio.gather(*(_one_thread(u, p) for u, p in pending))
+        results.update(zip(pending, done, strict=True))
+        return results
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=float(timeout_seconds)),
+            connector=aiohttp.TCPConnector(limit=limit),
+        )
+    sem = asyncio.Semaphore(limit)
+    fetcher = _SessionFetcher(session)
+
+    async def _one(url: str, prefix: str) -> DownloadResult:
+        async with sem:
+            return await fetcher.download(url, prefix=prefix)
 
     try:
-        with open(out_path, "wb") as f:
-            f.write(data)
-        return True, "", out_path
-    except Exception as e:
-        return False, f"Écriture cache impossible: {e}", None
+        done = await asyncio.gather(*(_one(u, p) for u, p in pending))
+    finally:
+        if own_session:
+            await session.close()
+    results.update(zip(pending, done, strict=True))
+    return results
+
+
+def download_images_to_cache(
+    items: Iterable[ImageRequest],
+    *,
+    concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+    timeout_seconds: int = 12,
+    refresh_hours: int = 0,
+    force: bool = False,
+) -> dict[ImageRequest, DownloadResult]:
+    """Version synchrone de `download_images_to_cache_async` (scripts, launcher)."""
+    requests = _normalize_requests(items)
+    return _run_sync(
+        lambda: download_images_to_cache_async(
+            requests,
+            concurrency=concurrency,
+            timeout_seconds=timeout_seconds,
+            refresh_hours=refresh_hours,
+            force=force,
+        ),
+        # Borne large: les lots sont bornés par `concurrency`, pas par leur taille.
+        timeout_seconds=float(timeout_seconds) * (1 + len(requests) // max(1, int(concurrency))),
+    )
+
+
+# =============================================================================
+# Préchargement en arrière-plan (rendu Streamlit non bloquant)
+# =============================================================================
+
+_prefetch_lock = threading.Lock()
+_prefetch_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_prefetch_inflight: set[ImageRequest] = set()
+_prefetch_failures: dict[ImageRequest, tuple[float, str]] = {}
+
+
+def prefetch_images_in_background(
+    items: Iterable[ImageRequest],
+    *,
+    refresh_hours: int = 0,
+    timeout_seconds: int = 12,
+    concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+) -> concurrent.futures.Future | None:
+    """Planifie le téléchargement des images absentes du cache, sans attendre.
+
+    Les requêtes déjà en cours, déjà en cache, ou en échec depuis moins de
+    `PREFETCH_RETRY_SECONDS` sont ignorées. Retourne le Future du lot, ou None
+    s'il n'y a rien à télécharger.
+    """
+    global _prefetch_executor
+
+    now = time.time()
+    with _prefetch_lock:
+        todo = []
+        for key in _normalize_requests(items):
+            if not is_http_url(key[0]) or key in _prefetch_inflight:
+                continue
+            failed = _prefetch_failures.get(key)
+            if failed and now - failed[0] < PREFETCH_RETRY_SECONDS:
+                continue
+            if _fresh_cached_path(key[0], prefix=key[1], refresh_hours=refresh_hours):
+                continue
+            todo.append(key)
+        if not todo:
+            return None
+        _prefetch_inflight.update(todo)
+        if _prefetch_executor is None:
+            _prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="player-assets"
+            )
+        executor = _prefetch_executor
+
+    def _job() -> dict[ImageRequest, DownloadResult]:
+        try:
+            results = download_images_to_cache(
+                todo,
+                concurrency=concurrency,
+                timeout_seconds=timeout_seconds,
+                refresh_hours=refresh_hours,
+            )
+        except Exception as e:
+            results = dict.fromkeys(todo, (False, f"Téléchargement impossible: {e}", None))
+        finally:
+            with _prefetch_lock:
+                _prefetch_inflight.difference_update(todo)
+        with _prefetch_lock:
+            for key, (ok, msg, _path) in results.items():
+                if ok:
+                    _prefetch_failures.pop(key, None)
+                else:
+                    _prefetch_failures[key] = (time.time(), msg)
+        return results
+
+    return executor.submit(_job)
+
+
+def prefetch_error(url: str | None, *, prefix: str) -> str | None:
+    """Dernière erreur de préchargement pour (url, prefix), ou None."""
+    with _prefetch_lock:
+        failed = _prefetch_failures.get((str(url or "").strip(), str(prefix)))
+    return failed[1] if failed else None
+
+
+def resolve_or_prefetch_images(
+    items: Iterable[tuple[str | None, str]],
+    *,
+    download_enabled: bool,
+    auto_refresh_hours: int = 0,
+    timeout_seconds: int = 12,
+) -> list[str | None]:
+    """Variante non bloquante de `ensure_local_image_path` pour plusieurs images.
+
+    Retourne tout de suite, pour chaque (value, prefix), le chemin local
+    disponible (cache éventuellement ancien inclus) ; les URLs absentes ou
+    périmées sont préchargées en arrière-plan si `download_enabled` et
+    apparaîtront au rendu suivant.
+    """
+    paths: list[str | None] = []
+    to_fetch: list[ImageRequest] = []
+    for value, prefix in items:
+        s = str(value or "").strip()
+        local = ensure_local_image_path(s, prefix=prefix, download_enabled=False)
+        paths.append(local)
+        if (
+            download_enabled
+            and is_http_url(s)
+            and not _fresh_cached_path(s, prefix=prefix, refresh_hours=auto_refresh_hours)
+        ):
+            to_fetch.append((s, prefix))
+    if to_fetch:
+        prefetch_images_in_background(
+            to_fetch, refresh_hours=auto_refresh_hours, timeout_seconds=timeout_seconds
+        )
+    return paths
 
 
 def ensure_local_image_path(
@@ -404,11 +738,9 @@ def ensure_local_image_path(
     if not is_http_url(s):
         return None
 
-    cache_dir = get_player_assets_cache_dir()
-    fname = _hashed_name(s, prefix=prefix)
-    cached = os.path.join(cache_dir, fname)
+    cached = _cached_file(s, prefix=prefix)
 
-    if os.path.exists(cached) and os.path.isfile(cached):
+    if cached:
         if int(auto_refresh_hours) <= 0:
             return cached
         try:
@@ -427,7 +759,7 @@ def ensure_local_image_path(
         return out_path
 
     # Fallback: si un cache existe malgré tout, ou un cache ancien d'un autre préfixe
-    if os.path.exists(cached) and os.path.isfile(cached):
+    if cached and os.path.isfile(cached):
         return cached
     return resolve_local_image_path(s)
 
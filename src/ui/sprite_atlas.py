@@ -0,0 +1,270 @@
+"""Atlas d'icônes (sprite sheets) servis par le static serving Streamlit.
+
+HOW IT WORKS:
+- `build_atlas("medals")` assemble toutes les icônes d'un dossier
+  (static/medals/icons, static/commendations/h5g) en une seule image
+  static/atlas/<nom>.png, accompagnée d'un index JSON {clé: [colonne, ligne]}.
+- L'index porte la signature des sources (noms, tailles, mtimes) : l'atlas n'est
+  reconstruit que si une icône change (ou via scripts/build_sprite_atlases.py).
+- Les pages référencent l'atlas par son URL statique
+  (app/static/atlas/<nom>.png?v=<signature>) et un décalage CSS
+  (background-position en %) : le navigateur télécharge une image, une fois,
+  au lieu de data URIs base64 ré-envoyées à chaque rerun.
+- Sans Pillow, sans static serving, ou pour une icône absente de l'atlas,
+  `get_sprite` retourne None et l'appelant garde son rendu historique.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.config import get_repo_root
+
+ATLAS_DIR = os.path.join("static", "atlas")
+ATLAS_INDEX_VERSION = 1
+# Préfixe des URLs servies par Streamlit pour le dossier static/ (server.enableStaticServing)
+STATIC_URL_PREFIX = "app/static"
+
+
+@dataclass(frozen=True)
+class AtlasSpec:
+    """Source d'un atlas: dossier d'icônes PNG (relatif au repo) et taille des tuiles."""
+
+    name: str
+    source_dir: str
+    tile_px: int
+
+
+ATLAS_SPECS: dict[str, AtlasSpec] = {
+    # Icônes 256 px affichées dans des colonnes de ~100-150 px
+    "medals": AtlasSpec("medals", os.path.join("static", "medals", "icons"), 128),
+    # Citations H5G: PNG 100 px d'origine
+    "commendations": AtlasSpec(
+        "commendations", os.path.join("static", "commendations", "h5g"), 100
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Sprite:
+    """Position d'une icône dans un atlas, exprimée en CSS (indépendante de la taille affichée)."""
+
+    url: str
+    size: str
+    position: str
+
+    def css(self) -> str:
+        """Déclarations CSS pour un élément carré affichant l'icône."""
+        return (
+            f"background-image:url('{self.url}');background-size:{self.size};"
+            f"background-position:{self.position};background-repeat:no-repeat"
+        )
+
+    def css_vars(self) -> str:
+        """Variables CSS (--img, --img-size, --img-pos) pour les composants stylés (anneaux)."""
+        return f"--img:url('{self.url}');--img-size:{self.size};--img-pos:{self.position}"
+
+
+def _root(repo_root: str | None) -> Path:
+    return Path(repo_root or get_repo_root(__file__))
+
+
+def _atlas_paths(name: str, repo_root: str | None = None) -> tuple[Path, Path]:
+    base = _root(repo_root) / ATLAS_DIR
+    return base / f"{name}.png", base / f"{name}.json"
+
+
+def _source_files(spec: AtlasSpec, repo_root: str | None = None) -> list[Path]:
+    src = _root(repo_root) / spec.source_dir
+    if not src.is_dir():
+        return []
+    return sorted(p for p in src.iterdir() if p.suffix.lower() == ".png" and p.is_file())
+
+
+def _signature(files: list[Path], tile_px: int) -> str:
+    h = hashlib.sha1(f"v{ATLAS_INDEX_VERSION}:{tile_px}".encode())
+    for p in files:
+        st = p.stat()
+        h.update(f"|{p.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()[:12]
+
+
+def _write_atomic(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=path.suffix, dir=str(path.parent))
+    os.close(fd)
+    try:
+        write(tmp)
+        # mkstemp crée en 0600: l'atlas doit rester lisible par le serveur statique
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _read_index(index_path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != ATLAS_INDEX_VERSION:
+        return None
+    return data
+
+
+def build_atlas(
+    name: str, *, repo_root: str | None = None, force: bool = False
+) -> dict[str, Any] | None:
+    """Construit (si nécessaire) l'atlas `name` et retourne son index.
+
+    Args:
+        name: Clé de `ATLAS_SPECS` ("medals", "commendations").
+        repo_root: Racine du repo (défaut: détectée).
+        force: Reconstruit même si la signature des sources n'a pas changé.
+
+    Returns:
+        L'index de l'atlas, ou None si aucune icône source ou Pillow absent.
+    """
+    spec = ATLAS_SPECS[name]
+    files = _source_files(spec, repo_root)
+    if not files:
+        return None
+
+    png_path, index_path = _atlas_paths(name, repo_root)
+    signature = _signature(files, spec.tile_px)
+    if not force and png_path.exists():
+        current = _read_index(index_path)
+        if current and current.get("signature") == signature:
+            return current
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    tile = int(spec.tile_px)
+    columns = max(1, math.ceil(math.sqrt(len(files))))
+    rows = max(1, math.ceil(len(files) / columns))
+    sheet = Image.new("RGBA", (columns * tile, rows * tile), (0, 0, 0, 0))
+    sprites: dict[str, list[int]] = {}
+
+    for i, path in enumerate(files):
+        try:
+            with Image.open(path) as img:
+                icon = img.convert("RGBA")
+        except Exception:
+            continue
+        # Ajuste dans la tuile sans déformer, centré
+        icon.thumbnail((tile, tile), Image.Resampling.LANCZOS)
+        col, row = i % columns, i // columns
+        offset = (col * tile + (tile - icon.width) // 2, row * tile + (tile - icon.height) // 2)
+        sheet.paste(icon, offset)
+        sprites[path.stem] = [col, row]
+
+    index = {
+        "version": ATLAS_INDEX_VERSION,
+        "name": name,
+        "tile": tile,
+        "columns": columns,
+        "rows": rows,
+        "signature": signature,
+        "sprites": sprites,
+    }
+    _write_atomic(png_path, lambda tmp: sheet.save(tmp, format="PNG", compress_level=6))
+    _write_atomic(
+        index_path,
+        lambda tmp: Path(tmp).write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8"),
+    )
+    _index_cache.pop((name, str(_root(repo_root))), None)
+    return index
+
+
+# (nom, racine) -> ((mtime dossier source, mtime index), index)
+_index_cache: dict[tuple[str, str], tuple[tuple[float, float], dict[str, Any] | None]] = {}
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def load_atlas(
+    name: str, *, repo_root: str | None = None, build: bool = True
+) -> dict[str, Any] | None:
+    """Index de l'atlas `name`, (re)construit à la volée si absent ou périmé.
+
+    Le coût par rendu se limite à deux `stat` (dossier source + index) : l'index
+    n'est relu et la signature recalculée que si l'un des deux a changé.
+    """
+    spec = ATLAS_SPECS[name]
+    root = _root(repo_root)
+    _png_path, index_path = _atlas_paths(name, str(root))
+    stamp = (_mtime(root / spec.source_dir), _mtime(index_path))
+    key = (name, str(root))
+    cached = _index_cache.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    index = _read_index(index_path)
+    files = _source_files(spec, str(root))
+    if index is None or index.get("signature") != _signature(files, spec.tile_px):
+        index = build_atlas(name, repo_root=str(root)) if build else None
+
+    _index_cache[key] = ((_mtime(root / spec.source_dir), _mtime(index_path)), index)
+    return index
+
+
+def static_serving_enabled() -> bool:
+    """True si Streamlit sert le dossier static/ (option server.enableStaticServing)."""
+    try:
+        import streamlit as st
+
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def sprite_from_index(index: dict[str, Any], key: str) -> Sprite | None:
+    """Sprite de `key` dans un index d'atlas, ou None si l'icône n'y figure pas."""
+    pos = (index.get("sprites") or {}).get(str(key))
+    if not pos:
+        return None
+    columns = int(index.get("columns") or 1)
+    rows = int(index.get("rows") or 1)
+    col, row = int(pos[0]), int(pos[1])
+    # background-position en %: 0% = bord gauche/haut, 100% = bord droit/bas
+    x = col * 100.0 / (columns - 1) if columns > 1 else 0.0
+    y = row * 100.0 / (rows - 1) if rows > 1 else 0.0
+    url = f"{STATIC_URL_PREFIX}/atlas/{index.get('name')}.png?v={index.get('signature')}"
+    return Sprite(
+        url=url,
+        size=f"{columns * 100}% {rows * 100}%",
+        position=f"{x:.4f}% {y:.4f}%",
+    )
+
+
+def get_sprite(name: str, key: str) -> Sprite | None:
+    """Sprite de l'icône `key` de l'atlas `name`, si servable en statique.
+
+    Args:
+        name: Atlas ("medals" : clé = NameId, "commendations" : clé = nom de fichier sans .png).
+        key: Identifiant de l'icône.
+    """
+    if not static_serving_enabled():
+        return None
+    index = load_atlas(name)
+    if not index:
+        return None
+    return sprite_from_index(index, key)
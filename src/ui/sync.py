@@ -243,9 +243,9 @@ def _sync_duckdb_player(
         # Compter les matchs avant (player_match_stats = source de vérité v5)
         matches_before = 0
         try:
-            import duckdb
+            from src.data.infrastructure.database.snapshots import connect_read_only
 
-            conn = duckdb.connect(str(db_file), read_only=True)
+            conn = connect_read_only(db_file)
             # Essayer player_match_stats (v5), puis match_stats (fallback)
             for table in ("player_match_stats", "match_stats"):
                 try:
@@ -302,7 +302,7 @@ def _sync_duckdb_player(
         # Compter les matchs après (même logique que avant)
         matches_after = 0
         try:
-            conn = duckdb.connect(str(db_file), read_only=True)
+            conn = connect_read_only(db_file)
             for table in ("player_match_stats", "match_stats"):
                 try:
                     result = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
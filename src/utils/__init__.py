@@ -1,31 +1,38 @@
 """Utilitaires partagés pour le projet OpenSpartan Graph."""
 
-from src.utils.paths import (
-    ARCHIVE_DIR,
-    DATA_DIR,
-    PLAYERS_DIR,
-    REPO_ROOT,
-    WAREHOUSE_DIR,
-    get_metadata_db_path,
-    get_player_archive_dir,
-    get_player_db_path,
-    list_player_gamertags,
-)
-from src.utils.profiles import (
-    PROFILES_PATH,
-    get_profiles_path,
-    list_local_dbs,
-    load_profiles,
-    save_profiles,
-)
-from src.utils.xuid import (
-    XUID_DIGITS_RE,
-    extract_gamertag_from_player_id,
-    extract_xuid_from_player_id,
-    guess_xuid_from_db_path,
-    infer_spnkr_player_from_db_path,
-    parse_xuid_input,
-    resolve_xuid_from_db,
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "src.utils.paths": (
+            "ARCHIVE_DIR",
+            "DATA_DIR",
+            "PLAYERS_DIR",
+            "REPO_ROOT",
+            "WAREHOUSE_DIR",
+            "get_metadata_db_path",
+            "get_player_archive_dir",
+            "get_player_db_path",
+            "list_player_gamertags",
+        ),
+        "src.utils.profiles": (
+            "PROFILES_PATH",
+            "get_profiles_path",
+            "list_local_dbs",
+            "load_profiles",
+            "save_profiles",
+        ),
+        "src.utils.xuid": (
+            "XUID_DIGITS_RE",
+            "extract_gamertag_from_player_id",
+            "extract_xuid_from_player_id",
+            "guess_xuid_from_db_path",
+            "infer_spnkr_player_from_db_path",
+            "parse_xuid_input",
+            "resolve_xuid_from_db",
+        ),
+    },
 )
 
 __all__ = [
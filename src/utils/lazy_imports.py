@@ -0,0 +1,69 @@
+"""Exports paresseux des packages (PEP 562).
+(Lazy package exports)
+
+Les ``__init__.py`` de ``src/*`` ré-exportent les fonctions de leurs
+sous-modules. Importés à plat, ils chargeaient Plotly, Polars, DuckDB et
+pandas dès ``import src.ui`` ou ``import src.analysis``, même pour un appel
+CLI ou une page qui n'en a pas besoin.
+
+HOW IT WORKS:
+1. Chaque package déclare ses exports : ``{sous-module: (nom, ...)}`` ;
+   ``"nom_source as alias"`` pour un export renommé
+2. ``lazy_exports`` fournit ``__getattr__`` / ``__dir__`` au niveau module :
+   le sous-module n'est importé qu'au premier accès à l'un de ses noms
+3. La valeur est ensuite mise en cache dans le package (accès suivants
+   sans passer par ``__getattr__``)
+
+Usage:
+    __getattr__, __dir__ = lazy_exports(
+        __name__,
+        {"src.ui.settings": ("AppSettings", "load_settings")},
+    )
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+
+def _parse_exports(exports: Mapping[str, Iterable[str]]) -> dict[str, tuple[str, str]]:
+    """Aplatit ``{module: noms}`` en ``{nom_exporté: (module, nom_source)}``."""
+    table: dict[str, tuple[str, str]] = {}
+    for module_name, names in exports.items():
+        for entry in names:
+            source, _, alias = entry.partition(" as ")
+            table[(alias or source).strip()] = (module_name, source.strip())
+    return table
+
+
+def lazy_exports(
+    package: str,
+    exports: Mapping[str, Iterable[str]],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Construit ``__getattr__`` et ``__dir__`` pour un package.
+
+    Args:
+        package: ``__name__`` du package.
+        exports: Sous-module → noms exportés.
+
+    Returns:
+        Tuple (``__getattr__``, ``__dir__``) à assigner au niveau module.
+    """
+    table = _parse_exports(exports)
+
+    def __getattr__(name: str) -> Any:
+        target = table.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, source = target
+        value = getattr(importlib.import_module(module_name), source)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(table))
+
+    return __getattr__, __dir__
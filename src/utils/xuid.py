@@ -158,9 +158,9 @@ def resolve_xuid_from_db(
     # DuckDB v4 : utiliser la table xuid_aliases
     if db_path.endswith(".duckdb"):
         try:
-            import duckdb
+            from src.data.infrastructure.database.snapshots import connect_read_only
 
-            conn = duckdb.connect(db_path, read_only=True)
+            conn = connect_read_only(db_path)
             result = conn.execute(
                 "SELECT xuid FROM xuid_aliases WHERE LOWER(gamertag) = LOWER(?)",
                 [p],
@@ -19,6 +19,7 @@ from src.visualization._compat import (
     ensure_polars,
     ensure_polars_series,
 )
+from src.visualization.figure_cache import cached_figure
 from src.visualization.theme import (
     apply_halo_plot_style,
     get_legend_horizontal_bottom,  # noqa: F401 – re-export implicite
@@ -28,6 +29,7 @@ if TYPE_CHECKING:
     import pandas as pd
 
 
+@cached_figure
 def plot_kda_distribution(df: DataFrameLike) -> go.Figure:
     """Graphique de distribution du KDA (FDA) avec KDE.
 
@@ -351,6 +353,7 @@ def plot_medals_distribution(
     return apply_halo_plot_style(fig, title=title, height=height)
 
 
+@cached_figure
 def plot_correlation_scatter(
     df: DataFrameLike,
     x_col: str,
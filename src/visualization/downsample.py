@@ -0,0 +1,162 @@
+"""Réduction du nombre de points des séries temporelles (LTTB + enveloppe min/max).
+
+Une carrière de plusieurs milliers de matchs envoie sinon un point par match
+au navigateur à chaque rerun. Les graphiques concernés sélectionnent un
+sous-ensemble de lignes *réelles* : les valeurs, le hover et le customdata des
+points gardés restent exacts.
+
+HOW IT WORKS:
+1. ``lttb_indices`` : Largest-Triangle-Three-Buckets vectorisé. Le point
+   gardé dans chaque bucket maximise l'aire du triangle formé avec la moyenne
+   du bucket précédent et celle du suivant (variante sans dépendance
+   séquentielle, calculable en une passe NumPy)
+2. ``minmax_indices`` : enveloppe min/max par bucket, pour que les pics
+   (meilleur / pire match) ne disparaissent jamais
+3. ``downsample_indices`` : union LTTB + enveloppe + extrêmes globaux + bornes,
+   pour une ou plusieurs séries partageant le même axe X
+4. Sous le budget de points (ex. plage de dates resserrée par les filtres),
+   la série complète est renvoyée telle quelle
+
+Le budget par défaut est ``PLOT_CONFIG.max_points`` ; ``max_points=0``
+désactive la réduction pour un graphique.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import polars as pl
+
+from src.config import PLOT_CONFIG
+
+
+def _first_per_bucket(bucket_ids: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """Indice (dans l'ordre d'origine) du meilleur score de chaque bucket."""
+    order = np.lexsort((-score, bucket_ids))
+    sorted_ids = bucket_ids[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+    return order[first]
+
+
+def _bucket_ids(n: int, n_buckets: int, start: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Découpe [start, n - start[ en ``n_buckets`` buckets contigus non vides."""
+    edges = np.linspace(start, n - start, n_buckets + 1).astype(np.int64)
+    sizes = np.diff(edges)
+    return edges, np.repeat(np.arange(n_buckets), sizes)
+
+
+def lttb_indices(y: Sequence[float] | np.ndarray, n_out: int) -> np.ndarray:
+    """Indices gardés par LTTB (premier et dernier points inclus).
+
+    Args:
+        y: Valeurs de la série (NaN tolérés, jamais préférés).
+        n_out: Nombre de points souhaité.
+
+    Returns:
+        Indices croissants (``np.arange(n)`` si ``n_out >= n``).
+    """
+    values = np.asarray(y, dtype=np.float64)
+    n = len(values)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    n_buckets = n_out - 2
+    edges, ids = _bucket_ids(n, n_buckets, start=1)
+    x = np.arange(n, dtype=np.float64)
+
+    finite = np.isfinite(values)
+    y0 = np.where(finite, values, 0.0)
+    cs_y = np.concatenate(([0.0], np.cumsum(y0)))
+    cs_n = np.concatenate(([0], np.cumsum(finite)))
+    starts, ends = edges[:-1], edges[1:]
+    counts = cs_n[ends] - cs_n[starts]
+    mean_y = np.divide(cs_y[ends] - cs_y[starts], counts, out=np.zeros(n_buckets), where=counts > 0)
+    mean_x = (starts + ends - 1) / 2.0
+
+    # Ancre gauche : bucket précédent (premier point pour le bucket 0),
+    # ancre droite : bucket suivant (dernier point pour le dernier bucket)
+    ax = np.concatenate(([0.0], mean_x[:-1]))[ids]
+    ay = np.concatenate(([y0[0]], mean_y[:-1]))[ids]
+    cx = np.concatenate((mean_x[1:], [n - 1.0]))[ids]
+    cy = np.concatenate((mean_y[1:], [y0[-1]]))[ids]
+
+    px = x[1 : n - 1]
+    py = values[1 : n - 1]
+    area = np.abs((ax - cx) * (py - ay) - (ax - px) * (cy - ay))
+    area = np.where(np.isfinite(area), area, -1.0)
+
+    picked = _first_per_bucket(ids, area) + 1
+    return np.concatenate(([0], np.sort(picked), [n - 1]))
+
+
+def minmax_indices(y: Sequence[float] | np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices des minimum et maximum de chaque bucket (enveloppe)."""
+    values = np.asarray(y, dtype=np.float64)
+    n = len(values)
+    if n_buckets <= 0 or 2 * n_buckets >= n:
+        return np.arange(n)
+
+    _, ids = _bucket_ids(n, n_buckets)
+    finite = np.isfinite(values)
+    hi = _first_per_bucket(ids, np.where(finite, values, -np.inf))
+    lo = _first_per_bucket(ids, np.where(finite, -values, -np.inf))
+    return np.unique(np.concatenate((hi, lo)))
+
+
+def downsample_indices(
+    series: Sequence[Sequence[float] | np.ndarray],
+    max_points: int | None = None,
+    *,
+    envelope: bool = True,
+) -> np.ndarray:
+    """Indices communs à garder pour des séries partageant le même axe X.
+
+    Args:
+        series: Une ou plusieurs séries de même longueur.
+        max_points: Budget de points (None = ``PLOT_CONFIG.max_points``, 0 = tout garder).
+        envelope: Ajouter l'enveloppe min/max par bucket.
+
+    Returns:
+        Indices croissants, toujours avec premier/dernier point et extrêmes globaux.
+    """
+    if not series:
+        return np.arange(0)
+    n = len(series[0])
+    budget = PLOT_CONFIG.max_points if max_points is None else max_points
+    if budget <= 0 or n <= budget:
+        return np.arange(n)
+
+    share = max(budget // len(series), 4)
+    lttb_points = share // 2 if envelope else share
+    keep = [np.array([0, n - 1])]
+    for y in series:
+        values = np.asarray(y, dtype=np.float64)
+        keep.append(lttb_indices(values, lttb_points))
+        if envelope:
+            keep.append(minmax_indices(values, share // 4))
+        if np.isfinite(values).any():
+            keep.append(np.array([np.nanargmin(values), np.nanargmax(values)]))
+    return np.unique(np.concatenate(keep))
+
+
+def downsample_frame(
+    df: pl.DataFrame,
+    columns: Sequence[str],
+    max_points: int | None = None,
+    *,
+    envelope: bool = True,
+) -> tuple[pl.DataFrame, list[int]]:
+    """Sous-ensemble de lignes de ``df`` préservant la forme de ``columns``.
+
+    Returns:
+        (DataFrame réduit, positions d'origine des lignes gardées).
+    """
+    series = [df[c].cast(pl.Float64, strict=False).to_numpy() for c in columns if c in df.columns]
+    if not series:
+        return df, list(range(df.height))
+    idx = downsample_indices(series, max_points, envelope=envelope)
+    if len(idx) == df.height:
+        return df, list(range(df.height))
+    return df[idx], idx.tolist()
@@ -0,0 +1,202 @@
+"""Cache des figures Plotly rendues.
+
+Streamlit rerun toute la page à chaque interaction : sans cache, chaque
+graphique est reconstruit (calculs Polars, conversion Pandas, construction
+Plotly) même quand seul un widget sans rapport a changé.
+
+HOW IT WORKS:
+1. ``@cached_figure`` calcule une clé (fonction, génération de la DB joueur,
+   empreinte des DataFrames reçus, autres paramètres)
+2. L'empreinte d'un DataFrame Polars est (hauteur, schéma, hash de la
+   séquence des ``hash_rows``) : elle capture le résultat des filtres (et
+   l'ordre des lignes) sans connaître leur détail
+3. La figure est stockée sérialisée (JSON) : chaque hit renvoie une copie
+   indépendante, que l'appelant peut modifier sans polluer le cache
+4. Éviction LRU bornée en nombre d'entrées et en octets
+
+La génération (``db_cache_key`` de la DB joueur) est posée par le routeur de
+pages via ``set_figure_cache_generation`` ; les entrées d'une DB modifiée ne
+sont alors plus jamais servies et sortent par LRU.
+
+Les appels avec un DataFrame Pandas ou des paramètres non hachables ne sont
+pas mis en cache (appel direct).
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import polars as pl
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_generation: ContextVar[Any] = ContextVar("figure_cache_generation", default=None)
+
+
+class _Uncacheable(Exception):
+    """Paramètre sans empreinte stable : l'appel contourne le cache."""
+
+
+@dataclass
+class FigureCacheStats:
+    """Compteurs du cache de figures."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FigureCache:
+    """Cache LRU de figures sérialisées, borné en entrées et en octets."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._bytes = 0
+        self._stats = FigureCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return payload
+
+    def put(self, key: tuple, payload: str) -> None:
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = payload
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats.evictions += 1
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats.bypassed += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats = FigureCacheStats()
+
+    def stats(self) -> FigureCacheStats:
+        with self._lock:
+            return FigureCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                bypassed=self._stats.bypassed,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+
+_FIGURE_CACHE = FigureCache()
+
+
+def get_figure_cache() -> FigureCache:
+    """Retourne le cache de figures du processus."""
+    return _FIGURE_CACHE
+
+
+def set_figure_cache_generation(generation: Any) -> None:
+    """Déclare la génération de données courante (ex. ``db_cache_key``)."""
+    _generation.set(generation)
+
+
+def frame_fingerprint(df: pl.DataFrame) -> tuple:
+    """Empreinte de contenu d'un DataFrame Polars (hauteur, schéma, hash des lignes)."""
+    schema = tuple((name, str(dtype)) for name, dtype in df.schema.items())
+    if df.is_empty():
+        return ("df", 0, schema)
+    try:
+        digest = hash(df.hash_rows(seed=0).to_numpy().tobytes())
+    except Exception as e:  # types non hachables (objets Python, etc.)
+        raise _Uncacheable from e
+    return ("df", df.height, schema, digest)
+
+
+def _param_key(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, pl.DataFrame):
+        return frame_fingerprint(value)
+    if isinstance(value, pl.Series):
+        return ("series", value.name, *frame_fingerprint(value.to_frame())[1:])
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, *(_param_key(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", *((str(k), _param_key(v)) for k, v in sorted(value.items(), key=str)))
+    raise _Uncacheable
+
+
+def _figure_from_json(payload: str) -> Any:
+    import plotly.io as pio
+
+    return pio.from_json(payload)
+
+
+def cached_figure(func: F) -> F:
+    """Met en cache la figure retournée par ``func`` (voir module)."""
+    key_prefix = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache = _FIGURE_CACHE
+        try:
+            key = (
+                key_prefix,
+                _generation.get(),
+                _param_key(args),
+                _param_key(kwargs),
+            )
+        except _Uncacheable:
+            cache.record_bypass()
+            return func(*args, **kwargs)
+
+        payload = cache.get(key)
+        if payload is not None:
+            return _figure_from_json(payload)
+
+        fig = func(*args, **kwargs)
+        if fig is not None and hasattr(fig, "to_json"):
+            cache.put(key, fig.to_json())
+        return fig
+
+    return wrapper  # type: ignore[return-value]
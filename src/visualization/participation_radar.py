@@ -7,7 +7,9 @@ et des match_stats.
 Axes : Objectifs, Combat, Support, Score, Impact, Survie.
 
 Les seuils peuvent être dérivés du "meilleur match" global (toutes DBs joueurs)
-pour une normalisation plus réaliste.
+pour une normalisation plus réaliste. Ils sont lus dans shared_matches.duckdb
+(table radar_thresholds, voir src/data/sync/radar_thresholds.py) et, à défaut,
+recalculés en scannant les DBs joueurs.
 
 Voir : .ai/features/RADAR_PARTICIPATION_UNIFIE_PLAN.md
 """
@@ -39,6 +41,9 @@ RADAR_THRESHOLDS: dict[str, float] = {
 # Cache des seuils globaux (meilleur match ever)
 _global_thresholds_cache: dict[str, float] | None = None
 
+# Cache des seuils lus dans shared_matches.duckdb : chemin → (état fichier, seuils)
+_shared_thresholds_cache: dict[str, tuple[tuple, dict[str, float]]] = {}
+
 
 def compute_global_radar_thresholds(
     players_base_path: str | Path | None = None,
@@ -60,7 +65,7 @@ def compute_global_radar_thresholds(
     if _global_thresholds_cache is not None:
         return _global_thresholds_cache.copy()
 
-    import duckdb
+    from src.data.infrastructure.database.snapshots import connect_read_only
 
     if players_base_path is None:
         from src.config import get_repo_root
@@ -83,7 +88,7 @@ def compute_global_radar_thresholds(
             continue
 
         try:
-            conn = duckdb.connect(str(db_path), read_only=True)
+            conn = connect_read_only(str(db_path))
 
             # Exclure Firefight et BTB (scores disproportionnés) pour une référence Arena/Slayer
             exclude_filter = """
@@ -157,45 +162,109 @@ def compute_global_radar_thresholds(
     if not seen_any:
         return RADAR_THRESHOLDS.copy()
 
-    # Objectifs = max(objective, kill) car selon le mode
-    objectifs = max(max_obj, max_kill)
+    result = _thresholds_from_maxima(
+        {
+            "objectifs": max(max_obj, max_kill),
+            "combat": max_kill,
+            "support": max_assist,
+            "score": max_score,
+            "impact_pts_per_min": max_impact,
+        }
+    )
+    _global_thresholds_cache = result
+    return result.copy()
+
+
+def _thresholds_from_maxima(maxima: dict[str, float]) -> dict[str, float]:
+    """Seuils = max Arena/Slayer × 0.85 (évite radar vide, garde de la marge).
+
+    ``maxima["objectifs"]`` vaut déjà max(objective, kill) car selon le mode.
+    """
+    objectifs = maxima.get("objectifs", 0.0)
     if objectifs <= 0:
         objectifs = RADAR_THRESHOLDS["objectifs"]
-    combat = max(max_kill, 1.0)
-    support = max(max_assist, 1.0)
-    score = max(max_score, 1.0)
-    impact = max(max_impact, 1.0)
-
-    # Seuils = max Arena/Slayer × 0.85 (évite radar vide, garde de la marge)
     factor = 0.85
-    result = {
+    return {
         "objectifs": objectifs * factor,
-        "combat": combat * factor,
-        "support": support * factor,
-        "score": score * factor,
-        "impact_pts_per_min": impact * factor,
+        "combat": max(maxima.get("combat", 0.0), 1.0) * factor,
+        "support": max(maxima.get("support", 0.0), 1.0) * factor,
+        "score": max(maxima.get("score", 0.0), 1.0) * factor,
+        "impact_pts_per_min": max(maxima.get("impact_pts_per_min", 0.0), 1.0) * factor,
         "survie_deaths_per_min_ref": RADAR_THRESHOLDS["survie_deaths_per_min_ref"],
         "survie_avg_life_ref_seconds": RADAR_THRESHOLDS.get("survie_avg_life_ref_seconds", 90.0),
     }
-    _global_thresholds_cache = result
+
+
+def _file_state(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load_shared_radar_thresholds(shared_db_path: str | Path) -> dict[str, float] | None:
+    """Seuils précalculés dans shared_matches.duckdb (table radar_thresholds).
+
+    Lecture O(1) : 5 lignes, quel que soit le nombre de joueurs suivis.
+    Le résultat est mis en cache tant que le fichier (et son WAL) ne change pas.
+
+    Returns:
+        Dict de seuils, ou None si la table est absente/vide ou illisible.
+    """
+    path = Path(shared_db_path)
+    state = (
+        str(path),
+        _file_state(path),
+        _file_state(path.with_name(path.name + ".wal")),
+    )
+    if state[1] is None:
+        return None
+    cached = _shared_thresholds_cache.get(state[0])
+    if cached is not None and cached[0] == state:
+        return cached[1].copy()
+
+    try:
+        from src.data.sync.radar_thresholds import read_radar_maxima
+
+        maxima = read_radar_maxima(path)
+    except Exception:
+        # DB verrouillée en écriture par un autre processus, schéma ancien, etc.
+        return None
+    if maxima is None:
+        return None
+
+    result = _thresholds_from_maxima(maxima)
+    _shared_thresholds_cache[state[0]] = (state, result)
     return result.copy()
 
 
 def get_radar_thresholds(db_path: str | Path | None = None) -> dict[str, float]:
     """Retourne les seuils à utiliser pour le radar.
 
-    Utilise les seuils globaux (meilleur match) si disponibles,
-    sinon RADAR_THRESHOLDS.
+    Utilise en priorité les seuils précalculés dans shared_matches.duckdb
+    (table radar_thresholds, maintenue après chaque sync), puis le scan des
+    DBs joueurs (meilleur match), sinon RADAR_THRESHOLDS.
 
     Args:
         db_path: Chemin vers une DB joueur (ex. data/players/X/stats.duckdb).
-                 Utilisé pour déduire data/players.
+                 Utilisé pour déduire data/players et data/warehouse.
     """
     players_path = None
     if db_path:
         p = Path(db_path)
         if p.name == "stats.duckdb" and p.parent.name:
             players_path = p.parent.parent
+
+    if players_path is not None:
+        warehouse = players_path.parent / "warehouse"
+    else:
+        from src.config import get_repo_root
+
+        warehouse = Path(get_repo_root()) / "data" / "warehouse"
+    shared = load_shared_radar_thresholds(warehouse / "shared_matches.duckdb")
+    if shared is not None:
+        return shared
     return compute_global_radar_thresholds(players_path)
 
 
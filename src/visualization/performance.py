@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from src.config import HALO_COLORS, THEME_COLORS
+from src.visualization.downsample import downsample_frame
 from src.visualization.theme import apply_halo_plot_style
 
 # Import conditionnel de Polars
@@ -232,6 +233,7 @@ def plot_cumulative_kd(
     show_target: float | None = 1.0,
     time_played_seconds: list[int | float] | None = None,
     duration_marker_minutes: float = 8.0,
+    max_points: int | None = None,
 ) -> go.Figure:
     """Crée un graphique du K/D cumulé au fil des matchs.
 
@@ -242,6 +244,8 @@ def plot_cumulative_kd(
         show_target: Afficher une ligne cible (ex: 1.0 pour K/D équilibré).
         time_played_seconds: Durée de chaque match (secondes) pour marqueurs de durée.
         duration_marker_minutes: Intervalle en minutes entre les marqueurs de durée.
+        max_points: Budget de matchs tracés (None = ``PLOT_CONFIG.max_points``,
+            0 = tous). Les marqueurs de durée restent calculés sur tous les matchs.
 
     Returns:
         Figure Plotly avec le graphique.
@@ -260,7 +264,9 @@ def plot_cumulative_kd(
         )
         return apply_halo_plot_style(fig, title=title, height=height)
 
-    data = cumulative_df.to_dicts()
+    all_x = cumulative_df["start_time"].to_list() if "start_time" in cumulative_df.columns else []
+    sampled, _ = downsample_frame(cumulative_df, ["cumulative_kd", "kd"], max_points)
+    data = sampled.to_dicts()
 
     x_values = [d.get("start_time", "") for d in data]
     y_cumulative = [d.get("cumulative_kd", 0) for d in data]
@@ -316,7 +322,7 @@ def plot_cumulative_kd(
     )
 
     # Marqueurs de durée cumulée (Sprint 6 - 6.4)
-    _add_duration_markers(fig, x_values, time_played_seconds, duration_marker_minutes)
+    _add_duration_markers(fig, all_x, time_played_seconds, duration_marker_minutes)
 
     return apply_halo_plot_style(fig, title=title, height=height)
 
@@ -327,6 +333,7 @@ def plot_rolling_kd(
     window_size: int = 5,
     title: str | None = None,
     height: int = 400,
+    max_points: int | None = None,
 ) -> go.Figure:
     """Crée un graphique du K/D glissant.
 
@@ -335,6 +342,7 @@ def plot_rolling_kd(
         window_size: Taille de la fenêtre (pour le titre).
         title: Titre personnalisé (par défaut: "K/D Glissant (5 matchs)").
         height: Hauteur en pixels.
+        max_points: Budget de matchs tracés (None = ``PLOT_CONFIG.max_points``, 0 = tous).
 
     Returns:
         Figure Plotly avec le graphique.
@@ -356,7 +364,8 @@ def plot_rolling_kd(
         )
         return apply_halo_plot_style(fig, title=title, height=height)
 
-    data = rolling_df.to_dicts()
+    sampled, _ = downsample_frame(rolling_df, ["rolling_kd", "kd"], max_points)
+    data = sampled.to_dicts()
 
     x_values = [d.get("start_time", "") for d in data]
     y_rolling = [d.get("rolling_kd", 0) for d in data]
@@ -14,6 +14,8 @@ from src.visualization._compat import (
     ensure_polars_series,
     smart_scatter,
 )
+from src.visualization.downsample import downsample_frame
+from src.visualization.figure_cache import cached_figure
 from src.visualization.theme import apply_halo_plot_style, get_legend_horizontal_bottom
 
 
@@ -118,8 +120,18 @@ def _add_kda_traces(
     )
 
 
-def plot_timeseries(df: DataFrameLike, title: str = "Frags / Morts / Ratio") -> go.Figure:
-    """Graphique principal: Kills/Deaths/Ratio dans le temps."""
+@cached_figure
+def plot_timeseries(
+    df: DataFrameLike,
+    title: str = "Frags / Morts / Ratio",
+    *,
+    max_points: int | None = None,
+) -> go.Figure:
+    """Graphique principal: Kills/Deaths/Ratio dans le temps.
+
+    Au-delà de ``max_points`` matchs (défaut ``PLOT_CONFIG.max_points``),
+    seuls les matchs retenus par LTTB + enveloppe min/max sont tracés.
+    """
     df_pl = pl.DataFrame() if df is None else ensure_polars(df)
 
     if df_pl.is_empty():
@@ -137,8 +149,7 @@ def plot_timeseries(df: DataFrameLike, title: str = "Frags / Morts / Ratio") ->
 
     fig = make_subplots(rows=1, cols=1, specs=[[{"secondary_y": True}]])
     colors = HALO_COLORS.as_dict()
-    d = df_pl.sort("start_time")
-    x_idx = list(range(len(d)))
+    d, x_idx = downsample_frame(df_pl.sort("start_time"), ["ratio", "kills", "deaths"], max_points)
 
     customdata, common_hover = _build_kda_customdata(d)
     _add_kda_traces(fig, x_idx, d, customdata, common_hover, colors)
@@ -268,21 +279,29 @@ def _add_permin_rolling_lines(
     dpm: pl.Series,
     apm: pl.Series,
     colors: dict[str, str],
+    keep: list[int] | None = None,
 ) -> None:
     """Ajoute les 3 courbes de moyenne mobile par minute (frags, morts, assistances).
 
     Args:
         fig: Figure Plotly à enrichir.
-        x_idx: Index des matchs.
-        kpm: Série kills per minute.
-        dpm: Série deaths per minute.
-        apm: Série assists per minute.
+        x_idx: Index des matchs tracés.
+        kpm: Série kills per minute (complète).
+        dpm: Série deaths per minute (complète).
+        apm: Série assists per minute (complète).
         colors: Dict de couleurs HALO.
+        keep: Positions des matchs tracés (None = tous). Les moyennes sont
+            calculées sur la série complète puis échantillonnées.
     """
+
+    def _smooth(series: pl.Series) -> list:
+        rolled = _rolling_mean(series, window=10)
+        return (rolled if keep is None else rolled.gather(keep)).to_list()
+
     fig.add_trace(
         smart_scatter(
             x=x_idx,
-            y=_rolling_mean(kpm, window=10).to_list(),
+            y=_smooth(kpm),
             mode="lines",
             name="Moy. frags/min",
             line={"width": PLOT_CONFIG.line_width, "color": colors["cyan"]},
@@ -292,7 +311,7 @@ def _add_permin_rolling_lines(
     fig.add_trace(
         smart_scatter(
             x=x_idx,
-            y=_rolling_mean(dpm, window=10).to_list(),
+            y=_smooth(dpm),
             mode="lines",
             name="Moy. morts/min",
             line={"width": PLOT_CONFIG.line_width, "color": colors["red"], "dash": "dot"},
@@ -302,7 +321,7 @@ def _add_permin_rolling_lines(
     fig.add_trace(
         smart_scatter(
             x=x_idx,
-            y=_rolling_mean(apm, window=10).to_list(),
+            y=_smooth(apm),
             mode="lines",
             name="Moy. assist./min",
             line={"width": PLOT_CONFIG.line_width, "color": colors["violet"], "dash": "dot"},
@@ -311,14 +330,20 @@ def _add_permin_rolling_lines(
     )
 
 
+@cached_figure
 def plot_per_minute_timeseries(
-    df: DataFrameLike, title: str = "Frags / Morts / Assistances par minute"
+    df: DataFrameLike,
+    title: str = "Frags / Morts / Assistances par minute",
+    *,
+    max_points: int | None = None,
 ) -> go.Figure:
     """Graphique des stats par minute.
 
     Args:
         df: DataFrame avec colonnes kills_per_min, deaths_per_min, assists_per_min.
         title: Titre du graphique.
+        max_points: Budget de matchs tracés (None = ``PLOT_CONFIG.max_points``,
+            0 = tous).
 
     Returns:
         Figure Plotly.
@@ -326,8 +351,13 @@ def plot_per_minute_timeseries(
     df_pl = ensure_polars(df)
 
     colors = HALO_COLORS.as_dict()
-    d = df_pl.sort("start_time")
-    x_idx = list(range(len(d)))
+    full = df_pl.sort("start_time")
+    kpm_full = full["kills_per_min"].cast(pl.Float64, strict=False)
+    dpm_full = full["deaths_per_min"].cast(pl.Float64, strict=False)
+    apm_full = full["assists_per_min"].cast(pl.Float64, strict=False)
+    d, x_idx = downsample_frame(
+        full, ["kills_per_min", "deaths_per_min", "assists_per_min"], max_points
+    )
     labels = d["start_time"].dt.strftime("%m-%d %H:%M").to_list()
     step = max(1, len(labels) // 10) if len(labels) > 1 else 1
 
@@ -343,9 +373,9 @@ def plot_per_minute_timeseries(
         )
     )
 
-    kpm = d["kills_per_min"].cast(pl.Float64, strict=False)
-    dpm = d["deaths_per_min"].cast(pl.Float64, strict=False)
-    apm = d["assists_per_min"].cast(pl.Float64, strict=False)
+    kpm = kpm_full.gather(x_idx)
+    dpm = dpm_full.gather(x_idx)
+    apm = apm_full.gather(x_idx)
 
     fig = go.Figure()
     fig.add_trace(
@@ -391,7 +421,7 @@ def plot_per_minute_timeseries(
         )
     )
 
-    _add_permin_rolling_lines(fig, x_idx, kpm, dpm, apm, colors)
+    _add_permin_rolling_lines(fig, x_idx, kpm_full, dpm_full, apm_full, colors, keep=x_idx)
 
     fig.update_layout(
         title=title,
@@ -36,6 +36,7 @@ from src.app.filters import (
 from src.app.filters_render import (
     apply_filters,
     render_filters_sidebar,
+    resolve_filter_cube,
 )
 
 # Phase 1 refactoring: Import des nouveaux modules app
@@ -77,6 +78,8 @@ from src.app.page_router import (
     consume_pending_match_id,
     consume_pending_page,
     dispatch_page,
+    lazy_page_renderer,
+    load_page_renderer,
     render_page_selector,
 )
 
@@ -119,20 +122,6 @@ from src.ui.multiplayer import (
     get_gamertag_from_duckdb_v4_path,
     render_player_selector_unified,
 )
-from src.ui.pages import (
-    render_career_page,
-    render_citations_page,
-    render_last_match_page,
-    render_match_history_page,
-    render_match_search_page,
-    render_match_view,
-    render_media_tab,
-    render_session_comparison_page,
-    render_settings_page,
-    render_teammates_page,
-    render_timeseries_page,
-    render_win_loss_page,
-)
 from src.ui.perf import perf_reset_run, perf_section
 from src.ui.sync import (
     cleanup_orphan_tmp_dbs,
@@ -140,9 +129,6 @@ from src.ui.sync import (
     render_sync_indicator,
     sync_all_players,
 )
-from src.visualization import (
-    plot_multi_metric_bars_by_match,
-)
 
 # =============================================================================
 # Aliases vers les fonctions extraites (Phase 2)
@@ -535,7 +521,7 @@ def main() -> None:
             key="page",
             label_visibility="collapsed",
         )
-        render_settings_page(
+        load_page_renderer("render_settings_page")(
             settings,
             get_local_dbs_fn=cached_list_local_dbs,
             on_clear_caches_fn=_clear_app_caches,
@@ -586,7 +572,16 @@ def main() -> None:
     # KPIs
     # ==========================================================================
 
-    render_kpis_section(dff)
+    filter_cube = resolve_filter_cube(
+        filter_state,
+        db_path,
+        xuid,
+        db_key=db_key,
+        clean_asset_label_fn=_clean_asset_label,
+        normalize_mode_label_fn=_normalize_mode_label,
+        normalize_map_label_fn=_normalize_map_label,
+    )
+    render_kpis_section(dff, filter_cube=filter_cube)
     render_performance_info()
 
     # ==========================================================================
@@ -605,7 +600,7 @@ def main() -> None:
         db_key=db_key,
         settings=settings,
         df_full=df,
-        render_match_view_fn=render_match_view,
+        render_match_view_fn=lazy_page_renderer("render_match_view"),
         normalize_mode_label_fn=_normalize_mode_label,
         format_score_label_fn=format_score_label,
         score_css_color_fn=score_css_color,
@@ -634,26 +629,14 @@ def main() -> None:
         waypoint_player=waypoint_player,
         gap_minutes=gap_minutes,
         match_view_params=_match_view_params,
-        # Fonctions de rendu
-        render_last_match_page_fn=render_last_match_page,
-        render_match_search_page_fn=render_match_search_page,
-        render_citations_page_fn=render_citations_page,
-        render_session_comparison_page_fn=render_session_comparison_page,
-        render_timeseries_page_fn=render_timeseries_page,
-        render_win_loss_page_fn=render_win_loss_page,
-        render_teammates_page_fn=render_teammates_page,
-        render_match_history_page_fn=render_match_history_page,
-        render_media_tab_fn=render_media_tab,
-        render_career_page_fn=render_career_page,
-        render_settings_page_fn=render_settings_page,
-        # Fonctions utilitaires
+        # Fonctions utilitaires (les pages sont importées par dispatch_page)
         cached_compute_sessions_db_fn=cached_compute_sessions_db,
         top_medals_fn=_top_medals,
         build_friends_opts_map_fn=_build_friends_opts_map,
         assign_player_colors_fn=_assign_player_colors,
-        plot_multi_metric_bars_fn=plot_multi_metric_bars_by_match,
         get_local_dbs_fn=cached_list_local_dbs,
         clear_caches_fn=_clear_app_caches,
+        filter_cube=filter_cube,
     )
 
 
@@ -63,17 +63,27 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=False,
         help="Exécute les tests E2E navigateur réel (Playwright).",
     )
+    parser.addoption(
+        "--run-perf-budget",
+        action="store_true",
+        default=False,
+        help="Exécute les budgets de temps (mesures wall-clock, sensibles à la machine).",
+    )
 
 
 def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
-    """Skip des tests E2E navigateur sauf si explicitement demandés."""
-    if config.getoption("--run-e2e-browser"):
-        return
-
-    skip_e2e = pytest.mark.skip(reason="E2E navigateur désactivé (utiliser --run-e2e-browser)")
-    for item in items:
-        if "e2e_browser" in item.keywords:
-            item.add_marker(skip_e2e)
+    """Skip des tests E2E navigateur et des budgets de temps sauf si explicitement demandés."""
+    optional = [
+        ("e2e_browser", "--run-e2e-browser", "E2E navigateur désactivé"),
+        ("perf_budget", "--run-perf-budget", "Budget de temps désactivé"),
+    ]
+    for marker, option, reason in optional:
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f"{reason} (utiliser {option})")
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip)
 
 
 def pytest_configure(config: pytest.Config) -> None:
@@ -0,0 +1,184 @@
+"""Tests pour scripts/backfill/bulk_updates.py — UPDATE groupés du backfill.
+
+Couvre : BulkUpdateBatch (participants, accuracy/shots, enemy_mmr, bitmask)
+         comparé au chemin ligne à ligne de orchestrator.py.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import duckdb
+import pytest
+
+from scripts.backfill.bulk_updates import PARTICIPANT_DETAIL_COLUMNS, BulkUpdateBatch
+from scripts.backfill.orchestrator import _update_participants_details
+from scripts.benchmark.synthetic import create_shared_schema
+from scripts.benchmark_match_decoder import synthetic_match
+from src.data.sync.batch_insert import PARTICIPANT_COLUMNS, batch_insert_rows
+from src.data.sync.transformers import extract_participants
+
+_DETAILS = ", ".join(c for cols in PARTICIPANT_DETAIL_COLUMNS.values() for c in cols)
+
+
+@dataclass
+class FakeMatchRow:
+    accuracy: float | None = None
+    shots_fired: int | None = None
+    shots_hit: int | None = None
+
+
+@dataclass
+class FakeSkillRow:
+    match_id: str
+    enemy_mmr: float | None
+    team_id: int = 0
+    team_mmr: float | None = None
+    kills_expected: float | None = None
+    kills_stddev: float | None = None
+    deaths_expected: float | None = None
+    deaths_stddev: float | None = None
+    assists_expected: float | None = None
+    assists_stddev: float | None = None
+
+
+def _matches() -> list[dict]:
+    matches = []
+    for i in range(5):
+        match = synthetic_match(4, seed_xuid=2535400000000000 + 10 * i)
+        match["MatchId"] = f"m{i}"
+        matches.append(match)
+    # Pas de shots renvoyés pour un joueur : ses valeurs existantes sont conservées
+    del matches[0]["Players"][0]["PlayerTeamStats"][0]["Stats"]["CoreStats"]["ShotsFired"]
+    del matches[0]["Players"][0]["PlayerTeamStats"][0]["Stats"]["CoreStats"]["ShotsHit"]
+    return matches
+
+
+@pytest.fixture()
+def shared_conns():
+    conns = []
+    for _ in range(2):
+        c = duckdb.connect(":memory:")
+        create_shared_schema(c)
+        rows = [row for match in _matches() for row in extract_participants(match)]
+        batch_insert_rows(c, "match_participants", rows, PARTICIPANT_COLUMNS)
+        c.execute("UPDATE match_participants SET score = NULL, shots_fired = -1, shots_hit = -1")
+        conns.append(c)
+    yield conns
+    for c in conns:
+        c.close()
+
+
+@pytest.fixture()
+def conn():
+    c = duckdb.connect(":memory:")
+    c.execute("""
+        CREATE TABLE match_stats (
+            match_id VARCHAR PRIMARY KEY,
+            accuracy FLOAT,
+            shots_fired INTEGER,
+            shots_hit INTEGER,
+            backfill_completed INTEGER
+        )
+    """)
+    c.execute("""
+        CREATE TABLE player_match_stats (
+            match_id VARCHAR NOT NULL,
+            xuid VARCHAR NOT NULL,
+            team_id INTEGER,
+            team_mmr FLOAT,
+            enemy_mmr FLOAT,
+            kills_expected FLOAT,
+            kills_stddev FLOAT,
+            deaths_expected FLOAT,
+            deaths_stddev FLOAT,
+            assists_expected FLOAT,
+            assists_stddev FLOAT,
+            PRIMARY KEY (match_id, xuid)
+        )
+    """)
+    yield c
+    c.close()
+
+
+class TestParticipants:
+    """Le lot Arrow produit la même table que le chemin ligne à ligne."""
+
+    def test_same_result_as_row_wise(self, shared_conns):
+        row_conn, bulk_conn = shared_conns
+        batch = BulkUpdateBatch(participant_groups=tuple(PARTICIPANT_DETAIL_COLUMNS), chunk_size=2)
+        row_counts = [0] * 5
+        bulk_counts = [0] * 5
+        flushed = 0
+        for match in _matches():
+            counts = _update_participants_details(
+                row_conn,
+                match,
+                participants_scores=True,
+                participants_kda=True,
+                participants_shots=True,
+                participants_damage=True,
+                participants_avg_life=True,
+            )
+            row_counts = [a + b for a, b in zip(row_counts, counts, strict=True)]
+            counts = batch.add_participants(extract_participants(match))
+            bulk_counts = [a + b for a, b in zip(bulk_counts, counts, strict=True)]
+            if batch.full:
+                flushed += batch.flush(bulk_conn)["participants"]
+        flushed += batch.flush(bulk_conn)["participants"]
+
+        sql = f"SELECT match_id, xuid, {_DETAILS} FROM match_participants ORDER BY 1, 2"
+        assert bulk_conn.execute(sql).fetchall() == row_conn.execute(sql).fetchall()
+        assert bulk_counts == row_counts == [20, 20, 19, 20, 20]
+        assert flushed == 20
+        assert batch.report.chunks == 3 and batch.report.matches == 5
+        kept = bulk_conn.execute(
+            "SELECT shots_fired, shots_hit FROM match_participants WHERE match_id = 'm0' "
+            "AND xuid = '2535400000000000'"
+        ).fetchone()
+        assert kept == (-1, -1)
+
+
+class TestPlayerUpdates:
+    """accuracy / shots / enemy_mmr : mêmes règles (NULL seulement sans force) et bitmask."""
+
+    def test_fill_nulls_and_mark_completed(self, conn):
+        conn.execute(
+            "INSERT INTO match_stats VALUES ('m1', NULL, NULL, NULL, 1), ('m2', 0.3, 10, 5, NULL)"
+        )
+        conn.execute(
+            "INSERT INTO player_match_stats (match_id, xuid, enemy_mmr) VALUES ('m1', 'x', NULL)"
+        )
+        batch = BulkUpdateBatch()
+        for match_id in ("m1", "m2"):
+            batch.add_match_stats(FakeMatchRow(0.5, 200, 100), match_id, accuracy=True, shots=True)
+            batch.add_enemy_mmr(FakeSkillRow(match_id, 1450.0), "x")
+            batch.mark_completed(match_id, 6)
+
+        result = batch.flush(conn)
+
+        assert result == {
+            "participants": 0,
+            "accuracy": 1,
+            "shots": 1,
+            "enemy_mmr": 2,
+            "completed": 2,
+        }
+        assert conn.execute("SELECT * FROM match_stats ORDER BY 1").fetchall() == [
+            ("m1", pytest.approx(0.5), 200, 100, 7),
+            ("m2", pytest.approx(0.3), 10, 5, 6),
+        ]
+        assert conn.execute(
+            "SELECT match_id, enemy_mmr FROM player_match_stats ORDER BY 1"
+        ).fetchall() == [("m1", 1450.0), ("m2", 1450.0)]
+        assert batch.pending_matches == 0
+
+    def test_force_overwrites(self, conn):
+        conn.execute("INSERT INTO match_stats VALUES ('m1', 0.3, 10, 5, NULL)")
+        batch = BulkUpdateBatch(force_accuracy=True)
+        batch.add_match_stats(FakeMatchRow(0.5, 200, 100), "m1", accuracy=True, shots=True)
+        assert batch.flush(conn)["accuracy"] == 1
+        assert conn.execute("SELECT accuracy, shots_fired FROM match_stats").fetchone() == (
+            pytest.approx(0.5),
+            10,
+        )
@@ -0,0 +1,193 @@
+"""
+Tests des backups incrémentaux (empreintes, deltas, restauration, vérification).
+(Tests for incremental content-hashed backups)
+"""
+
+from __future__ import annotations
+
+import duckdb
+import pytest
+
+from src.data.infrastructure.database.backup import (
+    BackupManifest,
+    backup_database,
+    restore_table,
+    table_fingerprint,
+    verify_backup,
+)
+
+
+@pytest.fixture
+def player_db(tmp_path):
+    db_path = tmp_path / "stats.duckdb"
+    conn = duckdb.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE match_stats (match_id VARCHAR PRIMARY KEY, kills INTEGER, mmr HUGEINT)"
+    )
+    conn.execute(
+        "CREATE TABLE medals_earned (match_id VARCHAR, medal_name_id BIGINT, count SMALLINT, "
+        "PRIMARY KEY (match_id, medal_name_id))"
+    )
+    conn.execute("CREATE TABLE sync_meta (key VARCHAR, value VARCHAR)")
+    conn.execute("INSERT INTO match_stats SELECT 'm' || i, i, i * 10 FROM range(100) t(i)")
+    conn.execute("INSERT INTO medals_earned SELECT 'm' || (i // 3), i % 3, 1 FROM range(300) t(i)")
+    conn.execute("INSERT INTO sync_meta VALUES ('last_sync', '2026-01-01')")
+    conn.close()
+    return db_path
+
+
+def _execute(db_path, *statements):
+    conn = duckdb.connect(str(db_path))
+    for sql in statements:
+        conn.execute(sql)
+    conn.close()
+
+
+def _restore_all(backup_dir):
+    manifest = BackupManifest.load(backup_dir)
+    conn = duckdb.connect(":memory:")
+    for table in manifest.latest.tables:
+        restore_table(conn, table, backup_dir, manifest.table_chain(table))
+    return conn
+
+
+class TestIncrementalBackup:
+    """Détection des changements et chaîne base + deltas."""
+
+    def test_first_backup_is_full(self, player_db, tmp_path):
+        entry = backup_database(player_db, tmp_path / "bk")
+        assert entry.kind == "full"
+        assert entry.parent is None
+        assert entry.tables["match_stats"].key_columns == ["match_id"]
+        assert entry.tables["sync_meta"].key_columns == []
+
+    def test_unchanged_tables_write_nothing(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        files_before = set(backup_dir.iterdir())
+
+        entry = backup_database(player_db, backup_dir)
+
+        assert entry.kind == "unchanged"
+        new_files = {p.name for p in set(backup_dir.iterdir()) - files_before}
+        assert new_files == set()
+
+    def test_delta_exports_only_touched_keys(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        first = backup_database(player_db, backup_dir)
+        _execute(
+            player_db,
+            "INSERT INTO match_stats VALUES ('m100', 1, 1), ('m101', 2, 2)",
+            "UPDATE match_stats SET kills = 99 WHERE match_id = 'm5'",
+            "DELETE FROM match_stats WHERE match_id = 'm7'",
+        )
+
+        entry = backup_database(player_db, backup_dir)
+
+        state = entry.tables["match_stats"]
+        assert entry.parent == first.id
+        assert state.mode == "delta"
+        assert state.rows == 3  # m100, m101, m5 (m7 n'est que dans les clés touchées)
+        assert entry.tables["medals_earned"].mode == "unchanged"
+
+    def test_restore_replays_chain(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        _execute(player_db, "UPDATE match_stats SET kills = -1 WHERE match_id = 'm1'")
+        backup_database(player_db, backup_dir)
+        _execute(
+            player_db,
+            "DELETE FROM medals_earned WHERE match_id = 'm2'",
+            "INSERT INTO match_stats VALUES ('m200', 5, NULL)",
+        )
+        backup_database(player_db, backup_dir)
+
+        restored = _restore_all(backup_dir)
+        source = duckdb.connect(str(player_db), read_only=True)
+        for table in ("match_stats", "medals_earned", "sync_meta"):
+            assert table_fingerprint(restored, table) == table_fingerprint(source, table)
+        assert restored.execute("DESCRIBE match_stats").fetchall()[2][1] == "HUGEINT"
+        source.close()
+        restored.close()
+
+    def test_restore_keeps_original_constraints(self, player_db, tmp_path):
+        _execute(
+            player_db,
+            "CREATE TABLE players (xuid VARCHAR PRIMARY KEY, gamertag VARCHAR NOT NULL, "
+            "rank INTEGER DEFAULT 1 CHECK (rank > 0))",
+            "INSERT INTO players VALUES ('x1', 'Alpha', 3)",
+        )
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        _execute(player_db, "INSERT INTO players VALUES ('x2', 'Bravo', 2)")
+        backup_database(player_db, backup_dir)
+
+        manifest = BackupManifest.load(backup_dir)
+        conn = duckdb.connect(":memory:")
+        for table in ("players", "match_stats"):
+            restore_table(
+                conn, table, backup_dir, manifest.table_chain(table), target_table=f"_r_{table}"
+            )
+            conn.execute(f'ALTER TABLE "_r_{table}" RENAME TO "{table}"')
+
+        assert conn.execute("SELECT COUNT(*) FROM players").fetchone()[0] == 2
+        with pytest.raises(duckdb.ConstraintException):
+            conn.execute("INSERT INTO players VALUES ('x1', 'Dup', 1)")
+        with pytest.raises(duckdb.ConstraintException):
+            conn.execute("INSERT INTO players VALUES ('x3', NULL, 1)")
+        with pytest.raises(duckdb.ConstraintException):
+            conn.execute("INSERT INTO players VALUES ('x4', 'Zero', 0)")
+        conn.execute("INSERT INTO players (xuid, gamertag) VALUES ('x5', 'Echo')")
+        assert conn.execute("SELECT rank FROM players WHERE xuid = 'x5'").fetchone()[0] == 1
+        with pytest.raises(duckdb.ConstraintException):
+            conn.execute("INSERT INTO match_stats VALUES ('m1', 0, 0)")
+        conn.close()
+
+    def test_unkeyed_table_change_is_full_export(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        _execute(player_db, "UPDATE sync_meta SET value = '2026-02-01'")
+
+        entry = backup_database(player_db, backup_dir)
+
+        assert entry.tables["sync_meta"].mode == "full"
+        assert entry.tables["match_stats"].mode == "unchanged"
+
+    def test_schema_change_forces_full(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        _execute(player_db, "ALTER TABLE match_stats ADD COLUMN deaths INTEGER")
+
+        entry = backup_database(player_db, backup_dir)
+        assert entry.tables["match_stats"].mode == "full"
+
+    def test_full_flag(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        assert backup_database(player_db, backup_dir, full=True).kind == "full"
+
+
+class TestVerify:
+    """Mode de vérification."""
+
+    def test_verify_ok(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        backup_database(player_db, backup_dir)
+        _execute(player_db, "UPDATE match_stats SET kills = 0 WHERE match_id = 'm3'")
+        backup_database(player_db, backup_dir)
+        assert verify_backup(backup_dir) == []
+
+    def test_verify_detects_corruption(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        entry = backup_database(player_db, backup_dir)
+        data_file = backup_dir / entry.tables["match_stats"].file
+        data_file.write_bytes(data_file.read_bytes()[:-10] + b"0" * 10)
+
+        errors = verify_backup(backup_dir)
+        assert any("checksum" in e for e in errors)
+
+    def test_verify_detects_missing_file(self, player_db, tmp_path):
+        backup_dir = tmp_path / "bk"
+        entry = backup_database(player_db, backup_dir)
+        (backup_dir / entry.tables["sync_meta"].file).unlink()
+        assert any("manquant" in e for e in verify_backup(backup_dir))
@@ -0,0 +1,91 @@
+"""
+Tests du générateur synthétique et du gating de la suite de benchmarks.
+(Tests for the synthetic data generator and benchmark regression gating)
+"""
+
+from __future__ import annotations
+
+import duckdb
+import pytest
+
+from scripts.benchmark import harness
+from scripts.benchmark.synthetic import SyntheticSpec, generate_dataset, load_dataset
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    root = tmp_path_factory.mktemp("synthetic")
+    return generate_dataset(root, SyntheticSpec(matches=60, players=2, overlap=0.5, seed=7))
+
+
+class TestSyntheticDataset:
+    """Volumétrie, chevauchement entre joueurs suivis et réutilisation."""
+
+    def test_counts_and_overlap(self, dataset):
+        conn = duckdb.connect(str(dataset.shared_db_path), read_only=True)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM match_registry").fetchone()[0] == 60
+            assert conn.execute("SELECT COUNT(*) FROM match_participants").fetchone()[0] == 480
+            assert conn.execute("SELECT COUNT(*) FROM highlight_events").fetchone()[0] == 60 * 24
+        finally:
+            conn.close()
+
+        a, b = dataset.players
+        assert a.matches + b.matches > 60  # matchs partagés comptés des deux côtés
+        for player in dataset.players:
+            conn = duckdb.connect(str(player.db_path), read_only=True)
+            try:
+                assert (
+                    conn.execute("SELECT COUNT(*) FROM match_stats").fetchone()[0] == player.matches
+                )
+                assert conn.execute("SELECT COUNT(*) FROM personal_score_awards").fetchone()[0] > 0
+            finally:
+                conn.close()
+
+        reloaded = generate_dataset(dataset.root, dataset.spec)
+        assert reloaded.to_dict() == dataset.to_dict() == load_dataset(dataset.root).to_dict()
+
+
+class TestHarness:
+    """Exécution des benchmarks sur le dataset synthétique."""
+
+    def test_run_selected_benchmarks(self, dataset):
+        report = harness.run_benchmarks(
+            dataset, runs=2, only=["repo_load_matches_cold", "antagonists_summary", "mv_refresh"]
+        )
+
+        assert report["spec"]["matches"] == 60
+        by_name = {b["name"]: b for b in report["benchmarks"]}
+        assert set(by_name) == {"repo_load_matches_cold", "antagonists_summary", "mv_refresh"}
+        for bench in by_name.values():
+            assert bench["success"], bench["error"]
+            assert len(bench["times_ms"]) == 2
+        top = max(dataset.players, key=lambda p: p.matches)
+        assert by_name["repo_load_matches_cold"]["rows_returned"] == top.matches
+
+
+class TestFindRegressions:
+    """Seuil relatif, seuil absolu, échecs et spécifications incompatibles."""
+
+    @staticmethod
+    def _report(spec, **p50):
+        return {
+            "spec": spec,
+            "benchmarks": [
+                {"name": n, "p50_ms": v, "success": v is not None, "error": None}
+                for n, v in p50.items()
+            ],
+        }
+
+    def test_gating(self):
+        spec = {"matches": 1000}
+        base = self._report(spec, load=100.0, tiny=1.0, scores=50.0, broken=10.0)
+        cur = self._report(spec, load=130.0, tiny=2.0, scores=55.0, broken=None)
+
+        regressions = harness.find_regressions(base, cur, threshold=0.2, min_delta_ms=5.0)
+
+        assert [r["name"] for r in regressions] == ["load", "broken"]
+        assert regressions[0]["delta_pct"] == 30.0
+        assert regressions[1]["current_ms"] is None
+        with pytest.raises(ValueError):
+            harness.find_regressions(base, self._report({"matches": 10}, load=1.0))
@@ -0,0 +1,160 @@
+"""
+Tests des snapshots DuckDB publiés (lecteurs jamais bloqués par une sync).
+(Tests for published DuckDB snapshots)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import duckdb
+
+from src.data.infrastructure.database import snapshots
+from src.data.repositories.duckdb_repo import DuckDBRepository
+
+
+def _player_db(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE TABLE match_stats (match_id VARCHAR)")
+    conn.execute("INSERT INTO match_stats VALUES ('m1')")
+    return conn
+
+
+def _age(path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestPublishSnapshot:
+    """Publication et lecture des générations."""
+
+    def test_reader_sees_published_generation_only(self, tmp_path):
+        db = tmp_path / "stats.duckdb"
+        writer = _player_db(db)
+
+        # Sans snapshot : repli sur le fichier de travail
+        assert snapshots.resolve_read_path(db) == db
+        assert snapshots.publish_snapshot(db, writer) == 1
+
+        writer.execute("INSERT INTO match_stats VALUES ('m2')")
+        reader = snapshots.connect_read_only(db)
+        assert reader.execute("SELECT COUNT(*) FROM match_stats").fetchone()[0] == 1
+        reader.close()
+
+        assert snapshots.publish_snapshot(db, writer) == 2
+        assert snapshots.resolve_read_path(db) == snapshots.generation_path(db, 2)
+        reader = snapshots.connect_read_only(db)
+        assert reader.execute("SELECT COUNT(*) FROM match_stats").fetchone()[0] == 2
+        reader.close()
+        writer.close()
+
+    def test_repository_reopens_on_new_generation(self, tmp_path):
+        db = tmp_path / "players" / "Tester" / "stats.duckdb"
+        writer = _player_db(db)
+        snapshots.publish_snapshot(db, writer)
+        repo = DuckDBRepository(db, xuid="1", read_only=True)
+
+        count = "SELECT COUNT(*) FROM match_stats"
+        assert repo._get_connection().execute(count).fetchone()[0] == 1
+        writer.execute("INSERT INTO match_stats VALUES ('m2')")
+        assert repo._get_connection().execute(count).fetchone()[0] == 1
+
+        snapshots.publish_snapshot(db, writer)
+        assert repo._get_connection().execute(count).fetchone()[0] == 2
+        repo.close()
+        writer.close()
+
+
+    def test_failed_checkpoint_skips_publication(self, tmp_path):
+        class _NoCheckpoint:
+            def execute(self, sql):
+                raise duckdb.TransactionException("Cannot CHECKPOINT: transaction en cours")
+
+        db = tmp_path / "stats.duckdb"
+        writer = _player_db(db)
+        assert snapshots.publish_snapshot(db, writer) == 1
+        writer.execute("INSERT INTO match_stats VALUES ('m2')")
+
+        # Pas de CHECKPOINT : pas de génération (ni de WAL copié), reprise au prochain appel
+        assert snapshots.publish_snapshot(db, _NoCheckpoint()) is None
+        assert snapshots.current_generation(db) == 1
+        assert not list(snapshots.snapshot_dir(db).glob("*.wal"))
+
+        assert snapshots.publish_written((db, writer), always=True) == {"stats.duckdb": 2}
+        reader = snapshots.connect_read_only(db)
+        assert reader.execute("SELECT COUNT(*) FROM match_stats").fetchone()[0] == 2
+        reader.close()
+        writer.close()
+
+    def test_readers_open_published_generation(self, tmp_path):
+        from src.data.sync.radar_thresholds import (
+            RADAR_THRESHOLDS_TABLE,
+            ensure_radar_tables,
+            read_radar_maxima,
+        )
+
+        shared = tmp_path / "shared_matches.duckdb"
+        writer = duckdb.connect(str(shared))
+        ensure_radar_tables(writer)
+        insert = f"INSERT OR REPLACE INTO {RADAR_THRESHOLDS_TABLE} VALUES ('combat', ?, ?, 3, NULL)"
+        writer.execute(insert, [1000.0, 900.0])
+        snapshots.publish_snapshot(shared, writer)
+
+        # Le writer garde le fichier de travail ouvert : le lecteur lit le snapshot
+        writer.execute(insert, [2000.0, 1800.0])
+        assert read_radar_maxima(shared) == {"combat": 1000.0}
+        writer.close()
+
+
+class TestCollectGarbage:
+    """Suppression des générations remplacées."""
+
+    def test_keeps_generations_in_use_and_within_grace(self, tmp_path):
+        db = tmp_path / "stats.duckdb"
+        writer = _player_db(db)
+        for _ in range(4):
+            snapshots.publish_snapshot(db, writer)
+        writer.close()
+        paths = [snapshots.generation_path(db, g) for g in range(1, 5)]
+
+        # Successeurs trop récents : rien n'est supprimé
+        assert snapshots.collect_garbage(db) == []
+
+        for path in paths:
+            _age(path, 3600)
+        with snapshots.reading(db) as current:
+            assert current == paths[-1]
+            snapshots.acquire(db)  # lecteur qui tient encore g4
+        snapshots._readers[paths[0]] += 1
+        try:
+            removed = snapshots.collect_garbage(db, keep=1)
+        finally:
+            snapshots.release(paths[0])
+            snapshots.release(paths[-1])
+
+        assert removed == paths[1:3]
+        assert [p.exists() for p in paths] == [True, False, False, True]
+
+
+class TestPublishWritten:
+    """Publication en fin d'écriture (backfill, scripts de maintenance)."""
+
+    def test_publishes_changed_databases_only_when_enabled(self, tmp_path, monkeypatch):
+        db = tmp_path / "stats.duckdb"
+        writer = _player_db(db)
+        monkeypatch.delenv("OPENSPARTAN_DB_SNAPSHOTS", raising=False)
+        assert snapshots.publish_written((db, writer)) == {}
+
+        monkeypatch.setenv("OPENSPARTAN_DB_SNAPSHOTS", "1")
+        assert snapshots.publish_written((db, writer), None) == {"stats.duckdb": 1}
+        _age(db, 60)
+        assert snapshots.publish_written(db) == {}
+
+        writer.execute("INSERT INTO match_stats VALUES ('m2')")
+        writer.close()
+        assert snapshots.publish_written(db) == {"stats.duckdb": 2}
+        reader = snapshots.connect_read_only(db)
+        assert reader.execute("SELECT COUNT(*) FROM match_stats").fetchone()[0] == 2
+        reader.close()
@@ -0,0 +1,168 @@
+"""
+Tests du writer DuckDB avec group commit.
+(Tests for the DuckDB writer thread with group commit)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import duckdb
+
+from src.data.sync.db_writer import DBWriter
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _conn(tmp_path):
+    conn = duckdb.connect(str(tmp_path / "stats.duckdb"))
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    return conn
+
+
+def _insert(conn, *ids):
+    def _apply():
+        for i in ids:
+            conn.execute("INSERT INTO t VALUES (?)", [i])
+        return len(ids)
+
+    return _apply
+
+
+def _insert_swallowing_errors(conn, i):
+    """Lot qui avale son erreur (comme les fallbacks de batch_insert)."""
+
+    def _apply():
+        with contextlib.suppress(duckdb.Error):
+            conn.execute("INSERT INTO t VALUES (?)", [i])
+        return 0
+
+    return _apply
+
+
+class _CommitFailsOnce:
+    """Connexion dont le premier COMMIT échoue (panne entre les deux commits)."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.failed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        if not self.failed:
+            self.failed = True
+            raise duckdb.IOException("disk full")
+        return self._conn.commit()
+
+
+class TestDBWriter:
+    """Group commit, rejeu individuel et statistiques."""
+
+    def test_concurrent_batches_share_transactions(self, tmp_path):
+        conn = _conn(tmp_path)
+        writer = DBWriter([conn], max_group=5, linger_seconds=0.05)
+
+        async def main():
+            return await asyncio.gather(
+                *(writer.submit(f"m{i}", _insert(conn, i)) for i in range(10))
+            )
+
+        assert _run(main()) == [1] * 10
+        stats = writer.take_stats()
+        writer.close()
+
+        assert stats.batches == 10
+        assert 2 <= stats.commits < 10
+        assert stats.max_queue_depth >= 1
+        assert stats.commit_latency_ms_avg > 0
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 10
+        assert writer.take_stats().batches == 0
+
+    def test_failed_batch_does_not_drop_the_group(self, tmp_path):
+        conn = _conn(tmp_path)
+        conn.execute("INSERT INTO t VALUES (0)")
+        writer = DBWriter([conn], max_group=10, linger_seconds=0.05)
+
+        async def main():
+            return await asyncio.gather(
+                writer.submit("ok1", _insert(conn, 1)),
+                writer.submit("dup", _insert(conn, 2, 0)),
+                writer.submit("swallow", _insert_swallowing_errors(conn, 0)),
+                writer.submit("ok2", _insert(conn, 3)),
+                return_exceptions=True,
+            )
+
+        results = _run(main())
+        stats = writer.take_stats()
+        writer.close()
+
+        assert results[0] == 1 and results[2] == 0 and results[3] == 1
+        assert isinstance(results[1], duckdb.ConstraintException)
+        assert stats.replayed_groups >= 1
+        # Rejeu en autocommit : le lot fautif a écrit ses lignes valides, rien n'est perdu
+        ids = [r[0] for r in conn.execute("SELECT id FROM t ORDER BY id").fetchall()]
+        assert ids == [0, 1, 2, 3]
+
+    def test_commit_failure_replays_only_uncommitted_connection(self, tmp_path):
+        upsert = "INSERT INTO c VALUES (?, 1) ON CONFLICT (id) DO UPDATE SET n = n + 1"
+        player = duckdb.connect(str(tmp_path / "stats.duckdb"))
+        shared = duckdb.connect(str(tmp_path / "shared.duckdb"))
+        for conn in (player, shared):
+            conn.execute("CREATE TABLE c (id INTEGER PRIMARY KEY, n INTEGER)")
+        flaky = _CommitFailsOnce(shared)
+        writer = DBWriter([player, flaky], max_group=10, linger_seconds=0.05)
+
+        def _write_both(i):
+            def _apply():
+                # Compteurs non idempotents : un rejeu complet les incrémenterait deux fois
+                player.execute(upsert, [i])
+                shared.execute(upsert, [i])
+                return i
+
+            return _apply
+
+        async def main():
+            return await asyncio.gather(*(writer.submit(f"m{i}", _write_both(i)) for i in range(3)))
+
+        results = _run(main())
+        stats = writer.take_stats()
+        writer.close()
+
+        assert flaky.failed
+        assert results == [0, 1, 2]
+        assert stats.replayed_groups == 1
+        # Player déjà commité : non réécrit ; shared annulé : rejoué une seule fois
+        assert player.execute("SELECT SUM(n), COUNT(*) FROM c").fetchone() == (3, 3)
+        assert shared.execute("SELECT SUM(n), COUNT(*) FROM c").fetchone() == (3, 3)
+
+    def test_close_then_submit_restarts_thread(self, tmp_path):
+        conn = _conn(tmp_path)
+        writer = DBWriter([conn])
+        _run(writer.submit("a", _insert(conn, 1)))
+        writer.close()
+        _run(writer.submit("b", _insert(conn, 2)))
+        writer.close()
+
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+
+
+class TestSyncResultWriterStats:
+    """Exposition des compteurs du writer."""
+
+    def test_to_dict(self):
+        from src.data.sync.models import SyncResult
+
+        data = SyncResult(write_batches=4, write_commits=2, commit_latency_ms_max=1.234).to_dict()
+        assert data["write_batches"] == 4
+        assert data["write_commits"] == 2
+        assert data["commit_latency_ms_max"] == 1.23
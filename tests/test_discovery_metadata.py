@@ -0,0 +1,247 @@
+"""
+Tests du peuplement metadata.duckdb depuis Discovery UGC.
+(Tests for Discovery UGC metadata population)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.data.sync.discovery_metadata import (
+    METADATA_SCHEMA_DDL,
+    DiscoveryAssetFetcher,
+    collect_asset_refs,
+    load_known_assets,
+    upsert_assets,
+)
+from src.data.sync.metadata_resolver import MetadataResolver
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def client_asset(asset_type: str, asset_id: str, version_id: str) -> dict:
+    return {
+        "AssetId": asset_id,
+        "VersionId": version_id,
+        "PublicName": f"{asset_type}:{asset_id}",
+        "Tags": ["Ranked"],
+    }
+
+
+class _FakeClient:
+    """Client Discovery factice : compte les appels et la concurrence."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.calls: list[tuple[str, str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._delay = delay
+
+    async def get_asset(self, asset_type: str, asset_id: str, version_id: str):
+        self.calls.append((asset_type, asset_id, version_id))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self._delay)
+        self.in_flight -= 1
+        if asset_id.startswith("missing"):
+            return None
+        return client_asset(asset_type, asset_id, version_id or "v-latest")
+
+
+def _player_db(path: Path, rows: list[tuple[str, str, str, str]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(path))
+    conn.execute(
+        "CREATE TABLE match_stats (match_id VARCHAR, playlist_id VARCHAR, map_id VARCHAR, "
+        "pair_id VARCHAR, game_variant_id VARCHAR)"
+    )
+    for i, row in enumerate(rows):
+        conn.execute("INSERT INTO match_stats VALUES (?, ?, ?, ?, ?)", [f"m{i}", *row])
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def metadata_conn():
+    conn = duckdb.connect(":memory:")
+    conn.execute(METADATA_SCHEMA_DDL)
+    yield conn
+    conn.close()
+
+
+class TestCollectAssetRefs:
+    """Collecte des asset IDs en une requête."""
+
+    def test_union_over_players_and_shared(self, tmp_path, metadata_conn):
+        p1 = _player_db(tmp_path / "a" / "stats.duckdb", [("pl1", "map1", "pair1", "gv1")])
+        p2 = _player_db(tmp_path / "b" / "stats.duckdb", [("pl2", "map1", None, "")])
+        shared = tmp_path / "shared_matches.duckdb"
+        conn = duckdb.connect(str(shared))
+        conn.execute(
+            "CREATE TABLE match_registry (match_id VARCHAR, playlist_id VARCHAR, "
+            "map_id VARCHAR, pair_id VARCHAR, game_variant_id VARCHAR)"
+        )
+        conn.execute("INSERT INTO match_registry VALUES ('m9', 'pl3', 'map2', 'pair1', 'gv1')")
+        conn.close()
+
+        refs = collect_asset_refs(metadata_conn, [p1, p2], shared_db_path=shared)
+
+        assert refs["playlists"] == {("pl1", ""), ("pl2", ""), ("pl3", "")}
+        assert refs["maps"] == {("map1", ""), ("map2", "")}
+        assert refs["pairs"] == {("pair1", "")}
+        assert refs["variants"] == {("gv1", "")}
+        # Les DBs sont détachées après la collecte
+        catalogs = {r[0] for r in metadata_conn.execute("SHOW DATABASES").fetchall()}
+        assert not any(c.startswith("disc_") for c in catalogs)
+
+    def test_skips_assets_already_in_metadata(self, tmp_path, metadata_conn):
+        p1 = _player_db(tmp_path / "a" / "stats.duckdb", [("pl1", "map1", "pair1", "gv1")])
+        metadata_conn.execute(
+            "INSERT INTO playlists (asset_id, version_id, public_name) VALUES ('pl1', 'v1', 'X')"
+        )
+
+        refs = collect_asset_refs(metadata_conn, [p1])
+        assert refs["playlists"] == set()
+        assert refs["maps"] == {("map1", "")}
+
+        all_refs = collect_asset_refs(metadata_conn, [p1], skip_known=False)
+        assert all_refs["playlists"] == {("pl1", "")}
+
+    def test_skip_is_keyed_on_registry_versions(self, tmp_path, metadata_conn):
+        shared = tmp_path / "l'equipe" / "shared_matches.duckdb"
+        shared.parent.mkdir()
+        conn = duckdb.connect(str(shared))
+        conn.execute(
+            "CREATE TABLE match_registry (match_id VARCHAR, playlist_id VARCHAR, "
+            "map_id VARCHAR, pair_id VARCHAR, game_variant_id VARCHAR, "
+            "playlist_version_id VARCHAR, map_version_id VARCHAR, "
+            "pair_version_id VARCHAR, game_variant_version_id VARCHAR)"
+        )
+        conn.execute(
+            "INSERT INTO match_registry VALUES "
+            "('m1', 'pl1', 'map1', NULL, NULL, 'v1', 'v1', NULL, NULL), "
+            "('m2', 'pl1', 'map1', NULL, NULL, 'v2', NULL, NULL, NULL)"
+        )
+        conn.close()
+        metadata_conn.execute(
+            "INSERT INTO playlists (asset_id, version_id, public_name) VALUES ('pl1', 'v1', 'X')"
+        )
+        metadata_conn.execute(
+            "INSERT INTO maps (asset_id, version_id, public_name) VALUES ('map1', 'v0', 'Y')"
+        )
+
+        refs = collect_asset_refs(metadata_conn, shared_db_path=shared)
+
+        # pl1/v1 connu, pl1/v2 nouvelle version ; map1 sans version déjà présent
+        assert refs["playlists"] == {("pl1", "v2")}
+        assert refs["maps"] == {("map1", "v1")}
+
+        # Chemin avec apostrophe : la DB joueur est attachée malgré tout
+        player = _player_db(tmp_path / "l'equipe" / "stats.duckdb", [("pl9", None, None, None)])
+        assert collect_asset_refs(metadata_conn, [player])["playlists"] == {("pl9", "")}
+
+    def test_missing_databases(self, tmp_path, metadata_conn):
+        refs = collect_asset_refs(
+            metadata_conn, [tmp_path / "nope.duckdb"], shared_db_path=tmp_path / "none.duckdb"
+        )
+        assert not any(refs.values())
+
+
+class TestDiscoveryAssetFetcher:
+    """Récupération concurrente et dédupliquée."""
+
+    def test_bounded_concurrency_and_dedup(self):
+        client = _FakeClient()
+        fetcher = DiscoveryAssetFetcher(client, concurrency=3)
+        refs = {"maps": {(f"map{i}", "") for i in range(10)}, "playlists": {("missing1", "")}}
+
+        async def scenario():
+            fetched = await fetcher.fetch_many(refs)
+            again = await fetcher.fetch_many({"maps": {("map0", "")}})
+            return fetched, again
+
+        fetched, again = _run(scenario())
+
+        assert len(fetched["maps"]) == 10
+        assert fetched["playlists"] == {}
+        assert again["maps"][("map0", "")]["PublicName"] == "Maps:map0"
+        assert len(client.calls) == 11
+        assert 1 < client.max_in_flight <= 3
+
+    def test_enrich_skips_known_versions(self):
+        client = _FakeClient()
+        fetcher = DiscoveryAssetFetcher(
+            client, known={"playlists": {("pl1", "v1"): "Ranked Arena"}}
+        )
+        stats = {
+            "MatchInfo": {
+                "Playlist": {"AssetId": "pl1", "VersionId": "v1"},
+                "MapVariant": {"AssetId": "map1", "VersionId": "v7"},
+                "UgcGameVariant": {"AssetId": "gv1"},  # sans version : ignoré
+            }
+        }
+        other = {"MatchInfo": {"MapVariant": {"AssetId": "map1", "VersionId": "v7"}}}
+
+        async def scenario():
+            await asyncio.gather(fetcher.enrich_match_info(stats), fetcher.enrich_match_info(other))
+
+        _run(scenario())
+
+        assert stats["MatchInfo"]["Playlist"]["PublicName"] == "Ranked Arena"
+        assert stats["MatchInfo"]["MapVariant"]["PublicName"] == "Maps:map1"
+        assert other["MatchInfo"]["MapVariant"]["PublicName"] == "Maps:map1"
+        assert client.calls == [("Maps", "map1", "v7")]
+        assert fetcher.drain() == {
+            "playlists": {},
+            "maps": {("map1", "v7"): client_asset("Maps", "map1", "v7")},
+            "pairs": {},
+            "variants": {},
+        }
+
+
+class TestUpsertAssets:
+    """Insertion en bloc et relecture."""
+
+    def test_roundtrip(self, metadata_conn):
+        written = upsert_assets(
+            metadata_conn,
+            {
+                "playlists": {("pl1", ""): client_asset("Playlists", "pl1", "v2")},
+                "maps": {("map1", "v1"): client_asset("Maps", "map1", "v1")},
+            },
+        )
+        assert written == {"playlists": 1, "maps": 1, "pairs": 0, "variants": 0}
+
+        row = metadata_conn.execute(
+            "SELECT version_id, is_ranked, raw_json FROM playlists WHERE asset_id = 'pl1'"
+        ).fetchone()
+        assert row[0] == "v2" and row[1] is True
+        assert json.loads(row[2])["PublicName"] == "Playlists:pl1"
+
+        known = load_known_assets(metadata_conn)
+        assert known["maps"] == {("map1", "v1"): "Maps:map1"}
+
+    def test_resolver_store_feeds_cache(self, tmp_path):
+        resolver = MetadataResolver(tmp_path / "metadata.duckdb", create_if_missing=True)
+        assert resolver.resolve("map", "map1") is None
+
+        stored = resolver.store_assets(
+            {"maps": {("map1", "v1"): client_asset("Maps", "map1", "v1")}}
+        )
+
+        assert stored == 1
+        assert resolver.resolve("map", "map1") == "Maps:map1"
+        assert resolver.known_assets()["maps"] == {("map1", "v1"): "Maps:map1"}
+        resolver.close()
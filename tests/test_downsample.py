@@ -0,0 +1,130 @@
+"""
+Tests de la réduction de points LTTB + enveloppe min/max.
+(Tests for the LTTB + min/max envelope downsampler)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+
+from src.visualization.downsample import (
+    downsample_frame,
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def _career(n: int, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    kills = rng.integers(0, 30, n)
+    deaths = rng.integers(1, 20, n)
+    base = datetime(2022, 1, 1)
+    return pl.DataFrame(
+        {
+            "match_id": [f"m{i}" for i in range(n)],
+            "start_time": [base + timedelta(hours=i) for i in range(n)],
+            "kills": kills,
+            "deaths": deaths,
+            "assists": rng.integers(0, 10, n),
+            "accuracy": rng.uniform(30, 60, n),
+            "ratio": kills / deaths,
+            "time_played_seconds": rng.integers(300, 900, n),
+        }
+    ).with_columns(
+        (pl.col("kills") / (pl.col("time_played_seconds") / 60)).alias("kills_per_min"),
+        (pl.col("deaths") / (pl.col("time_played_seconds") / 60)).alias("deaths_per_min"),
+        (pl.col("assists") / (pl.col("time_played_seconds") / 60)).alias("assists_per_min"),
+    )
+
+
+class TestLttb:
+    """Algorithme LTTB vectorisé."""
+
+    def test_keeps_endpoints_and_size(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        idx = lttb_indices(y, 200)
+        assert len(idx) == 200
+        assert idx[0] == 0 and idx[-1] == 4999
+        assert np.all(np.diff(idx) > 0)
+
+    def test_small_series_untouched(self):
+        assert lttb_indices([1.0, 2.0, 3.0], 10).tolist() == [0, 1, 2]
+
+    def test_spike_is_kept(self):
+        y = np.zeros(1000)
+        y[537] = 50.0
+        assert 537 in lttb_indices(y, 50)
+
+    def test_nan_tolerated(self):
+        y = np.arange(100, dtype=float)
+        y[10:20] = np.nan
+        idx = lttb_indices(y, 20)
+        assert len(idx) == 20
+
+    def test_minmax_envelope(self):
+        y = np.array([0, 5, 1, -3, 2, 2, 9, 0], dtype=float)
+        idx = minmax_indices(y, 2)
+        assert {1, 3, 6}.issubset(set(idx.tolist()))
+
+
+class TestDownsample:
+    """Sélection commune des lignes pour les graphiques."""
+
+    def test_below_budget_is_full_series(self):
+        assert downsample_indices([np.arange(50)], 100).tolist() == list(range(50))
+
+    def test_zero_budget_disables(self):
+        assert len(downsample_indices([np.arange(5000)], 0)) == 5000
+
+    def test_budget_and_global_extremes(self):
+        df = _career(15000)
+        sampled, positions = downsample_frame(df, ["ratio", "kills", "deaths"], 1000)
+        assert sampled.height <= 1100
+        assert sampled["ratio"].max() == df["ratio"].max()
+        assert sampled["ratio"].min() == df["ratio"].min()
+        assert sampled["kills"].max() == df["kills"].max()
+        # Lignes réelles : le hover des points gardés est exact
+        assert sampled["match_id"].to_list() == df["match_id"].gather(positions).to_list()
+
+
+class TestCharts:
+    """Intégration dans les graphiques de séries temporelles."""
+
+    def test_plot_timeseries_downsampled(self):
+        from src.visualization.timeseries import plot_timeseries
+
+        df = _career(6000)
+        fig = plot_timeseries(df, max_points=600)
+        n_points = len(fig.data[0].x)
+        assert n_points < 800
+        assert len(fig.data[0].customdata) == n_points
+        assert max(fig.data[2].y) == df["ratio"].max()
+
+    def test_plot_timeseries_full_when_disabled(self):
+        from src.visualization.timeseries import plot_timeseries
+
+        fig = plot_timeseries(_career(3000), max_points=0)
+        assert len(fig.data[0].x) == 3000
+
+    def test_per_minute_rolling_uses_full_series(self):
+        from src.visualization.timeseries import plot_per_minute_timeseries
+
+        df = _career(5000)
+        full = plot_per_minute_timeseries(df, max_points=0)
+        reduced = plot_per_minute_timeseries(df, max_points=500)
+        kept = list(reduced.data[0].x)
+        full_smooth = dict(zip(full.data[3].x, full.data[3].y, strict=True))
+        assert list(reduced.data[3].y) == [full_smooth[x] for x in kept]
+
+    def test_cumulative_kd_downsampled(self):
+        from src.analysis.cumulative import compute_cumulative_kd_series_polars
+        from src.visualization.performance import plot_cumulative_kd
+
+        cumul = compute_cumulative_kd_series_polars(_career(8000))
+        fig = plot_cumulative_kd(cumul, max_points=400)
+        assert len(fig.data[0].x) < 500
+        assert max(fig.data[1].y) == cumul["kd"].max()
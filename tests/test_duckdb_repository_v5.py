@@ -17,6 +17,7 @@ from pathlib import Path
 import duckdb
 import pytest
 
+from src.data.repositories._roster_loader import invalidate_gamertag_cache
 from src.data.repositories.duckdb_repo import DuckDBRepository
 from src.data.repositories.factory import get_repository
 
@@ -584,6 +585,80 @@ class TestSharedGamertagResolution:
         assert gt is None
 
 
+class TestGamertagBatchCache:
+    """Résolution par lot (une requête) et cache process-wide des alias."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        invalidate_gamertag_cache()
+        yield
+        invalidate_gamertag_cache()
+
+    def test_batch_issues_single_query(self, repo_v5: DuckDBRepository, monkeypatch):
+        """Un roster de match se résout en un seul appel aux sources."""
+        calls = []
+        original = repo_v5._query_gamertag_sources
+
+        def _spy(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(repo_v5, "_query_gamertag_sources", _spy)
+        roster = [PLAYER_XUID, TEAMMATE_XUID, "xuid_enemy_1", "xuid_enemy_2", "xuid_unknown"]
+        result = repo_v5.resolve_gamertags_batch(roster, match_id=MATCH_ID_1)
+        assert len(calls) == 1
+        assert result["xuid_enemy_2"] == "EnemyBeta"
+        assert result["xuid_unknown"] is None
+
+    def test_aliases_served_from_cache(self, repo_v5: DuckDBRepository, monkeypatch):
+        """Sans match_id, un lot déjà résolu ne relance aucune requête."""
+        first = repo_v5.resolve_gamertags_batch([PLAYER_XUID, "xuid_unknown"])
+
+        def _fail(*args):
+            raise AssertionError("requête inattendue")
+
+        monkeypatch.setattr(repo_v5, "_query_gamertag_sources", _fail)
+        assert repo_v5.resolve_gamertags_batch([PLAYER_XUID, "xuid_unknown"]) == first
+        assert first == {PLAYER_XUID: "PlayerOne", "xuid_unknown": None}
+
+    def test_alias_write_invalidates_cache(self, tmp_player_db: Path):
+        """Une écriture dans xuid_aliases est visible après invalidation."""
+        conn = duckdb.connect(str(tmp_player_db))
+        conn.execute("INSERT INTO xuid_aliases (xuid, gamertag) VALUES ('xuid_new', 'Old')")
+        conn.close()
+        repo = DuckDBRepository(
+            tmp_player_db, PLAYER_XUID, shared_db_path=Path("/nonexistent/shared.duckdb")
+        )
+        assert repo.resolve_gamertag("xuid_new") == "Old"
+        repo.close()
+
+        conn = duckdb.connect(str(tmp_player_db))
+        conn.execute("UPDATE xuid_aliases SET gamertag = 'Renamed' WHERE xuid = 'xuid_new'")
+        conn.close()
+        invalidate_gamertag_cache()
+
+        repo = DuckDBRepository(
+            tmp_player_db, PLAYER_XUID, shared_db_path=Path("/nonexistent/shared.duckdb")
+        )
+        assert repo.resolve_gamertag("xuid_new") == "Renamed"
+
+    def test_highlight_events_cleaned(self, tmp_player_db: Path):
+        """La source highlight_events passe par _extract_ascii_token."""
+        conn = duckdb.connect(str(tmp_player_db))
+        conn.execute(
+            "INSERT INTO highlight_events (match_id, event_type, xuid, gamertag) "
+            "VALUES (?, 'kill', 'xuid_ev', ?)",
+            [MATCH_ID_1, "juan1\x00\x00\x00"],
+        )
+        conn.close()
+        repo = DuckDBRepository(
+            tmp_player_db, PLAYER_XUID, shared_db_path=Path("/nonexistent/shared.duckdb")
+        )
+        assert repo.resolve_gamertags_batch(["xuid_ev"], match_id=MATCH_ID_1) == {
+            "xuid_ev": "juan1"
+        }
+
+
 # =============================================================================
 # Tests list_other_player_xuids (v5 shared)
 # =============================================================================
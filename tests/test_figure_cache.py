@@ -0,0 +1,145 @@
+"""
+Tests du cache de figures Plotly (clé génération + empreinte + paramètres, LRU).
+(Tests for the rendered-figure cache)
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import plotly.graph_objects as go
+import polars as pl
+import pytest
+
+from src.visualization.figure_cache import (
+    FigureCache,
+    cached_figure,
+    frame_fingerprint,
+    get_figure_cache,
+    set_figure_cache_generation,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    get_figure_cache().clear()
+    set_figure_cache_generation(None)
+    yield
+    get_figure_cache().clear()
+    set_figure_cache_generation(None)
+
+
+def _df(n: int = 20) -> pl.DataFrame:
+    base = datetime(2026, 1, 1)
+    return pl.DataFrame(
+        {
+            "start_time": [base + timedelta(hours=i) for i in range(n)],
+            "kills": list(range(n)),
+        }
+    )
+
+
+def _counting_plot():
+    calls = []
+
+    @cached_figure
+    def plot(df: pl.DataFrame, title: str = "t") -> go.Figure:
+        calls.append(title)
+        return go.Figure(go.Scatter(x=df["start_time"].to_list(), y=df["kills"].to_list()))
+
+    return plot, calls
+
+
+class TestCachedFigure:
+    """Décorateur @cached_figure."""
+
+    def test_same_inputs_hit(self):
+        plot, calls = _counting_plot()
+        first = plot(_df())
+        second = plot(_df())
+        assert len(calls) == 1
+        assert isinstance(second, go.Figure)
+        assert list(second.data[0].y) == list(first.data[0].y)
+        assert get_figure_cache().stats().hits == 1
+
+    def test_filter_change_misses(self):
+        plot, calls = _counting_plot()
+        plot(_df())
+        plot(_df().filter(pl.col("kills") > 3))
+        plot(_df().with_columns(pl.col("kills") + 1))
+        assert len(calls) == 3
+
+    def test_params_and_generation_are_part_of_key(self):
+        plot, calls = _counting_plot()
+        plot(_df(), title="a")
+        plot(_df(), title="b")
+        set_figure_cache_generation(("db", (1, 2)))
+        plot(_df(), title="a")
+        assert calls == ["a", "b", "a"]
+
+    def test_hit_returns_independent_copy(self):
+        plot, _ = _counting_plot()
+        plot(_df())
+        fig = plot(_df())
+        fig.update_layout(title="modifié")
+        assert plot(_df()).layout.title.text is None
+
+    def test_pandas_input_bypasses_cache(self):
+        pd = pytest.importorskip("pandas")
+        calls = []
+
+        @cached_figure
+        def plot(df) -> go.Figure:
+            calls.append(1)
+            return go.Figure()
+
+        pdf = pd.DataFrame({"a": [1, 2]})
+        plot(pdf)
+        plot(pdf)
+        assert len(calls) == 2
+        assert get_figure_cache().stats().bypassed == 2
+
+
+class TestFigureCacheLimits:
+    """Éviction LRU et plafond mémoire."""
+
+    def test_lru_entries(self):
+        cache = FigureCache(max_entries=2)
+        cache.put(("a",), "1")
+        cache.put(("b",), "2")
+        assert cache.get(("a",)) == "1"
+        cache.put(("c",), "3")
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "1"
+        assert cache.stats().evictions == 1
+
+    def test_memory_cap(self):
+        cache = FigureCache(max_entries=100, max_bytes=10)
+        cache.put(("a",), "x" * 6)
+        cache.put(("b",), "y" * 6)
+        stats = cache.stats()
+        assert stats.entries == 1
+        assert stats.bytes == 6
+        cache.put(("big",), "z" * 11)
+        assert cache.get(("big",)) is None
+
+    def test_fingerprint_is_order_sensitive(self):
+        df = _df(5)
+        assert frame_fingerprint(df) != frame_fingerprint(df.reverse())
+        assert frame_fingerprint(df) == frame_fingerprint(df.clone())
+
+
+def test_real_chart_is_cached():
+    """Les graphiques de séries temporelles passent par le cache."""
+    from src.visualization.timeseries import plot_timeseries
+
+    df = _df().with_columns(
+        pl.lit(5).alias("deaths"),
+        pl.lit(2).alias("assists"),
+        (pl.col("kills") / 5).alias("ratio"),
+        pl.lit(1.0).alias("kda"),
+        pl.lit(45.0).alias("accuracy"),
+    )
+    plot_timeseries(df)
+    plot_timeseries(df)
+    assert get_figure_cache().stats().hits == 1
@@ -0,0 +1,181 @@
+"""
+Tests du cube pré-agrégé pour les KPIs filtrés.
+(Tests for the pre-aggregated filter cube)
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import polars as pl
+import pytest
+
+from src.analysis.filter_cube import (
+    CUBE_SCHEMA,
+    build_filter_cube,
+    cube_totals,
+    slice_filter_cube,
+)
+from src.app.kpis import compute_kpi_stats, compute_kpi_stats_from_cube
+from src.data.services.win_loss_service import WinLossService
+
+_PLAYLISTS = ("Quick Play", "Ranked Arena", "Firefight: Heroic", None)
+_PAIRS = ("Arena:Slayer", "Ranked:CTF", "Firefight:King of the Hill", "Arena:Oddball")
+_MAPS = ("Streets", "Recharge", None, "Live Fire")
+
+
+def _matches(n: int = 120, span_days: int = 60) -> pl.DataFrame:
+    """Frame enrichie comme load_df_optimized (start_time local naïf + date)."""
+    base = datetime(2025, 1, 1, 20, 0)
+    step = timedelta(days=span_days) / n
+    rows = []
+    for i in range(n):
+        start = base + step * i
+        rows.append(
+            {
+                "match_id": f"m{i}",
+                "start_time": start,
+                "date": start.date(),
+                "playlist_name": _PLAYLISTS[i % 4],
+                "pair_name": _PAIRS[i % 4],
+                "map_name": _MAPS[(i // 2) % 4],
+                "outcome": None if i % 17 == 0 else (2, 3, 1, 4, 2)[i % 5],
+                "kills": 5 + i % 13,
+                "deaths": 3 + i % 7,
+                "assists": i % 9,
+                "accuracy": None if i % 11 == 0 else 35.0 + i % 20,
+                "average_life_seconds": None if i % 13 == 0 else 20.0 + i % 30,
+                "time_played_seconds": None if i % 19 == 0 else 400.0 + i * 3,
+            }
+        )
+    return pl.DataFrame(rows)
+
+
+def _label(x: str) -> str:
+    return x.upper()
+
+
+def _filter_frame(df: pl.DataFrame, *, start=None, end=None, playlists=(), maps=()) -> pl.DataFrame:
+    """Réplique des filtres de apply_filters (libellé nul → "")."""
+    out = df
+    if start is not None:
+        out = out.filter(pl.col("date") >= start)
+    if end is not None:
+        out = out.filter(pl.col("date") <= end)
+    if playlists:
+        out = out.filter(
+            pl.col("playlist_name").str.to_uppercase().fill_null("").is_in(list(playlists))
+        )
+    if maps:
+        out = out.filter(pl.col("map_name").fill_null("").is_in(list(maps)))
+    return out
+
+
+def _assert_same(cube_kpis, raw_kpis) -> None:
+    for field in raw_kpis._fields:
+        expected = getattr(raw_kpis, field)
+        got = getattr(cube_kpis, field)
+        if expected is None:
+            assert got is None, field
+        else:
+            assert got == pytest.approx(expected), field
+
+
+class TestBuildCube:
+    """Construction du cube."""
+
+    def test_schema_and_row_count(self):
+        df = _matches(n=600, span_days=3)
+        cube = build_filter_cube(df)
+        assert dict(cube.schema) == CUBE_SCHEMA
+        assert cube["matches"].sum() == df.height
+        assert cube.height < df.height
+
+    def test_flags_inferred_from_names(self):
+        cube = build_filter_cube(_matches())
+        ff = cube.filter(pl.col("is_firefight"))
+        assert set(ff["pair_name"].to_list()) == {"Firefight:King of the Hill"}
+        ranked = cube.filter(pl.col("is_ranked"))
+        assert set(ranked["pair_name"].to_list()) == {"Ranked:CTF"}
+
+    def test_utc_start_time_uses_paris_day(self):
+        df = pl.DataFrame(
+            {
+                "start_time": [datetime(2025, 3, 1, 23, 30)],
+                "pair_name": ["Arena:Slayer"],
+                "outcome": [2],
+                "kills": [1],
+                "deaths": [1],
+                "assists": [0],
+            }
+        ).with_columns(pl.col("start_time").dt.replace_time_zone("UTC"))
+        cube = build_filter_cube(df)
+        assert cube["day"].to_list() == [date(2025, 3, 2)]
+
+    def test_empty_frame(self):
+        assert build_filter_cube(pl.DataFrame()).is_empty()
+
+
+class TestKpiParity:
+    """Les KPIs issus du cube valent ceux calculés sur la frame filtrée."""
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {"start": date(2025, 1, 10), "end": date(2025, 2, 5)},
+            {"playlists": ("QUICK PLAY", "")},
+            {"maps": ("Streets", "")},
+            {"start": date(2025, 1, 20), "playlists": ("RANKED ARENA",), "maps": ("Recharge",)},
+            {"start": date(2030, 1, 1)},
+        ],
+    )
+    def test_parity(self, filters):
+        df = _matches()
+        sliced = slice_filter_cube(
+            build_filter_cube(df),
+            start_date=filters.get("start"),
+            end_date=filters.get("end"),
+            playlists=filters.get("playlists"),
+            maps=filters.get("maps"),
+            playlist_label_fn=_label,
+        )
+        raw = compute_kpi_stats(_filter_frame(df, **filters))
+        _assert_same(compute_kpi_stats_from_cube(cube_totals(sliced)), raw)
+        assert cube_totals(sliced).matches == _filter_frame(df, **filters).height
+
+    @pytest.mark.parametrize("is_ranked", [None, True, False])
+    @pytest.mark.parametrize("is_firefight", [None, True, False])
+    def test_ranked_and_firefight_dimensions(self, is_ranked, is_firefight):
+        df = _matches().with_columns(
+            pl.col("pair_name").str.starts_with("Ranked").alias("is_ranked"),
+            pl.col("pair_name").str.starts_with("Firefight").alias("is_firefight"),
+        )
+        sliced = slice_filter_cube(
+            build_filter_cube(df), is_ranked=is_ranked, is_firefight=is_firefight
+        )
+        raw = df
+        if is_ranked is not None:
+            raw = raw.filter(pl.col("is_ranked") == is_ranked)
+        if is_firefight is not None:
+            raw = raw.filter(pl.col("is_firefight") == is_firefight)
+        _assert_same(compute_kpi_stats_from_cube(cube_totals(sliced)), compute_kpi_stats(raw))
+        assert cube_totals(sliced).matches == raw.height
+
+
+class TestPeriodTable:
+    """Tableau par période depuis le cube."""
+
+    @pytest.mark.parametrize("span_days", [8, 30, 120])
+    def test_matches_pandas_table(self, span_days):
+        df = _matches(n=150, span_days=span_days)
+        expected = WinLossService.compute_period_table(df.to_pandas(), "période")
+        got = WinLossService.compute_period_table_from_cube(build_filter_cube(df), "période")
+        assert got is not None
+        assert list(got.table.columns) == list(expected.table.columns)
+        for column in expected.table.columns:
+            assert got.table[column].tolist() == pytest.approx(expected.table[column].tolist())
+
+    def test_short_range_needs_raw_frame(self):
+        cube = build_filter_cube(_matches(n=20, span_days=3))
+        assert WinLossService.compute_period_table_from_cube(cube, "heure") is None
@@ -0,0 +1,183 @@
+"""
+Tests de la résolution globale XUID → gamertag.
+(Tests for global XUID → gamertag resolution)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import duckdb
+
+from src.data.sync.gamertag_resolution import (
+    GamertagResolver,
+    collect_alias_gaps,
+    write_aliases,
+)
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _db(path: Path, participants: list[str], aliases: dict[str, str] | None = None) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE TABLE match_participants (match_id VARCHAR, xuid VARCHAR)")
+    conn.execute(
+        "CREATE TABLE xuid_aliases (xuid VARCHAR PRIMARY KEY, gamertag VARCHAR NOT NULL, "
+        "last_seen TIMESTAMP, source VARCHAR, updated_at TIMESTAMP)"
+    )
+    for xuid in participants:
+        conn.execute("INSERT INTO match_participants VALUES ('m1', ?)", [xuid])
+    for xuid, gamertag in (aliases or {}).items():
+        conn.execute(
+            "INSERT INTO xuid_aliases VALUES (?, ?, NULL, 'test', CURRENT_TIMESTAMP)",
+            [xuid, gamertag],
+        )
+    conn.close()
+    return path
+
+
+class _RateLimited(Exception):
+    status = 429
+
+
+class _FakeProfile:
+    """API profile factice : un 429 au premier appel, XUIDs 'inconnus' ignorés."""
+
+    def __init__(self, rate_limit_first: bool = False) -> None:
+        self.calls: list[list[str]] = []
+        self.answered: list[list[str]] = []
+        self._rate_limit = rate_limit_first
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_users_by_id(self, xuids: list[str]):
+        self.calls.append(list(xuids))
+        if self._rate_limit:
+            self._rate_limit = False
+            raise _RateLimited("HTTP 429")
+        if "1000000000000666" in xuids and len(xuids) > 1:
+            raise ValueError("HTTP 400")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.answered.append(list(xuids))
+        users = [SimpleNamespace(xuid=x, gamertag=f"GT{x[-3:]}") for x in xuids]
+        return SimpleNamespace(data=[u for u in users if u.xuid != "1000000000000666"])
+
+
+class TestCollectAliasGaps:
+    """Collecte globale des XUIDs sans alias."""
+
+    def test_dedup_across_dbs_and_known_elsewhere(self, tmp_path):
+        a = _db(tmp_path / "A" / "stats.duckdb", ["1000000000000001", "1000000000000002"])
+        b = _db(
+            tmp_path / "B" / "stats.duckdb",
+            ["1000000000000001", "1000000000000003"],
+            {"1000000000000003": "Known3"},
+        )
+        shared = _db(
+            tmp_path / "shared_matches.duckdb",
+            ["1000000000000002", "1000000000000004", "bad"],
+            {"1000000000000002": "Known2"},
+        )
+
+        gaps = collect_alias_gaps([a, b], shared_db_path=shared)
+
+        assert gaps.missing_by_db[a] == {"1000000000000001", "1000000000000002"}
+        assert gaps.missing_by_db[b] == {"1000000000000001"}
+        assert gaps.missing_by_db[shared] == {"1000000000000004", "bad"}
+        assert gaps.known == {"1000000000000002": "Known2"}
+        # XUID inconnu partout résolu une seule fois, XUID invalide écarté
+        assert gaps.to_resolve == ["1000000000000001", "1000000000000004"]
+
+    def test_write_aliases_fills_each_db(self, tmp_path):
+        a = _db(tmp_path / "A" / "stats.duckdb", ["1000000000000001", "1000000000000002"])
+        shared = _db(
+            tmp_path / "shared_matches.duckdb",
+            ["1000000000000002"],
+            {"1000000000000002": "Known2"},
+        )
+        gaps = collect_alias_gaps([a], shared_db_path=shared)
+
+        assert write_aliases(gaps, {"1000000000000001": "New1"}, dry_run=True) == {a: 2}
+        written = write_aliases(gaps, {"1000000000000001": "New1"})
+
+        assert written == {a: 2}
+        conn = duckdb.connect(str(a), read_only=True)
+        rows = conn.execute("SELECT xuid, gamertag, source FROM xuid_aliases ORDER BY xuid")
+        assert rows.fetchall() == [
+            ("1000000000000001", "New1", "api_resolve"),
+            ("1000000000000002", "Known2", "api_resolve"),
+        ]
+        conn.close()
+        assert collect_alias_gaps([a], shared_db_path=shared).to_resolve == []
+
+
+class TestGamertagResolver:
+    """Résolution adaptative via l'API profile."""
+
+    def test_backs_off_on_429_and_splits_bad_batches(self):
+        profile = _FakeProfile(rate_limit_first=True)
+        resolver = GamertagResolver(
+            SimpleNamespace(profile=profile), batch_size=10, concurrency=3, backoff_seconds=0.01
+        )
+        xuids = [f"1000000000000{i:03d}" for i in range(40)] + ["1000000000000666"]
+
+        resolved = _run(resolver.resolve(xuids + xuids[:5]))
+
+        assert set(resolved) == set(xuids) - {"1000000000000666"}
+        assert resolver.rate_limited == 1
+        # Doublons dédupliqués : chaque XUID n'obtient qu'une réponse
+        requested = [x for call in profile.answered for x in call]
+        assert sorted(requested) == sorted(set(requested))
+        assert profile.max_in_flight <= 3
+
+    def test_rate_limit_is_decided_on_status_and_capped(self):
+        class _AlwaysLimited:
+            def __init__(self) -> None:
+                self.calls = 0
+
+            async def get_users_by_id(self, xuids: list[str]):
+                self.calls += 1
+                if xuids[0].endswith("429"):
+                    # « 429 » dans le texte seulement : erreur ordinaire, pas un rate limit
+                    raise ValueError(f"HTTP 400 for {xuids[0]}")
+                raise _RateLimited("Too Many Requests")
+
+        profile = _AlwaysLimited()
+        resolver = GamertagResolver(
+            SimpleNamespace(profile=profile),
+            batch_size=2,
+            concurrency=1,
+            backoff_seconds=0.001,
+            max_rate_limit_retries=2,
+        )
+
+        resolved = _run(resolver.resolve(["1000000000000429", "1000000000000001"]))
+
+        assert resolved == {}
+        # Batch scindé (pas de 429), puis un XUID isolé limité 1 + 2 fois
+        assert resolver.rate_limited == 3
+        assert profile.calls == 1 + 1 + 3
+
+    def test_batch_size_grows_after_success(self):
+        profile = _FakeProfile()
+        resolver = GamertagResolver(SimpleNamespace(profile=profile), batch_size=5, concurrency=1)
+
+        _run(resolver.resolve([f"1000000000000{i:03d}" for i in range(60)]))
+
+        sizes = [len(call) for call in profile.calls]
+        assert sizes[0] == 5
+        assert sizes[1] > sizes[0]
+        assert len(profile.calls) < 60 // 5
@@ -0,0 +1,132 @@
+"""
+Budget d'import à froid : launcher et premier rendu de l'app.
+(Cold-start import budget for the launcher and the app's first render)
+
+Mesure via ``python -X importtime`` dans un sous-processus (cache d'import
+vierge). Les assertions par défaut portent sur les modules chargés (stables).
+Les budgets de temps (marqueur ``perf_budget``, ``--run-perf-budget``)
+détectent les régressions grossières sur une machine au calme ; le budget de
+l'app est relatif à ``import streamlit, polars`` mesuré dans les mêmes
+conditions.
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Budgets (ms) : import des modules hors démarrage de l'interpréteur (site)
+LAUNCHER_HELP_BUDGET_MS = 400
+# Premier rendu : au plus N fois le coût de ``import streamlit, polars``
+APP_FIRST_RENDER_BUDGET_RATIO = 2.5
+APP_REFERENCE_IMPORTS = "import streamlit, polars"
+
+# Modules que `launcher.py --help` ne doit jamais charger
+LAUNCHER_FORBIDDEN = ("asyncio", "duckdb", "polars", "pandas", "plotly", "streamlit")
+
+# Modules réservés aux pages (chargés au premier affichage de la page)
+APP_FORBIDDEN = ("pandas", "plotly.express", "src.ui.pages.win_loss", "src.ui.pages.timeseries")
+
+LAZY_PACKAGES = (
+    "src.ai",
+    "src.analysis",
+    "src.app",
+    "src.data",
+    "src.ui",
+    "src.ui.pages",
+    "src.utils",
+    "src.visualization",
+)
+
+
+def _importtime(args: list[str]) -> tuple[set[str], float]:
+    """Lance python -X importtime ; retourne (modules importés, total ms hors site)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    modules: set[str] = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        modules.add(name.strip())
+        if not name.startswith("  ") and name.strip() != "site":
+            total_us += int(cumulative)
+    return modules, total_us / 1000.0
+
+
+def _app_top_level_imports() -> str:
+    """Imports de niveau module de streamlit_app.py (ce que paie le premier rendu)."""
+    tree = ast.parse((REPO_ROOT / "streamlit_app.py").read_text(encoding="utf-8"))
+    return "\n".join(
+        ast.unparse(node) for node in tree.body if isinstance(node, ast.Import | ast.ImportFrom)
+    )
+
+
+def _loaded(modules: set[str], prefix: str) -> bool:
+    return any(m == prefix or m.startswith(prefix + ".") for m in modules)
+
+
+class TestLauncherImportBudget:
+    """`launcher.py --help` ne charge que la stdlib et src.utils.paths."""
+
+    def test_help_skips_heavy_modules(self):
+        modules, _ = _importtime(["launcher.py", "--help"])
+        assert not [m for m in LAUNCHER_FORBIDDEN if _loaded(modules, m)]
+
+    @pytest.mark.perf_budget
+    def test_help_time_budget(self):
+        # Meilleur de 3 (comme timeit) : insensible aux pics de charge ponctuels
+        total_ms = min(_importtime(["launcher.py", "--help"])[1] for _ in range(3))
+        assert total_ms < LAUNCHER_HELP_BUDGET_MS
+
+
+class TestAppFirstRenderBudget:
+    """Les imports de streamlit_app.py ne chargent aucune page."""
+
+    def test_pages_are_not_imported_upfront(self):
+        modules, _ = _importtime(["-c", _app_top_level_imports()])
+        assert not [m for m in APP_FORBIDDEN if _loaded(modules, m)]
+
+    @pytest.mark.perf_budget
+    def test_first_render_time_budget(self):
+        # Meilleur de 3 (comme timeit) : insensible aux pics de charge ponctuels
+        app_ms = min(_importtime(["-c", _app_top_level_imports()])[1] for _ in range(3))
+        reference_ms = min(_importtime(["-c", APP_REFERENCE_IMPORTS])[1] for _ in range(3))
+        assert app_ms < APP_FIRST_RENDER_BUDGET_RATIO * reference_ms
+
+
+class TestLazyPackages:
+    """Les exports paresseux des packages restent résolvables."""
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_all_exports_resolve(self, package):
+        module = importlib.import_module(package)
+        for name in getattr(module, "__all__", ()):
+            assert getattr(module, name) is not None, f"{package}.{name}"
+
+    def test_unknown_attribute_raises(self):
+        module = importlib.import_module("src.ui")
+        with pytest.raises(AttributeError):
+            _ = module.does_not_exist
+
+    def test_page_router_loads_page_on_demand(self):
+        from src.app.page_router import lazy_page_renderer, load_page_renderer
+        from src.ui.pages.settings import render_settings_page
+
+        assert load_page_renderer("render_settings_page") is render_settings_page
+        assert lazy_page_renderer("render_match_view").__name__ == "render_match_view"
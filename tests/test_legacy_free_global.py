@@ -68,6 +68,7 @@ class TestSprintTargetsMixinsSplit:
             "_roster_loader.py",
             "_materialized_views.py",
             "_antagonists_repo.py",
+            "_archives.py",
             "_arrow_bridge.py",
         ],
     )
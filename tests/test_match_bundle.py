@@ -0,0 +1,139 @@
+"""
+Tests des bundles de la vue Match (chargement groupé, cache et préchargement).
+(Tests for match-view bundles: batched loading, cache and prefetch)
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+
+import duckdb
+import polars as pl
+import pytest
+
+from src.data.repositories import _match_bundle
+from src.data.repositories.duckdb_repo import DuckDBRepository
+from src.ui.pages.match_view_helpers import neighbor_match_ids
+
+XUID = "2535423456789"
+MATCH_IDS = ["bundle-m1", "bundle-m2", "bundle-m3"]
+
+
+@pytest.fixture
+def player_db(tmp_path):
+    db_path = tmp_path / "players" / "Tester" / "stats.duckdb"
+    db_path.parent.mkdir(parents=True)
+    conn = duckdb.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE match_stats (
+            match_id VARCHAR PRIMARY KEY, start_time TIMESTAMP,
+            team_id INTEGER, team_mmr FLOAT, enemy_mmr FLOAT
+        )
+    """)
+    conn.execute(
+        "CREATE TABLE medals_earned (match_id VARCHAR, medal_name_id BIGINT, count SMALLINT)"
+    )
+    conn.execute("""
+        CREATE TABLE highlight_events (
+            match_id VARCHAR, event_type VARCHAR, time_ms INTEGER, xuid VARCHAR,
+            gamertag VARCHAR, type_hint INTEGER, raw_json VARCHAR
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE personal_score_awards (
+            match_id VARCHAR, xuid VARCHAR, award_name VARCHAR, award_category VARCHAR,
+            award_count INTEGER, award_score INTEGER, created_at TIMESTAMP
+        )
+    """)
+    start = datetime(2025, 6, 1, 20, 0)
+    for i, mid in enumerate(MATCH_IDS):
+        conn.execute(
+            "INSERT INTO match_stats VALUES (?, ?, 0, ?, 1480.0)",
+            [mid, start + timedelta(minutes=15 * i), 1500.0 + i],
+        )
+        conn.execute("INSERT INTO medals_earned VALUES (?, 1001, ?)", [mid, i + 1])
+        conn.execute(
+            "INSERT INTO highlight_events VALUES (?, 'kill', ?, ?, 'Tester', 0, '{\"extra\": 1}')",
+            [mid, 1000 * i, XUID],
+        )
+        conn.execute(
+            "INSERT INTO personal_score_awards VALUES (?, ?, 'Kill', 'kill', 3, 300, NULL)",
+            [mid, XUID],
+        )
+    conn.close()
+    _match_bundle.clear_match_bundle_cache()
+    yield db_path
+    _match_bundle.clear_match_bundle_cache()
+
+
+class TestLoadMatchBundles:
+    """Les bundles groupés reproduisent les chargeurs par match."""
+
+    def test_bundles_match_individual_loaders(self, player_db):
+        with DuckDBRepository(player_db, XUID) as repo:
+            bundles = repo.load_match_bundles(MATCH_IDS[:2] + ["absent"])
+            mmr = repo.load_match_mmr_batch(MATCH_IDS[:2])
+
+            for mid in MATCH_IDS[:2]:
+                bundle = bundles[mid]
+                assert (bundle.team_mmr, bundle.enemy_mmr) == mmr[mid]
+                assert bundle.medals == repo.load_match_medals(mid)
+                assert bundle.rosters == repo.load_match_rosters(mid)
+                assert bundle.highlight_events[0]["extra"] == 1
+                assert bundle.gamertags == {XUID: "Tester"}
+                assert bundle.personal_scores["match_id"].to_list() == [mid]
+
+        absent = bundles["absent"]
+        assert absent.medals == [] and absent.personal_scores.is_empty()
+        assert absent.player_match_result()["team_mmr"] is None
+
+
+class TestMatchBundleCache:
+    """Cache LRU invalidé par les écritures et préchargement des voisins."""
+
+    @staticmethod
+    def _wait_prefetch(count: int) -> None:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and (
+            len(_match_bundle._bundle_cache) < count or _match_bundle._prefetch_pending
+        ):
+            time.sleep(0.02)
+
+    def test_cache_prefetch_and_invalidation(self, player_db):
+        with DuckDBRepository(player_db, XUID) as repo:
+            first = _match_bundle.get_match_bundle(repo, MATCH_IDS[1], prefetch=MATCH_IDS)
+            assert first is not None and first.medals == [{"name_id": 1001, "count": 2}]
+            assert _match_bundle.get_match_bundle(repo, MATCH_IDS[1]) is first
+
+            # Les voisins arrivent dans le cache via le thread d'arrière-plan
+            self._wait_prefetch(3)
+        assert {key[2] for key in _match_bundle._bundle_cache} == set(MATCH_IDS)
+
+        conn = duckdb.connect(str(player_db))
+        conn.execute("UPDATE medals_earned SET count = 9")
+        conn.close()
+        with DuckDBRepository(player_db, XUID) as repo:
+            refreshed = _match_bundle.get_match_bundle(repo, MATCH_IDS[1], prefetch=MATCH_IDS)
+            assert refreshed is not first
+            assert refreshed.medals == [{"name_id": 1001, "count": 9}]
+
+            # Les voisins en cache mais périmés sont rechargés par le préchargement
+            self._wait_prefetch(3)
+        state = _match_bundle._bundle_state(repo._player_db_path, repo._shared_db_path)
+        for mid in MATCH_IDS:
+            cached = _match_bundle._cache_get(_match_bundle._cache_key(repo, mid), state)
+            assert cached is not None and cached.medals == [{"name_id": 1001, "count": 9}]
+
+
+class TestNeighborMatchIds:
+    """Précédent / suivant dans l'historique."""
+
+    def test_neighbors_by_start_time(self):
+        df = pl.DataFrame(
+            {"match_id": ["c", "a", "b"], "start_time": [3, 1, 2]},
+        )
+        assert neighbor_match_ids(df, "b") == ["a", "c"]
+        assert neighbor_match_ids(df, "a") == ["b"]
+        assert neighbor_match_ids(df, "zzz") == []
+        assert neighbor_match_ids(None, "a") == []
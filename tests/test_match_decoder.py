@@ -0,0 +1,108 @@
+"""
+Tests du décodeur MatchStats en une passe.
+(Tests for the single-pass MatchStats decoder)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from src.data.sync import transformers
+from src.data.sync.match_decoder import active_scan, decode_match, scan_match
+
+XUID = "2535423456789"
+
+
+def _player(xuid: str, gamertag: str, team: int, kills: int) -> dict[str, Any]:
+    return {
+        "PlayerId": f"xuid({xuid})",
+        "PlayerGamertag": gamertag,
+        "Outcome": 2 if team == 0 else 3,
+        "LastTeamId": team,
+        "Rank": 1,
+        "PlayerTeamStats": [
+            {
+                "Stats": {
+                    "CoreStats": {
+                        "Kills": kills,
+                        "Deaths": 10,
+                        "Assists": 5,
+                        "Accuracy": 0.5,
+                        "Score": 2000,
+                        "PersonalScore": 2000,
+                        "Medals": [{"NameId": 1001, "Count": 2}],
+                        "PersonalScores": [
+                            {"NameId": 3001, "Count": kills, "TotalPersonalScoreAwarded": 100}
+                        ],
+                    }
+                }
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def match_json() -> dict[str, Any]:
+    return {
+        "MatchId": "decoder-match-001",
+        "MatchInfo": {
+            "StartTime": "2024-06-15T18:30:00Z",
+            "Duration": "PT12M30S",
+            "Playlist": {"AssetId": "playlist-ranked", "PublicName": "Ranked Arena"},
+            "MapVariant": {"AssetId": "map-recharge", "PublicName": "Recharge"},
+        },
+        "Teams": [{"TeamId": 0, "TotalPoints": 50}, {"TeamId": 1, "TotalPoints": 47}],
+        "Players": [
+            _player(XUID, "Chocoboflor", 0, 20),
+            _player("2535498765432", "Rival", 1, 15),
+            "joueur-invalide",
+        ],
+    }
+
+
+class TestScanMatch:
+    """Index des joueurs construit en un seul parcours."""
+
+    def test_xuids_and_views(self, match_json):
+        scan = scan_match(match_json)
+
+        assert scan.xuids == transformers.extract_xuids_from_match(match_json)
+        assert [v.xuid for v in scan.players] == [XUID, "2535498765432"]
+        assert scan.find(XUID).obj is match_json["Players"][0]
+        assert scan.view(dict(match_json["Players"][0])) is None  # copie : pas la même identité
+        assert scan.players[1].core_stats["Kills"] == 15
+
+
+class TestDecodeMatch:
+    """decode_match produit exactement les lignes des extracteurs séparés."""
+
+    def test_matches_separate_extractors(self, match_json):
+        decoded = decode_match(match_json, XUID)
+
+        assert decoded.match_id == "decoder-match-001"
+        assert decoded.match_row == transformers.transform_match_stats(match_json, XUID)
+        assert decoded.registry == transformers.extract_match_registry_data(match_json)
+        assert decoded.participants == transformers.extract_participants(match_json)
+        assert decoded.all_medals == transformers.extract_all_medals(match_json)
+        assert decoded.medals == transformers.extract_medals(match_json, XUID)
+        assert [(a.xuid, a.gamertag) for a in decoded.aliases] == [
+            (a.xuid, a.gamertag) for a in transformers.extract_aliases(match_json)
+        ]
+        assert decoded.personal_scores == transformers.extract_personal_score_awards(
+            match_json, XUID
+        )
+        assert active_scan() is None
+
+    def test_helpers_read_the_scan(self, match_json):
+        scan = scan_match(match_json)
+        # Les helpers lisent la vue (pas de nouvelle recherche dans le JSON)
+        scan.players[0].core_stats = {**scan.players[0].core_stats, "Kills": 99}
+
+        decoded = decode_match(scan, XUID, with_registry=False, with_aliases=False)
+
+        assert decoded.match_row.kills == 99
+        assert decoded.registry is None and decoded.aliases == []
+        # Hors décodage, les extracteurs gardent leur comportement autonome
+        assert transformers.transform_match_stats(match_json, XUID).kills == 20
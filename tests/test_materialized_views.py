@@ -244,6 +244,41 @@ class TestMaterializedViews:
         # Les résultats doivent être identiques
         assert results1 == results2
 
+    def test_refresh_builds_filter_cube(self, repo):
+        """Test que mv_filter_cube couvre tous les matchs avec les mêmes sommes."""
+        assert repo.get_filter_cube() is None
+        # load_matches_as_polars joint match_participants (rang du joueur)
+        repo._get_connection().execute(
+            "CREATE TABLE match_participants (match_id VARCHAR, xuid VARCHAR, rank INTEGER)"
+        )
+
+        results = repo.refresh_materialized_views()
+        cube = repo.get_filter_cube()
+
+        assert cube is not None
+        assert results["mv_filter_cube"] == cube.height
+        assert cube["matches"].sum() == 50
+        raw = repo.load_matches_as_polars()
+        assert cube["kills_sum"].sum() == raw["kills"].sum()
+        assert cube["time_played_sum"].sum() == pytest.approx(raw["time_played_seconds"].sum())
+
+    def test_filter_cube_ignored_when_match_stats_changed(self, repo):
+        """Test qu'un cube construit avant une écriture dans match_stats n'est plus servi."""
+        repo._get_connection().execute(
+            "CREATE TABLE match_participants (match_id VARCHAR, xuid VARCHAR, rank INTEGER)"
+        )
+        repo.refresh_materialized_views()
+        assert repo.get_filter_cube() is not None
+
+        # Même nombre de matchs, contenu différent : le cube est en retard
+        repo._get_connection().execute(
+            "UPDATE match_stats SET kills = kills + 1 WHERE match_id = 'match_0000'"
+        )
+        assert repo.get_filter_cube() is None
+
+        repo.refresh_materialized_views()
+        assert repo.get_filter_cube() is not None
+
     def test_empty_tables_before_refresh(self, repo):
         """Test que les méthodes retournent des listes/dicts vides avant refresh."""
         # Avant refresh, les tables n'existent pas
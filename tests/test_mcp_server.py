@@ -0,0 +1,144 @@
+"""
+Tests du serveur MCP (boucle JSON-RPC concurrente).
+(Tests for the concurrent MCP server loop)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+from src.ai.mcp_server import LatencyHistogram, MCPServer, serve
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _FakeKB:
+    """Base factice : indexation lente, recherche rapide, compte la concurrence."""
+
+    def __init__(self, index_delay: float = 0.3) -> None:
+        self.warmed = False
+        self.index_delay = index_delay
+        self._lock = threading.Lock()
+        self.indexing = 0
+        self.max_indexing = 0
+
+    def warm(self) -> None:
+        self.warmed = True
+
+    def search(self, query: str, top_k: int = 5):
+        return [SimpleNamespace(content=query, source="fake", score=1.0, metadata={})]
+
+    def index_file(self, path) -> int:
+        with self._lock:
+            self.indexing += 1
+            self.max_indexing = max(self.max_indexing, self.indexing)
+        time.sleep(self.index_delay)
+        with self._lock:
+            self.indexing -= 1
+        return 1
+
+
+def _call(request_id: int, name: str, **arguments) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }
+
+
+def _serve(server: MCPServer, requests: list[dict | None]) -> list[dict]:
+    """Rejoue des requêtes (None = pause de 50 ms) et retourne les réponses reçues."""
+    inbox: queue.Queue = queue.Queue()
+    for request in requests:
+        inbox.put(request)
+    inbox.put("EOF")
+    responses: list[dict] = []
+
+    def read_request():
+        while True:
+            item = inbox.get()
+            if item is None:
+                time.sleep(0.05)
+                continue
+            return None if item == "EOF" else item
+
+    _run(serve(server, read_request, responses.append))
+    return responses
+
+
+class TestConcurrentServe:
+    """Traitement concurrent des requêtes."""
+
+    def test_search_not_blocked_by_indexing(self, tmp_path):
+        kb = _FakeKB()
+        server = MCPServer(kb_factory=lambda: kb)
+        doc = tmp_path / "doc.md"
+        doc.write_text("x")
+
+        responses = _serve(
+            server,
+            [
+                _call(1, "index_file", file_path=str(doc)),
+                _call(2, "index_file", file_path=str(doc)),
+                None,
+                _call(3, "search_knowledge", query="spartan"),
+            ],
+        )
+
+        assert [r["id"] for r in responses] == [3, 1, 2]
+        assert kb.warmed
+        # Les mutations de l'index sont sérialisées
+        assert kb.max_indexing == 1
+        result = json.loads(responses[0]["result"]["content"][0]["text"])
+        assert result["results"][0]["content"] == "spartan"
+
+    def test_stats_tool_and_errors(self):
+        server = MCPServer(kb_factory=lambda: _FakeKB())
+
+        responses = _serve(
+            server,
+            [
+                {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                _call(1, "search_knowledge", query="a"),
+                _call(2, "unknown_tool"),
+                None,
+                _call(3, "stats"),
+            ],
+        )
+
+        by_id = {r["id"]: r for r in responses}
+        assert len(responses) == 3  # pas de réponse aux notifications
+        assert by_id[2]["error"]["code"] == -32603
+        stats = json.loads(by_id[3]["result"]["content"][0]["text"])
+        assert stats["kb_ready"] is True
+        assert stats["tools"]["search_knowledge"]["count"] == 1
+        assert stats["tools"]["unknown_tool"]["errors"] == 1
+        assert any(t["name"] == "stats" for t in server.get_tools())
+
+
+class TestLatencyHistogram:
+    """Histogramme de latence par outil."""
+
+    def test_quantiles(self):
+        h = LatencyHistogram()
+        for ms in [0.5] * 90 + [300] * 10:
+            h.record(ms)
+
+        data = h.to_dict()
+        assert data["count"] == 100
+        assert data["p50_ms"] == 1.0
+        assert data["p95_ms"] == 500.0
+        assert data["buckets"] == {"<=1ms": 90, "<=500ms": 10}
@@ -72,6 +72,7 @@ def test_resolver_init_db_not_exists(monkeypatch: pytest.MonkeyPatch) -> None:
     with patch("pathlib.Path.exists", return_value=False):
         resolver = cls("/nonexistent/metadata.duckdb")
         assert resolver._conn is None
+        assert resolver.connected is False
         resolver.close()
 
 
@@ -89,6 +90,7 @@ def test_resolver_init_db_exists(monkeypatch: pytest.MonkeyPatch) -> None:
     ):
         resolver = cls("/fake/metadata.duckdb")
         assert resolver._conn is not None
+        assert resolver.connected is True
         resolver.close()
 
 
@@ -0,0 +1,260 @@
+"""
+Tests des segments Parquet immuables (writer append-only, manifeste, compaction).
+(Tests for immutable Parquet segments)
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+import pytest
+
+from src.data.domain.models.match import MatchFact, MatchFactInput
+from src.data.domain.models.medal import MedalAward
+from src.data.infrastructure.parquet.reader import ParquetReader
+from src.data.infrastructure.parquet.segments import MANIFEST_FILENAME, load_manifest
+from src.data.infrastructure.parquet.writer import ParquetWriter
+
+XUID = "1234567890"
+BASE = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _facts(start: int, stop: int, base: datetime = BASE) -> list[MatchFact]:
+    return [
+        MatchFact.from_input(
+            MatchFactInput(
+                match_id=f"match-{i:03d}",
+                xuid=XUID,
+                start_time=base + timedelta(hours=i),
+                kills=i % 20,
+                deaths=5,
+                outcome=2,
+            )
+        )
+        for i in range(start, stop)
+    ]
+
+
+def _partition(warehouse, table="match_facts", year=2025, month=1):
+    return warehouse / table / f"player={XUID}" / f"year={year}" / f"month={month:02d}"
+
+
+class TestSegmentWrites:
+    """Écritures append-only par segments."""
+
+    def test_append_adds_segment_without_rewrite(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 10))
+        part = _partition(tmp_path)
+        first = {p.name for p in part.glob("*.parquet")}
+        first_mtimes = {p.name: p.stat().st_mtime_ns for p in part.glob("*.parquet")}
+
+        writer.write_match_facts(_facts(10, 20))
+
+        files = {p.name for p in part.glob("*.parquet")}
+        assert len(files) == 2
+        assert first <= files
+        for name, mtime in first_mtimes.items():
+            assert (part / name).stat().st_mtime_ns == mtime
+        assert all(name.startswith("part-") for name in files)
+
+    def test_manifest_stats(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 5))
+
+        data = json.loads((_partition(tmp_path) / MANIFEST_FILENAME).read_text())
+        (segment,) = data["segments"]
+        assert segment["rows"] == 5
+        assert segment["match_ids"] == 5
+        assert datetime.fromisoformat(segment["min_start_time"]) == BASE
+        assert datetime.fromisoformat(segment["max_start_time"]) == BASE + timedelta(hours=4)
+
+    def test_duplicate_match_ids_are_skipped(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        assert writer.write_match_facts(_facts(0, 10)) == 10
+        assert writer.write_match_facts(_facts(5, 15)) == 5
+        assert writer.write_match_facts(_facts(0, 15)) == 0
+
+        df = ParquetReader(tmp_path).read_match_facts(XUID)
+        assert df["match_id"].n_unique() == len(df) == 15
+
+    def test_no_tmp_file_left(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 3))
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_overwrite_replaces_partition(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 10))
+        writer.write_match_facts(_facts(10, 20))
+
+        writer.write_match_facts(_facts(0, 3), append=False)
+
+        part = _partition(tmp_path)
+        assert len(list(part.glob("*.parquet"))) == 1
+        assert ParquetReader(tmp_path).count_rows(XUID) == 3
+
+    def test_legacy_data_file_is_adopted(self, tmp_path):
+        part = _partition(tmp_path)
+        part.mkdir(parents=True)
+        legacy = ParquetWriter(tmp_path)._prepare_match_facts_schema(
+            pl.DataFrame([f.model_dump() for f in _facts(0, 4)])
+        )
+        legacy.write_parquet(part / "data.parquet")
+
+        writer = ParquetWriter(tmp_path)
+        assert writer.write_match_facts(_facts(2, 6)) == 2
+
+        manifest = load_manifest(part)
+        assert {s.file for s in manifest.segments} >= {"data.parquet"}
+        assert ParquetReader(tmp_path).count_rows(XUID) == 6
+
+    def test_medals_segments_dedup_on_medal_key(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        medals = [MedalAward.from_raw("m1", XUID, BASE, nid, 1) for nid in (1, 2)]
+        assert writer.write_medals(medals) == 2
+        assert writer.write_medals([MedalAward.from_raw("m1", XUID, BASE, 3, 1)]) == 1
+        assert writer.write_medals(medals) == 0
+
+        df = ParquetReader(tmp_path).read_medals(XUID, match_ids=["m1"])
+        assert sorted(df["medal_name_id"].to_list()) == [1, 2, 3]
+
+
+class TestSegmentPruning:
+    """Pruning des segments par le manifeste à la lecture."""
+
+    def test_read_range_skips_non_overlapping_segments(self, tmp_path, monkeypatch):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 5))
+        writer.write_match_facts(_facts(100, 105))
+
+        read_files: list[int] = []
+        original = pl.read_parquet
+
+        def spy(source, *args, **kwargs):
+            read_files.append(len(source) if isinstance(source, list) else 1)
+            return original(source, *args, **kwargs)
+
+        monkeypatch.setattr(pl, "read_parquet", spy)
+
+        df = ParquetReader(tmp_path).read_match_facts(
+            XUID,
+            start_date=BASE + timedelta(hours=99),
+            end_date=BASE + timedelta(hours=200),
+            columns=["match_id", "kills"],
+        )
+
+        assert read_files == [1]
+        assert df.columns == ["match_id", "kills"]
+        assert df["match_id"].to_list() == [f"match-{i:03d}" for i in range(100, 105)]
+
+    def test_count_rows_from_manifest(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 7))
+        writer.write_match_facts(_facts(7, 9))
+        assert ParquetReader(tmp_path).count_rows(XUID) == 9
+
+
+class TestCompaction:
+    """Fusion des segments."""
+
+    def test_compact_merges_segments(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        for i in range(4):
+            writer.write_match_facts(_facts(i * 5, i * 5 + 5))
+
+        stats = writer.compact(min_segments=3)
+
+        part = _partition(tmp_path)
+        assert stats == {"partitions": 1, "segments_removed": 4}
+        assert len(list(part.glob("*.parquet"))) == 1
+        assert len(load_manifest(part).segments) == 1
+        assert ParquetReader(tmp_path).count_rows(XUID) == 20
+
+    def test_compact_below_threshold_noop(self, tmp_path):
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 5))
+        writer.write_match_facts(_facts(5, 10))
+        assert writer.compact(min_segments=3) == {"partitions": 0, "segments_removed": 0}
+
+    def test_background_compaction_on_threshold(self, tmp_path):
+        writer = ParquetWriter(tmp_path, compaction_threshold=3)
+        for i in range(3):
+            writer.write_match_facts(_facts(i * 5, i * 5 + 5))
+        writer.wait_for_compaction(timeout=30)
+
+        assert len(load_manifest(_partition(tmp_path)).segments) == 1
+        assert ParquetReader(tmp_path).count_rows(XUID) == 15
+
+    def test_undeletable_segment_is_never_reread(self, tmp_path, monkeypatch):
+        from pathlib import Path
+
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 5))
+        writer.write_match_facts(_facts(5, 10))
+
+        original_unlink = Path.unlink
+
+        def locked_unlink(self, *args, **kwargs):
+            if self.name.startswith("part-"):
+                raise PermissionError("fichier verrouillé")
+            return original_unlink(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "unlink", locked_unlink)
+        writer.compact(min_segments=2)
+        assert ParquetReader(tmp_path).count_rows(XUID) == 10
+        assert len(ParquetReader(tmp_path).read_match_facts(XUID)) == 10
+
+        monkeypatch.setattr(Path, "unlink", original_unlink)
+        manifest = load_manifest(_partition(tmp_path))
+        assert manifest.obsolete == []
+        assert len(list(_partition(tmp_path).glob("*.parquet"))) == 1
+
+    def test_interrupted_compaction_never_duplicates(self, tmp_path, monkeypatch):
+        from src.data.infrastructure.parquet import segments
+
+        writer = ParquetWriter(tmp_path)
+        writer.write_match_facts(_facts(0, 5))
+        writer.write_match_facts(_facts(5, 10))
+        part = _partition(tmp_path)
+        before = (part / MANIFEST_FILENAME).read_text()
+
+        def crash(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        # Interruption entre l'écriture du segment fusionné et la bascule du manifeste
+        monkeypatch.setattr(segments, "retire_segments", crash)
+        with pytest.raises(KeyboardInterrupt):
+            segments.compact_partition(part, ["match_id"])
+        monkeypatch.undo()
+
+        assert len(list(part.glob("*.parquet"))) == 3
+        reader = ParquetReader(tmp_path)
+        assert reader.count_rows(XUID) == 10
+        assert len(reader.read_match_facts(XUID)) == 10
+        assert len(json.loads(before)["segments"]) == 2
+        assert len(load_manifest(part, reconcile=False).pending) == 1
+
+        # La réconciliation d'un écrivain supprime le segment non publié
+        manifest = load_manifest(part)
+        assert manifest.pending == [] and len(manifest.segments) == 2
+        assert len(list(part.glob("*.parquet"))) == 2
+        assert writer.compact(min_segments=2) == {"partitions": 1, "segments_removed": 2}
+        assert len(ParquetReader(tmp_path).read_match_facts(XUID)) == 10
+
+
+@pytest.mark.parametrize("month_offset", [0, 40])
+def test_query_engine_reads_segments(tmp_path, month_offset):
+    """Le QueryEngine (glob *.parquet) voit tous les segments."""
+    from src.data.query.engine import QueryEngine
+
+    writer = ParquetWriter(tmp_path)
+    base = BASE + timedelta(days=month_offset)
+    writer.write_match_facts(_facts(0, 5, base))
+    writer.write_match_facts(_facts(5, 8, base))
+
+    with QueryEngine(tmp_path) as engine:
+        rows = engine.query_match_facts(XUID, select="COUNT(*) AS n")
+    assert rows[0]["n"] == 8
@@ -5,19 +5,28 @@ Teste les fonctions de cache d'assets joueur sans accès réseau.
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import json
 import os
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from src.ui import player_assets
 from src.ui.player_assets import (
     _hashed_name,
     _url_ext,
     download_image_to_cache,
+    download_images_to_cache_async,
     ensure_local_image_path,
     file_to_data_url,
     get_player_assets_cache_dir,
     is_http_url,
+    prefetch_images_in_background,
     resolve_local_image_path,
+    resolve_or_prefetch_images,
 )
 
 # ============================================================================
@@ -194,6 +203,188 @@ class TestDownloadImageToCache:
         assert os.path.exists(path)
 
 
+# ============================================================================
+# download_images_to_cache (lot)
+# ============================================================================
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes, content_type: str) -> None:
+        self._body = body
+        self.headers = {"content-type": content_type}
+
+    def raise_for_status(self) -> None:
+        if self._body is None:
+            raise RuntimeError("404")
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _FakeSession:
+    """Session aiohttp factice: réponses par URL, comptage des appels et de la concurrence."""
+
+    def __init__(self, routes: dict[str, tuple[bytes | None, str]]) -> None:
+        self.routes = routes
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, headers=None):
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session.calls.append(url)
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                await asyncio.sleep(0.01)
+                body, ctype = session.routes.get(url, (None, ""))
+                return _FakeResponse(body, ctype)
+
+            async def __aexit__(self, *exc):
+                session.in_flight -= 1
+                return False
+
+        return _Ctx()
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def assets_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.ui.player_assets.get_player_assets_cache_dir", lambda: str(tmp_path))
+    monkeypatch.delenv("SPNKR_CLEARANCE_TOKEN", raising=False)
+    monkeypatch.delenv("SPNKR_SPARTAN_TOKEN", raising=False)
+    return tmp_path
+
+
+class TestDownloadImagesToCache:
+    def test_bounded_concurrency_and_cache_skip(self, assets_dir):
+        urls = [f"https://example.com/img{i}.png" for i in range(8)]
+        session = _FakeSession({u: (b"\x89PNG" + u.encode(), "image/png") for u in urls})
+        cached_url = urls[0]
+        (assets_dir / _hashed_name(cached_url, prefix="emblem")).write_bytes(b"old")
+
+        items = [(u, "emblem") for u in urls] + [(urls[1], "emblem"), ("not_a_url", "emblem")]
+        results = _run(download_images_to_cache_async(items, concurrency=3, session=session))
+
+        assert len(results) == 9
+        assert results[("not_a_url", "emblem")][0] is False
+        assert all(results[(u, "emblem")][0] for u in urls)
+        # Déjà en cache: pas de requête; doublon: une seule requête
+        assert cached_url not in session.calls
+        assert sorted(session.calls) == sorted(urls[1:])
+        assert 1 < session.max_in_flight <= 3
+        # Écriture atomique: aucun fichier temporaire résiduel
+        assert not [p for p in os.listdir(assets_dir) if p.startswith(".tmp_")]
+        assert (assets_dir / _hashed_name(cached_url, prefix="emblem")).read_bytes() == b"old"
+
+    def test_force_and_manifest_redirect(self, assets_dir):
+        manifest_url = "https://example.com/manifest"
+        image_url = "https://example.com/final.png"
+        session = _FakeSession(
+            {
+                manifest_url: (
+                    json.dumps({"Media": {"Url": image_url}}).encode(),
+                    "application/json",
+                ),
+                image_url: (b"\x89PNG final", "image/png"),
+            }
+        )
+        (assets_dir / _hashed_name(manifest_url, prefix="backdrop")).write_bytes(b"old")
+
+        results = _run(
+            download_images_to_cache_async(
+                [(manifest_url, "backdrop"), ("https://example.com/404.png", "nameplate")],
+                force=True,
+                session=session,
+            )
+        )
+
+        ok, _msg, path = results[(manifest_url, "backdrop")]
+        assert ok and path == str(assets_dir / _hashed_name(image_url, prefix="backdrop"))
+        assert Path(path).read_bytes() == b"\x89PNG final"
+        assert results[("https://example.com/404.png", "nameplate")][0] is False
+
+
+    def test_manifest_redirect_is_cached_for_requested_url(self, assets_dir, monkeypatch):
+        manifest_url = "https://example.com/emblem-manifest"
+        image_url = "https://example.com/emblem-final.png"
+        session = _FakeSession(
+            {
+                manifest_url: (json.dumps({"Url": image_url}).encode(), "application/json"),
+                image_url: (b"\x89PNG final", "image/png"),
+            }
+        )
+        monkeypatch.setattr(
+            player_assets,
+            "prefetch_images_in_background",
+            lambda items, **_kw: _run(download_images_to_cache_async(items, session=session)),
+        )
+
+        assert resolve_or_prefetch_images([(manifest_url, "emblem")], download_enabled=True) == [
+            None
+        ]
+        assert session.calls == [manifest_url, image_url]
+
+        # Rendu suivant : l'image finale est servie sans nouveau téléchargement
+        paths = resolve_or_prefetch_images([(manifest_url, "emblem")], download_enabled=True)
+        assert paths == [str(assets_dir / _hashed_name(image_url, prefix="emblem"))]
+        assert session.calls == [manifest_url, image_url]
+        assert resolve_local_image_path(manifest_url) == paths[0]
+
+
+class TestBackgroundPrefetch:
+    def test_prefetch_runs_once_per_request(self, assets_dir, monkeypatch):
+        calls: list[list] = []
+
+        def fake_bulk(items, **kwargs):
+            calls.append(list(items))
+            out = {}
+            for url, prefix in items:
+                path = assets_dir / _hashed_name(url, prefix=prefix)
+                path.write_bytes(b"\x89PNG")
+                out[(url, prefix)] = (True, "", str(path))
+            return out
+
+        monkeypatch.setattr(player_assets, "download_images_to_cache", fake_bulk)
+        url = "https://example.com/prefetch_once.png"
+
+        fut = prefetch_images_in_background([(url, "emblem"), (url, "emblem")])
+        assert fut is not None
+        fut.result(timeout=5)
+        # Déjà en cache: rien à planifier
+        assert prefetch_images_in_background([(url, "emblem")]) is None
+        assert calls == [[(url, "emblem")]]
+
+    def test_resolve_or_prefetch_does_not_block(self, assets_dir, monkeypatch):
+        scheduled: list = []
+        monkeypatch.setattr(
+            player_assets,
+            "prefetch_images_in_background",
+            lambda items, **_kw: scheduled.extend(items),
+        )
+        cached_url = "https://example.com/have.png"
+        cached = assets_dir / _hashed_name(cached_url, prefix="emblem")
+        cached.write_bytes(b"\x89PNG")
+        missing_url = "https://example.com/missing.png"
+
+        paths = resolve_or_prefetch_images(
+            [(cached_url, "emblem"), (missing_url, "backdrop"), (None, "nameplate")],
+            download_enabled=True,
+        )
+
+        assert paths == [str(cached), None, None]
+        assert scheduled == [(missing_url, "backdrop")]
+
+
 # ============================================================================
 # ensure_local_image_path
 # ============================================================================
@@ -400,6 +400,100 @@ class TestTrendAnalyzer:
         assert "trend" in summary["kda"]
 
 
+class TestQueryResultCache:
+    """Tests du cache de résultats partagé du QueryEngine."""
+
+    @staticmethod
+    def _write(path, kills):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.table({"kills": kills}), path)
+
+    @pytest.fixture
+    def warehouse(self, tmp_path):
+        warehouse = tmp_path / "warehouse"
+        self._write(
+            warehouse / "match_facts" / "player=1" / "year=2024" / "month=01" / "a.parquet",
+            [1, 2, 3],
+        )
+        return warehouse
+
+    def test_hit_shared_between_engines(self, warehouse):
+        """Une requête identique (à l'indentation près) est servie par le cache."""
+        from src.data.query.engine import QueryEngine
+        from src.data.query.result_cache import QueryResultCache
+
+        cache = QueryResultCache()
+        glob = warehouse / "match_facts" / "player=1" / "**" / "*.parquet"
+        sql = f"SELECT SUM(kills) AS total FROM read_parquet('{glob}')"
+
+        with QueryEngine(warehouse, result_cache=cache) as engine:
+            first = engine.execute(sql)
+        with QueryEngine(warehouse, result_cache=cache) as engine:
+            second = engine.execute("  " + sql.replace(" FROM", "\n    FROM"))
+            df = engine.execute(sql, return_type="polars")
+
+        assert first == second == [{"total": 6}]
+        assert isinstance(first[0]["total"], int)
+        assert df["total"].to_list() == [6]
+        stats = cache.stats()
+        assert (stats.misses, stats.hits, stats.entries) == (1, 2, 1)
+
+    def test_parquet_change_invalidates(self, warehouse):
+        """Un nouveau fichier Parquet change la génération des données."""
+        from src.data.query.engine import QueryEngine
+        from src.data.query.result_cache import QueryResultCache
+
+        cache = QueryResultCache()
+        with QueryEngine(warehouse, result_cache=cache) as engine:
+            sql = "SELECT COUNT(*) AS n FROM {table}"
+            assert engine.execute_with_parquet(sql, "match_facts", "1") == [{"n": 3}]
+            self._write(
+                warehouse / "match_facts" / "player=1" / "year=2024" / "month=01" / "b.parquet", [4]
+            )
+            assert engine.execute_with_parquet(sql, "match_facts", "1") == [{"n": 4}]
+
+        assert cache.stats().hits == 0
+
+    def test_bypass_volatile_and_connection_tables(self, warehouse):
+        """NOW(), random() et les tables de la connexion ne sont pas mises en cache."""
+        from src.data.query.engine import QueryEngine
+        from src.data.query.result_cache import QueryResultCache
+
+        cache = QueryResultCache()
+        with QueryEngine(warehouse, result_cache=cache) as engine:
+            engine.execute("CREATE TABLE t AS SELECT 1 AS x")
+            engine.execute("SELECT random() AS r")
+            engine.execute("SELECT x FROM t")
+            engine.execute("INSERT INTO t VALUES (2)")
+            assert engine.execute("SELECT COUNT(*) AS n FROM t") == [{"n": 2}]
+
+        stats = cache.stats()
+        assert stats.entries == 0
+        assert stats.bypassed == 5
+
+    def test_lru_byte_budget(self):
+        """Le budget en octets évince les entrées les moins récemment lues."""
+        import pyarrow as pa
+
+        from src.data.query.result_cache import QueryResultCache
+
+        table = pa.table({"x": list(range(1000))})
+        cache = QueryResultCache(max_bytes=int(table.nbytes * 2.5))
+        for key in ("a", "b"):
+            cache.put((key,), table)
+        assert cache.get(("a",)) is not None
+        cache.put(("c",), table)
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) is not None
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.bytes <= cache.max_bytes
+
+
 # Exécution des tests si lancé directement
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
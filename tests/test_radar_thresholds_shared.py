@@ -0,0 +1,180 @@
+"""
+Tests des seuils radar précalculés dans shared_matches.duckdb.
+(Tests for shared-DB precomputed radar thresholds)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+import src.visualization.participation_radar as radar
+from src.data.sync.radar_thresholds import (
+    RADAR_THRESHOLDS_TABLE,
+    backfill_radar_totals,
+    read_radar_maxima,
+    sync_player_radar_totals,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    radar._global_thresholds_cache = None
+    radar._shared_thresholds_cache.clear()
+    yield
+    radar._global_thresholds_cache = None
+    radar._shared_thresholds_cache.clear()
+
+
+def _player_db(path: Path, xuid: str, matches: list[tuple]) -> Path:
+    """matches : (match_id, pair_name, time_played_seconds, [(category, score), ...])."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = duckdb.connect(str(path))
+    conn.execute(
+        "CREATE TABLE match_stats (match_id VARCHAR PRIMARY KEY, pair_name VARCHAR, "
+        "time_played_seconds INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE personal_score_awards (match_id VARCHAR, xuid VARCHAR, "
+        "award_name VARCHAR, award_category VARCHAR, award_count INTEGER, award_score INTEGER)"
+    )
+    for match_id, pair_name, seconds, awards in matches:
+        conn.execute("INSERT INTO match_stats VALUES (?, ?, ?)", [match_id, pair_name, seconds])
+        for i, (category, score) in enumerate(awards):
+            conn.execute(
+                "INSERT INTO personal_score_awards VALUES (?, ?, ?, ?, 1, ?)",
+                [match_id, xuid, f"a{i}", category, score],
+            )
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    players = tmp_path / "players"
+    _player_db(
+        players / "Alpha" / "stats.duckdb",
+        "x1",
+        [
+            ("m1", "Arena:Slayer", 600, [("kill", 1200), ("assist", 150), ("penalty", -50)]),
+            ("m2", "Arena:CTF", 480, [("kill", 500), ("objective", 900), ("vehicle", 40)]),
+            ("m3", "BTB:CTF", 900, [("kill", 5000), ("objective", 4000)]),
+        ],
+    )
+    _player_db(
+        players / "Bravo" / "stats.duckdb",
+        "x2",
+        [
+            ("m1", "Arena:Slayer", 600, [("kill", 800), ("assist", 400)]),
+            ("m4", "Firefight:Heroic", 1200, [("kill", 9000)]),
+        ],
+    )
+    (tmp_path / "warehouse").mkdir()
+    return tmp_path
+
+
+def _shared(data_dir: Path) -> Path:
+    return data_dir / "warehouse" / "shared_matches.duckdb"
+
+
+class TestParity:
+    """Les seuils précalculés valent ceux du scan historique."""
+
+    def test_backfill_matches_legacy_scan(self, data_dir):
+        legacy = radar.compute_global_radar_thresholds(data_dir / "players")
+        conn = duckdb.connect(str(_shared(data_dir)))
+        added = backfill_radar_totals(conn, data_dir / "players")
+        conn.close()
+        assert added == {"Alpha": 3, "Bravo": 2}
+
+        shared = radar.load_shared_radar_thresholds(_shared(data_dir))
+        assert shared == pytest.approx(legacy)
+        # BTB / Firefight exclus : le meilleur frag vient de m1 (Alpha)
+        assert shared["combat"] == pytest.approx(1200 * 0.85)
+        assert shared["objectifs"] == pytest.approx(1200 * 0.85)
+
+    def test_p99_and_sample_size_stored(self, data_dir):
+        conn = duckdb.connect(str(_shared(data_dir)))
+        backfill_radar_totals(conn, data_dir / "players")
+        rows = {
+            key: (p99, n)
+            for key, p99, n in conn.execute(
+                f"SELECT key, p99_value, sample_size FROM {RADAR_THRESHOLDS_TABLE}"
+            ).fetchall()
+        }
+        conn.close()
+        assert rows["combat"][1] == 3
+        assert 500 < rows["combat"][0] <= 1200
+
+
+class TestIncrementalSync:
+    """Mise à jour après sync d'un joueur."""
+
+    def test_only_new_matches_are_pushed(self, data_dir):
+        player = duckdb.connect(str(data_dir / "players" / "Alpha" / "stats.duckdb"))
+        shared = duckdb.connect(str(_shared(data_dir)))
+        assert sync_player_radar_totals(player, shared) == 3
+        assert sync_player_radar_totals(player, shared) == 0
+
+        player.execute("INSERT INTO match_stats VALUES ('m9', 'Ranked:Slayer', 300)")
+        player.execute(
+            "INSERT INTO personal_score_awards VALUES ('m9', 'x1', 'k', 'kill', 1, 2000)"
+        )
+        assert sync_player_radar_totals(player, shared) == 1
+        player.close()
+        shared.close()
+
+        maxima = read_radar_maxima(_shared(data_dir))
+        assert maxima["combat"] == 2000
+
+    def test_backfilled_awards_refresh_totals(self, data_dir):
+        player = duckdb.connect(str(data_dir / "players" / "Alpha" / "stats.duckdb"))
+        shared = duckdb.connect(str(_shared(data_dir)))
+        player.execute("INSERT INTO match_stats VALUES ('m9', 'Ranked:Slayer', 300)")
+        player.execute("INSERT INTO personal_score_awards VALUES ('m9', 'x1', 'k', 'kill', 1, 0)")
+        assert sync_player_radar_totals(player, shared) == 4
+
+        # Awards du match backfillés après la première insertion
+        player.execute(
+            "INSERT INTO personal_score_awards VALUES ('m9', 'x1', 'k2', 'kill', 1, 2500)"
+        )
+        assert sync_player_radar_totals(player, shared) == 1
+        assert shared.execute(
+            "SELECT kill_score, positive_score FROM radar_match_totals WHERE match_id = 'm9'"
+        ).fetchone() == (2500, 2500)
+        assert sync_player_radar_totals(player, shared) == 0
+        player.close()
+        shared.close()
+
+        assert read_radar_maxima(_shared(data_dir))["combat"] == 2500
+
+    def test_read_path_uses_shared_table(self, data_dir, monkeypatch):
+        conn = duckdb.connect(str(_shared(data_dir)))
+        backfill_radar_totals(conn, data_dir / "players")
+        conn.close()
+
+        def _no_scan(*_args, **_kwargs):
+            raise AssertionError("scan des DBs joueurs inattendu")
+
+        monkeypatch.setattr(radar, "compute_global_radar_thresholds", _no_scan)
+        db_path = data_dir / "players" / "Alpha" / "stats.duckdb"
+        first = radar.get_radar_thresholds(db_path)
+        assert radar.get_radar_thresholds(db_path) == first
+
+
+class TestFallback:
+    """Sans table précalculée, retour au scan des DBs joueurs."""
+
+    def test_missing_shared_falls_back(self, data_dir):
+        db_path = data_dir / "players" / "Alpha" / "stats.duckdb"
+        assert radar.load_shared_radar_thresholds(_shared(data_dir)) is None
+        thresholds = radar.get_radar_thresholds(db_path)
+        assert thresholds["combat"] == pytest.approx(1200 * 0.85)
+
+    def test_empty_table_falls_back(self, data_dir):
+        conn = duckdb.connect(str(_shared(data_dir)))
+        backfill_radar_totals(conn, data_dir / "warehouse")  # aucun joueur
+        conn.close()
+        assert read_radar_maxima(_shared(data_dir)) is None
@@ -510,3 +510,110 @@ class TestDeduplication:
         assert len(all_matches) == 10
 
         repo.close()
+
+
+class TestArchiveCatalog:
+    """Tests du catalogue d'archives (statistiques de footer, pruning, cache)."""
+
+    @staticmethod
+    def _write_archive(archive_dir: Path, name: str, rows: list[tuple[str, str]]) -> None:
+        conn = duckdb.connect(":memory:")
+        values = ", ".join(f"('{mid}', TIMESTAMP '{ts}')" for mid, ts in rows)
+        conn.execute(f"""
+            COPY (
+                SELECT match_id, start_time, 'map1' AS map_id, 'Streets' AS map_name,
+                    10 AS kills, 5 AS deaths, 3 AS assists
+                FROM (VALUES {values}) t(match_id, start_time)
+            ) TO '{archive_dir / name}' (FORMAT PARQUET)
+            """)
+        conn.close()
+
+    def test_register_writes_footer_stats(self, tmp_path: Path):
+        """Le catalogue enregistre lignes et plage de dates depuis le footer."""
+        from src.data.infrastructure.parquet.archive_catalog import ArchiveCatalog
+
+        archive_dir = tmp_path / "archive"
+        archive_dir.mkdir()
+        self._write_archive(
+            archive_dir,
+            "matches_2021.parquet",
+            [("m1", "2021-02-01 10:00:00"), ("m2", "2021-11-30 22:00:00")],
+        )
+
+        catalog = ArchiveCatalog.load(archive_dir)
+        catalog.register("matches_2021.parquet", cutoff_date="2022-01-01T00:00:00")
+        catalog.save()
+
+        data = json.loads((archive_dir / "archive_index.json").read_text(encoding="utf-8"))
+        (entry,) = data["archives"]
+        assert data["generation"] == 1
+        assert entry["row_count"] == 2
+        assert entry["min_start_time"] == "2021-02-01T10:00:00"
+        assert entry["max_start_time"] == "2021-11-30T22:00:00"
+        assert entry["cutoff_date"] == "2022-01-01T00:00:00"
+
+    def test_legacy_index_completed_from_footer(self, temp_archive_dir: Path):
+        """Un index v1 sans statistiques est complété à la lecture."""
+        from src.data.infrastructure.parquet.archive_catalog import ArchiveCatalog
+
+        catalog = ArchiveCatalog.load(temp_archive_dir)
+
+        (entry,) = catalog.entries
+        assert entry.row_count == 2
+        assert entry.created_at == "2024-01-01T00:00:00"
+        assert entry.min_start_time == "2022-05-15T10:00:00"
+
+    def test_files_for_range_prunes_archives(self, tmp_path: Path):
+        """Seules les archives chevauchant la plage sont retenues."""
+        from src.data.infrastructure.parquet.archive_catalog import ArchiveCatalog
+
+        archive_dir = tmp_path / "archive"
+        archive_dir.mkdir()
+        self._write_archive(archive_dir, "matches_2021.parquet", [("a", "2021-06-01 10:00:00")])
+        self._write_archive(archive_dir, "matches_2022.parquet", [("b", "2022-06-01 10:00:00")])
+
+        catalog = ArchiveCatalog.load(archive_dir)
+
+        files = catalog.files_for_range(datetime(2022, 1, 1), datetime(2023, 1, 1))
+        assert [f.name for f in files] == ["matches_2022.parquet"]
+        assert len(catalog.files_for_range(datetime(2021, 6, 1, 10, 0))) == 2
+        # end_date exclue : le match de 10h00 n'est pas dans [.., 10h00[
+        assert catalog.files_for_range(None, datetime(2021, 6, 1, 10, 0)) == []
+
+    def test_repository_reads_only_overlapping_archives(self, temp_player_db: Path):
+        """Le repository n'ouvre pas les archives hors plage."""
+        archive_dir = temp_player_db.parent / "archive"
+        archive_dir.mkdir()
+        self._write_archive(archive_dir, "matches_2021.parquet", [("a", "2021-06-01 10:00:00")])
+        self._write_archive(archive_dir, "matches_2022.parquet", [("b", "2022-06-01 10:00:00")])
+        # Un fichier hors plage et illisible ne doit jamais être ouvert
+        repo = DuckDBRepository(temp_player_db, "xuid123", read_only=True)
+        catalog = repo.get_archive_catalog()
+        (archive_dir / "matches_2021.parquet").write_bytes(b"corrompu")
+
+        df = repo.load_archives_as_polars(
+            start_date=datetime(2022, 1, 1), end_date=datetime(2023, 1, 1), catalog=catalog
+        )
+
+        assert df["match_id"].to_list() == ["b"]
+        repo.close()
+
+    def test_unified_view_cached_per_generation(self, temp_player_db: Path):
+        """La vue unifiée est servie depuis le cache tant que rien ne change."""
+        archive_dir = temp_player_db.parent / "archive"
+        archive_dir.mkdir()
+        self._write_archive(archive_dir, "matches_2021.parquet", [("a", "2021-06-01 10:00:00")])
+        repo = DuckDBRepository(temp_player_db, "xuid123", read_only=True)
+
+        first = repo.load_all_matches_unified()
+        with patch.object(DuckDBRepository, "load_matches", side_effect=AssertionError):
+            second = repo.load_all_matches_unified(start_date=datetime(2023, 1, 1))
+        assert len(first) == 11
+        assert len(second) == 10
+
+        # Nouvelle archive = nouvelle génération → reconstruction
+        self._write_archive(archive_dir, "matches_2020.parquet", [("z", "2020-06-01 10:00:00")])
+        third = repo.load_all_matches_unified()
+        assert len(third) == 12
+        assert third[0].match_id == "z"
+        repo.close()
@@ -0,0 +1,174 @@
+"""
+Tests du découpage de shared_matches.duckdb en partitions par période.
+(Tests for period partitions of shared_matches.duckdb)
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import timedelta
+
+import duckdb
+import pytest
+
+from scripts.benchmark.synthetic import SyntheticSpec, generate_dataset
+from src.data.infrastructure.database.shared_partitions import (
+    PARTITIONED_TABLES,
+    PartitionManifest,
+    attach_shared,
+    detach_shared,
+    partition_dir,
+    split_shared_db,
+)
+from src.data.infrastructure.database.snapshots import publish_snapshot, resolve_read_path
+from src.data.repositories.duckdb_repo import DuckDBRepository
+from src.data.sessions_backfill import get_top_two_teammate_xuids
+
+_COUNTED = (*PARTITIONED_TABLES, "xuid_aliases")
+
+
+@pytest.fixture()
+def dataset(tmp_path):
+    return generate_dataset(tmp_path, SyntheticSpec(matches=120, players=2, overlap=0.5, seed=11))
+
+
+def _counts(shared_db_path, **kwargs) -> dict[str, int]:
+    conn = duckdb.connect(":memory:")
+    try:
+        attach_shared(conn, shared_db_path, **kwargs)
+        return {t: conn.execute(f"SELECT COUNT(*) FROM shared.{t}").fetchone()[0] for t in _COUNTED}
+    finally:
+        conn.close()
+
+
+def _median_start(shared_db_path):
+    conn = duckdb.connect(str(shared_db_path), read_only=True)
+    try:
+        return conn.execute("SELECT quantile_disc(start_time, 0.5) FROM match_registry").fetchone()[
+            0
+        ]
+    finally:
+        conn.close()
+
+
+def _read_views(dataset) -> tuple:
+    player = dataset.players[0]
+    with DuckDBRepository(player.db_path, player.xuid, read_only=True) as repo:
+        teammates = sorted(repo.list_top_teammates(limit=1000))
+        matches = repo.load_matches_as_polars(columns=["match_id"]).height
+    return teammates, matches, get_top_two_teammate_xuids(player.db_path, player.xuid, limit=1000)
+
+
+class TestSplit:
+    """Les lecteurs voient le même shared avant et après découpage."""
+
+    def test_split_is_transparent_to_readers(self, dataset):
+        shared = dataset.shared_db_path
+        before_counts = _counts(shared)
+        before_views = _read_views(dataset)
+        cutoff = _median_start(shared)
+
+        report = split_shared_db(shared, before=cutoff, granularity="quarter")
+
+        moved = report["partitions"]["2022_Q1"]
+        assert 0 < moved < 120
+        assert report["rows_moved"]["match_registry"] == moved
+        assert _counts(shared) == before_counts
+        assert _read_views(dataset) == before_views
+
+        entry = PartitionManifest.load(shared).get("2022_Q1")
+        path = partition_dir(shared) / entry.file
+        assert entry.match_count == moved
+        assert not os.stat(path).st_mode & 0o222
+        conn = duckdb.connect(str(shared), read_only=True)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM match_registry").fetchone()[0] == 120 - moved
+            assert (
+                conn.execute(
+                    "SELECT COUNT(*) FROM match_registry WHERE start_time < ?", [cutoff]
+                ).fetchone()[0]
+                == 0
+            )
+        finally:
+            conn.close()
+
+        # Une plage postérieure à la partition ne l'ouvre pas
+        conn = duckdb.connect(":memory:")
+        try:
+            later = cutoff + timedelta(days=1)
+            assert attach_shared(conn, shared, start=later) == ["shared_hot", "shared"]
+        finally:
+            conn.close()
+
+    def test_split_publishes_shared_snapshot(self, dataset, monkeypatch):
+        monkeypatch.setenv("OPENSPARTAN_DB_SNAPSHOTS", "1")
+        shared = dataset.shared_db_path
+        publish_snapshot(shared)
+        before_counts = _counts(shared, read_path=resolve_read_path(shared))
+
+        split_shared_db(shared, before=_median_start(shared), granularity="quarter")
+
+        # Les matchs déplacés ne sont comptés qu'une fois (snapshot sans eux + partition)
+        assert resolve_read_path(shared) != shared
+        assert _counts(shared, read_path=resolve_read_path(shared)) == before_counts
+
+    def test_late_rows_are_merged_into_closed_partition(self, dataset):
+        shared = dataset.shared_db_path
+        cutoff = _median_start(shared)
+        split_shared_db(shared, before=cutoff, granularity="quarter")
+        before_counts = _counts(shared)
+
+        # Backfill tardif : une ligne de participant d'un match déjà fermé arrive dans shared
+        conn = duckdb.connect(":memory:")
+        try:
+            aliases = attach_shared(conn, shared)
+            match_id = conn.execute(
+                "SELECT match_id FROM shared_p2022_Q1.match_participants LIMIT 1"
+            ).fetchone()[0]
+            detach_shared(conn, aliases)
+        finally:
+            conn.close()
+        conn = duckdb.connect(str(shared))
+        try:
+            conn.execute(
+                "INSERT INTO match_participants (match_id, xuid, gamertag, team_id) "
+                "VALUES (?, '2533274999999999', 'Latecomer', 0)",
+                [match_id],
+            )
+        finally:
+            conn.close()
+
+        report = split_shared_db(shared, before=cutoff)
+        assert report["partitions"] == {"2022_Q1": 1}
+        after = _counts(shared)
+        assert after["match_participants"] == before_counts["match_participants"] + 1
+        assert {t: n for t, n in after.items() if t != "match_participants"} == {
+            t: n for t, n in before_counts.items() if t != "match_participants"
+        }
+        assert split_shared_db(shared, before=cutoff)["partitions"] == {}
+
+    def test_sync_engine_knows_closed_matches(self, dataset):
+        from src.data.sync.engine import DuckDBSyncEngine
+
+        shared = dataset.shared_db_path
+        cutoff = _median_start(shared)
+        split_shared_db(shared, before=cutoff, granularity="quarter")
+        conn = duckdb.connect(str(partition_dir(shared) / "shared_2022_Q1.duckdb"), read_only=True)
+        try:
+            closed_id = conn.execute("SELECT match_id FROM match_registry LIMIT 1").fetchone()[0]
+        finally:
+            conn.close()
+
+        player = dataset.players[0]
+        engine = DuckDBSyncEngine(
+            player.db_path, xuid=player.xuid, gamertag=player.gamertag, shared_db_path=shared
+        )
+        try:
+            reader = engine._get_shared_reader()
+            assert reader.execute(
+                "SELECT COUNT(*) FROM match_registry WHERE match_id = ?", [closed_id]
+            ).fetchone() == (0,)
+            entry = engine._closed_registry_entry(reader, closed_id)
+            assert entry is not None and entry[1] is True
+        finally:
+            engine.close()
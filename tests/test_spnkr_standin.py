@@ -0,0 +1,129 @@
+"""
+Tests du stand-in local des services Halo et de la redirection du client SPNKr.
+(Tests for the local Halo services stand-in and SPNKr client base-URL override)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+
+import aiohttp
+
+from scripts import refetch_film_roster
+from scripts.benchmark.api_standin import FaultProfile, StandinServer, SyntheticPayloads
+from src.data.sync.api_client import (
+    API_BASE_URL_ENV,
+    STANDIN_TOKENS,
+    SPNKrAPIClient,
+    get_tokens_from_env,
+    redirect_url,
+)
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestRedirect:
+    """Réécriture des hôtes halowaypoint.com et tokens factices."""
+
+    def test_redirect_url_and_tokens(self, monkeypatch):
+        base = "http://127.0.0.1:9"
+        assert (
+            redirect_url("https://halostats.svc.halowaypoint.com:443/hi/matches/m/stats", base)
+            == f"{base}/halostats/hi/matches/m/stats"
+        )
+        assert (
+            redirect_url("https://skill.svc.halowaypoint.com/hi/matches/m/skill?players=1", base)
+            == f"{base}/skill/hi/matches/m/skill?players=1"
+        )
+        assert redirect_url("https://example.com/x", base) == "https://example.com/x"
+        assert redirect_url("https://halostats.svc.halowaypoint.com/hi", None).startswith("https")
+
+        monkeypatch.setenv(API_BASE_URL_ENV, base)
+        monkeypatch.delenv("SPNKR_AZURE_CLIENT_ID", raising=False)
+        assert _run(get_tokens_from_env()) == STANDIN_TOKENS
+
+
+class TestClientAgainstStandin:
+    """Le client SPNKr réel (spnkr + aiohttp) consomme les payloads générés."""
+
+    def test_sync_endpoints(self, monkeypatch):
+        payloads = SyntheticPayloads(matches=30, seed=3)
+        match = payloads._build_match(0)
+        xuids = [x for x, _gt, _team in match.players]
+
+        async def main():
+            async with StandinServer(payloads) as server:
+                async with SPNKrAPIClient(base_url=server.base_url, requests_per_second=100) as c:
+                    history = await c.get_match_history(payloads.gamertag, start=25, count=25)
+                    data = await c.get_match_data(history[0].match_id, xuids)
+                    first = await c.get_match_data(match.match_id, xuids)
+                    asset = await c.get_asset(
+                        "Maps",
+                        first.stats_json["MatchInfo"]["MapVariant"]["AssetId"],
+                        first.stats_json["MatchInfo"]["MapVariant"]["VersionId"],
+                    )
+                    missing = await c.get_match_stats("00000000-0000-0000-0000-000000000000")
+                monkeypatch.setenv(API_BASE_URL_ENV, server.base_url)
+                manifest = await refetch_film_roster.fetch_manifest(
+                    match_id=match.match_id, headers={}
+                )
+                return history, data, first, asset, missing, manifest, dict(server.counters)
+
+        history, data, first, asset, missing, manifest, counters = _run(main())
+
+        assert [h.match_id for h in history] == [payloads.match_id(i) for i in range(25, 30)]
+        assert data.stats_json["MatchId"] == history[0].match_id
+        assert len(first.stats_json["Players"]) == 8
+        assert len(first.skill_json["Value"]) == 8
+        kinds = [e.event_type for e in first.highlight_events]
+        assert kinds.count("kill") == kinds.count("death") == len(match.kills)
+        assert kinds.count("medal") == len(match.medals)
+        assert asset["PublicName"] == match.map[1]
+        assert missing is None
+        assert manifest["CustomData"]["MatchId"] == match.match_id
+        roster = refetch_film_roster.extract_roster_from_chunk(
+            zlib.decompress(payloads.film_chunk(match.match_id, "filmChunk0"))
+        )
+        assert roster == {x: gt for x, gt, _team in match.players}
+        assert counters["status:404"] == 1
+
+
+class TestFaults:
+    """429 avec Retry-After, 5xx et plafond de débit."""
+
+    def test_injected_errors_and_bandwidth(self):
+        payloads = SyntheticPayloads(matches=5)
+        url_path = f"/halostats/hi/matches/{payloads.match_id(0)}/stats"
+
+        async def fetch_status(faults):
+            async with (
+                StandinServer(payloads, faults) as server,
+                aiohttp.ClientSession() as s,
+                s.get(server.base_url + url_path) as resp,
+            ):
+                await resp.read()
+                return resp.status, resp.headers.get("Retry-After")
+
+        async def timed_fetches(faults, n):
+            async with StandinServer(payloads, faults) as server, aiohttp.ClientSession() as s:
+                t0 = time.perf_counter()
+                sizes = []
+                for _ in range(n):
+                    async with s.get(server.base_url + url_path) as resp:
+                        sizes.append(len(await resp.read()))
+                return time.perf_counter() - t0, sizes
+
+        assert _run(fetch_status(FaultProfile(rate_429=1.0, retry_after_s=2))) == (429, "2")
+        assert _run(fetch_status(FaultProfile(rate_5xx=1.0)))[0] in (500, 502, 503)
+
+        elapsed, sizes = _run(timed_fetches(FaultProfile(bandwidth_bytes_per_s=200_000), 4))
+        assert elapsed >= 0.9 * sum(sizes) / 200_000
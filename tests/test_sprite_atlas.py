@@ -0,0 +1,92 @@
+"""
+Tests des atlas d'icônes (médailles / citations) servis en statique.
+(Tests for static sprite atlases)
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.ui import sprite_atlas
+from src.ui.sprite_atlas import build_atlas, load_atlas, sprite_from_index
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _icons(root, names, size=256):
+    icons_dir = root / "static" / "medals" / "icons"
+    icons_dir.mkdir(parents=True, exist_ok=True)
+    for i, name in enumerate(names):
+        Image.new("RGBA", (size, size), (i * 40 % 255, 80, 160, 255)).save(
+            icons_dir / f"{name}.png"
+        )
+    return icons_dir
+
+
+class TestBuildAtlas:
+    """Construction de l'atlas et de son index."""
+
+    def test_builds_sheet_and_index(self, tmp_path):
+        _icons(tmp_path, ["101", "202", "303", "404", "505"])
+
+        index = build_atlas("medals", repo_root=str(tmp_path))
+
+        assert index is not None
+        assert index["columns"] == 3 and index["rows"] == 2 and index["tile"] == 128
+        assert index["sprites"]["101"] == [0, 0]
+        assert index["sprites"]["505"] == [1, 1]
+        png = tmp_path / "static" / "atlas" / "medals.png"
+        with Image.open(png) as sheet:
+            assert sheet.size == (3 * 128, 2 * 128)
+            # Icône redimensionnée dans sa tuile
+            assert sheet.getpixel((128 + 64, 128 + 64))[3] == 255
+        on_disk = json.loads((tmp_path / "static" / "atlas" / "medals.json").read_text())
+        assert on_disk == index
+
+    def test_rebuild_only_when_sources_change(self, tmp_path):
+        icons_dir = _icons(tmp_path, ["1", "2"])
+        first = build_atlas("medals", repo_root=str(tmp_path))
+        png = tmp_path / "static" / "atlas" / "medals.png"
+        mtime = png.stat().st_mtime_ns
+
+        assert build_atlas("medals", repo_root=str(tmp_path)) == first
+        assert png.stat().st_mtime_ns == mtime
+
+        Image.new("RGBA", (64, 64)).save(icons_dir / "3.png")
+        loaded = load_atlas("medals", repo_root=str(tmp_path))
+        assert loaded["signature"] != first["signature"]
+        assert set(loaded["sprites"]) == {"1", "2", "3"}
+
+    def test_no_sources(self, tmp_path):
+        assert build_atlas("medals", repo_root=str(tmp_path)) is None
+        assert load_atlas("medals", repo_root=str(tmp_path)) is None
+
+
+class TestSprite:
+    """Positions CSS et repli sans static serving."""
+
+    def test_css_offsets(self):
+        index = {
+            "name": "medals",
+            "columns": 3,
+            "rows": 2,
+            "signature": "abc",
+            "sprites": {"7": [2, 1], "8": [1, 0]},
+        }
+
+        last = sprite_from_index(index, "7")
+        middle = sprite_from_index(index, "8")
+
+        assert last.url == "app/static/atlas/medals.png?v=abc"
+        assert last.size == "300% 200%"
+        assert last.position == "100.0000% 100.0000%"
+        assert middle.position == "50.0000% 0.0000%"
+        assert "background-position:50.0000% 0.0000%" in middle.css()
+        assert middle.css_vars().startswith("--img:url('app/static/atlas/medals.png?v=abc')")
+        assert sprite_from_index(index, "unknown") is None
+
+    def test_get_sprite_requires_static_serving(self, monkeypatch):
+        monkeypatch.setattr(sprite_atlas, "static_serving_enabled", lambda: False)
+        assert sprite_atlas.get_sprite("medals", "101") is None
@@ -0,0 +1,167 @@
+"""
+Tests de l'index de co-présence teammate_pairs de shared_matches.duckdb.
+(Tests for the shared teammate co-occurrence index)
+"""
+
+from __future__ import annotations
+
+import duckdb
+import pytest
+
+from scripts.backfill.core import insert_participant_rows
+from scripts.benchmark.synthetic import SyntheticSpec, generate_dataset
+from scripts.benchmark_match_decoder import synthetic_match
+from src.data.infrastructure.database.teammate_index import (
+    TEAMMATE_ORDINALS_TABLE,
+    TEAMMATE_PAIRS_TABLE,
+    ensure_teammate_index,
+    rebuild_teammate_index,
+    update_teammate_index,
+)
+from src.data.repositories.duckdb_repo import DuckDBRepository
+from src.data.sessions_backfill import get_top_two_teammate_xuids
+from src.data.sync.transformers import extract_participants
+
+
+@pytest.fixture()
+def dataset(tmp_path):
+    return generate_dataset(tmp_path, SyntheticSpec(matches=150, players=2, overlap=0.5, seed=5))
+
+
+def _pairs(conn) -> list[tuple]:
+    return conn.execute(
+        f"SELECT xuid_a, xuid_b, same_team, match_count, "
+        f"list_sort(list_transform(match_ordinals, o -> m[o])) "
+        f"FROM {TEAMMATE_PAIRS_TABLE}, "
+        f"(SELECT map_from_entries(list((ordinal, match_id))) AS m FROM {TEAMMATE_ORDINALS_TABLE}) "
+        f"ORDER BY 1, 2, 3"
+    ).fetchall()
+
+
+def _read_teammates(dataset) -> tuple:
+    player = dataset.players[0]
+    with DuckDBRepository(player.db_path, player.xuid, read_only=True) as repo:
+        teammates = sorted(repo.list_top_teammates(limit=1000))
+        friend = max(teammates, key=lambda t: (t[1], t[0]))[0]
+        same_team = repo.load_same_team_match_ids(friend)
+        any_team = repo.load_matches_with_teammate(friend)
+    top = get_top_two_teammate_xuids(player.db_path, player.xuid, limit=1000)
+    return teammates, same_team, any_team, top
+
+
+class TestReaders:
+    """Les lecteurs donnent les mêmes résultats via l'index et via l'auto-jointure."""
+
+    def test_index_matches_self_join(self, dataset):
+        indexed = _read_teammates(dataset)
+
+        conn = duckdb.connect(str(dataset.shared_db_path))
+        try:
+            conn.execute(f"DROP TABLE {TEAMMATE_PAIRS_TABLE}")
+            conn.execute(f"DROP TABLE {TEAMMATE_ORDINALS_TABLE}")
+        finally:
+            conn.close()
+
+        teammates, same_team, any_team, top = _read_teammates(dataset)
+        assert indexed == (teammates, same_team, any_team, top)
+        assert same_team and set(same_team) <= set(any_team)
+
+
+class TestIncremental:
+    """Mise à jour incrémentale : idempotente et identique à une reconstruction."""
+
+    def test_update_equals_rebuild(self, dataset):
+        conn = duckdb.connect(str(dataset.shared_db_path))
+        try:
+            rebuilt = _pairs(conn)
+            conn.execute(f"DROP TABLE {TEAMMATE_PAIRS_TABLE}")
+            conn.execute(f"DROP TABLE {TEAMMATE_ORDINALS_TABLE}")
+
+            # Rattrapage progressif : d'abord une partie des matchs, puis le reste
+            first = [
+                r[0]
+                for r in conn.execute(
+                    "SELECT DISTINCT match_id FROM match_participants ORDER BY match_id DESC "
+                    "LIMIT 40"
+                ).fetchall()
+            ]
+            conn.execute("CREATE TABLE _hidden AS SELECT * FROM match_participants")
+            conn.execute("DELETE FROM match_participants WHERE match_id NOT IN ?", [first])
+            assert ensure_teammate_index(conn) == 40
+            conn.execute(
+                "INSERT INTO match_participants SELECT * FROM _hidden EXCEPT ALL "
+                "SELECT * FROM match_participants"
+            )
+            assert ensure_teammate_index(conn) == 110
+            assert ensure_teammate_index(conn) == 0
+            assert update_teammate_index(conn, first) == 0
+            assert _pairs(conn) == rebuilt
+
+            # Participant ajouté après coup à un match indexé : réindexé si passé explicitement
+            conn.execute(
+                "INSERT INTO match_participants (match_id, xuid, gamertag, team_id) "
+                "VALUES (?, '2533274999999999', 'Latecomer', 0)",
+                [first[0]],
+            )
+            assert ensure_teammate_index(conn) == 0
+            conn.execute("BEGIN TRANSACTION")
+            assert update_teammate_index(conn, [first[0]]) == 1
+            conn.execute("COMMIT")
+            incremental = _pairs(conn)
+            rebuild_teammate_index(conn)
+            assert _pairs(conn) == incremental
+            assert any(p[1] == "2533274999999999" and p[2] for p in incremental)
+        finally:
+            conn.close()
+
+    def test_backfill_participants_update_index(self, dataset):
+        conn = duckdb.connect(str(dataset.shared_db_path))
+        try:
+            match = synthetic_match(8, seed_xuid=2533274900000000)
+            match["MatchId"] = "backfilled-match"
+            assert insert_participant_rows(conn, extract_participants(match)) == 8
+
+            # Indexé dans la même transaction : rien à rattraper, identique à une reconstruction
+            assert ensure_teammate_index(conn) == 0
+            incremental = _pairs(conn)
+            rebuild_teammate_index(conn)
+            assert _pairs(conn) == incremental
+            assert any("backfilled-match" in p[4] for p in incremental)
+        finally:
+            conn.close()
+
+    def test_team_change_with_same_participants_is_reindexed(self, dataset):
+        conn = duckdb.connect(str(dataset.shared_db_path))
+        try:
+            match_id, xuid = conn.execute(
+                "SELECT match_id, xuid FROM match_participants "
+                "WHERE team_id = 0 ORDER BY match_id, xuid LIMIT 1"
+            ).fetchone()
+
+            # Équipe corrigée par un backfill : même nombre de participants
+            conn.execute(
+                "UPDATE match_participants SET team_id = 1 WHERE match_id = ? AND xuid = ?",
+                [match_id, xuid],
+            )
+            assert update_teammate_index(conn, [match_id]) == 1
+            assert update_teammate_index(conn, [match_id]) == 0
+            incremental = _pairs(conn)
+            rebuild_teammate_index(conn)
+            assert _pairs(conn) == incremental
+        finally:
+            conn.close()
+
+    def test_index_without_signature_is_migrated(self, dataset):
+        conn = duckdb.connect(str(dataset.shared_db_path))
+        try:
+            conn.execute(f"ALTER TABLE {TEAMMATE_ORDINALS_TABLE} DROP COLUMN team_signature")
+            assert ensure_teammate_index(conn) == 0
+            match_id = conn.execute(
+                f"SELECT match_id FROM {TEAMMATE_ORDINALS_TABLE} ORDER BY match_id LIMIT 1"
+            ).fetchone()[0]
+
+            # Signature NULL héritée : réindexé une fois, puis stable
+            assert update_teammate_index(conn, [match_id]) == 1
+            assert update_teammate_index(conn, [match_id]) == 0
+        finally:
+            conn.close()
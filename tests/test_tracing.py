@@ -0,0 +1,116 @@
+"""
+Tests du tracing par étape des syncs / backfills et du rapport.
+(Tests for stage-level sync/backfill tracing and the report script)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import duckdb
+
+from scripts import trace_report
+from src.data.sync import tracing
+from src.data.sync.db_writer import DBWriter
+
+
+def _run(coro):
+    """Exécute une coroutine sur une boucle dédiée (sans toucher la boucle courante)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestDisabledTracing:
+    """Sans trace active, les helpers ne font rien."""
+
+    def test_noop_without_trace(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(tracing.TRACE_DIR_ENV, raising=False)
+
+        assert tracing.start_trace("sync") is None
+        assert tracing.span("transform") is tracing.span("write.wait")
+        with tracing.match_scope("m1"), tracing.span("transform"):
+            tracing.count("api.retry")
+        assert tracing.active_trace() is None
+        assert tracing.finish_trace(None) is None
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRunTrace:
+    """Attribution des étapes aux matchs, y compris via le writer DuckDB."""
+
+    def test_spans_attributed_to_matches(self, tmp_path):
+        conn = duckdb.connect(str(tmp_path / "stats.duckdb"))
+        conn.execute("CREATE TABLE t (id INTEGER)")
+        writer = DBWriter([conn], max_group=4, linger_seconds=0.01)
+
+        def _write(i):
+            def _apply():
+                with tracing.span("write.player"):
+                    conn.execute("INSERT INTO t VALUES (?)", [i])
+
+            return _apply
+
+        async def _match(i):
+            with tracing.match_scope(f"m{i}"):
+                with tracing.span("transform"):
+                    tracing.count("api.retry", 2)
+                await writer.submit(f"m{i}", _write(i))
+
+        async def main():
+            token = tracing.start_trace("sync", directory=tmp_path / "traces", gamertag="Tester")
+            await asyncio.gather(*(_match(i) for i in range(3)))
+            with tracing.span("mv_refresh"):
+                pass
+            return tracing.finish_trace(token)
+
+        try:
+            path = _run(main())
+        finally:
+            writer.close()
+            conn.close()
+
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        run, *rest = records
+        assert run["type"] == "run" and run["kind"] == "sync" and run["matches"] == 3
+        assert run["gamertag"] == "Tester"
+        assert [r["stage"] for r in rest if r["type"] == "stage"] == ["mv_refresh"]
+
+        matches = {r["match_id"]: r for r in rest if r["type"] == "match"}
+        assert set(matches) == {"m0", "m1", "m2"}
+        for record in matches.values():
+            assert set(record["stages"]) == {"transform", "api.retry", "write.player"}
+            assert record["stages"]["api.retry"] == {"seconds": 0.0, "count": 2}
+            assert record["total_seconds"] >= record["stages"]["write.player"]["seconds"]
+
+
+class TestTraceReport:
+    """Percentiles et matchs lents du rapport."""
+
+    def test_summary_and_slowest(self):
+        records = [{"type": "run", "kind": "sync"}] + [
+            {
+                "type": "match",
+                "match_id": f"m{i}",
+                "total_seconds": float(i),
+                "stages": {
+                    "api.match_stats": {"seconds": i * 0.8, "count": 1},
+                    "transform": {"seconds": i * 0.1, "count": 1},
+                },
+            }
+            for i in range(1, 6)
+        ]
+
+        summary = trace_report.stage_summary(records)
+
+        assert summary["match"]["p50"] == 3.0
+        assert summary["api.match_stats"]["calls"] == 5
+        assert abs(summary["transform"]["total"] - 1.5) < 1e-9
+        assert trace_report.percentile([1.0, 2.0], 50) == 1.5
+        assert trace_report.slowest_matches(records, 2) == [
+            ("m5", 5.0, "api.match_stats"),
+            ("m4", 4.0, "api.match_stats"),
+        ]